@@ -1,4 +1,3 @@
-import random
 from typing import List
 
 from enforce_typing import enforce_types
@@ -16,6 +15,8 @@ DEFAULT_profit_margin_on_consume = 0.2
 
 @enforce_types
 class DataconsumerAgent(AgentBase.AgentBaseEvm):
+    SHADOW_OK = True  # oceanv3 actions only
+
     def __init__(
         self,
         name: str,
@@ -36,11 +37,18 @@ class DataconsumerAgent(AgentBase.AgentBaseEvm):
             self._s_since_buy = 0
             self._buyAndConsumeDT(state)
 
+    def skipTime(self, s_skipped: int) -> None:
+        self._s_since_buy += s_skipped
+
+    def nextWakeTime(self, state):
+        s_until = self._s_between_buys - self._s_since_buy
+        return state.tick * state.ss.time_step + max(0, s_until)
+
     def _doBuyAndConsumeDT(self, state):
-        cand_pool_agents = self._candPoolAgents(state)
-        if not cand_pool_agents:
+        # check time first: finding candidate pools may read pools
+        if self._s_since_buy < self._s_between_buys:
             return False
-        return self._s_since_buy >= self._s_between_buys
+        return bool(self._candPoolAgents(state))
 
     def _candPoolAgents(  # pylint: disable=too-many-locals
         self, state
@@ -58,24 +66,12 @@ class DataconsumerAgent(AgentBase.AgentBaseEvm):
             if hasattr(state, "rugged_pools") and pool_name in state.rugged_pools:
                 continue
 
-            # filter 2: agent has enough funds?
-            pool = pool_agent.pool
+            # filter 2: agent has enough funds? Quote it locally
             DT_address = pool_agent.datatoken_address
-
-            tokenBalanceIn = pool.getBalance(OCEAN_address)
-            tokenWeightIn = pool.getDenormalizedWeight(OCEAN_address)
-            tokenBalanceOut = pool.getBalance(DT_address)
-            tokenWeightOut = pool.getDenormalizedWeight(DT_address)
             tokenAmountOut = toBase18(1.0)  # number of DTs
-            swapFee = pool.getSwapFee()
-
-            OCEANamountIn_base = pool.calcInGivenOut(
-                tokenBalanceIn,
-                tokenWeightIn,
-                tokenBalanceOut,
-                tokenWeightOut,
-                tokenAmountOut,
-                swapFee,
+
+            OCEANamountIn_base = pool_agent.pool_state.inGivenOut(
+                OCEAN_address, DT_address, tokenAmountOut
             )
 
             if OCEANamountIn_base >= OCEAN_base:
@@ -93,10 +89,11 @@ class DataconsumerAgent(AgentBase.AgentBaseEvm):
 
         cand_pool_agents = self._candPoolAgents(state)
         assert cand_pool_agents
-        pool_agent = random.choice(cand_pool_agents)
+        pool_agent = state.rng.choice(cand_pool_agents)
 
         pool = pool_agent.pool
         DT = pool_agent.datatoken
+        self._wallet.useMaxAllowance(pool.address)  # approve once per pool
 
         DT_before = self.DT(DT)
         OCEAN_before = self.OCEAN()
@@ -145,11 +142,18 @@ class DataconsumerAgentV4(AgentBase.AgentBaseEvm):
             self._s_since_buy = 0
             self._buyAndConsumeDT(state)
 
+    def skipTime(self, s_skipped: int) -> None:
+        self._s_since_buy += s_skipped
+
+    def nextWakeTime(self, state):
+        s_until = self._s_between_buys - self._s_since_buy
+        return state.tick * state.ss.time_step + max(0, s_until)
+
     def _doBuyAndConsumeDT(self, state):
-        cand_pool_agents = self._candPoolAgents(state)
-        if not cand_pool_agents:
+        # check time first: finding candidate pools may read pools
+        if self._s_since_buy < self._s_between_buys:
             return False
-        return self._s_since_buy >= self._s_between_buys
+        return bool(self._candPoolAgents(state))
 
     def _candPoolAgents(  # pylint: disable=too-many-locals
         self, state
@@ -167,15 +171,13 @@ class DataconsumerAgentV4(AgentBase.AgentBaseEvm):
             if hasattr(state, "rugged_pools") and pool_name in state.rugged_pools:
                 continue
 
-            # filter 2: agent has enough funds?
-            pool = pool_agent.pool
+            # filter 2: agent has enough funds? Quote it locally
+            pool_state = pool_agent.pool_state
             DT_address = pool_agent.datatoken_address
-
             tokenAmountOut = toBase18(1.0)  # number of DTs
-            swapFee = pool.getSwapFee()
 
-            OCEANamountIn_base = pool.getAmountInExactOut(
-                OCEAN_address, DT_address, tokenAmountOut, swapFee
+            OCEANamountIn_base = pool_state.inGivenOut(
+                OCEAN_address, DT_address, tokenAmountOut, pool_state.swapFee()
             )
 
             if OCEANamountIn_base >= OCEAN_base:
@@ -193,10 +195,11 @@ class DataconsumerAgentV4(AgentBase.AgentBaseEvm):
 
         cand_pool_agents = self._candPoolAgents(state)
         assert cand_pool_agents
-        pool_agent = random.choice(cand_pool_agents)
+        pool_agent = state.rng.choice(cand_pool_agents)
 
         pool = pool_agent.pool
         DT = pool_agent.datatoken
+        self._wallet.useMaxAllowance(pool.address)  # approve once per pool
 
         DT_before = self.DT(DT)
         OCEAN_before = self.OCEAN()
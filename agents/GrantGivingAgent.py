@@ -22,6 +22,7 @@ class GrantGivingAgent(AgentBase.AgentBaseNoEvm):
         super().__init__(name, USD, OCEAN)
         self._receiving_agent_name: str = receiving_agent_name
         self._s_between_grants: int = s_between_grants
+        self._n_actions: int = n_actions
         self._USD_per_grant: float = USD / float(n_actions)
         self._OCEAN_per_grant: float = OCEAN / float(n_actions)
 
@@ -41,6 +42,10 @@ class GrantGivingAgent(AgentBase.AgentBaseNoEvm):
             self._disburseFunds(state)
             self._tick_last_disburse = state.tick
 
+    def nextWakeTime(self, state):
+        s_last_disburse = self._tick_last_disburse * state.ss.time_step
+        return s_last_disburse + self._s_between_grants
+
     def _disburseFunds(self, state):
         # same amount each time
         receiving_agent = state.getAgent(self._receiving_agent_name)
@@ -39,6 +39,14 @@ class OCEANLinearMinterAgent(AgentBase.AgentBaseNoEvm):
         if self._doMint(state):
             self._mintAndDisburseFunds(state)
 
+    def nextWakeTime(self, state):
+        if self._n_mints_left == 0:
+            return math.inf
+        if self._tick_previous_mint is None:
+            return state.tick * state.ss.time_step
+        s_previous_mint = self._tick_previous_mint * state.ss.time_step
+        return s_previous_mint + self._s_between_mints
+
     def _doMint(self, state) -> bool:
         assert self._n_mints_left >= 0.0
 
@@ -249,6 +257,14 @@ class OCEANFuncMinterAgent(AgentBase.AgentBaseNoEvm):
         if self._doMint(state):
             self._mintAndDisburseFunds(state)
 
+    def nextWakeTime(self, state):
+        if self._OCEAN_left_to_mint == 0.0:
+            return math.inf
+        if self._tick_previous_mint is None:  # doesn't mint at tick 0
+            return (state.tick + 1) * state.ss.time_step
+        s_previous_mint = self._tick_previous_mint * state.ss.time_step
+        return s_previous_mint + self._s_between_mints
+
     def OCEANminted(self):
         return self._total_OCEAN_to_mint - self._OCEAN_left_to_mint
 
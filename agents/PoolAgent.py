@@ -1,24 +1,38 @@
 from enforce_typing import enforce_types
 
 from engine import AgentBase
-from util import globaltokens
-from util.constants import BROWNIE_PROJECT057, BROWNIE_PROJECT080
+from util import globaltokens, shadowamm
+from util import constants
+from util.poolstate import PoolState, PoolStateV4
 
 
 @enforce_types
 class PoolAgent(AgentBase.AgentBaseEvm):
+    SHADOW_OK = True  # oceanv3 actions only
+
     def __init__(self, name: str, pool):
         super().__init__(name, USD=0.0, OCEAN=0.0)
         self._pool = pool
 
         self._dt_address = self._datatokenAddress()
-        self._dt = BROWNIE_PROJECT057.DataTokenTemplate.at(self._dt_address)
+        if isinstance(pool, shadowamm.ShadowPool):
+            self._dt = shadowamm.contractAt(self._dt_address)
+        else:
+            self._dt = constants.BROWNIE_PROJECT057.DataTokenTemplate.at(
+                self._dt_address
+            )
         self._controller_address = self._controllerAddress()
+        self._pool_state = PoolState(pool, self._dt_address)
 
     @property
     def pool(self):
         return self._pool
 
+    @property
+    def pool_state(self) -> PoolState:
+        """Snapshot of the pool's balances, weights, fees, etc"""
+        return self._pool_state
+
     @property
     def datatoken_address(self) -> str:
         return self._dt_address
@@ -55,8 +69,9 @@ class PoolAgentV4(AgentBase.AgentBaseEvm):
         self._pool = pool
 
         self._dt_address = self._datatokenAddress()
-        self._dt = BROWNIE_PROJECT080.ERC20Template.at(self._dt_address)
+        self._dt = constants.BROWNIE_PROJECT080.ERC20Template.at(self._dt_address)
         self._controller_address = self._controllerAddress()
+        self._pool_state = PoolStateV4(pool, self._dt_address)
 
         self._minter_address = self._minterAddress()
 
@@ -64,6 +79,11 @@ class PoolAgentV4(AgentBase.AgentBaseEvm):
     def pool(self):
         return self._pool
 
+    @property
+    def pool_state(self) -> PoolStateV4:
+        """Snapshot of the pool's balances, weights, fees, etc"""
+        return self._pool_state
+
     @property
     def datatoken_address(self) -> str:
         return self._dt_address
@@ -94,9 +114,9 @@ class PoolAgentV4(AgentBase.AgentBaseEvm):
 
     @property
     def minter_address(self) -> str:
-        return self._minterAddress()
+        return self._minter_address
 
     def _minterAddress(self):
         nft_address = self.datatoken.getERC721Address()
-        nft = BROWNIE_PROJECT080.ERC721Template.at(nft_address)
+        nft = constants.BROWNIE_PROJECT080.ERC721Template.at(nft_address)
         return nft.ownerOf(1)
@@ -1,16 +1,11 @@
-import random
 from typing import List, Optional
 
 from enforce_typing import enforce_types
-import brownie
 
-from sol057.contracts.oceanv3 import oceanv3util
 from sol080.contracts.oceanv4 import oceanv4util
 from engine import AgentBase
-from util import globaltokens
-from util.base18 import toBase18
-from util.constants import S_PER_DAY, S_PER_HOUR, BROWNIE_PROJECT080
-from util.tx import txdict
+from util import balanceledger, constants
+from util.constants import S_PER_DAY, S_PER_HOUR
 from agents.PoolAgent import PoolAgent, PoolAgentV4
 
 
@@ -64,6 +59,8 @@ class PublisherStrategy:  # pylint: disable=too-many-instance-attributes
 
 @enforce_types
 class PublisherAgent(AgentBase.AgentBaseEvm):
+    SHADOW_OK = True  # oceanv3 actions only
+
     def __init__(
         self,
         name: str,
@@ -104,15 +101,28 @@ class PublisherAgent(AgentBase.AgentBaseEvm):
             if (len(self.pools) > 0) & (self.pools[-1] not in state.rugged_pools):
                 state.rugged_pools.append(self.pools[-1])
 
+    def skipTime(self, s_skipped: int) -> None:
+        self._s_since_create += s_skipped
+        self._s_since_unstake += s_skipped
+        self._s_since_sellDT += s_skipped
+
+    def nextWakeTime(self, state):
+        if self.pub_ss.is_malicious:
+            return None  # its rug window needs a check every tick
+        s_until = min(
+            self.pub_ss.s_between_create - self._s_since_create,
+            self.pub_ss.s_between_unstake - self._s_since_unstake,
+            self.pub_ss.s_between_sellDT - self._s_since_sellDT,
+        )
+        return state.tick * state.ss.time_step + max(0, s_until)
+
     def _doCreatePool(self) -> bool:
-        if self.OCEAN() < 200.0:  # magic number
+        if self._s_since_create < self.pub_ss.s_between_create:
             return False
-        return self._s_since_create >= self.pub_ss.s_between_create
+        return self.OCEAN() >= 200.0  # magic number
 
     def _createPoolAgent(self, state) -> PoolAgent:
         assert self.OCEAN() > 0.0, "should not call if no OCEAN"
-        account = self._wallet._account
-        OCEAN = globaltokens.OCEANtoken()
 
         # name
         pool_i = len(state.agents.filterToPool())
@@ -122,30 +132,16 @@ class PublisherAgent(AgentBase.AgentBaseEvm):
         # new DT
         DT = self._createDatatoken(dt_name, mint_amt=self.pub_ss.DT_init)
 
-        # new pool
-        pool = oceanv3util.newBPool(account)
-
-        # bind tokens & add initial liquidity
+        # new pool. Bind tokens & add initial liquidity
         OCEAN_bind_amt = max(0, self.OCEAN() - 1.0)  # magic number: use most OCEAN
         DT_bind_amt = self.pub_ss.DT_stake
-
-        DT.approve(pool.address, toBase18(DT_bind_amt), txdict(account))
-        OCEAN.approve(pool.address, toBase18(OCEAN_bind_amt), txdict(account))
-
-        pool.bind(
-            DT.address,
-            toBase18(DT_bind_amt),
-            toBase18(self.pub_ss.pool_weight_DT),
-            txdict(account),
+        pool = self._wallet.newPool(
+            DT,
+            DT_bind_amt,
+            self.pub_ss.pool_weight_DT,
+            OCEAN_bind_amt,
+            self.pub_ss.pool_weight_OCEAN,
         )
-        pool.bind(
-            OCEAN.address,
-            toBase18(OCEAN_bind_amt),
-            toBase18(self.pub_ss.pool_weight_OCEAN),
-            txdict(account),
-        )
-
-        pool.finalize(txdict(account))
 
         # create agent
         pool_agent = PoolAgent(pool_agent_name, pool)
@@ -158,44 +154,37 @@ class PublisherAgent(AgentBase.AgentBaseEvm):
         return pool_agent
 
     def _doUnstakeOCEAN(self, state) -> bool:
-        if not state.agents.filterByNonzeroStake(self):
+        # check time first: finding staked pools costs RPC calls
+        if self._s_since_unstake < self.pub_ss.s_between_unstake:
+            return False
+        if self.pub_ss.is_malicious and not self._inRugWindow():
             return False
 
-        if self.pub_ss.is_malicious:
-            return (
-                (self._s_since_unstake >= self.pub_ss.s_between_unstake)
-                & (self._s_since_create >= self.pub_ss.s_wait_to_rug)
-                & (
-                    self._s_since_create
-                    <= self.pub_ss.s_wait_to_rug + self.pub_ss.s_rug_time
-                )
-            )
-
-        return self._s_since_unstake >= self.pub_ss.s_between_unstake
+        return bool(state.agents.filterByNonzeroStake(self))
 
     def _unstakeOCEANsomewhere(self, state):
         """Choose what pool to unstake and by how much. Then do the action."""
         pool_agents = state.agents.filterByNonzeroStake(self)
-        pool_agent = random.choice(list(pool_agents.values()))
+        pool_agent = state.rng.choice(list(pool_agents.values()))
         BPT = self.BPT(pool_agent.pool)
         BPT_unstake = PERCENT_UNSTAKE * BPT
         self.unstakeOCEAN(BPT_unstake, pool_agent.pool)
 
     def _doSellDT(self, state) -> bool:
-        if not self._DTsWithNonzeroBalance(state):
+        # check time first: finding DT balances costs RPC calls
+        if self._s_since_sellDT < self.pub_ss.s_between_sellDT:
+            return False
+        if self.pub_ss.is_malicious and not self._inRugWindow():
             return False
 
-        if self.pub_ss.is_malicious:
-            return (
-                (self._s_since_sellDT >= self.pub_ss.s_between_sellDT)
-                & (self._s_since_create >= self.pub_ss.s_wait_to_rug)
-                & (
-                    self._s_since_create
-                    <= self.pub_ss.s_wait_to_rug + self.pub_ss.s_rug_time
-                )
-            )
+        return bool(self._DTsWithNonzeroBalance(state))
 
-        return self._s_since_sellDT >= self.pub_ss.s_between_sellDT
+    def _inRugWindow(self) -> bool:
+        return (
+            self.pub_ss.s_wait_to_rug
+            <= self._s_since_create
+            <= self.pub_ss.s_wait_to_rug + self.pub_ss.s_rug_time
+        )
 
     def _sellDTsomewhere(self, state, perc_sell: float = 0.01):
         """Choose what DT to sell and by how much. Then do the action."""
@@ -207,9 +196,9 @@ class PublisherAgent(AgentBase.AgentBaseEvm):
         else:
             # random by DT, then pool (could be something else)
             cand_DTs = self._DTsWithNonzeroBalance(state)
-            DT = random.choice(cand_DTs)
+            DT = state.rng.choice(cand_DTs)
             cand_pools = self._poolsWithDT(state, DT)
-            pool = random.choice(cand_pools)
+            pool = state.rng.choice(cand_pools)
 
         DT_balance_amt = self.DT(DT)
         assert DT_balance_amt > 0.0
@@ -242,15 +231,12 @@ class PublisherAgent(AgentBase.AgentBaseEvm):
         """Return a list of Datatokens that this agent has >0 balance of"""
         pool_agents = state.agents.filterToPool().values()
         DTs = [pool_agent.datatoken for pool_agent in pool_agents]
+        balanceledger.prefetch([(DT, self.address) for DT in DTs])
         return [DT for DT in DTs if self.DT(DT) > 0.0]
 
     def _createDatatoken(self, dt_name: str, mint_amt: float):
         """Create datatoken contract and mint DTs to self."""
-        account = self._wallet._account
-        DT = oceanv3util.newDatatoken("", dt_name, dt_name, toBase18(mint_amt), account)
-        DT.mint(account.address, toBase18(mint_amt), txdict(account))
-        self._wallet.resetCachedInfo()
-        return DT
+        return self._wallet.newDatatoken(dt_name, mint_amt)
 
 
 class PublisherStrategyV4:  # pylint: disable=too-many-instance-attributes
@@ -339,13 +325,8 @@ class PublisherAgentV4(AgentBase.AgentBaseEvm):
         dt_name = f"DT{pool_i}"
         pool_agent_name = f"pool{pool_i}"
 
-        # Router
-        router = self._deployRouter()
-
-        # new dataNFT
-        createDataNFT = self._creatDataNFT_withRouter(dt_name, dt_name, router)
-        dataNFT = createDataNFT[0]
-        erc721_factory = createDataNFT[1]
+        # new dataNFT. Via the chain's shared router and ERC721 factory
+        dataNFT, erc721_factory = self._createDataNFT(dt_name, dt_name)
 
         # new DT
         DT = self._createDataToken(dt_name, dt_name, self.pub_ss.DT_cap, dataNFT)
@@ -386,7 +367,7 @@ class PublisherAgentV4(AgentBase.AgentBaseEvm):
     def _unstakeOCEANsomewhere(self, state):
         """Choose what pool to unstake and by how much. Then do the action."""
         pool_agents = state.agents.filterByNonzeroStakeV4(self)
-        pool_agent = random.choice(list(pool_agents.values()))
+        pool_agent = state.rng.choice(list(pool_agents.values()))
         BPT = self.BPT(pool_agent.pool)
         BPT_unstake = PERCENT_UNSTAKE * BPT
         self.unstakeOCEAN(BPT_unstake, pool_agent.pool)
@@ -417,9 +398,9 @@ class PublisherAgentV4(AgentBase.AgentBaseEvm):
         else:
             # random by DT, then pool (could be something else)
             cand_DTs = self._DTsWithNonzeroBalance(state)
-            DT = random.choice(cand_DTs)
+            DT = state.rng.choice(cand_DTs)
             cand_pools = self._poolsWithDT(state, DT)
-            pool = random.choice(cand_pools)
+            pool = state.rng.choice(cand_pools)
 
         DT_balance_amt = self.DT(DT)
         if DT_balance_amt > 0.0:
@@ -451,18 +432,12 @@ class PublisherAgentV4(AgentBase.AgentBaseEvm):
         """Return a list of Datatokens that this agent has >0 balance of"""
         pool_agents = state.agents.filterToPoolV4().values()
         DTs = [pool_agent.datatoken for pool_agent in pool_agents]
+        balanceledger.prefetch([(DT, self.address) for DT in DTs])
         return [DT for DT in DTs if self.DT(DT) > 0.0]
 
-    def _deployRouter(self):
-        account = self._wallet._account
-        return oceanv4util.deployRouter(account)
-
-    def _creatDataNFT_withRouter(self, dataNFT_name: str, dataNFT_symbol: str, router):
+    def _createDataNFT(self, dataNFT_name: str, dataNFT_symbol: str) -> tuple:
         account = self._wallet._account
-        createDataNFT = oceanv4util.createDataNFT(
-            dataNFT_name, dataNFT_symbol, account, router
-        )
-        return createDataNFT
+        return oceanv4util.createDataNFT(dataNFT_name, dataNFT_symbol, account)
 
     def _createDataToken(self, DT_name, DT_symbol, DT_cap, dataNFT):
         account = self._wallet._account
@@ -487,7 +462,9 @@ class PublisherAgentV4(AgentBase.AgentBaseEvm):
         return pool
 
     def _doGetVesting(self):
-        return (brownie.chain.height >= ss_DT_vested_blocks) & (
+        from brownie.network import chain  # pylint: disable=import-outside-toplevel
+
+        return (chain.height >= ss_DT_vested_blocks) & (
             self._s_since_getVesing == self._s_since_getVesing
         )
 
@@ -497,7 +474,9 @@ class PublisherAgentV4(AgentBase.AgentBaseEvm):
             pool = pool_agent.pool
             DT = pool_agent._dt
             oneSSContractAddress = pool.getController()
-            oneSSContract = BROWNIE_PROJECT080.SideStaking.at(oneSSContractAddress)
+            oneSSContract = constants.BROWNIE_PROJECT080.SideStaking.at(
+                oneSSContractAddress
+            )
 
             get_vest = oneSSContract.getvestingAmountSoFar(
                 DT.address
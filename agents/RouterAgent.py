@@ -1,9 +1,9 @@
 import math
-from typing import List
 
 from enforce_typing import enforce_types
 
 from engine import AgentBase
+from engine.KPIsBase import RollingSum
 from util.constants import S_PER_MONTH
 
 
@@ -25,15 +25,19 @@ class RouterAgent(AgentBase.AgentBaseNoEvm):
         """
         super().__init__(name, USD, OCEAN)
         self._receiving_agents = receiving_agents
+        self._network = None  # RouterNetworkAgent that disburses for it, if any
 
-        # track amounts over time
-        self._USD_per_tick: List[float] = []  # the next tick will record what's in self
-        self._OCEAN_per_tick: List[float] = []  # ""
+        # track amounts over time. O(1) sums over ticks
+        self._USD_per_tick = RollingSum()  # the next tick will record what's in self
+        self._OCEAN_per_tick = RollingSum()  # ""
 
     def takeStep(self, state) -> None:
+        if self._network is not None:
+            self._network.takeStep(state)  # disburses for all of its routers
+            return
+
         # record what we had up until this point
-        self._USD_per_tick.append(self.USD())
-        self._OCEAN_per_tick.append(self.OCEAN())
+        self.recordHoldings()
 
         # disburse it all, as soon as agent has it
         if self.USD() > 0:
@@ -41,6 +45,19 @@ class RouterAgent(AgentBase.AgentBaseNoEvm):
         if self.OCEAN() > 0:
             self._disburseOCEAN(state)
 
+    def joinNetwork(self, network) -> None:
+        """From now on, network (a RouterNetworkAgent) does this agent's
+        disbursing. Stepping this agent steps network"""
+        self._network = network
+
+    def receivingAgents(self) -> dict:
+        return self._receiving_agents
+
+    def recordHoldings(self) -> None:
+        """Append what this agent holds now to its per-tick history"""
+        self._USD_per_tick.append(self.USD())
+        self._OCEAN_per_tick.append(self.OCEAN())
+
     def _disburseUSD(self, state) -> None:
         USD = self.USD()
         for name, computePercent in self._receiving_agents.items():
@@ -55,13 +72,13 @@ class RouterAgent(AgentBase.AgentBaseNoEvm):
         """USD received in the past month. Disburses immediately on receipt."""
         tick1 = self._tickOneMonthAgo(state)
         tick2 = state.tick
-        return float(sum(self._USD_per_tick[tick1 : tick2 + 1]))
+        return self._USD_per_tick.sumOverTicks(tick1, tick2 + 1)
 
     def monthlyOCEANreceived(self, state) -> float:
         """OCEAN received in past month. Disburses immediately on receipt."""
         tick1 = self._tickOneMonthAgo(state)
         tick2 = state.tick
-        return float(sum(self._OCEAN_per_tick[tick1 : tick2 + 1]))
+        return self._OCEAN_per_tick.sumOverTicks(tick1, tick2 + 1)
 
     @staticmethod
     def _tickOneMonthAgo(state) -> int:
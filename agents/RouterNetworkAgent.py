@@ -0,0 +1,112 @@
+from typing import List
+
+from enforce_typing import enforce_types
+import numpy
+
+from engine import AgentBase
+from .RouterAgent import RouterAgent
+
+
+@enforce_types
+class RouterNetworkAgent(AgentBase.AgentBaseNoEvm):
+    """
+    Does the disbursing of a set of RouterAgents, all at once.
+
+    At construction, it compiles the routers' receiving_agents into a flow
+    matrix: flow[j, i] = percent of router i's funds going to node j. Nodes
+    are the routers, then the other receivers. Each tick, it evaluates the
+    percent funcs once, then moves USD and OCEAN through the whole graph
+    with a few matrix products, rather than one transfer per edge.
+
+    The routers stay in state.agents, so their wallets and _USD_per_tick
+    etc. stay observable. Stepping any of them steps this agent instead,
+    once per tick: the first of them to step disburses for all. So this
+    agent needn't be in state.agents; if it is, it steps once too. To keep
+    the step order of routers that step apart, give each group its own
+    RouterNetworkAgent.
+    """
+
+    def __init__(self, name: str, routers: List[RouterAgent]):
+        super().__init__(name, USD=0.0, OCEAN=0.0)
+        self._routers = routers
+        router_names = [router.name for router in routers]
+        assert len(set(router_names)) == len(router_names), "duplicate routers"
+
+        # nodes: routers first, then receivers that aren't routers
+        self._sink_names: List[str] = []
+        for router in routers:
+            for name_j in router.receivingAgents():
+                if name_j not in router_names and name_j not in self._sink_names:
+                    self._sink_names.append(name_j)
+        node_index = {
+            name_j: j for j, name_j in enumerate(router_names + self._sink_names)
+        }
+
+        # flow matrix, in sparse (COO) form: one entry per edge
+        self._percent_funcs = []
+        dst, src = [], []
+        for i, router in enumerate(routers):
+            for name_j, computePercent in router.receivingAgents().items():
+                self._percent_funcs.append(computePercent)
+                dst.append(node_index[name_j])
+                src.append(i)
+        self._dst = numpy.array(dst, dtype=int)
+        self._src = numpy.array(src, dtype=int)
+        self._n_nodes = len(node_index)
+        self._depth = self._routingDepth()
+        self._tick_last_step = None
+
+        for router in routers:
+            router.joinNetwork(self)
+
+    def _routingDepth(self) -> int:
+        """Longest chain of routers feeding routers. Asserts there's no cycle"""
+        n_routers = len(self._routers)
+        is_edge = self._dst < n_routers
+        reach = numpy.zeros((n_routers, n_routers), dtype=int)
+        reach[self._dst[is_edge], self._src[is_edge]] = 1
+        depth, paths = 0, numpy.eye(n_routers, dtype=int)
+        while paths.any():
+            depth += 1
+            assert depth <= n_routers, "routers must not route in a cycle"
+            paths = reach @ paths
+        return depth
+
+    def takeStep(self, state) -> None:
+        if self._tick_last_step == state.tick:
+            return  # already disbursed this tick, eg via one of the routers
+        self._tick_last_step = state.tick
+
+        n_routers = len(self._routers)
+        flow = numpy.zeros((self._n_nodes, n_routers))
+        flow[self._dst, self._src] = [f() for f in self._percent_funcs]
+
+        # what each router holds, then what it will hold once the routers
+        # upstream of it disburse: held + flow @ held + flow^2 @ held + ..
+        held = numpy.array([[r.USD(), r.OCEAN()] for r in self._routers])
+        holdings = held
+        for _ in range(self._depth - 1):
+            holdings = held + flow[:n_routers] @ holdings
+        inflows = flow @ holdings  # [node_j, (USD, OCEAN)]
+        outflows = flow.sum(axis=0)[:, numpy.newaxis] * holdings
+
+        # routers: receive, record, disburse
+        # pylint: disable=protected-access
+        for i, router in enumerate(self._routers):
+            USD_in, OCEAN_in = inflows[i]
+            if USD_in > 0.0:
+                router.receiveUSD(float(USD_in))
+            if OCEAN_in > 0.0:
+                router.receiveOCEAN(float(OCEAN_in))
+            router.recordHoldings()
+            if router.USD() > 0.0:
+                router._transferUSD(None, float(outflows[i, 0]))
+            if router.OCEAN() > 0.0:
+                router._transferOCEAN(None, float(outflows[i, 1]))
+
+        # other receivers
+        for name_j, (USD_in, OCEAN_in) in zip(self._sink_names, inflows[n_routers:]):
+            if USD_in > 0.0:
+                state.getAgent(name_j).receiveUSD(float(USD_in))
+            if OCEAN_in > 0.0:
+                state.getAgent(name_j).receiveOCEAN(float(OCEAN_in))
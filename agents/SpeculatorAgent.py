@@ -5,7 +5,6 @@
 """
 
 from abc import abstractmethod
-import random
 from typing import List
 
 from enforce_typing import enforce_types
@@ -19,6 +18,8 @@ DEFAULT_s_between_speculates = 1 * constants.S_PER_DAY
 
 @enforce_types
 class SpeculatorAgentBase(AgentBase.AgentBaseEvm):
+    SHADOW_OK = True  # oceanv3 actions only
+
     def __init__(
         self,
         name: str,
@@ -38,12 +39,18 @@ class SpeculatorAgentBase(AgentBase.AgentBaseEvm):
             self._s_since_speculate = 0
             self._speculateAction(state)
 
+    def skipTime(self, s_skipped: int) -> None:
+        self._s_since_speculate += s_skipped
+
+    def nextWakeTime(self, state):
+        s_until = self._s_between_speculates - self._s_since_speculate
+        return state.tick * state.ss.time_step + max(0, s_until)
+
     def _doSpeculateAction(self, state):
-        pool_agents = self._poolsForSpeculate(state)
-        if not pool_agents:
+        if self._s_since_speculate < self._s_between_speculates:
             return False
 
-        return self._s_since_speculate >= self._s_between_speculates
+        return bool(self._poolsForSpeculate(state))
 
     @abstractmethod
     def _speculateAction(self, state):
@@ -69,14 +76,15 @@ class SpeculatorAgent(SpeculatorAgentBase):
         pool_agents = self._poolsForSpeculate(state)
         assert pool_agents, "need pools to be able to speculate"
 
-        pool_agent = random.choice(list(pool_agents))
+        pool_agent = state.rng.choice(list(pool_agents))
         pool = pool_agent.pool
+        self._wallet.useMaxAllowance(pool.address)  # approve once per pool
 
         DT = self.DT(pool_agent.datatoken)
         datatoken = pool_agent.datatoken
 
         max_OCEAN_allow = self.OCEAN()
-        if DT > 0.0 and random.random() < 0.50:  # magic number
+        if DT > 0.0 and state.rng.random() < 0.50:  # magic number
             DT_sell_amt = 1.0 * DT  # magic number
             self._wallet.sellDT(pool, datatoken, DT_sell_amt)
 
@@ -93,10 +101,11 @@ class StakerspeculatorAgent(SpeculatorAgentBase):
         pool_agents = self._poolsForSpeculate(state)
         assert pool_agents, "need pools to be able to speculate"
 
-        pool = random.choice(list(pool_agents)).pool
+        pool = state.rng.choice(list(pool_agents)).pool
+        self._wallet.useMaxAllowance(pool.address)  # approve once per pool
         BPT = self.BPT(pool)
 
-        if BPT > 0.0 and random.random() < 0.50:  # magic number
+        if BPT > 0.0 and state.rng.random() < 0.50:  # magic number
             BPT_sell = 0.10 * BPT  # magic number
             self.unstakeOCEAN(BPT_sell, pool)
 
@@ -126,12 +135,18 @@ class SpeculatorAgentBaseV4(AgentBase.AgentBaseEvm):
             self._s_since_speculate = 0
             self._speculateAction(state)
 
+    def skipTime(self, s_skipped: int) -> None:
+        self._s_since_speculate += s_skipped
+
+    def nextWakeTime(self, state):
+        s_until = self._s_between_speculates - self._s_since_speculate
+        return state.tick * state.ss.time_step + max(0, s_until)
+
     def _doSpeculateAction(self, state):
-        pool_agents = self._poolsForSpeculate(state)
-        if not pool_agents:
+        if self._s_since_speculate < self._s_between_speculates:
             return False
 
-        return self._s_since_speculate >= self._s_between_speculates
+        return bool(self._poolsForSpeculate(state))
 
     @abstractmethod
     def _speculateAction(self, state):
@@ -156,14 +171,15 @@ class SpeculatorAgentV4(SpeculatorAgentBaseV4):
         pool_agents = self._poolsForSpeculate(state)
         assert pool_agents, "need pools to be able to speculate"
 
-        pool_agent = random.choice(list(pool_agents))
+        pool_agent = state.rng.choice(list(pool_agents))
         pool = pool_agent.pool
+        self._wallet.useMaxAllowance(pool.address)  # approve once per pool
 
         DT = self.DT(pool_agent.datatoken)
         datatoken = pool_agent.datatoken
 
         max_OCEAN_allow = self.OCEAN()
-        if DT > 0.0 and random.random() < 0.50:  # magic number
+        if DT > 0.0 and state.rng.random() < 0.50:  # magic number
             DT_sell_amt = 0.5 * DT  # magic number
             self._wallet.sellDTV4(pool, datatoken, DT_sell_amt)
 
@@ -180,10 +196,11 @@ class StakerspeculatorAgentV4(SpeculatorAgentBaseV4):
         pool_agents = self._poolsForSpeculate(state)
         assert pool_agents, "need pools to be able to speculate"
 
-        pool = random.choice(list(pool_agents)).pool
+        pool = state.rng.choice(list(pool_agents)).pool
+        self._wallet.useMaxAllowance(pool.address)  # approve once per pool
         BPT = self.BPT(pool)
 
-        if BPT > 0.0 and random.random() < 0.50:  # magic number
+        if BPT > 0.0 and state.rng.random() < 0.50:  # magic number
             BPT_sell = 0.1 * BPT  # magic number
             self.unstakeOCEAN(BPT_sell, pool)
 
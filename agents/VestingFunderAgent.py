@@ -2,7 +2,7 @@ from enforce_typing import enforce_types
 
 from agents.VestingWalletAgent import VestingWalletAgent
 from engine import AgentBase
-from util.constants import BROWNIE_PROJECT057
+from util import constants
 from util import globaltokens
 from util.base18 import toBase18
 from util.tx import txdict
@@ -40,7 +40,7 @@ class VestingFunderAgent(AgentBase.AgentBaseEvm):
 
         # create vesting wallet
         beneficiary_agent = state.getAgent(self._beneficiary_agent_name)
-        vw_contract = BROWNIE_PROJECT057.VestingWallet057.deploy(
+        vw_contract = constants.BROWNIE_PROJECT057.VestingWallet057.deploy(
             beneficiary_agent.address,
             self._start_timestamp,
             self._duration_seconds,
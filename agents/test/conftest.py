@@ -8,7 +8,7 @@ import pytest
 
 from engine import AgentBase
 from sol057.contracts.oceanv3 import oceanv3util
-from util import globaltokens
+from util import balanceledger, globaltokens
 from util.base18 import toBase18, fromBase18
 from util.constants import GOD_ACCOUNT
 from util.tx import txdict
@@ -74,8 +74,7 @@ def _make_info(account):
     # postconditions
     w = info.agent._wallet
     OCEAN1 = w.OCEAN()
-    assert w._cached_OCEAN_base is not None
-    OCEAN2 = fromBase18(int(w._cached_OCEAN_base))
+    OCEAN2 = fromBase18(balanceledger.balanceOf(OCEAN, account.address))
     OCEAN3 = fromBase18(OCEAN.balanceOf(account))
     assert OCEAN1 == OCEAN2 == OCEAN3, (OCEAN1, OCEAN2, OCEAN3)
 
@@ -1,3 +1,5 @@
+import random
+
 from enforce_typing import enforce_types
 from pytest import approx
 
@@ -20,6 +22,7 @@ class MockState:
     def __init__(self):
         self.agents = AgentDict({})
         self.ss = MockSS()
+        self.rng = random.Random()
 
     def addAgent(self, agent):
         self.agents[agent.name] = agent
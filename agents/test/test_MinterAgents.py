@@ -1,3 +1,5 @@
+import math
+
 from enforce_typing import enforce_types
 from matplotlib import pyplot, ticker
 
@@ -70,6 +72,27 @@ def testOCEANLinearMinterAgent():
     assert state._total_OCEAN_minted == 20.0
 
 
+@enforce_types
+def testOCEANLinearMinterAgent_nextWakeTime():
+    ss = SimStrategy.SimStrategy()
+    ss.time_step = 2
+    state = SimState.SimState(ss)
+
+    minter = OCEANLinearMinterAgent(
+        "minter",
+        receiving_agent_name="ocean_dao",
+        total_OCEAN_to_mint=20.0,
+        s_between_mints=4,
+        n_mints=2,
+    )
+    minter.takeStep(state)  # tick=0, 1st mint
+    assert minter.nextWakeTime(state) == 4  # 2nd mint at tick=2
+
+    state.tick = 2
+    minter.takeStep(state)  # 2nd mint. No mints left
+    assert minter.nextWakeTime(state) == math.inf
+
+
 @enforce_types
 def test_funcMinter_exp():
     func = ExpFunc(H=4.0)
@@ -1,6 +1,7 @@
 from enforce_typing import enforce_types
 
 from agents import PoolAgent
+from util import globaltokens
 
 
 @enforce_types
@@ -15,3 +16,29 @@ def test1(alice_info):
 
     state = MockState()
     alice_pool_agent.takeStep(state)
+
+
+@enforce_types
+def test_pool_state(alice_info):
+    agent_wallet, pool, DT = alice_info.agent._wallet, alice_info.pool, alice_info.DT
+    pool_agent = PoolAgent.PoolAgent("pool_agent", pool)
+    pool_state = pool_agent.pool_state
+    OCEAN_address = globaltokens.OCEAN_address()
+
+    def _assertMatchesChain():
+        for address in [OCEAN_address, DT.address]:
+            assert pool_state.balance(address) == pool.getBalance(address)
+            assert pool_state.denormWeight(address) == pool.getDenormalizedWeight(
+                address
+            )
+        assert pool_state.swapFee() == pool.getSwapFee()
+        assert pool_state.totalSupply() == pool.totalSupply()
+        assert pool_state.spotPrice() == pool.getSpotPrice(OCEAN_address, DT.address)
+
+    _assertMatchesChain()
+
+    # a trade touches the pool, so the snapshot gets re-read
+    OCEAN_before = pool_state.balance(OCEAN_address)
+    agent_wallet.sellDT(pool, DT, DT_sell_amt=1.0)
+    assert pool_state.balance(OCEAN_address) < OCEAN_before
+    _assertMatchesChain()
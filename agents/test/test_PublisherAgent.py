@@ -1,3 +1,5 @@
+import random
+
 from enforce_typing import enforce_types
 import pytest
 
@@ -16,6 +18,7 @@ class MockState:
     def __init__(self):
         self.agents = AgentDict.AgentDict({})
         self.ss = MockSS()
+        self.rng = random.Random()
 
     def addAgent(self, agent):
         self.agents[agent.name] = agent
@@ -42,8 +42,8 @@ def test_RouterAgent():
     assert a1.OCEAN() == (0.2 * 10.0)
     assert a2.OCEAN() == (0.8 * 10.0)
 
-    assert am._USD_per_tick == ([1.0])
-    assert am._OCEAN_per_tick == ([10.0])
+    assert am._USD_per_tick.values().tolist() == ([1.0])
+    assert am._OCEAN_per_tick.values().tolist() == ([10.0])
     assert am._tickOneMonthAgo(state) == (0)
     assert am.monthlyUSDreceived(state) == (1.0)
     assert am.monthlyOCEANreceived(state) == (10.0)
@@ -53,8 +53,8 @@ def test_RouterAgent():
     am.takeStep(state)
     state.tick += 1
 
-    assert am._USD_per_tick == ([1.0, 0.0, 0.0])
-    assert am._OCEAN_per_tick == ([10.0, 0.0, 0.0])
+    assert am._USD_per_tick.values().tolist() == ([1.0, 0.0, 0.0])
+    assert am._OCEAN_per_tick.values().tolist() == ([10.0, 0.0, 0.0])
     assert am._tickOneMonthAgo(state) == (0)
     assert am.monthlyUSDreceived(state) == (1.0)
     assert am.monthlyOCEANreceived(state) == (10.0)
@@ -0,0 +1,76 @@
+from enforce_typing import enforce_types
+import pytest
+
+from agents.RouterAgent import RouterAgent
+from agents.RouterNetworkAgent import RouterNetworkAgent
+from engine import AgentBase, KPIsBase, SimStateBase, SimStrategyBase
+
+SimState = SimStateBase.SimStateBase
+SimStrategy = SimStrategyBase.SimStrategyBase
+
+
+class FooAgent(AgentBase.AgentBaseNoEvm):
+    def takeStep(self, state):
+        pass
+
+
+@enforce_types
+def _state(use_network: bool):
+    """r1 -> (r2 -> a1, a2), with funds to start in r1 and r2"""
+    state = SimState(SimStrategy())
+    state.kpis = KPIsBase.KPIsBase(state.ss.time_step)
+    r1 = RouterAgent("r1", 10.0, 1.0, {"r2": lambda: 0.3, "a2": lambda: 0.7})
+    r2 = RouterAgent("r2", 5.0, 0.0, {"a1": lambda: 1.0})
+    for agent in [r1, r2, FooAgent("a1", 0.0, 0.0), FooAgent("a2", 0.0, 0.0)]:
+        state.agents[agent.name] = agent
+    if use_network:
+        state.agents["net"] = RouterNetworkAgent("net", [r1, r2])
+    return state
+
+
+@enforce_types
+def test_RouterNetworkAgent_matches_routers():
+    state1, state2 = _state(use_network=False), _state(use_network=True)
+    for state in [state1, state2]:
+        state.takeStep()
+        state.getAgent("r1").receiveUSD(2.0)
+        state.tick += 1
+        state.takeStep()
+
+    for name in ["r1", "r2", "a1", "a2"]:
+        agent1, agent2 = state1.getAgent(name), state2.getAgent(name)
+        assert agent2.USD() == pytest.approx(agent1.USD())
+        assert agent2.OCEAN() == pytest.approx(agent1.OCEAN())
+    for name in ["r1", "r2"]:
+        values1 = state1.getAgent(name)._USD_per_tick.values().tolist()
+        values2 = state2.getAgent(name)._USD_per_tick.values().tolist()
+        assert values2 == pytest.approx(values1)
+
+    assert state2.getAgent("a1").USD() == pytest.approx(5.0 + 0.3 * 10.0 + 0.3 * 2.0)
+    assert state2.getAgent("r2")._USD_per_tick.values().tolist() == pytest.approx(
+        [8.0, 0.6]
+    )
+
+
+@enforce_types
+def test_RouterNetworkAgent_routerStepsNetwork():
+    state = _state(use_network=True)
+    state.getAgent("r1").takeStep(state)  # disburses r1 and r2 at once
+    assert state.getAgent("r1").USD() == state.getAgent("r2").USD() == 0.0
+    assert state.getAgent("a1").USD() == pytest.approx(5.0 + 0.3 * 10.0)
+    assert state.getAgent("a2").USD() == pytest.approx(0.7 * 10.0)
+
+    # once per tick
+    state.getAgent("r1").receiveUSD(1.0)
+    state.getAgent("r2").takeStep(state)
+    state.getAgent("net").takeStep(state)
+    assert state.getAgent("r1").USD() == 1.0
+    assert len(state.getAgent("r1")._USD_per_tick) == 1
+
+
+@enforce_types
+def test_RouterNetworkAgent_no_cycles():
+    r1 = RouterAgent("r1", 0.0, 0.0, {"r2": lambda: 1.0})
+    r2 = RouterAgent("r2", 0.0, 0.0, {"r1": lambda: 1.0})
+    with pytest.raises(AssertionError):
+        RouterNetworkAgent("net", [r1, r2])
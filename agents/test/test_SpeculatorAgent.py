@@ -1,4 +1,6 @@
 """Test SpeculatorAgent *and* StakerspeculatorAgent.py"""
+import random
+
 from enforce_typing import enforce_types
 import pytest
 
@@ -18,6 +20,7 @@ class MockState:
     def __init__(self):
         self.ss = MockSS()
         self.agents = AgentDict({})
+        self.rng = random.Random()
 
     def addAgent(self, agent):
         self.agents[agent.name] = agent
@@ -0,0 +1,108 @@
+#!/usr/bin/env python
+"""
+Sim speed on each chain backend (CHAIN_BACKEND in tokenspice.ini): ticks
+per second of EVM netlists, on ganache vs the in-process chain.
+
+Each (workload, backend) runs in a fresh Python process. Setup (agents,
+first deploys) and the first tick are not timed; the ticks after are. A
+backend that can't start (eg ganache not installed, or eth-tester not
+installed) is reported as n/a. So is a netlist whose contracts can't be
+compiled (no solc).
+
+Besides the netlists, the "eth_transfers" workload needs no contracts:
+each tick, TRANSFERS_PER_TICK ETH transfers between the base accounts,
+then a block mined like SimEngine does. It measures the backend itself.
+
+Usage, from the repo root (like tsp): ./benchmarks/chain_backends.py [NUM_TICKS]
+"""
+
+import subprocess
+import sys
+
+NETLISTS = ["netlists/simplepool/netlist.py", "netlists/oceanv3/netlist.py"]
+
+BACKENDS = ["ganache", "inprocess"]
+
+TRANSFERS_PER_TICK = 5
+
+NETLIST_PROBE = """
+import time
+from util import constants, globaltokens
+from util.sweeputil import importNetlistModule
+from engine.SimEngine import SimEngine
+
+constants.CHAIN_BACKEND = "{backend}"
+netlist_module = importNetlistModule("{workload}")
+with globaltokens.batchedFunding():
+    state = netlist_module.SimState()
+engine = SimEngine(state, None, netlist_module.netlist_createLogData)
+engine.takeStep()
+engine.advanceTick()
+
+t0 = time.perf_counter()
+for _ in range({num_ticks}):
+    engine.takeStep()
+    engine.advanceTick()
+print(time.perf_counter() - t0)
+"""
+
+TRANSFERS_PROBE = """
+import time
+from util import constants
+from util import tx
+from util.tx import transferETH
+
+constants.CHAIN_BACKEND = "{backend}"
+constants.connectToChain()
+from brownie.network import accounts, chain
+
+
+def tick():
+    for i in range({transfers_per_tick}):
+        transferETH(accounts[i], accounts[i + 1], 1)
+    chain.mine(blocks=1, timedelta=3600)
+    tx.invalidateFees()
+
+
+tick()
+
+t0 = time.perf_counter()
+for _ in range({num_ticks}):
+    tick()
+print(time.perf_counter() - t0)
+"""
+
+
+def _ticksPerSecond(workload: str, backend: str, num_ticks: int):
+    """Ticks/s, or None if the run failed"""
+    probe = TRANSFERS_PROBE if workload == "eth_transfers" else NETLIST_PROBE
+    probe = probe.format(
+        workload=workload,
+        backend=backend,
+        num_ticks=num_ticks,
+        transfers_per_tick=TRANSFERS_PER_TICK,
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", probe], capture_output=True, text=True, check=False
+    )
+    if result.returncode != 0:
+        return None
+    return num_ticks / float(result.stdout.split()[-1])
+
+
+def main():
+    num_ticks = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+
+    print(f"Ticks/s per chain backend ({num_ticks} ticks, after setup)")
+    print(f"{'workload':<32}" + "".join(f" {b:>10}" for b in BACKENDS))
+    for workload in ["eth_transfers"] + NETLISTS:
+        row = f"{workload:<32}"
+        for backend in BACKENDS:
+            ticks_per_s = _ticksPerSecond(workload, backend, num_ticks)
+            cell = "n/a" if ticks_per_s is None else f"{ticks_per_s:.2f}"
+            row += f" {cell:>10}"
+        print(row)
+
+
+if __name__ == "__main__":
+    main()
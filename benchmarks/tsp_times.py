@@ -0,0 +1,135 @@
+#!/usr/bin/env python
+"""
+Time of tsp subcommands, each run as its own ./tsp process, like from a
+terminal. Two numbers per subcommand:
+- startup: until the subcommand's real work would start. That's imports,
+  loading Brownie projects, connecting to the chain, and for "run", the
+  netlist's SimState (its agents, and their first deploys and txs). The
+  work (SimEngine.run(), or plotting) is stubbed out
+- total: the whole subcommand, work included
+
+A run of wsloop, profiled with cProfile, is made beforehand, untimed: "plot"
+plots it and "showstats" shows its stats. A subcommand that fails (eg an EVM
+netlist with no chain or solc available) is reported as n/a.
+
+To compare against another version of TokenSPICE, give the root of its
+tree, eg a git worktree: its ./tsp gets timed instead.
+
+Usage, from the repo root (like tsp): ./benchmarks/tsp_times.py [NUM_REPEATS] [TREE]
+"""
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+# subcommand label : (tsp args, the work that startup stubs out, as
+# "module:attribute"; None if it's all startup). {out} is a fresh output
+# dir; {run} the run made beforehand
+CASES = {
+    "tsp (help)": ([], None),
+    "tsp showstats": (["showstats", "{run}.stats", "20", "cumulative"], None),
+    "tsp plot wsloop": (
+        ["plot", "netlists/wsloop/netlist.py", "{run}", "{out}"],
+        "util.plotutil:runDirToPngs",
+    ),
+    "tsp run simplegrant": (
+        ["run", "netlists/simplegrant/netlist.py", "{out}"],
+        "engine.SimEngine:SimEngine.run",
+    ),
+    "tsp run wsloop": (
+        ["run", "netlists/wsloop/netlist.py", "{out}"],
+        "engine.SimEngine:SimEngine.run",
+    ),
+    "tsp run simplepool": (
+        ["run", "netlists/simplepool/netlist.py", "{out}"],
+        "engine.SimEngine:SimEngine.run",
+    ),
+    "tsp run oceanv3": (
+        ["run", "netlists/oceanv3/netlist.py", "{out}"],
+        "engine.SimEngine:SimEngine.run",
+    ),
+    "tsp run oceanv4": (  # the only netlist that loads sol080
+        ["run", "netlists/oceanv4/netlist.py", "{out}"],
+        "engine.SimEngine:SimEngine.run",
+    ),
+}
+
+# run made beforehand, for "plot" and "showstats"
+PREP_RUN = [
+    "-m", "cProfile", "-o", "{out}.stats",
+    "./tsp", "run", "netlists/wsloop/netlist.py", "{out}",
+]  # fmt: skip
+
+# runs ./tsp with sys.argv = args, with the work stubbed out
+STARTUP_PROBE = """
+import importlib, runpy, sys, time
+t0 = time.perf_counter()
+stub = {stub!r}
+if stub is not None:
+    module_name, attr_path = stub.split(":")
+    obj = importlib.import_module(module_name)
+    *parents, attr_name = attr_path.split(".")
+    for parent in parents:
+        obj = getattr(obj, parent)
+    setattr(obj, attr_name, lambda *args, **kwargs: None)
+sys.argv = ["./tsp"] + {args!r}
+runpy.run_path("./tsp", run_name="__main__")
+print(time.perf_counter() - t0)
+"""
+
+
+def _timeTsp(tree: str, args: list, stub, tmp_dir: str, run_dir: str):
+    """Seconds that tree's ./tsp took with args, or None if it failed. With
+    stub given, the work is stubbed out: it's the startup time"""
+    out_dir = tempfile.mkdtemp(dir=tmp_dir)
+    os.rmdir(out_dir)  # tsp wants to create it
+    makes_out_dir = stub is None and "{out}" in args
+    args = [arg.format(out=out_dir, run=run_dir) for arg in args]
+    if stub is None:
+        cmd = [sys.executable, "./tsp"] + args
+    else:
+        cmd = [sys.executable, "-c", STARTUP_PROBE.format(stub=stub, args=args)]
+    t0 = time.perf_counter()
+    result = subprocess.run(cmd, cwd=tree, capture_output=True, check=False)
+    dt = time.perf_counter() - t0
+    if result.returncode != 0 or (makes_out_dir and not os.path.exists(out_dir)):
+        return None
+    return dt
+
+
+def _median(times: list) -> str:
+    if None in times:
+        return "n/a"
+    return f"{statistics.median(times):.3f}"
+
+
+def main():
+    num_repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    tree = os.path.abspath(sys.argv[2]) if len(sys.argv) > 2 else os.getcwd()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        run_dir = os.path.join(tmp_dir, "prep_run")
+        subprocess.run(
+            [sys.executable] + [arg.format(out=run_dir) for arg in PREP_RUN],
+            cwd=tree,
+            capture_output=True,
+            check=True,
+        )
+
+        print(f"Time per tsp subcommand in {tree} (median of {num_repeats} runs)")
+        print(f"{'subcommand':<22} {'startup (s)':>11} {'total (s)':>10}")
+        for label, (args, stub) in CASES.items():
+            startup, total = [], []
+            for _ in range(num_repeats):
+                total.append(_timeTsp(tree, args, None, tmp_dir, run_dir))
+                if stub is None:
+                    startup.append(total[-1])
+                else:
+                    startup.append(_timeTsp(tree, args, stub, tmp_dir, run_dir))
+            print(f"{label:<22} {_median(startup):>11} {_median(total):>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,9 +3,9 @@ Hooks to run commands after the entire testsuite or at_exit in unittest / pytest
 
 https://stackoverflow.com/questions/62628825/hooks-to-run-commands-after-the-entire-testsuite-or-at-exit-in-unittest-pytest
 """
-import pytest
+import sys
 
-import brownie
+import pytest
 
 
 @pytest.fixture(scope="session", autouse=True)
@@ -16,5 +16,6 @@ def session_setup_teardown():
 
 
 def cleanup_testsuite():
-    if brownie.network.is_connected():
+    brownie = sys.modules.get("brownie")  # None if only NoEvm tests ran
+    if brownie is not None and brownie.network.is_connected():
         brownie.network.disconnect()
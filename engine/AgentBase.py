@@ -2,16 +2,25 @@
 Main classes in this module:
 -AgentBaseAbstract - abstract interface
 -AgentBaseNoEvm - hold AgentWalletNoEvm
--AgentBaseEvm - hold AgentWalletEvm
+-AgentBaseEvm - hold AgentWalletEvm. Or AgentWalletShadow, if POOL_BACKEND
+ is "shadow". Only agents that set SHADOW_OK may: shadow wallets do just
+ the oceanv3 actions
 -Sub-class AgentBase{NoEvm,Evm} for specific agents (buyers, publishers, ..)
 """
 
 from abc import ABC, abstractmethod
 import logging
+from typing import Union
 
 from enforce_typing import enforce_types
 
-from engine.AgentWallet import AgentWalletAbstract, AgentWalletEvm, AgentWalletNoEvm
+from engine.AgentWallet import (
+    AgentWalletAbstract,
+    AgentWalletEvm,
+    AgentWalletNoEvm,
+    AgentWalletShadow,
+)
+from util import constants
 from util.constants import SAFETY
 from util.strutil import StrMixin
 
@@ -28,6 +37,25 @@ class AgentBaseAbstract(ABC):
     def takeStep(self, state):  # this is where the Agent does *work*
         pass
 
+    # scheduling. SimStateBase calls these after / before takeStep()
+    def nextWakeTime(self, state):
+        """
+        When should this agent be stepped next? Called after each takeStep().
+
+        Return None to be stepped every tick (the default). Otherwise return
+        the simulation time (seconds elapsed since tick 0) to wake up at, or
+        math.inf for never. The agent gets stepped at the first tick at or
+        after that time; it may be stepped earlier, so takeStep() must still
+        check its own conditions.
+        """
+        return None
+
+    def skipTime(self, s_skipped: int) -> None:
+        """
+        Called before a scheduled wake-up, with the seconds of the ticks that
+        the agent slept through. Agents that count time per step catch up here.
+        """
+
     # USD-related
     def USD(self) -> float:
         return self._wallet.USD()
@@ -76,9 +104,22 @@ class AgentBaseNoEvm(StrMixin, AgentBaseAbstract):
 
 @enforce_types
 class AgentBaseEvm(StrMixin, AgentBaseAbstract):
+    # True if the agent only takes wallet actions that AgentWalletShadow
+    # has too (the oceanv3 ones), so it can run with POOL_BACKEND "shadow"
+    SHADOW_OK = False
+
     def __init__(self, name: str, USD: float, OCEAN: float):
         AgentBaseAbstract.__init__(self, name)
-        self._wallet: AgentWalletEvm = AgentWalletEvm(USD, OCEAN)
+        self._wallet: Union[AgentWalletEvm, AgentWalletShadow]
+        if constants.POOL_BACKEND == "shadow":
+            if not self.SHADOW_OK:
+                raise ValueError(
+                    f"{type(self).__name__} '{name}' needs the EVM. POOL_BACKEND"
+                    " 'shadow' only runs oceanv3 agents; set it to 'evm'"
+                )
+            self._wallet = AgentWalletShadow(USD, OCEAN)
+        else:
+            self._wallet = AgentWalletEvm(USD, OCEAN)
 
         # postconditions
         assert self.USD() == USD
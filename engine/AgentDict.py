@@ -1,9 +1,10 @@
 from enforce_typing import enforce_types
 
-from agents.PublisherAgent import PublisherAgent
-from agents.PoolAgent import PoolAgent, PoolAgentV4
-from agents.DataconsumerAgent import DataconsumerAgent
-from agents.SpeculatorAgent import SpeculatorAgent, StakerspeculatorAgent
+from util import balanceledger
+
+# Note: the filterTo*() methods import agent classes where they're used.
+# Those agents are Evm-based, and importing them at the top would drag
+# brownie into every simulation, including NoEvm ones.
 
 
 @enforce_types
@@ -14,38 +15,59 @@ class AgentDict(dict):
 
     def filterByNonzeroStake(self, agent):
         """Which pools has 'agent' staked on?"""
+        pool_agents = self.filterToPool().values()
+        balanceledger.prefetch(
+            [(pool_agent.pool, agent.address) for pool_agent in pool_agents]
+        )
         return AgentDict(
             {
                 pool_agent.name: pool_agent
-                for pool_agent in self.filterToPool().values()
+                for pool_agent in pool_agents
                 if agent.BPT(pool_agent.pool) > 0.0
             }
         )
 
+    # pylint: disable=import-outside-toplevel
     def filterToPool(self):
+        from agents.PoolAgent import PoolAgent
+
         return self.filterByClass(PoolAgent)
 
     def filterToPublisher(self):
+        from agents.PublisherAgent import PublisherAgent
+
         return self.filterByClass(PublisherAgent)
 
     def filterToStakerspeculator(self):
+        from agents.SpeculatorAgent import StakerspeculatorAgent
+
         return self.filterByClass(StakerspeculatorAgent)
 
     def filterToDataconsumer(self):
+        from agents.DataconsumerAgent import DataconsumerAgent
+
         return self.filterByClass(DataconsumerAgent)
 
     def filterToSpeculator(self):
+        from agents.SpeculatorAgent import SpeculatorAgent
+
         return self.filterByClass(SpeculatorAgent)
 
     def filterToPoolV4(self):
+        from agents.PoolAgent import PoolAgentV4
+
         return self.filterByClass(PoolAgentV4)
 
     def filterByNonzeroStakeV4(self, agent):
         """Which pools has 'agent' staked on?"""
+        pool_agents = self.filterToPoolV4().values()
+        balanceledger.prefetch(
+            [(pool_agent.pool, agent.address) for pool_agent in pool_agents]
+        )
         return AgentDict(
             {
                 pool_agent.name: pool_agent
-                for pool_agent in self.filterToPoolV4().values()
+                for pool_agent in pool_agents
                 if agent.BPT(pool_agent.pool) > 0.0
             }
         )
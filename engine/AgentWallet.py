@@ -3,6 +3,7 @@ Main classes in this module:
 -AgentWalletAbstract - abstract interface
 -AgentWalletNoEvm - no-EVM wallet
 -AgentWalletEvm - EVM wallet
+-AgentWalletShadow - like AgentWalletEvm, on util.shadowamm. No EVM
 
 Support classes include:
 -UsdNoEvmWalletMixIn - no-EVM implement USD deposit/withdraw/..
@@ -13,21 +14,22 @@ Support classes include:
 
 from abc import abstractmethod, ABC
 import logging
-import typing
+from typing import Dict, Set, Tuple
 
-import brownie
-from brownie.network.account import Account  # pylint: disable=no-name-in-module
 from enforce_typing import enforce_types
 
-from util import constants
-from util import globaltokens
+from sol057.contracts.oceanv3 import oceanv3util
+from util import balanceledger, constants
+from util import agentkeys, fasttx, globaltokens, shadowamm
 from util.base18 import toBase18, fromBase18
-from util.constants import GOD_ACCOUNT, OPF_ADDRESS
 from util.strutil import asCurrency
-from util.tx import txdict, transferETH
+from util.multisend import MultiSendBatch
 
 log = logging.getLogger("wallet")
 
+# ETH that new AgentWalletEvms get, to pay gas fees
+_GAS_FUNDS_BASE = toBase18(0.01)
+
 
 @enforce_types
 class AgentWalletAbstract(ABC):
@@ -223,25 +225,43 @@ class AgentWalletEvm(
         AgentWalletAbstract.__init__(self, USD, OCEAN, private_key)
         UsdNoEvmWalletMixIn.__init__(self, USD)
 
-        self._account: Account = None
+        self._account = None  # brownie Account
 
-        accounts = brownie.network.accounts
-        if private_key is None:
-            self._account = accounts.add()
-        else:
-            self._account = accounts.add(private_key=private_key)
+        # what each spender (eg a pool) may still take from self, per token.
+        # Lets pool actions skip approve() txs when the allowance suffices
+        self._allowances: Dict[Tuple[str, str], int] = {}  # (token, spender)
+        self._max_allowance_spenders: Set[str] = set()
 
-        # Give the new wallet ETH to pay gas fees (but don't track otherwise)
-        transferETH(GOD_ACCOUNT, self._account, "0.01 ether")
+        # import here, so that NoEvm runs never import brownie
+        import brownie  # pylint: disable=import-outside-toplevel
 
-        # OCEAN is tracked in EVM, not here. But we cache here for speed
-        self._burnOCEAN_nocache()  # ensure 0 OCEAN (eg >1 unit tests)
-        self._cached_OCEAN_base: typing.Union[int, None] = None
+        # an agent account that got ETH at genesis, if any is left. Else new
+        accounts = brownie.network.accounts
+        claimed_account = None
+        if private_key is not None:
+            self._account = accounts.add(private_key=private_key)
+        else:
+            claimed_account = agentkeys.claimAccount()
+            if claimed_account is not None:
+                self._account = claimed_account
+            else:
+                self._account = accounts.add()
+
+        # OCEAN is tracked in EVM, not here. But balanceledger keeps a copy
+        # up to date from Transfer events, for speed. Only known accounts
+        # may hold OCEAN already (eg >1 unit tests); new ones can't
+        prev_OCEAN_base = 0
+        if private_key is not None or claimed_account is not None:
+            prev_OCEAN_base = globaltokens.OCEANtoken().balanceOf(self._account)
+
+        # Give the new wallet ETH to pay gas fees (but don't track otherwise),
+        # unless it has some from genesis. And its OCEAN. In one tx. Or, within
+        # globaltokens.batchedFunding(), in txs shared with other new wallets
+        ETH_base = 0 if claimed_account is not None else _GAS_FUNDS_BASE
+        globaltokens.fundFromAbove(self.address, ETH_base, toBase18(OCEAN))
         self._total_OCEAN_in: float = OCEAN
-        assert self.OCEAN() == 0.0
 
-        globaltokens.fundOCEANFromAbove(self._account.address, toBase18(OCEAN))
-        self._cached_OCEAN_base = None
+        self._burnOCEAN(prev_OCEAN_base)  # ensure just OCEAN
 
         # postconditions
         assert self.USD() == USD
@@ -256,20 +276,30 @@ class AgentWalletEvm(
     def address(self) -> str:
         return self._account.address
 
-    def _burnOCEAN_nocache(self):
+    def _sendTx(self, contract, method_name: str, *args):
+        """Call contract.method_name(*args) as a tx from self. Fast: see
+        util.fasttx. Returns its receipt"""
+        globaltokens.sendPendingFunds()  # self's own funds may be queued
+        return fasttx.sendTx(self._account, contract, method_name, *args)
+
+    def _burnOCEAN(self, OCEAN_base: int):
         """
-        If this agent has any OCEAN, burn it.
-        Explicitly don't use caching, so __init__ can safely call this
+        Burn OCEAN_base of this agent's OCEAN, if > 0. Doesn't touch
+        _total_OCEAN_in, so __init__ can safely call this
         """
-        OCEAN_token = globaltokens.OCEANtoken()
-        OCEAN_balance_base = OCEAN_token.balanceOf(self._account)
-        if OCEAN_balance_base > 0:
-            OCEAN_token.transfer(
-                _BURN_WALLET.address, OCEAN_balance_base, txdict(self._account)
+        if OCEAN_base > 0:
+            self._sendTx(
+                globaltokens.OCEANtoken(),
+                "transfer",
+                _BURN_WALLET.address,
+                OCEAN_base,
             )
 
     def resetCachedInfo(self):
-        self._cached_OCEAN_base = None
+        """Re-read balances from chain on next access. Only needed if they
+        changed without a Transfer event, or outside of brownie"""
+        balanceledger.forget(self.address)
+        self._allowances.clear()
 
     # ===================================================================
     # USD-related
@@ -282,23 +312,14 @@ class AgentWalletEvm(
         return fromBase18(self._OCEAN_base())
 
     def _OCEAN_base(self) -> int:
-        OCEAN_token = globaltokens.OCEANtoken()
-        if self._cached_OCEAN_base is None:
-            self._cached_OCEAN_base = OCEAN_token.balanceOf(self.address)
-
-        assert self._cached_OCEAN_base == OCEAN_token.balanceOf(self.address), (
-            self._cached_OCEAN_base,
-            OCEAN_token.balanceOf(self.address),
-            self._account.address,
-        )
-
-        return self._cached_OCEAN_base
+        _, pending_OCEAN_base = globaltokens.pendingFunds(self.address)
+        OCEAN = globaltokens.OCEANtoken()
+        return balanceledger.balanceOf(OCEAN, self.address) + pending_OCEAN_base
 
     def depositOCEAN(self, amt: float) -> None:
         assert amt >= 0.0
         globaltokens.fundOCEANFromAbove(self._account.address, toBase18(amt))
         self._total_OCEAN_in += amt
-        self.resetCachedInfo()
 
     def withdrawOCEAN(self, amt: float) -> None:
         self.transferOCEAN(_BURN_WALLET, amt)
@@ -326,11 +347,33 @@ class AgentWalletEvm(
                 " exceeds OCEAN holdings ({fromBase18(OCEAN_base)})"
             )
 
-        globaltokens.OCEANtoken().transfer(dst_address, amt_base, txdict(self._account))
+        self._sendTx(globaltokens.OCEANtoken(), "transfer", dst_address, amt_base)
 
         dst_wallet._total_OCEAN_in += amt
-        self.resetCachedInfo()
-        dst_wallet.resetCachedInfo()
+
+    def transferOCEANMany(self, dst_wallets: list, amts: list) -> None:
+        """Transfer amts[i] OCEAN to dst_wallets[i], for each i. In one tx,
+        via MultiSend. Eg to disburse to many wallets"""
+        assert len(dst_wallets) == len(amts)
+        amts_base = [toBase18(amt) for amt in amts]
+        OCEAN_base = self._OCEAN_base()
+        if sum(amts_base) > OCEAN_base:
+            raise ValueError(
+                f"transfer amts ({fromBase18(sum(amts_base))})"
+                f" exceed OCEAN holdings ({fromBase18(OCEAN_base)})"
+            )
+
+        OCEAN = globaltokens.OCEANtoken()
+        batch = MultiSendBatch()
+        for dst_wallet, amt_base in zip(dst_wallets, amts_base):
+            assert isinstance(dst_wallet, (AgentWalletEvm, BurnWallet))
+            assert amt_base >= 0
+            batch.add(OCEAN, dst_wallet.address, amt_base)
+        globaltokens.sendPendingFunds()
+        batch.send(self._account)
+
+        for dst_wallet, amt in zip(dst_wallets, amts):
+            dst_wallet._total_OCEAN_in += amt
 
     def totalOCEANin(self) -> float:
         return self._total_OCEAN_in
@@ -341,7 +384,40 @@ class AgentWalletEvm(
         return fromBase18(self._ETH_base())
 
     def _ETH_base(self) -> int:  # i.e. num wei
-        return self._account.balance()
+        pending_ETH_base, _ = globaltokens.pendingFunds(self.address)
+        return self._account.balance() + pending_ETH_base
+
+    # ===================================================================
+    # allowance-related
+    def useMaxAllowance(self, spender_address: str) -> None:
+        """From now on, approve the spender (eg a pool) for as much as
+        possible, at once. Then later actions on it never need an approve"""
+        self._max_allowance_spenders.add(spender_address)
+
+    def allowance(self, token, spender_address: str) -> float:
+        """What spender may still take of self's token, as far as self knows"""
+        return fromBase18(self._allowances.get((token.address, spender_address), 0))
+
+    def _approveIfNeeded(self, token, spender_address: str, amt_base: int) -> None:
+        """Make sure that spender may take amt_base of token. Only send an
+        approve tx if the allowance left from earlier approves is too small"""
+        key = (token.address, spender_address)
+        if self._allowances.get(key, 0) >= amt_base:
+            return
+        if spender_address in self._max_allowance_spenders:
+            amt_base = constants.HUGEINT
+        self._sendTx(token, "approve", spender_address, amt_base)
+        self._allowances[key] = amt_base
+
+    def _spendAllowance(self, tx, token, spender_address: str) -> None:
+        """Take the amount of token that tx moved away from self off the
+        allowance. Only the spender moves self's tokens in tx"""
+        key = (token.address, spender_address)
+        spent_base = 0
+        for token_address, src, _, amt in fasttx.transfers(tx):
+            if token_address == token.address and src == self.address:
+                spent_base += amt
+        self._allowances[key] = max(0, self._allowances.get(key, 0) - spent_base)
 
     # ===================================================================
     # datatoken and pool-related
@@ -349,79 +425,82 @@ class AgentWalletEvm(
         return fromBase18(self._DT_base(dt))
 
     def _DT_base(self, dt) -> int:
-        return dt.balanceOf(self.address)
+        return balanceledger.balanceOf(dt, self.address)
 
     def BPT(self, pool) -> float:
         return fromBase18(self._BPT_base(pool))
 
     def _BPT_base(self, pool) -> int:
-        return pool.balanceOf(self.address)
+        return balanceledger.balanceOf(pool, self.address)
 
     def sellDT(self, pool, DT, DT_sell_amt: float, min_OCEAN_amt: float = 0.0):
         """Swap DT for OCEAN. min_OCEAN_amt>0 protects from slippage."""
-        DT.approve(pool.address, toBase18(DT_sell_amt), txdict(self._account))
+        self._approveIfNeeded(DT, pool.address, toBase18(DT_sell_amt))
 
         tokenIn_address = DT.address  # entering pool
         tokenAmountIn_base = toBase18(DT_sell_amt)  # ""
         tokenOut_address = globaltokens.OCEAN_address()  # leaving pool
         minAmountOut_base = toBase18(min_OCEAN_amt)  # ""
         maxPrice_base = 2**255  # limit by min_OCEAN_amt, not price
-        pool.swapExactAmountIn(
+        tx = self._sendTx(
+            pool,
+            "swapExactAmountIn",
             tokenIn_address,
             tokenAmountIn_base,
             tokenOut_address,
             minAmountOut_base,
             maxPrice_base,
-            txdict(self._account),
         )
-        self.resetCachedInfo()
+        self._spendAllowance(tx, DT, pool.address)
 
     def buyDT(self, pool, DT, DT_buy_amt: float, max_OCEAN_allow: float):
         """Swap OCEAN for DT"""
         OCEAN = globaltokens.OCEANtoken()
-        OCEAN.approve(pool.address, toBase18(max_OCEAN_allow), txdict(self._account))
+        self._approveIfNeeded(OCEAN, pool.address, toBase18(max_OCEAN_allow))
 
         tokenIn_address = globaltokens.OCEAN_address()
         maxAmountIn_base = toBase18(max_OCEAN_allow)
         tokenOut_address = DT.address
         tokenAmountOut_base = toBase18(DT_buy_amt)
         maxPrice_base = 2**255
-        pool.swapExactAmountOut(
+        tx = self._sendTx(
+            pool,
+            "swapExactAmountOut",
             tokenIn_address,
             maxAmountIn_base,
             tokenOut_address,
             tokenAmountOut_base,
             maxPrice_base,
-            txdict(self._account),
         )
-        self.resetCachedInfo()
+        self._spendAllowance(tx, OCEAN, pool.address)
 
     def stakeOCEAN(self, OCEAN_stake: float, pool):
         """Convert some OCEAN to DT, then add both as liquidity."""
         OCEAN = globaltokens.OCEANtoken()
-        OCEAN.approve(pool.address, toBase18(OCEAN_stake), txdict(self._account))
+        self._approveIfNeeded(OCEAN, pool.address, toBase18(OCEAN_stake))
         tokenIn_address = globaltokens.OCEAN_address()
         tokenAmountIn_base = toBase18(OCEAN_stake)
         minPoolAmountOut_base = toBase18(0.0)
-        pool.joinswapExternAmountIn(
+        tx = self._sendTx(
+            pool,
+            "joinswapExternAmountIn",
             tokenIn_address,
             tokenAmountIn_base,
             minPoolAmountOut_base,
-            txdict(self._account),
         )
-        self.resetCachedInfo()
+        self._spendAllowance(tx, OCEAN, pool.address)
 
     def unstakeOCEAN(self, BPT_unstake: float, pool):
         tokenOut_address = globaltokens.OCEAN_address()
         poolAmountIn_base = toBase18(BPT_unstake)
         minAmountOut_base = toBase18(0.0)
-        pool.exitswapPoolAmountIn(
+        self._sendTx(
+            pool,
+            "exitswapPoolAmountIn",
             tokenOut_address,
             poolAmountIn_base,
             minAmountOut_base,
-            txdict(self._account),
         )
-        self.resetCachedInfo()
 
     def transferDT(self, dst_wallet, DT, amt: float) -> None:
         assert isinstance(dst_wallet, (AgentWalletEvm, BurnWallet))
@@ -446,31 +525,76 @@ class AgentWalletEvm(
                 " exceeds DT holdings ({fromBase18(DT_base)})"
             )
 
-        DT.transfer(dst_address, amt_base, txdict(self._account))
+        self._sendTx(DT, "transfer", dst_address, amt_base)
+
+    def newDatatoken(self, name: str, mint_amt: float):
+        """Create an oceanv3 datatoken capped at mint_amt. Mint it all to self"""
+        globaltokens.sendPendingFunds()
+        DT = oceanv3util.newDatatoken("", name, name, toBase18(mint_amt), self._account)
+        self._sendTx(DT, "mint", self.address, toBase18(mint_amt))
+        self.resetCachedInfo()
+        return DT
+
+    def newPool(  # pylint: disable=too-many-arguments
+        self,
+        DT,
+        DT_bind_amt: float,
+        DT_weight: float,
+        OCEAN_bind_amt: float,
+        OCEAN_weight: float,
+    ):
+        """Create an oceanv3 pool controlled by self. Bind DT and OCEAN of
+        self's as initial liquidity, then finalize it"""
+        OCEAN = globaltokens.OCEANtoken()
+        globaltokens.sendPendingFunds()
+        pool = oceanv3util.newBPool(self._account)
+
+        self._sendTx(DT, "approve", pool.address, toBase18(DT_bind_amt))
+        self._sendTx(OCEAN, "approve", pool.address, toBase18(OCEAN_bind_amt))
+
+        self._sendTx(
+            pool,
+            "bind",
+            DT.address,
+            toBase18(DT_bind_amt),
+            toBase18(DT_weight),
+        )
+        self._sendTx(
+            pool,
+            "bind",
+            OCEAN.address,
+            toBase18(OCEAN_bind_amt),
+            toBase18(OCEAN_weight),
+        )
+
+        self._sendTx(pool, "finalize")
+        self.resetCachedInfo()
+        return pool
 
     def joinPoolAddOCEAN(self, OCEAN_stake: float, pool):
         """adds more liquidity with joinswapExternAmountIn (only OCEAN), oceanv4 contracts"""
         OCEAN = globaltokens.OCEANtoken()
-        OCEAN.approve(pool.address, toBase18(OCEAN_stake), txdict(self._account))
+        self._approveIfNeeded(OCEAN, pool.address, toBase18(OCEAN_stake))
         tokenAmountIn_base = toBase18(OCEAN_stake)
         minPoolAmountOut_base = toBase18(0.1)
 
-        pool.joinswapExternAmountIn(
+        tx = self._sendTx(
+            pool,
+            "joinswapExternAmountIn",
             OCEAN.address,
             tokenAmountIn_base,
             minPoolAmountOut_base,
-            txdict(self._account),
         )
-        self.resetCachedInfo()
+        self._spendAllowance(tx, OCEAN, pool.address)
 
     def buyDTV4(self, pool, DT, DT_buy_amt: float, max_OCEAN_allow: float):
         """Swap OCEAN for DT, oceanv4 contracts"""
         OCEAN = globaltokens.OCEANtoken()
-        OCEAN.approve(pool.address, toBase18(max_OCEAN_allow), txdict(self._account))
+        self._approveIfNeeded(OCEAN, pool.address, toBase18(max_OCEAN_allow))
 
         tokenIn_address = globaltokens.OCEAN_address()
         tokenOut_address = DT.address
-        marketFeeAddress = OPF_ADDRESS
+        marketFeeAddress = constants.OPF_ADDRESS
 
         maxAmountIn_base = toBase18(max_OCEAN_allow)
         tokenAmountOut_base = toBase18(DT_buy_amt)
@@ -487,21 +611,24 @@ class AgentWalletEvm(
             maxPrice_base,
             0,
         ]  # [maxAmountIn,exactAmountOut,maxPrice,_swapMarketFee]
-        pool.swapExactAmountOut(
-            tokenInOutMarket, amountsInOutMaxFee, txdict(self._account)
+        tx = self._sendTx(
+            pool,
+            "swapExactAmountOut",
+            tokenInOutMarket,
+            amountsInOutMaxFee,
         )
-        self.resetCachedInfo()
+        self._spendAllowance(tx, OCEAN, pool.address)
 
     def sellDTV4(self, pool, DT, DT_sell_amt: float, min_OCEAN_amt: float = 0.0):
         """Swap DT for OCEAN. min_OCEAN_amt>0 protects from slippage."""
-        DT.approve(pool.address, toBase18(DT_sell_amt), txdict(self._account))
+        self._approveIfNeeded(DT, pool.address, toBase18(DT_sell_amt))
 
         tokenIn_address = DT.address  # entering pool
         tokenAmountIn_base = toBase18(DT_sell_amt)  # ""
         tokenOut_address = globaltokens.OCEAN_address()  # leaving pool
         minAmountOut_base = toBase18(min_OCEAN_amt)  # ""
         maxPrice_base = 2**255  # limit by min_OCEAN_amt, not price
-        marketFeeAddress = OPF_ADDRESS
+        marketFeeAddress = constants.OPF_ADDRESS
         tokenInOutMarket = [
             tokenIn_address,
             tokenOut_address,
@@ -514,12 +641,236 @@ class AgentWalletEvm(
             0,
         ]  # [exactAmountIn,minAmountOut,maxPrice,_swapMarketFee]
 
-        pool.swapExactAmountIn(
+        tx = self._sendTx(
+            pool,
+            "swapExactAmountIn",
             tokenInOutMarket,
             amountsInOutMaxFee,
-            txdict(self._account),
         )
-        self.resetCachedInfo()
+        self._spendAllowance(tx, DT, pool.address)
+
+
+@enforce_types
+class AgentWalletShadow(
+    UsdNoEvmWalletMixIn,
+    StrMixIn,
+    AgentWalletAbstract,
+):
+    """
+    In this wallet subclass, OCEAN, DTs and BPTs are util.shadowamm tokens,
+    in Python. No Evm. USD is stored in Python.
+
+    It takes the same actions as AgentWalletEvm's oceanv3 ones, with the
+    same float-to-base18 conversions. So it moves the same amounts, to
+    the wei, that AgentWalletEvm's txs would.
+    """
+
+    def __init__(self, USD: float = 0.0, OCEAN: float = 0.0, private_key=None):
+        assert private_key is None, "shadow wallets have no keys"
+        AgentWalletAbstract.__init__(self, USD, OCEAN, private_key)
+        UsdNoEvmWalletMixIn.__init__(self, USD)
+
+        self._address = shadowamm.newAddress()
+        self._max_allowance_spenders: Set[str] = set()
+
+        self._total_OCEAN_in: float = OCEAN
+        globaltokens.fundOCEANFromAbove(self._address, toBase18(OCEAN))
+
+        # postconditions
+        assert self.USD() == USD
+        assert self.OCEAN() == OCEAN
+
+    @property
+    def account(self):
+        """No brownie account: there's no chain"""
+        return None
+
+    @property
+    def address(self) -> str:
+        return self._address
+
+    def resetCachedInfo(self):
+        """Nothing is cached: balances are read from shadowamm directly"""
+
+    # ===================================================================
+    # OCEAN-related
+    def OCEAN(self) -> float:
+        return fromBase18(self._OCEAN_base())
+
+    def _OCEAN_base(self) -> int:
+        return globaltokens.OCEANtoken().balanceOf(self.address)
+
+    def depositOCEAN(self, amt: float) -> None:
+        assert amt >= 0.0
+        globaltokens.fundOCEANFromAbove(self.address, toBase18(amt))
+        self._total_OCEAN_in += amt
+
+    def withdrawOCEAN(self, amt: float) -> None:
+        self.transferOCEAN(_BURN_WALLET, amt)
+
+    def transferOCEAN(self, dst_wallet, amt: float) -> None:
+        assert isinstance(dst_wallet, (AgentWalletShadow, BurnWallet))
+        amt_base = self._transferAmtBase(amt, self._OCEAN_base(), "OCEAN")
+        if amt_base == 0:
+            return
+        globaltokens.OCEANtoken().transfer(self.address, dst_wallet.address, amt_base)
+
+        dst_wallet._total_OCEAN_in += amt
+
+    def transferOCEANMany(self, dst_wallets: list, amts: list) -> None:
+        """As AgentWalletEvm.transferOCEANMany"""
+        assert len(dst_wallets) == len(amts)
+        amts_base = [toBase18(amt) for amt in amts]
+        OCEAN_base = self._OCEAN_base()
+        if sum(amts_base) > OCEAN_base:
+            raise ValueError(
+                f"transfer amts ({fromBase18(sum(amts_base))})"
+                f" exceed OCEAN holdings ({fromBase18(OCEAN_base)})"
+            )
+
+        OCEAN = globaltokens.OCEANtoken()
+        for dst_wallet, amt_base, amt in zip(dst_wallets, amts_base, amts):
+            assert isinstance(dst_wallet, (AgentWalletShadow, BurnWallet))
+            assert amt_base >= 0
+            OCEAN.transfer(self.address, dst_wallet.address, amt_base)
+            dst_wallet._total_OCEAN_in += amt
+
+    def totalOCEANin(self) -> float:
+        return self._total_OCEAN_in
+
+    # ===================================================================
+    # allowance-related
+    def useMaxAllowance(self, spender_address: str) -> None:
+        """As AgentWalletEvm.useMaxAllowance. Approves are free here, but
+        follow it, so that allowances match"""
+        self._max_allowance_spenders.add(spender_address)
+
+    def allowance(self, token, spender_address: str) -> float:
+        return fromBase18(token.allowance(self.address, spender_address))
+
+    def _approveIfNeeded(self, token, spender_address: str, amt_base: int) -> None:
+        if token.allowance(self.address, spender_address) >= amt_base:
+            return
+        if spender_address in self._max_allowance_spenders:
+            amt_base = constants.HUGEINT
+        token.approve(self.address, spender_address, amt_base)
+
+    # ===================================================================
+    # datatoken and pool-related
+    def DT(self, dt) -> float:
+        return fromBase18(self._DT_base(dt))
+
+    def _DT_base(self, dt) -> int:
+        return dt.balanceOf(self.address)
+
+    def BPT(self, pool) -> float:
+        return fromBase18(self._BPT_base(pool))
+
+    def _BPT_base(self, pool) -> int:
+        return pool.balanceOf(self.address)
+
+    def sellDT(self, pool, DT, DT_sell_amt: float, min_OCEAN_amt: float = 0.0):
+        """Swap DT for OCEAN. min_OCEAN_amt>0 protects from slippage."""
+        self._approveIfNeeded(DT, pool.address, toBase18(DT_sell_amt))
+        pool.swapExactAmountIn(
+            self.address,
+            DT.address,
+            toBase18(DT_sell_amt),
+            globaltokens.OCEAN_address(),
+            toBase18(min_OCEAN_amt),
+            2**255,  # limit by min_OCEAN_amt, not price
+        )
+
+    def buyDT(self, pool, DT, DT_buy_amt: float, max_OCEAN_allow: float):
+        """Swap OCEAN for DT"""
+        OCEAN = globaltokens.OCEANtoken()
+        self._approveIfNeeded(OCEAN, pool.address, toBase18(max_OCEAN_allow))
+        pool.swapExactAmountOut(
+            self.address,
+            OCEAN.address,
+            toBase18(max_OCEAN_allow),
+            DT.address,
+            toBase18(DT_buy_amt),
+            2**255,
+        )
+
+    def stakeOCEAN(self, OCEAN_stake: float, pool):
+        """Convert some OCEAN to DT, then add both as liquidity."""
+        OCEAN = globaltokens.OCEANtoken()
+        self._approveIfNeeded(OCEAN, pool.address, toBase18(OCEAN_stake))
+        pool.joinswapExternAmountIn(
+            self.address, OCEAN.address, toBase18(OCEAN_stake), toBase18(0.0)
+        )
+
+    def unstakeOCEAN(self, BPT_unstake: float, pool):
+        pool.exitswapPoolAmountIn(
+            self.address,
+            globaltokens.OCEAN_address(),
+            toBase18(BPT_unstake),
+            toBase18(0.0),
+        )
+
+    def transferDT(self, dst_wallet, DT, amt: float) -> None:
+        assert isinstance(dst_wallet, (AgentWalletShadow, BurnWallet))
+        amt_base = self._transferAmtBase(amt, self._DT_base(DT), "DT")
+        if amt_base == 0:
+            return
+        DT.transfer(self.address, dst_wallet.address, amt_base)
+
+    def newDatatoken(self, name: str, mint_amt: float):
+        """Create a datatoken capped at mint_amt. Mint it all to self"""
+        DT = shadowamm.ShadowToken(name, name, self.address, cap=toBase18(mint_amt))
+        DT.mint(self.address, self.address, toBase18(mint_amt))
+        return DT
+
+    def newPool(  # pylint: disable=too-many-arguments
+        self,
+        DT,
+        DT_bind_amt: float,
+        DT_weight: float,
+        OCEAN_bind_amt: float,
+        OCEAN_weight: float,
+    ):
+        """Create a pool controlled by self. Bind DT and OCEAN of self's as
+        initial liquidity, then finalize it"""
+        OCEAN = globaltokens.OCEANtoken()
+        pool = shadowamm.ShadowPool(self.address)
+
+        DT.approve(self.address, pool.address, toBase18(DT_bind_amt))
+        OCEAN.approve(self.address, pool.address, toBase18(OCEAN_bind_amt))
+
+        pool.bind(self.address, DT.address, toBase18(DT_bind_amt), toBase18(DT_weight))
+        pool.bind(
+            self.address,
+            OCEAN.address,
+            toBase18(OCEAN_bind_amt),
+            toBase18(OCEAN_weight),
+        )
+
+        pool.finalize(self.address)
+        return pool
+
+    @staticmethod
+    def _transferAmtBase(amt: float, balance_base: int, token_name: str) -> int:
+        """Base18 amount to transfer for amt, as AgentWalletEvm rounds it"""
+        amt_base = toBase18(amt)
+        assert amt_base >= 0
+        if amt_base == 0:
+            return 0
+
+        if balance_base == 0:
+            raise ValueError(f"no {token_name} to transfer")
+
+        tol = 1e-12
+        if (1.0 - tol) <= amt / fromBase18(balance_base) <= (1.0 + tol):
+            amt_base = balance_base
+
+        if amt_base > balance_base:
+            raise ValueError(
+                f"transfer amt ({fromBase18(amt_base)})"
+                f" exceeds {token_name} holdings ({fromBase18(balance_base)})"
+            )
+        return amt_base
 
 
 # ========================================================================
@@ -532,7 +883,7 @@ class BurnWallet:
 
     def __init__(self):
         self.address = constants.BURN_ADDRESS
-        self._total_OCEAN_in: float = 0.0  # type:ignore
+        self._total_OCEAN_in: float = 0.0  # type: ignore
 
     def resetCachedInfo(self):
         pass
@@ -1,4 +1,7 @@
+from typing import Optional
+
 from enforce_typing import enforce_types
+import numpy
 
 
 @enforce_types
@@ -17,3 +20,109 @@ class KPIsBase:
     def elapsedTime(self) -> int:
         """Elapsed time (seconds) since start of run"""
         return self._tick * self._time_step
+
+
+# magic number: # ticks that a TickSeries has room for, if not told
+DEFAULT_CAPACITY = 1000
+
+
+@enforce_types
+class TickSeries:
+    """
+    A series with one float value per tick. Values live in a preallocated
+    float64 array, which doubles in size whenever it fills up. Size it
+    with the # ticks of the run (eg ss.max_ticks) to never grow.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        self._array = numpy.empty(max(1, capacity), dtype=numpy.float64)
+        self._n_ticks = 0
+
+    def append(self, value: float) -> None:
+        """Add the value of the next tick"""
+        if self._n_ticks == len(self._array):
+            self._array = numpy.concatenate(
+                [self._array, numpy.empty_like(self._array)]
+            )
+        self._array[self._n_ticks] = value
+        self._n_ticks += 1
+
+    def __len__(self) -> int:
+        return self._n_ticks
+
+    def values(self) -> numpy.ndarray:
+        """All values so far, as a read-only view (no copy). Later appends
+        don't show up in it."""
+        view = self._array[: self._n_ticks]
+        view.flags.writeable = False
+        return view
+
+    def valueAt(self, tick: int) -> float:
+        """Value at a tick. Negative ticks count from the end, like lists"""
+        return float(self.values()[tick])
+
+    def valuesOverTicks(self, tick1: int, tick2: int) -> numpy.ndarray:
+        """Values at ticks tick1, .., tick2 - 1, as a view. For numpy
+        reductions over a window. Ticks outside of the series are left out"""
+        tick1 = min(max(0, tick1), self._n_ticks)
+        tick2 = min(max(0, tick2), self._n_ticks)
+        return self.values()[tick1 : max(tick1, tick2)]
+
+    def sumOverTicks(self, tick1: int, tick2: int) -> float:
+        """Sum of values at ticks tick1, .., tick2 - 1, like a slice.
+        Ticks outside of the series count as 0."""
+        return float(numpy.sum(self.valuesOverTicks(tick1, tick2)))
+
+
+@enforce_types
+class RollingSum(TickSeries):
+    """
+    A TickSeries that keeps prefix sums as it grows, so that the sum over
+    any range of ticks or interval of time is O(1), no matter how long
+    the range.
+    """
+
+    def __init__(
+        self, time_step: Optional[int] = None, capacity: int = DEFAULT_CAPACITY
+    ):
+        super().__init__(capacity)
+        self._time_step = time_step  # seconds per tick. For sumOverInterval()
+        self._prefix_sums = TickSeries(capacity + 1)  # [i] = sum of 1st i values
+        self._prefix_sums.append(0.0)
+
+    def append(self, value: float) -> None:
+        """Add the value of the next tick"""
+        super().append(value)
+        self._prefix_sums.append(self._prefix_sums.valueAt(-1) + value)
+
+    def sumOverTicks(self, tick1: int, tick2: int) -> float:
+        """Sum of values at ticks tick1, .., tick2 - 1, like a slice.
+        Ticks outside of the series count as 0."""
+        n_ticks = len(self)
+        tick1 = min(max(0, tick1), n_ticks)
+        tick2 = min(max(0, tick2), n_ticks)
+        if tick2 <= tick1:
+            return 0.0
+        return self._prefix_sums.valueAt(tick2) - self._prefix_sums.valueAt(tick1)
+
+    def sumOverInterval(self, t1: int, t2: int) -> float:
+        """
+        Treat each value as a rate per second, held during its tick.
+        Return the total over the time from t1 to t2 (both inclusive,
+        in # seconds since start). A tick partly in the interval
+        counts for its seconds in the interval only.
+        """
+        assert t2 > t1
+        assert self._time_step is not None, "need time_step"
+        time_step = self._time_step
+        tick1 = max(0, t1 // time_step)
+        tick2 = min(len(self), t2 // time_step + 1)
+        if tick2 <= tick1:
+            return 0.0
+
+        total = time_step * self.sumOverTicks(tick1, tick2)
+
+        # first & last ticks: take off their seconds outside the interval
+        total -= self.valueAt(tick1) * max(0, t1 - tick1 * time_step)
+        total -= self.valueAt(tick2 - 1) * max(0, tick2 * time_step - 1 - t2)
+        return total
@@ -0,0 +1,134 @@
+import logging
+import os
+from typing import List, Optional
+
+from enforce_typing import enforce_types
+import numpy
+
+try:
+    import pyarrow  # pylint: disable=unused-import
+    import pyarrow.parquet
+except ImportError:  # optional dependency
+    pyarrow = None
+
+log = logging.getLogger("master")
+
+# magic numbers: filenames within a run's output directory
+CSV_FILENAME = "data.csv"
+NPZ_FILENAME = "data.npz"
+PARQUET_FILENAME = "data.parquet"
+
+# how many rows to buffer in memory before appending to the csv file
+DEFAULT_CHUNK_ROWS = 500
+
+
+@enforce_types
+class RunRecorder:
+    """
+    @description
+      Records the rows that SimEngine logs, for later plotting & analysis.
+
+      Rows are buffered in memory as float64 columns, keyed by the header
+      seen on the first row, and as csv lines. Each value's csv text is
+      f"{val}" of the value as logged, so ints stay exact. Every
+      'chunk_rows' rows, the buffered lines get appended to the csv file in
+      one write. When the run closes, the full
+      table also gets stored in a binary columnar file (npz, plus parquet
+      if pyarrow is installed) which loads without any text parsing.
+
+    @attributes
+      output_dir -- directory of where results are stored
+      chunk_rows -- number of rows buffered between csv writes
+      header -- list of str -- column names. None until first row
+    """
+
+    def __init__(self, output_dir: str, chunk_rows: int = DEFAULT_CHUNK_ROWS):
+        assert chunk_rows > 0
+        self.output_dir = output_dir
+        self.chunk_rows = chunk_rows
+        self.header: Optional[List[str]] = None
+
+        self._buffer = None  # 2d float64 array [row_i, col_i]
+        self._csv_lines: List[str] = []  # buffered rows, as csv text
+        self._n_buffered = 0
+        self._chunks: List[numpy.ndarray] = []  # flushed rows, for binary
+        self._closed = False
+
+    def record(self, dataheader: list, datarow: list) -> None:
+        """Add one row. On the first call, fixes the header."""
+        assert not self._closed, "can't record after close()"
+        if self.header is None:
+            self._startTable(dataheader)
+        elif dataheader != self.header:
+            raise ValueError("header changed mid-run")
+
+        self._buffer[self._n_buffered, :] = datarow
+        self._csv_lines.append(", ".join(f"{val}" for val in datarow) + "\n")
+        self._n_buffered += 1
+        if self._n_buffered == self.chunk_rows:
+            self.flush()
+
+    def numRows(self) -> int:
+        return sum(len(chunk) for chunk in self._chunks) + self._n_buffered
+
+    def values(self) -> numpy.ndarray:
+        """Returns 2d float64 array [row_i, col_i] of all rows recorded."""
+        ncols = 0 if self.header is None else len(self.header)
+        chunks = self._chunks
+        if self._n_buffered > 0:
+            chunks = chunks + [self._buffer[: self._n_buffered]]
+        if not chunks:
+            return numpy.zeros((0, ncols), dtype=numpy.float64)
+        return numpy.concatenate(chunks)
+
+    def flush(self) -> None:
+        """Append the buffered rows to the csv file."""
+        if self._n_buffered == 0:
+            return
+        with open(self._csvFilename(), mode="a", encoding="UTF-8") as f:
+            f.write("".join(self._csv_lines))
+        self._chunks.append(self._buffer[: self._n_buffered].copy())
+        self._csv_lines = []
+        self._n_buffered = 0
+
+    def close(self) -> None:
+        """Flush remaining rows, then write the binary columnar file(s)."""
+        if self._closed:
+            return
+        self.flush()
+        self._closed = True
+        if self.header is None:
+            return
+        values = self.values()
+        writeNpz(self.output_dir, self.header, values)
+        if pyarrow is not None:
+            _writeParquet(self.output_dir, self.header, values)
+
+    def _startTable(self, dataheader: list) -> None:
+        self.header = list(dataheader)
+        self._buffer = numpy.empty(
+            (self.chunk_rows, len(dataheader)), dtype=numpy.float64
+        )
+        if not os.path.exists(self.output_dir):
+            os.mkdir(self.output_dir)
+        with open(self._csvFilename(), mode="w", encoding="UTF-8") as f:
+            f.write(", ".join(self.header) + "\n")
+
+    def _csvFilename(self) -> str:
+        return os.path.join(self.output_dir, CSV_FILENAME)
+
+
+@enforce_types
+def writeNpz(output_dir: str, header: List[str], values: numpy.ndarray) -> str:
+    """Store (header, values) in output_dir. Returns the full filename."""
+    filename = os.path.join(output_dir, NPZ_FILENAME)
+    numpy.savez(filename, header=numpy.array(header), values=values)
+    return filename
+
+
+@enforce_types
+def _writeParquet(output_dir: str, header: List[str], values: numpy.ndarray):
+    table = pyarrow.table({name: values[:, i] for i, name in enumerate(header)})
+    filename = os.path.join(output_dir, PARQUET_FILENAME)
+    pyarrow.parquet.write_table(table, filename)
+    log.debug("Wrote %s", filename)
@@ -1,10 +1,19 @@
 import logging
-import os
+from typing import Optional
 
-from brownie.network import chain  # pylint: disable=no-name-in-module
 from enforce_typing import enforce_types
 
-from util.constants import S_PER_MIN, S_PER_HOUR, S_PER_DAY, S_PER_MONTH, S_PER_YEAR
+from engine.AgentBase import AgentBaseNoEvm
+from engine.RunRecorder import RunRecorder
+from util import balanceledger, chainstats, constants, tx
+from util.constants import (
+    ENGINE_MODE,
+    S_PER_MIN,
+    S_PER_HOUR,
+    S_PER_DAY,
+    S_PER_MONTH,
+    S_PER_YEAR,
+)
 
 log = logging.getLogger("master")
 
@@ -17,43 +26,67 @@ class SimEngine:
 
     @attributes
       state - child of SimState
-      output_dir -- directory of where results are stored
+      output_dir -- directory of where results are stored, or None
+      recorder -- RunRecorder, or None if output_dir is None
+      use_evm -- mine a block per tick? If False, never touch the chain
     """
 
-    def __init__(self, state, output_dir: str, netlist_log_func=None):
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        state,
+        output_dir: Optional[str],
+        netlist_log_func=None,
+        recorder=None,
+        use_evm: Optional[bool] = None,
+    ):
         self.state = state
         self.output_dir = output_dir
-        self.output_csv = "data.csv"  # magic number
         self.netlist_log_func = netlist_log_func
 
+        if recorder is None and output_dir is not None:
+            recorder = RunRecorder(output_dir)
+        self.recorder = recorder
+
+        if use_evm is None:
+            use_evm = self._autoUseEvm()
+        self.use_evm = use_evm
+
     def run(self):
         """
         @description
           Runs the simulation!  This is the main work routine.
 
         @return
-           <<none>> but it continually generates an output csv output_dir
+           <<none>> but it generates output files in output_dir
         """
         log.info("Begin.")
         log.info(str(self.state.ss) + "\n")  # pylint: disable=logging-not-lazy
-
-        while True:
-            self.takeStep()
-            if self.doStop():
-                break
-            self.state.tick += 1
-            chain.mine(blocks=1, timedelta=self.state.ss.time_step)
+        log.info("Engine mode: %s", "evm" if self.use_evm else "noevm")
+
+        try:
+            while True:
+                self.takeStep()
+                if self.doStop():
+                    break
+                self.advanceTick()
+        finally:
+            if self.recorder is not None:
+                self.recorder.close()
+            if constants.CHAIN_STATS and self.output_dir is not None:
+                chainstats.writeCsv(self.output_dir)
         log.info("Done")
 
     def takeStep(self) -> None:
         """Run one tick, updates self.state"""
         log.debug("=============================================")
         log.debug("Tick=%d: begin", (self.state.tick))
+        chainstats.setTick(self.state.tick)
 
         if (self.elapsedSeconds() % self.state.ss.log_interval) == 0:
             s, dataheader, datarow = self.createLogData()
             log.info("".join(s))
-            self.logToCsv(dataheader, datarow)
+            if self.recorder is not None:
+                self.recorder.record(dataheader, datarow)
 
         # main work
         self.state.takeStep()
@@ -61,6 +94,12 @@ class SimEngine:
         log.debug("=============================================")
         log.debug("Tick=%d: done", self.state.tick)
 
+    def advanceTick(self) -> None:
+        """Move on to the next tick"""
+        self.state.tick += 1
+        if self.use_evm:
+            self._mineBlock()
+
     def createLogData(self):
         """Compute this iter's status, and output in forms ready
         for console logging and csv logging."""
@@ -89,31 +128,43 @@ class SimEngine:
 
         # other columns to log
         if self.netlist_log_func is not None:
-            s2, dataheader2, datarow2 = self.netlist_log_func(state)
+            with chainstats.attributeTo("log"):
+                s2, dataheader2, datarow2 = self.netlist_log_func(state)
             s += s2
             dataheader += dataheader2
             datarow += datarow2
 
-        return s, dataheader, datarow
+        # chain stats so far, if counted: see util/chainstats.py
+        if constants.CHAIN_STATS and self.use_evm:
+            totals = chainstats.totals()
+            dataheader += ["chain_" + name for name in chainstats.STATS]
+            datarow += [totals[name] for name in chainstats.STATS]
 
-    def logToCsv(self, dataheader, datarow) -> None:
-        if self.output_dir is None:
-            return
-
-        if not os.path.exists(self.output_dir):
-            os.mkdir(self.output_dir)
-
-        full_filename = os.path.join(self.output_dir, self.output_csv)
-
-        # if needed, create file and add header
-        if not os.path.exists(full_filename):
-            with open(full_filename, mode="w+", encoding="UTF-8") as f:
-                f.write(", ".join(dataheader) + "\n")
+        return s, dataheader, datarow
 
-        # add in row
-        datarow_s = [f"{dataval}" for dataval in datarow]
-        with open(full_filename, mode="a+", encoding="UTF-8") as f:
-            f.write(", ".join(datarow_s) + "\n")
+    def _autoUseEvm(self) -> bool:
+        """Use ENGINE_MODE from tokenspice.ini. If 'auto', look at agents.
+        Shadow pools need no EVM, so POOL_BACKEND 'shadow' means 'noevm'.
+        Agents that would need it refuse to be built with 'shadow'.
+
+        Note: 'auto' only sees the agents present at construction time.
+        Netlists whose NoEvm agents create Evm agents mid-run need 'evm'."""
+        if ENGINE_MODE != "auto":
+            return ENGINE_MODE == "evm"
+        if constants.POOL_BACKEND == "shadow":
+            return False
+        agents = self.state.agents.values()
+        return not all(isinstance(agent, AgentBaseNoEvm) for agent in agents)
+
+    def _mineBlock(self) -> None:
+        """Advance the chain by one tick's worth of time"""
+        # pylint: disable=import-outside-toplevel, no-name-in-module
+        from brownie.network import chain
+
+        with chainstats.attributeTo("engine"):
+            chain.mine(blocks=1, timedelta=self.state.ss.time_step)
+        tx.invalidateFees()  # the new block may have a new base fee
+        balanceledger.setTick(self.state.tick)
 
     def elapsedSeconds(self) -> int:
         return self.state.tick * self.state.ss.time_step
@@ -1,5 +1,12 @@
+import heapq
+import itertools
+import math
+import random
+from typing import Dict, List, Tuple
+
 from enforce_typing import enforce_types
 from engine.AgentDict import AgentDict
+from util import chainstats
 
 
 @enforce_types
@@ -17,14 +24,75 @@ class SimStateBase:
         # extra-agenent state variables, to track metrics. Child of Kpis
         self.kpis = None
 
+        # random stream of this run. Agents draw from it, not from 'random'.
+        # Seed it for a reproducible run: state.rng.seed(seed)
+        self.rng = random.Random()
+
+        # agent scheduling. See AgentBaseAbstract.nextWakeTime()
+        self._sched_agents = None  # the 'agents' dict that's scheduled
+        self._sched_names: List[str] = []  # agent names, in order added
+        self._polled: List[int] = []  # agents to step every tick, by order
+        self._wake_heap: List[Tuple[float, int]] = []  # (wake time, order)
+        self._tick_last_step: Dict[str, int] = {}  # agent_name : tick
+
     def takeStep(self) -> None:
         """This happens once per tick"""
-        # update agents
-        for agent in list(self.agents.values()):
-            agent.takeStep(self)
+        # update agents that are due, in the order they were added
+        for order in self._dueAgents():
+            self._stepAgent(order)
 
         # update global state values
-        self.kpis.takeStep(self)
+        with chainstats.attributeTo("kpis"):
+            self.kpis.takeStep(self)
+
+    # ==============================================================
+    # agent scheduling
+    def _dueAgents(self) -> List[int]:
+        """Return orders of agents to step this tick, and unschedule them"""
+        self._syncSchedule()
+
+        due = self._polled
+        self._polled = []
+        if self._wake_heap:
+            now = self.tick * self.ss.time_step
+            while self._wake_heap and self._wake_heap[0][0] <= now:
+                due.append(heapq.heappop(self._wake_heap)[1])
+            due.sort()
+
+        return due
+
+    def _stepAgent(self, order: int) -> None:
+        agent_name = self._sched_names[order]
+        agent = self.agents[agent_name]
+        tick_last_step = self._tick_last_step.get(agent_name)
+        if tick_last_step is not None and self.tick - tick_last_step > 1:
+            agent.skipTime((self.tick - tick_last_step - 1) * self.ss.time_step)
+
+        with chainstats.attributeTo(agent_name):
+            agent.takeStep(self)
+        self._tick_last_step[agent_name] = self.tick
+
+        wake_time = agent.nextWakeTime(self)
+        if wake_time is None:
+            self._polled.append(order)
+        elif wake_time != math.inf:
+            heapq.heappush(self._wake_heap, (wake_time, order))
+
+    def _syncSchedule(self) -> None:
+        """Agents added since last tick are due now. If 'agents' got replaced
+        or shrank, start over with every agent due now. Waking early is ok."""
+        agents = self.agents
+        n_sched = len(self._sched_names)
+        if agents is not self._sched_agents or len(agents) < n_sched:
+            self._sched_agents = agents
+            self._sched_names = []
+            self._polled = []
+            self._wake_heap = []
+            n_sched = 0
+
+        for agent_name in itertools.islice(agents.keys(), n_sched, None):
+            self._polled.append(len(self._sched_names))
+            self._sched_names.append(agent_name)
 
     # ==============================================================
     # basic agent management
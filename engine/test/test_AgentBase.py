@@ -2,7 +2,9 @@ from enforce_typing import enforce_types
 import pytest
 
 from engine.AgentBase import AgentBaseEvm, AgentBaseNoEvm
+from engine.AgentWallet import AgentWalletShadow
 from agents.test.conftest import _DT_INIT, _DT_STAKE
+from util import constants, shadowamm
 
 
 @enforce_types
@@ -36,6 +38,19 @@ def testInitEvm():
     assert id(agent.account) == id(agent._wallet.account)
 
 
+@enforce_types
+def testInitEvm_shadowBackend(monkeypatch):
+    monkeypatch.setattr(constants, "POOL_BACKEND", "shadow")
+    shadowamm.reset()
+    with pytest.raises(ValueError):  # its actions may need the EVM
+        MyTestAgentEvm("agent1", USD=1.1, OCEAN=1.2)
+
+    monkeypatch.setattr(MyTestAgentEvm, "SHADOW_OK", True)
+    agent = MyTestAgentEvm("agent1", USD=1.1, OCEAN=1.2)
+    assert isinstance(agent._wallet, AgentWalletShadow)
+    assert agent.OCEAN() == 1.2
+
+
 @enforce_types
 def testInitNoEvm():
     agent = MyTestAgentNoEvm("agent1", USD=1.1, OCEAN=1.2)
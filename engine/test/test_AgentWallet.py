@@ -1,3 +1,4 @@
+import brownie
 from enforce_typing import enforce_types
 import pytest
 from pytest import approx
@@ -6,11 +7,12 @@ from agents.test.conftest import _DT_INIT, _DT_STAKE
 from engine.AgentWallet import (
     AgentWalletNoEvm,
     AgentWalletEvm,
+    AgentWalletShadow,
     BurnWallet,
     UsdNoEvmWalletMixIn,
     OceanNoEvmWalletMixIn,
 )
-from util import constants, globaltokens
+from util import agentkeys, balanceledger, constants, fasttx, globaltokens, shadowamm
 from util.base18 import fromBase18
 
 
@@ -215,6 +217,7 @@ def testStr(_AgentWallet):
 # AgentWalletNoEvm
 # (ADD TO ME)
 
+
 # =======================================================================
 # =======================================================================
 # =======================================================================
@@ -237,12 +240,72 @@ def test_initFromRandom():
     assert w1.address != w2.address
 
 
+@enforce_types
+def test_initFromClaimedAccount(monkeypatch):
+    # pretend that the chain's accounts from #7 on are agent accounts
+    monkeypatch.setattr(agentkeys, "N_BASE_ACCOUNTS", 7)
+    monkeypatch.setattr(agentkeys, "_N_CLAIMED", 0)
+    account = brownie.network.accounts[7]
+    ETH_before = fromBase18(account.balance())
+
+    w = AgentWalletEvm(OCEAN=2.0)
+    assert w.account == account
+    assert w.OCEAN() == 2.0
+    assert w.ETH() <= ETH_before  # has ETH from genesis. Not sent more
+
+
 @enforce_types
 def test_gotSomeETHforGas():
     w = AgentWalletEvm()
     assert w.ETH() > 0.0
 
 
+@enforce_types
+def test_batchedFunding():
+    history = brownie.network.history
+    globaltokens.OCEANtoken()  # deploy, if needed
+    n_txs_before = len(history)
+    with globaltokens.batchedFunding():
+        wallets = [AgentWalletEvm(OCEAN=float(i)) for i in range(5)]
+        assert len(history) == n_txs_before  # all funding is pending
+        assert [w.OCEAN() for w in wallets] == [float(i) for i in range(5)]
+        assert wallets[0].ETH() > 0.0
+
+    # 1 MultiSend tx, plus maybe deploy + approve of the MultiSend contract
+    assert len(history) - n_txs_before <= 3
+    for i, w in enumerate(wallets):
+        w.resetCachedInfo()
+        assert w.OCEAN() == float(i)
+        assert w.ETH() > 0.0
+        assert globaltokens.pendingFunds(w.address) == (0, 0)
+
+
+@enforce_types
+def test_batchedFunding_sentBeforeTx():
+    with globaltokens.batchedFunding():
+        w1, w2 = AgentWalletEvm(OCEAN=3.0), AgentWalletEvm()
+        w1.transferOCEAN(w2, 1.0)  # needs w1's ETH and OCEAN on chain
+        assert w1.OCEAN() == 2.0
+        assert w2.OCEAN() == 1.0
+
+
+@enforce_types
+def test_transferOCEANMany():
+    w1 = AgentWalletEvm(OCEAN=10.0)
+    w2, w3 = AgentWalletEvm(OCEAN=1.0), AgentWalletEvm()
+
+    w1.transferOCEANMany([w2, w3, BurnWallet()], [2.0, 3.0, 1.0])
+
+    assert w1.OCEAN() == 10.0 - 2.0 - 3.0 - 1.0
+    assert w2.OCEAN() == 1.0 + 2.0
+    assert w3.OCEAN() == 3.0
+    assert w3.totalOCEANin() == 3.0
+
+    with pytest.raises(ValueError):
+        w1.transferOCEANMany([w2, w3], [3.0, 2.0])
+    assert w1.OCEAN() == 4.0
+
+
 # ===================================================================
 # ETH-related
 @enforce_types
@@ -325,7 +388,7 @@ def test_stakeOCEAN(alice_info):
 
     BPT_before = agent_wallet.BPT(pool)
     OCEAN1 = agent_wallet.OCEAN()
-    OCEAN2 = fromBase18(agent_wallet._cached_OCEAN_base)
+    OCEAN2 = fromBase18(balanceledger.balanceOf(OCEAN, agent_wallet.address))
     OCEAN3 = fromBase18(OCEAN.balanceOf(agent_wallet.address))
     assert OCEAN1 == OCEAN2 == OCEAN3
 
@@ -340,7 +403,7 @@ def test_stakeOCEAN(alice_info):
 def test_unstakeOCEAN(alice_info):
     agent_wallet, pool = alice_info.agent._wallet, alice_info.pool
 
-    BPT_before: float = agent_wallet.BPT(pool)  # type:ignore
+    BPT_before: float = agent_wallet.BPT(pool)  # type: ignore
 
     agent_wallet.unstakeOCEAN(BPT_unstake=20.0, pool=pool)
 
@@ -348,6 +411,93 @@ def test_unstakeOCEAN(alice_info):
     assert BPT_after == (BPT_before - 20.0)
 
 
+@enforce_types
+def test_buyDT_reusesAllowance(alice_info):
+    agent_wallet, DT, pool = alice_info.agent._wallet, alice_info.DT, alice_info.pool
+    OCEAN = globaltokens.OCEANtoken()
+
+    # 1st buy approves all of the OCEAN; it spends some of it
+    agent_wallet.buyDT(pool, DT, DT_buy_amt=1.0, max_OCEAN_allow=agent_wallet.OCEAN())
+    allowance_base = OCEAN.allowance(agent_wallet.address, pool.address)
+    assert agent_wallet.allowance(OCEAN, pool.address) == fromBase18(allowance_base)
+    assert agent_wallet.allowance(OCEAN, pool.address) == agent_wallet.OCEAN()
+
+    # 2nd buy is covered by what's left, so it's just 1 tx: the swap
+    n_txs = sum(fasttx.txCounts())
+    agent_wallet.buyDT(pool, DT, DT_buy_amt=1.0, max_OCEAN_allow=agent_wallet.OCEAN())
+    assert sum(fasttx.txCounts()) == n_txs + 1
+
+
+@enforce_types
+def test_sellDT_maxAllowance(alice_info):
+    agent_wallet, DT, pool = alice_info.agent._wallet, alice_info.DT, alice_info.pool
+    agent_wallet.useMaxAllowance(pool.address)
+
+    agent_wallet.sellDT(pool, DT, DT_sell_amt=1.0)
+    assert agent_wallet.allowance(DT, pool.address) == approx(
+        fromBase18(constants.HUGEINT) - 1.0
+    )
+
+    n_txs = sum(fasttx.txCounts())
+    agent_wallet.sellDT(pool, DT, DT_sell_amt=1.0)
+    assert sum(fasttx.txCounts()) == n_txs + 1
+
+
+# ===================================================================
+# AgentWalletShadow: tokens and pools of util.shadowamm
+@pytest.fixture
+def shadow_backend(monkeypatch):
+    monkeypatch.setattr(constants, "POOL_BACKEND", "shadow")
+    shadowamm.reset()
+
+
+@enforce_types
+def test_shadow_OCEAN(shadow_backend):  # pylint: disable=unused-argument
+    w1 = AgentWalletShadow(USD=1.0, OCEAN=10.0)
+    w2 = AgentWalletShadow()
+    assert w1.account is None
+    assert w1.address != w2.address
+
+    w1.transferOCEAN(w2, 2.0)
+    w1.withdrawOCEAN(7.9999999999999996)  # roundoff: all of it
+    assert w1.OCEAN() == 0.0
+    assert w2.OCEAN() == w2.totalOCEANin() == 2.0
+    with pytest.raises(ValueError):
+        w2.withdrawOCEAN(3.0)
+
+
+@enforce_types
+def test_shadow_poolActions(shadow_backend):  # pylint: disable=unused-argument
+    w = AgentWalletShadow(OCEAN=1000.0)
+    DT = w.newDatatoken("DT1", _DT_INIT)
+    pool = w.newPool(DT, _DT_STAKE, 3.0, 200.0, 7.0)
+    assert w.DT(DT) == _DT_INIT - _DT_STAKE
+    assert w.BPT(pool) == 100.0
+    assert w.OCEAN() == 800.0
+
+    w.sellDT(pool, DT, DT_sell_amt=1.0)
+    assert w.DT(DT) == _DT_INIT - _DT_STAKE - 1.0
+    assert w.OCEAN() > 800.0
+
+    OCEAN_before = w.OCEAN()
+    w.useMaxAllowance(pool.address)
+    w.buyDT(pool, DT, DT_buy_amt=1.0, max_OCEAN_allow=OCEAN_before)
+    assert w.DT(DT) == _DT_INIT - _DT_STAKE
+    assert w.OCEAN() < OCEAN_before
+    assert w.allowance(globaltokens.OCEANtoken(), pool.address) == approx(
+        fromBase18(constants.HUGEINT)
+    )
+
+    w.stakeOCEAN(OCEAN_stake=20.0, pool=pool)
+    assert w.BPT(pool) > 100.0
+    w.unstakeOCEAN(BPT_unstake=20.0, pool=pool)
+    assert w.BPT(pool) < 100.0
+
+    w2 = AgentWalletShadow()
+    w.transferDT(w2, DT, 1.0)
+    assert w2.DT(DT) == 1.0
+
+
 # ===================================================================
 # helps testing
 
@@ -1,6 +1,8 @@
 from enforce_typing import enforce_types
+import numpy
+import pytest
 
-from engine.KPIsBase import KPIsBase
+from engine.KPIsBase import KPIsBase, RollingSum, TickSeries
 
 
 @enforce_types
@@ -22,3 +24,90 @@ def test1():
     assert kpis._tick == 2
     assert kpis.tick() == 2
     assert kpis.elapsedTime() == 2 * 12
+
+
+@enforce_types
+def test_TickSeries():
+    series = TickSeries(capacity=2)
+    assert not series
+    assert series.sumOverTicks(0, 3) == 0.0
+
+    for value in [1.0, 2.0, 4.0, 8.0, 16.0]:  # grows past capacity, twice
+        series.append(value)
+    assert len(series) == 5
+    assert series.values().tolist() == [1.0, 2.0, 4.0, 8.0, 16.0]
+    assert series.valueAt(1) == 2.0
+    assert series.valueAt(-1) == 16.0
+    assert isinstance(series.valueAt(0), float)
+
+    assert series.sumOverTicks(1, 3) == 6.0
+    assert series.sumOverTicks(-5, 2) == 3.0  # clipped, unlike a slice
+    assert series.valuesOverTicks(3, 100).tolist() == [8.0, 16.0]
+    assert series.valuesOverTicks(2, 1).tolist() == []
+    assert series.valuesOverTicks(1, 4).max() == 8.0
+
+
+@enforce_types
+def test_TickSeries_values_is_readonly_view():
+    series = TickSeries()
+    series.append(1.0)
+    values = series.values()
+    assert values.dtype == numpy.float64
+    assert numpy.shares_memory(values, series.values())
+    with pytest.raises(ValueError):
+        values[0] = 2.0
+
+    series.append(3.0)  # old view stays as it was
+    assert values.tolist() == [1.0]
+    assert series.values().tolist() == [1.0, 3.0]
+
+
+@enforce_types
+def test_RollingSum_sumOverTicks():
+    series = RollingSum()
+    assert not series
+    assert series.sumOverTicks(0, 3) == 0.0
+
+    for value in [1.0, 2.0, 4.0, 8.0]:
+        series.append(value)
+    assert len(series) == 4
+    assert series.values().tolist() == [1.0, 2.0, 4.0, 8.0]
+    assert series.valueAt(2) == 4.0
+
+    assert series.sumOverTicks(0, 4) == 15.0
+    assert series.sumOverTicks(1, 3) == 6.0
+    assert series.sumOverTicks(-5, 2) == 3.0  # clipped, unlike a slice
+    assert series.sumOverTicks(3, 100) == 8.0
+    assert series.sumOverTicks(3, 3) == 0.0
+    assert series.sumOverTicks(4, 10) == 0.0
+
+
+@enforce_types
+def _sumOverIntervalByLoop(values: list, time_step: int, t1: int, t2: int) -> float:
+    """Sum over [t1, t2] by visiting each tick, to compare against"""
+    total = 0.0
+    for tick_i, value in enumerate(values):
+        start_s = max(t1, tick_i * time_step)
+        end_s = min(t2, (tick_i + 1) * time_step - 1)
+        if end_s >= start_s:
+            total += value * (end_s - start_s + 1)
+    return total
+
+
+@enforce_types
+def test_RollingSum_sumOverInterval():
+    time_step = 10
+    series = RollingSum(time_step)
+    values = [float(v) for v in [3, 1, 4, 1, 5, 9, 2, 6]]
+    for value in values:
+        series.append(value)
+
+    assert series.sumOverInterval(0, 79) == 10.0 * sum(values)  # all ticks
+    assert series.sumOverInterval(5, 5 + 1) == 2 * 3.0  # within 1 tick
+    assert series.sumOverInterval(-100, -1) == 0.0  # before start
+    assert series.sumOverInterval(80, 100) == 0.0  # after end
+
+    for t1 in range(-15, 95, 3):
+        for t2 in range(t1 + 1, 100, 7):
+            target = _sumOverIntervalByLoop(values, time_step, t1, t2)
+            assert series.sumOverInterval(t1, t2) == pytest.approx(target)
@@ -0,0 +1,110 @@
+import os
+
+from enforce_typing import enforce_types
+import numpy
+import pytest
+
+from engine.RunRecorder import RunRecorder, CSV_FILENAME, NPZ_FILENAME
+from util.plotutil import (
+    _csvToHeaderValues,
+    _npzToHeaderValues,
+    runDirToHeaderValues,
+)
+
+HEADER = ["Tick", "Second", "foo"]
+
+
+@enforce_types
+def _record(recorder: RunRecorder, n_rows: int):
+    for tick in range(n_rows):
+        recorder.record(HEADER, [tick, tick * 10.0, tick / 3.0])
+
+
+@enforce_types
+def test_csv_format(tmpdir):
+    output_dir = str(tmpdir.join("out"))
+    recorder = RunRecorder(output_dir)
+    _record(recorder, 2)
+    recorder.close()
+
+    with open(os.path.join(output_dir, CSV_FILENAME), encoding="UTF-8") as f:
+        lines = f.read().splitlines()
+    assert lines == [
+        "Tick, Second, foo",
+        "0, 0.0, 0.0",
+        f"1, 10.0, {1/3.0}",
+    ]
+
+
+@enforce_types
+def test_csv_format_perValue(tmpdir):
+    """Each value is formatted as logged, not as its column's first value"""
+    output_dir = str(tmpdir.join("out"))
+    recorder = RunRecorder(output_dir)
+    recorder.record(HEADER, [0, 0.0, 0])  # eg a placeholder 0
+    recorder.record(HEADER, [1, 10.0, 12.75])
+    recorder.record(HEADER, [2, 20.0, 2**60 + 1])  # beyond float64's ints
+    recorder.close()
+
+    with open(os.path.join(output_dir, CSV_FILENAME), encoding="UTF-8") as f:
+        lines = f.read().splitlines()
+    assert lines[1:] == ["0, 0.0, 0", "1, 10.0, 12.75", f"2, 20.0, {2**60 + 1}"]
+
+
+@enforce_types
+def test_buffering(tmpdir):
+    output_dir = str(tmpdir.join("out"))
+    recorder = RunRecorder(output_dir, chunk_rows=3)
+    csv_filename = os.path.join(output_dir, CSV_FILENAME)
+
+    _record(recorder, 2)
+    assert recorder.numRows() == 2
+    with open(csv_filename, encoding="UTF-8") as f:
+        assert len(f.read().splitlines()) == 1  # just header so far
+
+    _record(recorder, 2)  # fills a chunk -> flush
+    with open(csv_filename, encoding="UTF-8") as f:
+        assert len(f.read().splitlines()) == 1 + 3
+
+    assert recorder.numRows() == 4
+    assert recorder.values().shape == (4, 3)
+    assert not os.path.exists(os.path.join(output_dir, NPZ_FILENAME))
+
+    recorder.close()
+    with open(csv_filename, encoding="UTF-8") as f:
+        assert len(f.read().splitlines()) == 1 + 4
+
+
+@enforce_types
+def test_npz_matches_csv(tmpdir):
+    output_dir = str(tmpdir.join("out"))
+    recorder = RunRecorder(output_dir, chunk_rows=4)
+    _record(recorder, 10)
+    recorder.close()
+
+    (header1, values1) = _csvToHeaderValues(os.path.join(output_dir, CSV_FILENAME))
+    (header2, values2) = _npzToHeaderValues(os.path.join(output_dir, NPZ_FILENAME))
+    assert header1 == header2 == HEADER
+    assert values2.dtype == numpy.float64
+    numpy.testing.assert_allclose(values1.astype(float), values2)
+
+    (header3, values3) = runDirToHeaderValues(output_dir)
+    assert header3 == HEADER
+    numpy.testing.assert_array_equal(values2, values3)
+
+
+@enforce_types
+def test_header_change(tmpdir):
+    recorder = RunRecorder(str(tmpdir.join("out")))
+    recorder.record(["Tick", "Second"], [0, 0.0])
+    with pytest.raises(ValueError):
+        recorder.record(["Tick", "Minute"], [1, 1.0])
+
+
+@enforce_types
+def test_close_without_rows(tmpdir):
+    output_dir = str(tmpdir.join("out"))
+    recorder = RunRecorder(output_dir)
+    recorder.close()
+    recorder.close()  # idempotent
+    assert not os.path.exists(output_dir)
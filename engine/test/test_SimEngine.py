@@ -67,7 +67,7 @@ def testRunEngine():
 
     state = SimState(time_step=10)
     state.ss.setMaxTicks(3)
-    engine = SimEngine.SimEngine(state, PATH1)
+    engine = SimEngine.SimEngine(state, PATH1, use_evm=True)
     engine.run()
     assert os.path.exists(PATH1)
     assert engine.state.numAgents() >= 0
@@ -77,6 +77,22 @@ def testRunEngine():
     assert elapsed_time in [30, 31]  # 3 ticks * 10 s/tick
 
 
+@enforce_types
+def testRunEngineNoEvm():
+    init_block = chain.height
+
+    state = SimState(time_step=10)
+    state.addAgent(SimpleAgent("agent1", 0.0, 0.0))
+    state.ss.setMaxTicks(3)
+    engine = SimEngine.SimEngine(state, PATH1)
+    assert not engine.use_evm  # all agents are NoEvm
+    engine.run()
+    assert engine.state.tick == 3
+    assert engine.elapsedSeconds() == 30
+
+    assert chain.height == init_block  # no blocks mined
+
+
 @enforce_types
 def tearDown():
     if os.path.exists(PATH1):
@@ -1,3 +1,5 @@
+import math
+
 from enforce_typing import enforce_types
 
 from engine import SimStateBase, SimStrategyBase, KPIsBase
@@ -35,6 +37,53 @@ class MockSimState(SimStateBase.SimStateBase):
         self.addAgent(SimpleAgent("agent2", 0.0, 0.0))
 
 
+@enforce_types
+class CountingAgent(AgentBase.AgentBaseNoEvm):
+    """Steps every 's_between' seconds. Counts time like agents/ do."""
+
+    def __init__(self, name: str, s_between, log: list):
+        super().__init__(name, 0.0, 0.0)
+        self.s_between = s_between  # None = poll every tick
+        self.log = log  # (tick, agent_name) of each step
+        self.s_since: int = 0
+        self.action_ticks: list = []
+
+    def takeStep(self, state):
+        self.log.append((state.tick, self.name))
+        self.s_since += state.ss.time_step
+        if self.s_between is not None and self.s_since >= self.s_between:
+            self.s_since = 0
+            self.action_ticks.append(state.tick)
+
+    def skipTime(self, s_skipped: int) -> None:
+        self.s_since += s_skipped
+
+    def nextWakeTime(self, state):
+        if self.s_between is None:
+            return None
+        if self.s_between == math.inf:
+            return math.inf
+        s_until = self.s_between - self.s_since
+        return state.tick * state.ss.time_step + max(0, s_until)
+
+
+@enforce_types
+def _scheduledState(log: list, s_betweens: list) -> SimStateBase.SimStateBase:
+    state = SimStateBase.SimStateBase(SimStrategy())
+    state.ss.setTimeStep(10)
+    state.kpis = MockKPIs(time_step=10)
+    for i, s_between in enumerate(s_betweens):
+        state.addAgent(CountingAgent(f"agent{i}", s_between, log))
+    return state
+
+
+@enforce_types
+def _run(state, n_ticks: int):
+    for _ in range(n_ticks):
+        state.takeStep()
+        state.tick += 1
+
+
 # ==================================================================
 # actual tests
 
@@ -56,3 +105,83 @@ def test1():
     agent3 = SimpleAgent("agent3", 0.0, 0.0)
     state.addAgent(agent3)
     assert state.numAgents() == 3
+
+
+@enforce_types
+def test_scheduler_only_steps_due_agents():
+    log: list = []
+    state = _scheduledState(log, [None, 30, math.inf])
+    _run(state, 7)
+
+    ticks = {name: [t for (t, n) in log if n == name] for (_, name) in log}
+    assert ticks["agent0"] == list(range(7))  # polled
+    assert ticks["agent1"] == [0, 2, 5]  # acts every 30 s = 3 ticks
+    assert ticks["agent2"] == [0]  # never again
+
+    # skipped time got accounted for, like when stepped every tick
+    assert state.getAgent("agent1").action_ticks == [2, 5]
+
+
+@enforce_types
+def test_scheduler_matches_polling():
+    s_betweens = [20, 30, 70]
+    sched_log: list = []
+    sched_state = _scheduledState(sched_log, s_betweens)
+    poll_log: list = []
+    poll_state = _scheduledState(poll_log, [None] * len(s_betweens))
+    for agent, s_between in zip(poll_state.agents.values(), s_betweens):
+        agent.s_between = s_between
+        agent.nextWakeTime = lambda state: None
+
+    _run(sched_state, 50)
+    _run(poll_state, 50)
+
+    assert len(sched_log) < len(poll_log)
+    for name in sched_state.agents:
+        sched_agent, poll_agent = sched_state.agents[name], poll_state.agents[name]
+        assert sched_agent.action_ticks == poll_agent.action_ticks
+        assert sched_agent.action_ticks
+
+
+@enforce_types
+def test_scheduler_keeps_agent_order():
+    log: list = []
+    state = _scheduledState(log, [20, None, 20])
+    _run(state, 3)
+    assert log == [
+        (0, "agent0"),
+        (0, "agent1"),
+        (0, "agent2"),
+        (1, "agent0"),
+        (1, "agent1"),
+        (1, "agent2"),
+        (2, "agent1"),
+    ]
+
+
+@enforce_types
+def test_scheduler_new_agents():
+    log: list = []
+    state = _scheduledState(log, [math.inf])
+    _run(state, 2)
+    assert log == [(0, "agent0")]
+
+    # a new agent is due on the next tick
+    state.addAgent(CountingAgent("agent1", math.inf, log))
+    _run(state, 2)
+    assert log == [(0, "agent0"), (2, "agent1")]
+
+    # replacing the dict of agents starts the schedule over
+    state.agents = dict(state.agents)
+    _run(state, 1)
+    assert log[-2:] == [(4, "agent0"), (4, "agent1")]
+
+
+@enforce_types
+def test_rng():
+    state1, state2 = _scheduledState([], []), _scheduledState([], [])
+    state1.rng.seed(3)
+    state2.rng.seed(3)
+    assert [state1.rng.random() for _ in range(3)] == [
+        state2.rng.random() for _ in range(3)
+    ]
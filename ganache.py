@@ -5,6 +5,8 @@ import os
 
 import eth_utils
 
+from util import constants
+from util.agentkeys import agentPrivateKeys
 from util.configutil import confFileValue
 
 # Argument parsing for hiding ganache.py in background
@@ -14,6 +16,12 @@ parser.add_argument(
     action="store_true",
     help="Run ganache on background for further use of current terminal.",
 )
+parser.add_argument(
+    "--n-agent-keys",
+    type=int,
+    default=constants.N_AGENT_KEYS,
+    help="# agent accounts to fund, after the 10 base ones. See util/agentkeys.py",
+)
 args = parser.parse_args()
 
 # Port in ganache_url must match ganache call
@@ -46,6 +54,10 @@ for private_key in [
 ]:
     ganache_command += f' --account="{private_key},{amount_wei}"'
 
+# add the agent accounts. EVM agents claim them, so they needn't be funded by tx
+for private_key in agentPrivateKeys(args.n_agent_keys):
+    ganache_command += f' --account="{private_key},{amount_wei}"'
+
 if args.run_in_background:
     os.system(ganache_command + "&")
 else:
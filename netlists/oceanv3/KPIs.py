@@ -1,9 +1,9 @@
-from typing import List
+from typing import List, Optional
 
 from enforce_typing import enforce_types
 
 from engine import KPIsBase
-from util import globaltokens
+from util import balanceledger, globaltokens, poolstate
 from util.base18 import fromBase18
 from util.plotutil import YParam, arrayToFloatList, LINEAR, MULT1, COUNT, DOLLAR
 
@@ -14,55 +14,96 @@ class KPIs(KPIsBase.KPIsBase):
 
 
 @enforce_types
-def get_OCEAN_in_DTs(state, agent) -> float:
+def readPools(state) -> List[tuple]:
+    """Read the state of all pools: one eth_call for the pools that changed
+
+    Args:
+        state: SimState -- SimState, holds all pool agents (& their pools)
+
+    Returns:
+        pool_reads: List[tuple] -- per pool: (pool_agent, DT price in OCEAN,
+          pool value in OCEAN, # BPTs)
+    """
+    pool_agents = list(state.agents.filterToPool().values())
+    poolstate.fill([pool_agent.pool_state for pool_agent in pool_agents])
+
+    pool_reads = []
+    for pool_agent in pool_agents:
+        price, DT_balance, OCEAN_balance, amt_pool_BPTs = _poolValues(pool_agent)
+        pool_value_DT = price * DT_balance
+        pool_value_OCEAN = OCEAN_balance
+        pool_value = pool_value_DT + pool_value_OCEAN
+        pool_reads.append((pool_agent, price, pool_value, amt_pool_BPTs))
+    return pool_reads
+
+
+@enforce_types
+def _poolValues(pool_agent) -> List[float]:
+    """DT price in OCEAN, DT balance, OCEAN balance, # BPTs"""
+    pool_state = pool_agent.pool_state
+    OCEAN_address = globaltokens.OCEAN_address()
+    values_base = [
+        pool_state.spotPrice(),
+        pool_state.balance(pool_agent.datatoken_address),
+        pool_state.balance(OCEAN_address),
+        pool_state.totalSupply(),
+    ]
+    return [fromBase18(value_base) for value_base in values_base]
+
+
+@enforce_types
+def prefetchBalances(agents: list, pool_reads: List[tuple]) -> None:
+    """Read the agents' OCEAN, DT and BPT balances that aren't known yet,
+    in one RPC batch. Then the per-agent reads cost no RPCs"""
+    tokens = [globaltokens.OCEANtoken()]
+    for pool_agent, _, _, _ in pool_reads:
+        tokens += [pool_agent._dt, pool_agent._pool]
+    balanceledger.prefetch(
+        [(token, agent.address) for agent in agents for token in tokens]
+    )
+
+
+@enforce_types
+def get_OCEAN_in_DTs(state, agent, pool_reads: Optional[list] = None) -> float:
     """Value of DT that this agent staked across all pools, denominated in OCEAN
 
     Args:
         state: SimState -- SimState, holds all pool agents (& their pools)
         agent:  AgentBase -- agent of interest
+        pool_reads: List[tuple] -- output of readPools(). Read if None
 
     Returns:
         value_held: float -- value staked, denominated in OCEAN
     """
-    OCEAN_address = globaltokens.OCEAN_address()
+    if pool_reads is None:
+        pool_reads = readPools(state)
     value_held = 0.0
 
-    for pool_agent in state.agents.filterToPool().values():
-        pool = pool_agent._pool
-        DT = pool_agent._dt
-        price = fromBase18(pool.getSpotPrice(OCEAN_address, DT.address))
-        amt_DT = agent.DT(DT)
+    for pool_agent, price, _, _ in pool_reads:
+        amt_DT = agent.DT(pool_agent._dt)
         value_held += amt_DT * price
 
     return value_held
 
 
 @enforce_types
-@enforce_types
-def get_OCEAN_in_BPTs(state, agent):
+def get_OCEAN_in_BPTs(state, agent, pool_reads: Optional[list] = None):
     """Value of BPTs that this agent owns across all pools, denominated in OCEAN
 
     Args:
         state: SimState -- SimState, holds all pool agents (& their pools)
         agent:  AgentBase -- agent of interest
+        pool_reads: List[tuple] -- output of readPools(). Read if None
 
     Returns:
         value_held: float -- value of BPTs, denominated in OCEAN
     """
-    OCEAN_address = globaltokens.OCEAN_address()
+    if pool_reads is None:
+        pool_reads = readPools(state)
     value_held = 0
 
-    for pool_agent in state.agents.filterToPool().values():
-        pool = pool_agent._pool
-        DT = pool_agent._dt
-
-        price = fromBase18(pool.getSpotPrice(OCEAN_address, DT.address))
-        pool_value_DT = price * fromBase18(pool.getBalance(DT.address))
-        pool_value_OCEAN = fromBase18(pool.getBalance(OCEAN_address))
-        pool_value = pool_value_DT + pool_value_OCEAN
-
-        amt_pool_BPTs = fromBase18(pool.totalSupply())
-        agent_percent_pool = agent.BPT(pool) / amt_pool_BPTs
+    for pool_agent, _, pool_value, amt_pool_BPTs in pool_reads:
+        agent_percent_pool = agent.BPT(pool_agent._pool) / amt_pool_BPTs
 
         value_held += agent_percent_pool * pool_value
 
@@ -86,7 +127,10 @@ def netlist_createLogData(state):
         "maliciousPublisher",
     ]
 
-    # tracking OCEAN
+    # tracking OCEAN. All agents share one read of the pools, and one of
+    # their balances
+    pool_reads = readPools(state)
+    prefetchBalances([state.getAgent(name) for name in agents_names], pool_reads)
     for name in agents_names:
         agent = state.getAgent(name)
 
@@ -96,19 +140,17 @@ def netlist_createLogData(state):
 
         # in DTs
         dataheader += [f"{name}_OCEAN_in_DTs"]
-        datarow += [get_OCEAN_in_DTs(state, agent)]
+        OCEAN_in_DTs = get_OCEAN_in_DTs(state, agent, pool_reads)
+        datarow += [OCEAN_in_DTs]
 
         # in BPTs
         dataheader += [f"{name}_OCEAN_in_BPTs"]
-        datarow += [get_OCEAN_in_BPTs(state, agent)]
+        OCEAN_in_BPTs = get_OCEAN_in_BPTs(state, agent, pool_reads)
+        datarow += [OCEAN_in_BPTs]
 
         # networth
         dataheader += [f"{name}_OCEAN_networth"]
-        datarow += [
-            agent.OCEAN()
-            + get_OCEAN_in_DTs(state, agent)
-            + get_OCEAN_in_BPTs(state, agent)
-        ]
+        datarow += [agent.OCEAN() + OCEAN_in_DTs + OCEAN_in_BPTs]
 
     pool_agents = state.agents.filterToPool()
     n_pools = len(pool_agents)
@@ -1,4 +1,4 @@
-from typing import Set, List
+from typing import List
 
 from enforce_typing import enforce_types
 
@@ -23,7 +23,7 @@ class SimState(SimStateBase.SimStateBase):
         ss = self.ss  # for convenience as we go forward
 
         # wire up the circuit
-        new_agents: Set[AgentBase.AgentBaseAbstract] = set()  # type:ignore
+        new_agents: List[AgentBase.AgentBaseAbstract] = []  # type:ignore
 
         pub_ss = PublisherStrategy(  # type:ignore
             DT_init=self.ss.publisher_DT_init,
@@ -35,7 +35,7 @@ class SimState(SimStateBase.SimStateBase):
             s_between_sellDT=self.ss.publisher_s_between_sellDT,
             is_malicious=False,
         )
-        new_agents.add(
+        new_agents.append(
             PublisherAgent(
                 name="publisher",
                 USD=0.0,
@@ -44,7 +44,7 @@ class SimState(SimStateBase.SimStateBase):
             )
         )
 
-        new_agents.add(
+        new_agents.append(
             DataconsumerAgent(
                 name="consumer",
                 USD=0.0,
@@ -54,7 +54,7 @@ class SimState(SimStateBase.SimStateBase):
             )
         )
 
-        new_agents.add(
+        new_agents.append(
             StakerspeculatorAgent(
                 name="stakerSpeculator",
                 USD=0.0,
@@ -63,7 +63,7 @@ class SimState(SimStateBase.SimStateBase):
             )
         )
 
-        new_agents.add(
+        new_agents.append(
             SpeculatorAgent(
                 name="speculator",
                 USD=0.0,
@@ -84,7 +84,7 @@ class SimState(SimStateBase.SimStateBase):
             s_wait_to_rug=self.ss.mal_s_wait_to_rug,
             s_rug_time=self.ss.mal_s_rug_time,
         )
-        new_agents.add(
+        new_agents.append(
             PublisherAgent(
                 name="maliciousPublisher",
                 USD=0.0,
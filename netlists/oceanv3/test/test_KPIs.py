@@ -3,9 +3,10 @@ from pytest import approx
 from enforce_typing import enforce_types
 
 from agents.PoolAgent import PoolAgent
-from util import globaltokens
+from engine.SimEngine import SimEngine
+from util import constants, globaltokens, shadowamm
 from util.base18 import fromBase18
-from .. import KPIs
+from .. import KPIs, netlist
 
 
 @enforce_types
@@ -94,3 +95,49 @@ def test_get_OCEAN_in_BPTs(alice_info):
     value_held = KPIs.get_OCEAN_in_BPTs(state, foo_agent)
 
     assert value_held == 1.0 * pool_value
+
+
+@enforce_types
+def test_readPools(alice_info):
+    state = MockSimState()
+
+    pool, DT = alice_info.pool, alice_info.DT
+    pool_agent = PoolAgent("pool_agent", pool)
+    state.agents["agent1"] = pool_agent
+
+    OCEAN_address = globaltokens.OCEAN_address()
+    price = fromBase18(pool.getSpotPrice(OCEAN_address, DT.address))
+    pool_value_DT = price * fromBase18(pool.getBalance(DT.address))
+    pool_value_OCEAN = fromBase18(pool.getBalance(OCEAN_address))
+    pool_value = pool_value_DT + pool_value_OCEAN
+
+    pool_reads = KPIs.readPools(state)
+    assert pool_reads == [
+        (pool_agent, price, pool_value, fromBase18(pool.totalSupply()))
+    ]
+
+
+@enforce_types
+def test_netlist_createLogData(monkeypatch):
+    """Values from the shared, prefetched pool_reads match per-agent reads"""
+    monkeypatch.setattr(constants, "POOL_BACKEND", "shadow")
+    shadowamm.reset()
+    ss = netlist.SimStrategy()
+    ss.setMaxTime(30, "days")
+    state = netlist.SimState(ss)
+    state.rng.seed(3)
+    engine = SimEngine(state, None)
+    while not engine.doStop():
+        engine.takeStep()
+        engine.advanceTick()
+
+    _, dataheader, datarow = KPIs.netlist_createLogData(state)
+    logged = dict(zip(dataheader, datarow))
+    assert logged["n_pools"] > 0
+    for name in ["publisher", "stakerSpeculator", "speculator"]:
+        agent = state.getAgent(name)
+        OCEAN_in_DTs = KPIs.get_OCEAN_in_DTs(state, agent)
+        OCEAN_in_BPTs = KPIs.get_OCEAN_in_BPTs(state, agent)
+        assert logged[f"{name}_OCEAN_in_DTs"] == approx(OCEAN_in_DTs)
+        assert logged[f"{name}_OCEAN_in_BPTs"] == approx(OCEAN_in_BPTs)
+    assert logged["publisher_OCEAN_in_BPTs"] > 0.0
@@ -1,5 +1,8 @@
 """simply test for scope"""
 import inspect
+
+from engine.SimEngine import SimEngine
+from util import constants, shadowamm
 from .. import netlist
 
 
@@ -12,3 +15,20 @@ def test1():
     assert inspect.isclass(netlist.KPIs)
     assert callable(netlist.netlist_createLogData)
     assert callable(netlist.netlist_plotInstructions)
+
+
+def test_shadowBackend(monkeypatch):
+    """Agents & KPIs run unchanged on shadow pools, with no EVM"""
+    monkeypatch.setattr(constants, "POOL_BACKEND", "shadow")
+    shadowamm.reset()
+    ss = netlist.SimStrategy()
+    ss.setMaxTime(30, "days")
+    state = netlist.SimState(ss)
+    state.rng.seed(3)
+
+    engine = SimEngine(state, None, netlist.netlist_createLogData)
+    assert not engine.use_evm
+    engine.run()
+
+    assert len(state.agents.filterToPool()) > 0
+    assert state.getAgent("consumer").OCEAN() != ss.consumer_init_OCEAN
@@ -1,11 +1,11 @@
-from typing import List
-import brownie
+from typing import List, Optional
 
 from enforce_typing import enforce_types
 
 from engine import KPIsBase
-from util import globaltokens
+from util import balanceledger, globaltokens, poolstate
 from util.base18 import fromBase18
+from util.multicall import MulticallBatch
 from util.plotutil import YParam, arrayToFloatList, LINEAR, MULT1, COUNT, DOLLAR
 
 
@@ -15,59 +15,94 @@ class KPIs(KPIsBase.KPIsBase):
 
 
 @enforce_types
-def get_OCEAN_in_DTs(state, agent) -> float:
+def readPools(state, batch: Optional[MulticallBatch] = None) -> List[tuple]:
+    """Read the state of all pools: one eth_call for the pools that changed
+    Args:
+        state: SimState -- SimState, holds all pool agents (& their pools)
+        batch: MulticallBatch -- other reads, to resolve in the 1st eth_call.
+          Their results are in batch.results after
+    Returns:
+        pool_reads: List[tuple] -- per pool: (pool_agent, DT price in OCEAN,
+          pool value in OCEAN, # BPTs)
+    """
+    pool_agents = list(state.agents.filterToPoolV4().values())
+    poolstate.fill([pool_agent.pool_state for pool_agent in pool_agents], batch)
+
+    pool_reads = []
+    for pool_agent in pool_agents:
+        price, DT_balance, OCEAN_balance, amt_pool_BPTs = _poolValues(pool_agent)
+        pool_value_DT = price * DT_balance
+        pool_value_OCEAN = OCEAN_balance
+        pool_value = pool_value_DT + pool_value_OCEAN
+        pool_reads.append((pool_agent, price, pool_value, amt_pool_BPTs))
+    return pool_reads
+
+
+@enforce_types
+def _poolValues(pool_agent) -> List[float]:
+    """DT price in OCEAN, DT balance, OCEAN balance, # BPTs"""
+    pool_state = pool_agent.pool_state
+    OCEAN_address = globaltokens.OCEAN_address()
+    values_base = [
+        pool_state.spotPrice(),
+        pool_state.balance(pool_agent.datatoken_address),
+        pool_state.balance(OCEAN_address),
+        pool_state.totalSupply(),
+    ]
+    return [fromBase18(value_base) for value_base in values_base]
+
+
+@enforce_types
+def prefetchBalances(agents: list, pool_reads: List[tuple]) -> None:
+    """Read the agents' OCEAN, DT and BPT balances that aren't known yet,
+    in one RPC batch. Then the per-agent reads cost no RPCs"""
+    tokens = [globaltokens.OCEANtoken()]
+    for pool_agent, _, _, _ in pool_reads:
+        tokens += [pool_agent._dt, pool_agent._pool]
+    balanceledger.prefetch(
+        [(token, agent.address) for agent in agents for token in tokens]
+    )
+
+
+@enforce_types
+def get_OCEAN_in_DTs(state, agent, pool_reads: Optional[list] = None) -> float:
     """Value of DT that this agent staked across all pools, denominated in OCEAN
     Args:
         state: SimState -- SimState, holds all pool agents (& their pools)
         agent:  AgentBase -- agent of interest
+        pool_reads: List[tuple] -- output of readPools(). Read if None
     Returns:
         value_held: float -- value staked, denominated in OCEAN
     """
-    OCEAN_address = globaltokens.OCEAN_address()
+    if pool_reads is None:
+        pool_reads = readPools(state)
     value_held = 0.0
 
-    for pool_agent in state.agents.filterToPoolV4().values():
-        pool = pool_agent._pool
-        DT = pool_agent._dt
-        swapFee = pool.getSwapFee()
-        price = fromBase18(pool.getSpotPrice(OCEAN_address, DT.address, swapFee))
-        amt_DT = agent.DT(DT)
+    for pool_agent, price, _, _ in pool_reads:
+        amt_DT = agent.DT(pool_agent._dt)
         value_held += amt_DT * price
 
     return value_held
 
 
 @enforce_types
-@enforce_types
-def get_OCEAN_in_BPTs(state, agent):
+def get_OCEAN_in_BPTs(state, agent, pool_reads: Optional[list] = None):
     """Value of BPTs that this agent owns across all pools, denominated in OCEAN
     Args:
         state: SimState -- SimState, holds all pool agents (& their pools)
         agent:  AgentBase -- agent of interest
+        pool_reads: List[tuple] -- output of readPools(). Read if None
     Returns:
         value_held: float -- value of BPTs, denominated in OCEAN
     """
-    OCEAN_address = globaltokens.OCEAN_address()
+    if pool_reads is None:
+        pool_reads = readPools(state)
     value_held = 0
 
-    for pool_agent in state.agents.filterToPoolV4().values():
-        pool = pool_agent._pool
-        DT = pool_agent._dt
-
-        swapFee = pool.getSwapFee()
-        price = fromBase18(pool.getSpotPrice(OCEAN_address, DT.address, swapFee))
-        pool_value_DT = price * fromBase18(pool.getBalance(DT.address))
-        pool_value_OCEAN = fromBase18(pool.getBalance(OCEAN_address))
-        pool_value = pool_value_DT + pool_value_OCEAN
-
-        amt_pool_BPTs = fromBase18(
-            pool.totalSupply()
-        )  # from BPool, inheriting from BToken
-        agent_percent_pool = agent.BPT(pool) / amt_pool_BPTs
+    for pool_agent, _, pool_value, amt_pool_BPTs in pool_reads:
+        agent_percent_pool = agent.BPT(pool_agent._pool) / amt_pool_BPTs
 
         value_held += agent_percent_pool * pool_value
-        # import ipdb
-        # ipdb.set_trace()
 
     return value_held
 
@@ -90,9 +125,24 @@ def netlist_createLogData(state):  # pylint: disable=too-many-statements
         # "maliciousPublisher"
         # "erc721"
     ]
-    # tracking OCEAN
-    OCEANtoken = globaltokens.OCEANtoken()
-    OCEAN_address = globaltokens.OCEAN_address()
+    # pool0 reads: see "Track pool0" below. They go in the same eth_call
+    # as the pools' swap fees. All agents share one read of the pools
+    pool_agents = state.agents.filterToPoolV4()
+    pool0_reads = MulticallBatch()
+    if any(pool_agents.values()):
+        poolAgent_0 = list(pool_agents.values())[0]
+        pool0 = poolAgent_0._pool
+        DT = poolAgent_0._dt
+        oneSSContractAddress = poolAgent_0.controller_address
+        OCEANtoken = globaltokens.OCEANtoken()
+        pool0_reads.add(DT, "balanceOf", pool0.address)
+        pool0_reads.add(DT, "balanceOf", oneSSContractAddress)
+        pool0_reads.add(pool0, "balanceOf", oneSSContractAddress)
+        pool0_reads.add(OCEANtoken, "balanceOf", pool0.address)
+    pool_reads = readPools(state, pool0_reads)
+
+    # tracking OCEAN. All agents' balances get read in one RPC batch
+    prefetchBalances([state.getAgent(name) for name in agents_names], pool_reads)
     for name in agents_names:
         agent = state.getAgent(name)
 
@@ -102,30 +152,26 @@ def netlist_createLogData(state):  # pylint: disable=too-many-statements
 
         # in DTs
         dataheader += [f"{name}_OCEAN_in_DTs"]
-        datarow += [get_OCEAN_in_DTs(state, agent)]
+        OCEAN_in_DTs = get_OCEAN_in_DTs(state, agent, pool_reads)
+        datarow += [OCEAN_in_DTs]
 
         # in BPTs
         dataheader += [f"{name}_OCEAN_in_BPTs"]
-        datarow += [get_OCEAN_in_BPTs(state, agent)]
+        OCEAN_in_BPTs = get_OCEAN_in_BPTs(state, agent, pool_reads)
+        datarow += [OCEAN_in_BPTs]
 
         # networth
         dataheader += [f"{name}_OCEAN_networth"]
-        datarow += [
-            agent.OCEAN()
-            + get_OCEAN_in_DTs(state, agent)
-            + get_OCEAN_in_BPTs(state, agent)
-        ]
+        datarow += [agent.OCEAN() + OCEAN_in_DTs + OCEAN_in_BPTs]
 
         dataheader += [f"DT_{name}"]
         dataheader += [f"BPT_{name}"]
 
         # Tracking DT and BPT balances of agents
-        if any(state.agents.filterToPoolV4().values()):
-            poolAgent_0 = list(state.agents.filterToPoolV4().values())[0]
-            DT = poolAgent_0._dt
+        if any(pool_agents.values()):
             amt_DT = agent.DT(DT)
             datarow += [amt_DT]
-            datarow += [agent.BPT(poolAgent_0._pool)]  # agent.BPT(pool)
+            datarow += [agent.BPT(pool0)]  # agent.BPT(pool)
         else:
             datarow += [0, 0]
 
@@ -142,25 +188,19 @@ def netlist_createLogData(state):  # pylint: disable=too-many-statements
     dataheader += ["BPT_1ss_contract"]
     dataheader += ["DT_price"]
     dataheader += ["pool_OCEAN"]
-    if any(state.agents.filterToPoolV4().values()):
-        poolAgent_0 = list(state.agents.filterToPoolV4().values())[0]
-        pool0 = poolAgent_0._pool
-        DT = poolAgent_0._dt
-        oneSSContractAddress = pool0.getController()
-
-        datarow += [fromBase18(DT.balanceOf(pool0.address))]  # 1
-        datarow += [fromBase18(DT.balanceOf(oneSSContractAddress))]  # 2
-        datarow += [fromBase18(pool0.totalSupply())]  # 3
-        datarow += [fromBase18(pool0.balanceOf(oneSSContractAddress))]  # 4
-        swapFee = pool0.getSwapFee()
-        datarow += [
-            fromBase18(pool0.getSpotPrice(OCEAN_address, DT.address, swapFee))
-        ]  # 5
-        datarow += [fromBase18(OCEANtoken.balanceOf(pool0.address))]
+    if any(pool_agents.values()):
+        DT_pool, DT_1ss, BPT_1ss, pool_OCEAN = pool0_reads.results[:4]
+        _, price0, _, BPT_total0 = pool_reads[0]
+
+        datarow += [fromBase18(DT_pool)]  # 1
+        datarow += [fromBase18(DT_1ss)]  # 2
+        datarow += [BPT_total0]  # 3
+        datarow += [fromBase18(BPT_1ss)]  # 4
+        datarow += [price0]  # 5
+        datarow += [fromBase18(pool_OCEAN)]
     else:
         datarow += [0, 0, 0, 0, 0, 0]
 
-    pool_agents = state.agents.filterToPoolV4()
     n_pools = len(pool_agents)
     s += [f"; # pools={n_pools}"]
     dataheader += ["n_pools"]
@@ -169,7 +209,9 @@ def netlist_createLogData(state):  # pylint: disable=too-many-statements
     rugged_pool = state.rugged_pools
     n_rugged = len(rugged_pool)
     # s += [f"; # rugged pools={n_rugged}"]
-    s += [f"; # block height={brownie.chain.height}"]
+    from brownie.network import chain  # pylint: disable=import-outside-toplevel
+
+    s += [f"; # block height={chain.height}"]
     dataheader += ["n_rugged"]
     datarow += [n_rugged]
 
@@ -241,7 +283,7 @@ def netlist_plotInstructions(header: List[str], values):
                 "DT_consumer",
                 "DT_stakerSpeculator",
                 "DT_speculator",
-                "DT_buySellRobot"
+                "DT_buySellRobot",
                 # "DT_maliciousPublisher"
             ],
             [
@@ -1,4 +1,4 @@
-from typing import Set, List
+from typing import List
 
 from enforce_typing import enforce_types
 
@@ -25,7 +25,7 @@ class SimState(SimStateBase.SimStateBase):
         ss = self.ss  # for convenience as we go forward
 
         # wire up the circuit
-        new_agents: Set[AgentBase.AgentBaseAbstract] = set()  # type:ignore
+        new_agents: List[AgentBase.AgentBaseAbstract] = []  # type:ignore
 
         pub_ss = PublisherStrategyV4(
             DT_cap=self.ss.publisher_DT_cap,
@@ -37,7 +37,7 @@ class SimState(SimStateBase.SimStateBase):
             s_between_sellDT=self.ss.publisher_s_between_sellDT,
             is_malicious=False,
         )
-        new_agents.add(
+        new_agents.append(
             PublisherAgentV4(
                 name="publisher",
                 USD=0.0,
@@ -56,7 +56,7 @@ class SimState(SimStateBase.SimStateBase):
         #     s_wait_to_rug=self.ss.mal_s_wait_to_rug,
         #     s_rug_time=self.ss.mal_s_rug_time,
         # )
-        # new_agents.add(
+        # new_agents.append(
         #     PublisherAgentV4(
         #         name="maliciousPublisher",
         #         USD=0.0,
@@ -65,7 +65,7 @@ class SimState(SimStateBase.SimStateBase):
         #     )
         # )
 
-        # new_agents.add(
+        # new_agents.append(
         #     DataconsumerAgentV4(
         #         name="consumer",
         #         USD=0.0,
@@ -75,7 +75,7 @@ class SimState(SimStateBase.SimStateBase):
         #     )
         # )
 
-        new_agents.add(
+        new_agents.append(
             StakerspeculatorAgentV4(
                 name="stakerSpeculator",
                 USD=0.0,
@@ -84,7 +84,7 @@ class SimState(SimStateBase.SimStateBase):
             )
         )
 
-        new_agents.add(
+        new_agents.append(
             SpeculatorAgentV4(
                 name="speculator",
                 USD=0.0,
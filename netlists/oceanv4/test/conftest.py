@@ -0,0 +1 @@
+from agents.test.conftest import *  # pylint: disable=wildcard-import, W0614
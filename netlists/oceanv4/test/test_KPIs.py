@@ -0,0 +1,28 @@
+from pytest import approx
+
+from enforce_typing import enforce_types
+
+from engine.SimEngine import SimEngine
+from .. import KPIs, netlist
+
+
+@enforce_types
+def test_netlist_createLogData():
+    """Values from the shared, prefetched pool_reads match per-agent reads"""
+    ss = netlist.SimStrategy()
+    ss.setMaxTicks(20)
+    state = netlist.SimState(ss)
+    engine = SimEngine(state, None)
+    while not engine.doStop():
+        engine.takeStep()
+        engine.advanceTick()
+
+    _, dataheader, datarow = KPIs.netlist_createLogData(state)
+    logged = dict(zip(dataheader, datarow))
+    assert len(dataheader) == len(datarow)
+    for name in ["publisher", "stakerSpeculator", "speculator"]:
+        agent = state.getAgent(name)
+        OCEAN_in_DTs = KPIs.get_OCEAN_in_DTs(state, agent)
+        OCEAN_in_BPTs = KPIs.get_OCEAN_in_BPTs(state, agent)
+        assert logged[f"{name}_OCEAN_in_DTs"] == approx(OCEAN_in_DTs)
+        assert logged[f"{name}_OCEAN_in_BPTs"] == approx(OCEAN_in_BPTs)
@@ -6,7 +6,7 @@ from enforce_typing import enforce_types
 from agents.VestingBeneficiaryAgent import VestingBeneficiaryAgent
 from agents.VestingFunderAgent import VestingFunderAgent
 from engine import KPIsBase, SimStateBase, SimStrategyBase
-from util.constants import S_PER_MONTH, S_PER_YEAR
+from util.constants import S_PER_MONTH, S_PER_YEAR, connectToChain
 from util.globaltokens import OCEAN_address
 from util.plotutil import YParam, arrayToFloatList, LINEAR, MULT1, DOLLAR
 
@@ -24,6 +24,7 @@ class SimStrategy(SimStrategyBase.SimStrategyBase):
         self.setLogInterval(3 * S_PER_MONTH)
 
         # ==attributes specific to this netlist
+        connectToChain()  # need chain time below
         self.OCEAN_funded: float = 5.0  # type:ignore
         self.start_timestamp: int = chain[-1].timestamp + S_PER_YEAR  # type:ignore
         self.duration_seconds: int = 5 * S_PER_YEAR  # type:ignore
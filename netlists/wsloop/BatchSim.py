@@ -0,0 +1,672 @@
+"""
+Batch simulator for wsloop: run many SimStrategies in lockstep, with
+numpy arrays of one element per SimStrategy ("config") in place of each
+agent's floats.
+
+It mirrors what SimEngine does with SimState, agent by agent and in the
+same order, so each config's logged values match a SimEngine run of that
+config, within float tolerance. Configs may differ in the SimStrategy
+attributes of SWEEPABLE_ATTRS. They must share time_step, max_ticks and
+log_interval, since they step in lockstep. Any other attribute must keep
+its default: BatchSim doesn't read it, so it would be silently ignored.
+canBatch() tells; if not, run the configs with SimEngine instead.
+
+Its agents are wired like SimState's, as listed in AGENTS and ROUTES. Each
+BatchSim checks that against a SimState, so a change there can't diverge
+silently. Agent settings that don't come from the SimStrategy (initial
+sales per marketplace, grant counts and schedules, the mint func and
+schedule) get read from that SimState.
+
+Memory per config is about 20 floats per tick. runBatch() splits big
+batches into chunks to cap it.
+"""
+
+import math
+from typing import List, Tuple
+
+from enforce_typing import enforce_types
+import numpy
+
+from agents.RouterAgent import RouterAgent
+from util.constants import (
+    INF,
+    S_PER_MIN,
+    S_PER_HOUR,
+    S_PER_DAY,
+    S_PER_MONTH,
+    S_PER_YEAR,
+)
+from .SimState import SimState
+from .SimStrategy import SimStrategy
+
+# magic number: max # configs to step at once. Bounds memory
+DEFAULT_CHUNK_SIZE = 1000
+
+# SimStrategy attributes that may differ between configs. BatchSim reads
+# each into an array of one value per config
+SWEEPABLE_ATTRS = [
+    "_percent_consume_sales_for_network",
+    "_percent_swap_sales_for_network",
+    "_swap_to_consume_sales_ratio",
+    "init_n_marketplaces",
+    "_percent_burn",
+    "_p_s_ratio",
+    "_init_speculation_valuation",
+    "_percent_increase_speculation_valuation_per_s",
+    "growth_rate_if_0_sales",
+    "max_growth_rate",
+    "tau",
+    "INIT_OCEAN_SUPPLY",
+    "UNMINTED_OCEAN_SUPPLY",
+    "OPF_TREASURY_USD",
+    "OPF_TREASURY_OCEAN_FOR_OCEAN_DAO",
+    "OPF_TREASURY_OCEAN_FOR_OPF_MGMT",
+    "BDB_TREASURY_USD",
+    "BDB_TREASURY_OCEAN",
+]
+
+# SimStrategy attributes that configs must share, to step in lockstep
+LOCKSTEP_ATTRS = ["time_step", "max_ticks", "log_interval"]
+
+# (name, class name) of SimState's agents, in the order they step
+AGENTS = [
+    ("marketplaces1", "MarketplacesAgent"),
+    ("opc_address", "RouterAgent"),
+    ("opc_burner", "OCEANBurnerAgent"),
+    ("ocean_51", "OCEANFuncMinterAgent"),
+    ("opf_treasury_for_ocean_dao", "GrantGivingAgent"),
+    ("opf_treasury_for_opf_mgmt", "GrantGivingAgent"),
+    ("bdb_treasury", "GrantGivingAgent"),
+    ("ocean_dao", "RouterAgent"),
+    ("opf_mgmt", "RouterAgent"),
+    ("bdb_mgmt", "RouterAgent"),
+    ("opc_workers", "GrantTakingAgent"),
+    ("bdb_workers", "GrantTakingAgent"),
+]
+
+# router name : names of the agents it disburses to
+ROUTES = {
+    "opc_address": ["ocean_dao", "opc_burner"],
+    "ocean_dao": ["opc_workers"],
+    "opf_mgmt": ["opc_workers"],
+    "bdb_mgmt": ["bdb_workers"],
+}
+
+
+@enforce_types
+def runBatch(
+    ss_list: list, chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Tuple[List[str], numpy.ndarray]:
+    """
+    Run every SimStrategy in ss_list, like SimEngine would.
+    Returns (header, values). values is a 3d array [config_i, row_i, col_i]
+    holding what SimEngine logs, one row per log_interval.
+    """
+    assert chunk_size > 0
+    header = None
+    chunks_values = []
+    for start in range(0, len(ss_list), chunk_size):
+        sim = BatchSim(ss_list[start : start + chunk_size])
+        header, chunk_values = sim.run()
+        chunks_values.append(chunk_values)
+    return header, numpy.concatenate(chunks_values)
+
+
+@enforce_types
+def unsupportedAttrs(ss_list: list) -> List[str]:
+    """Names of the attributes that some SimStrategy of ss_list sets to
+    other than its default, and that BatchSim would ignore"""
+    default = vars(SimStrategy())
+    supported = set(SWEEPABLE_ATTRS + LOCKSTEP_ATTRS)
+    names = set()
+    for ss in ss_list:
+        for name, value in vars(ss).items():
+            if name not in supported and (
+                name not in default or value != default[name]
+            ):
+                names.add(name)
+    return sorted(names)
+
+
+@enforce_types
+def canBatch(ss_list: list) -> bool:
+    """Would BatchSim run the SimStrategies of ss_list like SimEngine?
+    Ignores LOCKSTEP_ATTRS: runBatch() needs them equal, sweeps group by them"""
+    if any(type(ss) is not SimStrategy for ss in ss_list):
+        return False  # eg overrides methods that BatchSim mirrors
+    return not unsupportedAttrs(ss_list)
+
+
+@enforce_types
+class BatchSim:  # pylint: disable=too-many-instance-attributes
+    """
+    Steps K wsloop configs at once. Each attribute that SimState or its
+    agents hold as a float is held here as an array of K floats.
+    """
+
+    def __init__(self, ss_list: list):
+        assert ss_list, "need at least one SimStrategy"
+        ss0 = ss_list[0]
+        for ss in ss_list:
+            assert type(ss) is SimStrategy, f"can't batch a {type(ss).__name__}"
+            assert ss.time_step == ss0.time_step, "time_step must match"
+            assert ss.max_ticks == ss0.max_ticks, "max_ticks must match"
+            assert ss.log_interval == ss0.log_interval, "log_interval must match"
+        unsupported = unsupportedAttrs(ss_list)
+        assert not unsupported, f"BatchSim would ignore {unsupported}"
+        self.ss_list = ss_list
+        self.time_step: int = ss0.time_step
+        self.max_ticks = ss0.max_ticks
+        self.log_interval: int = ss0.log_interval
+        self.tick = 0
+
+        def param(attr_name: str) -> numpy.ndarray:
+            return numpy.array([float(getattr(ss, attr_name)) for ss in ss_list])
+
+        # ss params
+        self._percent_consume_sales_for_network = param(
+            "_percent_consume_sales_for_network"
+        )
+        self._percent_swap_sales_for_network = param("_percent_swap_sales_for_network")
+        self._swap_to_consume_sales_ratio = param("_swap_to_consume_sales_ratio")
+        self._percent_burn = param("_percent_burn")
+        self._p_s_ratio = param("_p_s_ratio")
+        self._percent_increase_speculation_valuation_per_s = param(
+            "_percent_increase_speculation_valuation_per_s"
+        )
+        self.growth_rate_if_0_sales = param("growth_rate_if_0_sales")
+        self.max_growth_rate = param("max_growth_rate")
+        self.tau = param("tau")
+        self.INIT_OCEAN_SUPPLY = param("INIT_OCEAN_SUPPLY")
+
+        # SimState
+        K = len(ss_list)
+        self._total_OCEAN_minted = numpy.zeros(K)
+        self._total_OCEAN_burned = numpy.zeros(K)
+        self._total_OCEAN_burned_USD = numpy.zeros(K)
+        self._speculation_valuation = param("_init_speculation_valuation")
+
+        # agents. Same names, wiring and initial values as in SimState
+        state0 = SimState(ss0)
+        self._checkWiring(state0)
+        # pylint: disable=protected-access
+        mkts = state0.getAgent("marketplaces1")
+        self._n_marketplaces = param("init_n_marketplaces")
+        self._consume_sales_per_marketplace_per_s = numpy.full(
+            K, mkts.consumeSalesPerMarketplacePerSecond()
+        )
+
+        # wallets: agent name : USD or OCEAN of each config
+        self.USD = {
+            name: numpy.zeros(K)
+            for name in [
+                "opc_address",
+                "opc_burner",
+                "opf_treasury_for_ocean_dao",
+                "ocean_dao",
+                "opf_mgmt",
+                "bdb_mgmt",
+                "opc_workers",
+                "bdb_workers",
+            ]
+        }
+        self.USD["opf_treasury_for_opf_mgmt"] = param("OPF_TREASURY_USD")
+        self.USD["bdb_treasury"] = param("BDB_TREASURY_USD")
+        self.OCEAN = {name: numpy.zeros(K) for name in self.USD}
+        self.OCEAN["opf_treasury_for_ocean_dao"] = param(
+            "OPF_TREASURY_OCEAN_FOR_OCEAN_DAO"
+        )
+        self.OCEAN["opf_treasury_for_opf_mgmt"] = param(
+            "OPF_TREASURY_OCEAN_FOR_OPF_MGMT"
+        )
+        self.OCEAN["bdb_treasury"] = param("BDB_TREASURY_OCEAN")
+
+        # name : (receiving agent name, # grants, s between grants)
+        self._grants = {
+            name: (
+                state0.getAgent(name)._receiving_agent_name,
+                state0.getAgent(name)._n_actions,
+                state0.getAgent(name)._s_between_grants,
+            )
+            for name, class_name in AGENTS
+            if class_name == "GrantGivingAgent"
+        }
+        self._USD_per_grant = {
+            name: self.USD[name] / float(n_actions)
+            for name, (_, n_actions, _) in self._grants.items()
+        }
+        self._OCEAN_per_grant = {
+            name: self.OCEAN[name] / float(n_actions)
+            for name, (_, n_actions, _) in self._grants.items()
+        }
+        self._tick_last_grant = None  # same schedule for all grant givers
+        self._s_between_grants = state0.getAgent("bdb_treasury")._s_between_grants
+
+        minter = state0.getAgent("ocean_51")
+        self._mint_func = minter._func
+        self._mint_receiver: str = minter._receiving_agent_name
+        self._total_OCEAN_to_mint = param("UNMINTED_OCEAN_SUPPLY")
+        self._OCEAN_left_to_mint = self._total_OCEAN_to_mint.copy()
+        self._s_between_mints: int = minter._s_between_mints
+        self._tick_previous_mint = None
+
+        self._spent_at_tick = {
+            "opc_workers": numpy.zeros(K),
+            "bdb_workers": numpy.zeros(K),
+        }
+
+        # KPIs. Room for every tick of the run
+        n = math.ceil(self.max_ticks) + 1
+        self._granttakers_revenue_per_tick__per_tick = _BatchSeries(n, K)
+        self._onemkt_consume_sales_per_s__per_tick = _BatchSeries(n, K)
+        self._allmkts_consume_sales_per_s__per_tick = _BatchSeries(n, K)
+        self._network_revenue_per_s__per_tick = _BatchSeries(n, K)
+        self._total_OCEAN_minted__per_tick = _BatchSeries(n, K)
+        self._total_OCEAN_burned__per_tick = _BatchSeries(n, K)
+        self._total_OCEAN_minted_USD__per_tick = _BatchSeries(n, K)
+        self._total_OCEAN_burned_USD__per_tick = _BatchSeries(n, K)
+
+        # ocean_dao's RouterAgent._USD_per_tick, _OCEAN_per_tick
+        self._dao_USD_per_tick = _BatchSeries(n, K)
+        self._dao_OCEAN_per_tick = _BatchSeries(n, K)
+
+    def _checkWiring(self, state) -> None:
+        """Assert that state, a SimState, is wired like this BatchSim"""
+        agents = [(name, type(agent).__name__) for name, agent in state.agents.items()]
+        assert agents == AGENTS, f"SimState's agents changed: {agents}"
+        for name, agent in state.agents.items():
+            if isinstance(agent, RouterAgent):
+                receivers = list(agent.receivingAgents().keys())
+                assert receivers == ROUTES[name], f"{name} routes to {receivers}"
+        # pylint: disable=protected-access
+        mkts = state.getAgent("marketplaces1")
+        assert mkts._toll_agent_name == "opc_address", mkts._toll_agent_name
+        grant_intervals = {
+            state.getAgent(name)._s_between_grants
+            for name, class_name in AGENTS
+            if class_name == "GrantGivingAgent"
+        }
+        assert len(grant_intervals) == 1, "grant givers must share a schedule"
+
+    def run(self) -> Tuple[List[str], numpy.ndarray]:
+        """Run all configs to max_ticks, like SimEngine.run().
+        Returns (header, values [config_i, row_i, col_i])"""
+        header = None
+        rows = []
+        while True:
+            if (self.tick * self.time_step) % self.log_interval == 0:
+                header, row = self.createLogData()
+                rows.append(row)
+            self.takeStep()
+            if self.tick >= self.max_ticks:
+                break
+            self.tick += 1
+        return header, numpy.stack(rows, axis=1)
+
+    def takeStep(self) -> None:
+        """One tick of SimState.takeStep(), for all configs"""
+        self._stepMarketplaces()
+        self._stepRouter(
+            "opc_address",
+            {"ocean_dao": 1.0 - self._percent_burn, "opc_burner": self._percent_burn},
+        )
+        self._stepBurner()
+        self._stepMinter()
+        self._stepGrantGivers()
+        self._stepRouter("ocean_dao", {"opc_workers": 1.0})
+        self._stepRouter("opf_mgmt", {"opc_workers": 1.0})
+        self._stepRouter("bdb_mgmt", {"bdb_workers": 1.0})
+        self._stepGrantTaker("opc_workers")
+        self._stepGrantTaker("bdb_workers")
+        self._stepKPIs()
+
+        self._speculation_valuation = self._speculation_valuation * (
+            1.0 + self._percent_increase_speculation_valuation_per_s * self.time_step
+        )
+
+    # ==============================================================
+    # agents
+    def _stepMarketplaces(self) -> None:
+        ratio = self.mktsRNDToSalesRatio()
+        mkts_growth_rate_per_year = self.annualMktsGrowthRate(ratio)
+        ticks_per_year = S_PER_YEAR / float(self.time_step)
+        mkts_growth_rate_per_tick = (
+            numpy.power(mkts_growth_rate_per_year + 1, 1.0 / ticks_per_year) - 1.0
+        )
+
+        self._n_marketplaces = self._n_marketplaces * (1.0 + mkts_growth_rate_per_tick)
+        self._consume_sales_per_marketplace_per_s = (
+            self._consume_sales_per_marketplace_per_s
+            * (1.0 + mkts_growth_rate_per_tick)
+        )
+
+        consume_sales = (
+            self._n_marketplaces
+            * self._consume_sales_per_marketplace_per_s
+            * self.time_step
+        )
+        self.USD["opc_address"] += self.networkRevenue(consume_sales)
+
+    def _stepRouter(self, name: str, percents: dict) -> None:
+        if name == "ocean_dao":
+            self._dao_USD_per_tick.append(self.USD[name])
+            self._dao_OCEAN_per_tick.append(self.OCEAN[name])
+
+        for balances in [self.USD, self.OCEAN]:
+            amt = balances[name].copy()  # disburse it all
+            for receiving_name, percent in percents.items():
+                self._transfer(balances, name, receiving_name, percent * amt)
+
+    def _stepBurner(self) -> None:
+        # 0 USD spends 0 per loop. So no need to mask configs with 0 USD
+        USD_spend_per_loop = self.USD["opc_burner"] / 10.0
+        overall_valuation = self.overallValuation()
+        for _ in range(10):
+            price = overall_valuation / self.OCEANsupply()
+            self._total_OCEAN_burned += USD_spend_per_loop / price
+            self._total_OCEAN_burned_USD += USD_spend_per_loop
+        self.USD["opc_burner"] = numpy.zeros_like(self.USD["opc_burner"])  # spent
+
+    def _stepMinter(self) -> None:
+        if self.tick == 0:
+            return
+        if self._tick_previous_mint is not None:
+            n_s_since = (self.tick - self._tick_previous_mint) * self.time_step
+            if n_s_since < self._s_between_mints:
+                return
+        do_mint = self._OCEAN_left_to_mint != 0.0
+        if not do_mint.any():
+            return
+
+        t = self.tick * self.time_step / S_PER_YEAR
+        if self._tick_previous_mint is None:
+            tprev = 0.0
+        else:
+            tprev = self._tick_previous_mint * self.time_step / float(S_PER_YEAR)
+        percent_to_mint = self._mint_func(t) - self._mint_func(tprev)
+
+        OCEAN = percent_to_mint * self._total_OCEAN_to_mint
+        if not self._mint_func.keepMinting(t):
+            OCEAN = self._OCEAN_left_to_mint
+        OCEAN = numpy.minimum(OCEAN, self._OCEAN_left_to_mint)
+        OCEAN = numpy.where(do_mint, OCEAN, 0.0)
+
+        self._total_OCEAN_minted += OCEAN
+        self.OCEAN[self._mint_receiver] += OCEAN
+        self._tick_previous_mint = self.tick
+        self._OCEAN_left_to_mint = self._OCEAN_left_to_mint - OCEAN
+
+    def _stepGrantGivers(self) -> None:
+        if self._tick_last_grant is not None:
+            n_s_since = (self.tick - self._tick_last_grant) * self.time_step
+            if n_s_since < self._s_between_grants:
+                return
+        for name, (receiving_name, _, _) in self._grants.items():
+            USD = numpy.minimum(self.USD[name], self._USD_per_grant[name])
+            self._transfer(self.USD, name, receiving_name, USD)
+            OCEAN = numpy.minimum(self.OCEAN[name], self._OCEAN_per_grant[name])
+            self._transfer(self.OCEAN, name, receiving_name, OCEAN)
+        self._tick_last_grant = self.tick
+
+    def _stepGrantTaker(self, name: str) -> None:
+        self._spent_at_tick[name] = (
+            self.USD[name] + self.OCEAN[name] * self.OCEANprice()
+        )
+
+        # spend it all, as soon as agent has it
+        self.USD[name] = numpy.zeros_like(self.USD[name])
+        self.OCEAN[name] = numpy.zeros_like(self.OCEAN[name])
+
+    @staticmethod
+    def _transfer(
+        balances: dict, name: str, receiving_name: str, amt: numpy.ndarray
+    ) -> None:
+        balances[name] = _withdraw(balances[name], amt)
+        balances[receiving_name] = balances[receiving_name] + amt
+
+    # ==============================================================
+    # KPIs
+    def _stepKPIs(self) -> None:
+        self._granttakers_revenue_per_tick__per_tick.append(
+            self._spent_at_tick["opc_workers"] + self._spent_at_tick["bdb_workers"]
+        )
+
+        consume1 = self._consume_sales_per_marketplace_per_s
+        consumeN = self._n_marketplaces * consume1
+        self._onemkt_consume_sales_per_s__per_tick.append(consume1)
+        self._allmkts_consume_sales_per_s__per_tick.append(consumeN)
+        self._network_revenue_per_s__per_tick.append(self.networkRevenue(consumeN))
+
+        self._total_OCEAN_minted__per_tick.append(self._total_OCEAN_minted)
+        self._total_OCEAN_burned__per_tick.append(self._total_OCEAN_burned)
+
+        # like KPIs.takeStep(): price sees the tick's new revenue
+        O_price = self.OCEANprice()
+        self._total_OCEAN_minted_USD__per_tick.append(
+            self._total_OCEAN_minted * O_price
+        )
+        self._total_OCEAN_burned_USD__per_tick.append(self._total_OCEAN_burned_USD)
+
+    def mktsRNDToSalesRatio(self) -> numpy.ndarray:
+        monthly_RND = self.grantTakersMonthlyRevenueNow()
+        monthly_sales = self._overInterval(
+            self._network_revenue_per_s__per_tick, S_PER_MONTH, 0
+        )
+        ratio = numpy.zeros_like(monthly_RND)
+        numpy.divide(monthly_RND, monthly_sales, out=ratio, where=monthly_RND != 0.0)
+        return ratio
+
+    def grantTakersMonthlyRevenueNow(self) -> numpy.ndarray:
+        rev_per_tick = self._granttakers_revenue_per_tick__per_tick
+        return rev_per_tick.sumOverTicks(
+            len(rev_per_tick) - self._ticksOneMonth(), len(rev_per_tick)
+        )
+
+    def _overInterval(self, series, s_interval: int, s_ago: int) -> numpy.ndarray:
+        """Like KPIs' xOverInterval(t1, t2), with t2 = now - s_ago and
+        t1 = t2 - s_interval. 'now' is the # ticks in the series so far"""
+        t2 = len(series) * self.time_step - s_ago
+        return series.sumOverInterval(t2 - s_interval, t2, self.time_step)
+
+    def _OCEANchangePrevMonth(self, O_per_tick) -> numpy.ndarray:
+        ticks_total = len(O_per_tick)
+        if ticks_total == 0:
+            return numpy.zeros(len(self.ss_list))
+        ticks_1mo = self._ticksOneMonth()
+        if ticks_total <= ticks_1mo:
+            return O_per_tick.valueAt(-1)
+        return O_per_tick.valueAt(-1) - O_per_tick.valueAt(-(ticks_1mo + 1))
+
+    def _ticksOneMonth(self) -> int:
+        return math.ceil(S_PER_MONTH / float(self.time_step))
+
+    def _daoMonthly(self, per_tick) -> numpy.ndarray:
+        """Like RouterAgent.monthlyUSDreceived()"""
+        t1 = self.tick * self.time_step - S_PER_MONTH
+        tick1 = 0 if t1 < 0 else int(math.floor(t1 / float(self.time_step)))
+        return per_tick.sumOverTicks(tick1, self.tick + 1)
+
+    # ==============================================================
+    # SimStrategy & SimState
+    def networkRevenue(self, consume_sales: numpy.ndarray) -> numpy.ndarray:
+        swap_sales = self._swap_to_consume_sales_ratio * consume_sales
+        return (
+            self._percent_consume_sales_for_network * consume_sales
+            + self._percent_swap_sales_for_network * swap_sales
+        )
+
+    def totalSales(self, consume_sales: numpy.ndarray) -> numpy.ndarray:
+        return consume_sales + self._swap_to_consume_sales_ratio * consume_sales
+
+    def annualMktsGrowthRate(self, ratio_RND_to_sales: numpy.ndarray) -> numpy.ndarray:
+        mult = self.max_growth_rate - self.growth_rate_if_0_sales
+        return self.growth_rate_if_0_sales + mult * (
+            1.0 - numpy.power(0.5, ratio_RND_to_sales / self.tau)
+        )
+
+    def fundamentalsValuation(self) -> numpy.ndarray:
+        annual_revenue = self._overInterval(
+            self._network_revenue_per_s__per_tick, S_PER_YEAR, 0
+        )
+        return annual_revenue * self._p_s_ratio
+
+    def overallValuation(self) -> numpy.ndarray:
+        v = numpy.maximum(self.fundamentalsValuation(), self._speculation_valuation)
+        assert (v > 0.0).all()
+        return v
+
+    def OCEANsupply(self) -> numpy.ndarray:
+        return (
+            self.INIT_OCEAN_SUPPLY + self._total_OCEAN_minted - self._total_OCEAN_burned
+        )
+
+    def OCEANprice(self) -> numpy.ndarray:
+        supply = self.OCEANsupply()
+        assert (supply > 0.0).all()
+        return self.overallValuation() / supply
+
+    # ==============================================================
+    # logging
+    def createLogData(self) -> Tuple[List[str], numpy.ndarray]:
+        """Like SimEngine.createLogData() + wsloop's netlist_createLogData().
+        Returns (header, values [config_i, col_i])"""
+        # pylint: disable=too-many-locals
+        es = float(self.tick * self.time_step)
+        columns = {
+            "Tick": float(self.tick),
+            "Second": es,
+            "Min": es / S_PER_MIN,
+            "Hour": es / S_PER_HOUR,
+            "Day": es / S_PER_DAY,
+            "Month": es / S_PER_MONTH,
+            "Year": es / S_PER_YEAR,
+            "Num_mkts": self._n_marketplaces,
+        }
+
+        onemkt, allmkts, network_rev = (
+            self._onemkt_consume_sales_per_s__per_tick,
+            self._allmkts_consume_sales_per_s__per_tick,
+            self._network_revenue_per_s__per_tick,
+        )
+        columns["onemkt_cons_sales/mo"] = self._overInterval(onemkt, S_PER_MONTH, 0)
+        columns["onemkt_cons_sales/yr"] = self._overInterval(onemkt, S_PER_YEAR, 0)
+        allmkts_mo = self._overInterval(allmkts, S_PER_MONTH, 0)
+        allmkts_yr = self._overInterval(allmkts, S_PER_YEAR, 0)
+        columns["allmkts_cons_sales/mo"] = allmkts_mo
+        columns["allmkts_cons_sales/yr"] = allmkts_yr
+
+        allmkts_tot_sales_day = self.totalSales(allmkts_mo / 30.5)
+        columns["allmkts_tot_sales/day"] = allmkts_tot_sales_day
+        columns["allmkts_tot_sales/mo"] = self.totalSales(allmkts_mo)
+        columns["allmkts_tot_sales/yr"] = self.totalSales(allmkts_yr)
+        columns["tot_staked"] = self.totalSales(allmkts_tot_sales_day)
+
+        rev_mo = self._overInterval(network_rev, S_PER_MONTH, 0)
+        rev_yr = self._overInterval(network_rev, S_PER_YEAR, 0)
+        columns["network_rev/mo"] = rev_mo
+        columns["network_rev/yr"] = rev_yr
+        columns["network_rev_growth/mo"] = _growth(
+            self._overInterval(network_rev, S_PER_MONTH, S_PER_MONTH), rev_mo
+        )
+        columns["network_rev_growth/yr"] = _growth(
+            self._overInterval(network_rev, S_PER_YEAR, S_PER_YEAR), rev_yr
+        )
+
+        columns["overall_valuation"] = self.overallValuation()
+        columns["fundamentals_valuation"] = self.fundamentalsValuation()
+        columns["speculation_valuation"] = self._speculation_valuation
+
+        columns["tot_OCEAN_supply"] = self.OCEANsupply()
+        columns["tot_OCEAN_minted"] = self._total_OCEAN_minted
+        columns["tot_OCEAN_burned"] = self._total_OCEAN_burned
+        columns["OCEAN_minted/mo"] = self._OCEANchangePrevMonth(
+            self._total_OCEAN_minted__per_tick
+        )
+        columns["OCEAN_burned/mo"] = self._OCEANchangePrevMonth(
+            self._total_OCEAN_burned__per_tick
+        )
+        columns["OCEAN_minted_USD/mo"] = self._OCEANchangePrevMonth(
+            self._total_OCEAN_minted_USD__per_tick
+        )
+        columns["OCEAN_burned_USD/mo"] = self._OCEANchangePrevMonth(
+            self._total_OCEAN_burned_USD__per_tick
+        )
+
+        O_price = self.OCEANprice()
+        columns["OCEAN_price"] = O_price
+        columns["RND/mo"] = self.grantTakersMonthlyRevenueNow()
+        ratio = self.mktsRNDToSalesRatio()
+        columns["rnd_to_cons_sales_ratio"] = ratio
+        columns["mkts_annual_growth_rate"] = self.annualMktsGrowthRate(ratio)
+
+        dao_USD = self._daoMonthly(self._dao_USD_per_tick)
+        dao_OCEAN = self._daoMonthly(self._dao_OCEAN_per_tick)
+        columns["dao_USD/mo"] = dao_USD
+        columns["dao_OCEAN/mo"] = dao_OCEAN
+        columns["dao_OCEAN_in_USD/mo"] = dao_OCEAN * O_price
+        columns["dao_total_in_USD/mo"] = dao_USD + dao_OCEAN * O_price
+
+        K = len(self.ss_list)
+        header = list(columns.keys())
+        values = numpy.stack(
+            [numpy.broadcast_to(v, (K,)) for v in columns.values()], axis=1
+        )
+        return header, values
+
+
+@enforce_types
+class _BatchSeries:
+    """Like KPIsBase.RollingSum, with a row of K values per tick"""
+
+    def __init__(self, n_ticks: int, n_configs: int):
+        self._values = numpy.empty((n_ticks, n_configs))
+        self._prefix_sums = numpy.zeros((n_ticks + 1, n_configs))
+        self._n_ticks = 0
+
+    def append(self, values: numpy.ndarray) -> None:
+        n = self._n_ticks
+        self._values[n] = values
+        self._prefix_sums[n + 1] = self._prefix_sums[n] + values
+        self._n_ticks += 1
+
+    def __len__(self) -> int:
+        return self._n_ticks
+
+    def valueAt(self, tick: int) -> numpy.ndarray:
+        return self._values[: self._n_ticks][tick]
+
+    def sumOverTicks(self, tick1: int, tick2: int) -> numpy.ndarray:
+        tick1 = min(max(0, tick1), self._n_ticks)
+        tick2 = min(max(0, tick2), self._n_ticks)
+        if tick2 <= tick1:
+            return numpy.zeros(self._values.shape[1])
+        return self._prefix_sums[tick2] - self._prefix_sums[tick1]
+
+    def sumOverInterval(self, t1: int, t2: int, time_step: int) -> numpy.ndarray:
+        tick1 = max(0, t1 // time_step)
+        tick2 = min(self._n_ticks, t2 // time_step + 1)
+        if tick2 <= tick1:
+            return numpy.zeros(self._values.shape[1])
+        total = time_step * self.sumOverTicks(tick1, tick2)
+        total = total - self.valueAt(tick1) * max(0, t1 - tick1 * time_step)
+        total = total - self.valueAt(tick2 - 1) * max(0, tick2 * time_step - 1 - t2)
+        return total
+
+
+@enforce_types
+def _withdraw(balance: numpy.ndarray, amt: numpy.ndarray) -> numpy.ndarray:
+    """New balance after withdrawing amt. Like AgentWallet: if amt is
+    within 1e-12 relative of the balance, withdraw exactly the balance"""
+    tol = 1e-12
+    with numpy.errstate(divide="ignore", invalid="ignore"):
+        rel = amt / balance
+    snap = (amt > 0.0) & (balance > 0.0) & (1.0 - tol <= rel) & (rel <= 1.0 + tol)
+    return numpy.where(snap, amt, balance) - amt
+
+
+@enforce_types
+def _growth(rev1: numpy.ndarray, rev2: numpy.ndarray) -> numpy.ndarray:
+    """Like KPIs.monthlyNetworkRevenueGrowth(): INF if rev1 is 0"""
+    with numpy.errstate(divide="ignore", invalid="ignore"):
+        g = rev2 / rev1 - 1.0
+    return numpy.where(rev1 == 0.0, INF, g)
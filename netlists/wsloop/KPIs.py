@@ -4,6 +4,7 @@ from typing import List
 from enforce_typing import enforce_types
 
 from engine import KPIsBase
+from engine.KPIsBase import RollingSum, TickSeries
 from util.constants import S_PER_YEAR, S_PER_MONTH, INF
 from util.strutil import prettyBigNum
 
@@ -29,27 +30,34 @@ class KPIs(
         super().__init__(ss.time_step)
         self.ss = ss
 
-        # for these, append a new value with each tick. All List[float]
-        self._granttakers_revenue_per_tick__per_tick = []
-        self._consume_sales_per_marketplace_per_s__per_tick = []
-        self._n_marketplaces__per_tick = []  # this one's List[int]
-        self._total_OCEAN_minted__per_tick = []
-        self._total_OCEAN_burned__per_tick = []
-        self._total_OCEAN_minted_USD__per_tick = []
-        self._total_OCEAN_burned_USD__per_tick = []
+        # room for every tick of the run, so the series never grow
+        n = math.ceil(ss.max_ticks) + 1
+
+        # for these, append a new value with each tick. O(1) sums over time
+        self._granttakers_revenue_per_tick__per_tick = RollingSum(capacity=n)
+        self._onemkt_consume_sales_per_s__per_tick = RollingSum(ss.time_step, n)
+        self._allmkts_consume_sales_per_s__per_tick = RollingSum(ss.time_step, n)
+        self._network_revenue_per_s__per_tick = RollingSum(ss.time_step, n)
+
+        # for these, append a new value with each tick
+        self._total_OCEAN_minted__per_tick = TickSeries(n)
+        self._total_OCEAN_burned__per_tick = TickSeries(n)
+        self._total_OCEAN_minted_USD__per_tick = TickSeries(n)
+        self._total_OCEAN_burned_USD__per_tick = TickSeries(n)
 
     def takeStep(self, state):
         super().takeStep(state)  # parent e.g. increments self._tick
 
         self._granttakers_revenue_per_tick__per_tick.append(
-            state.grantTakersSpentAtTick()
+            float(state.grantTakersSpentAtTick())
         )
 
         am = state.getAgent("marketplaces1")
-        self._consume_sales_per_marketplace_per_s__per_tick.append(
-            am.consumeSalesPerMarketplacePerSecond()
-        )
-        self._n_marketplaces__per_tick.append(am.numMarketplaces())
+        consume1 = am.consumeSalesPerMarketplacePerSecond()
+        consumeN = am.numMarketplaces() * consume1
+        self._onemkt_consume_sales_per_s__per_tick.append(consume1)
+        self._allmkts_consume_sales_per_s__per_tick.append(consumeN)
+        self._network_revenue_per_s__per_tick.append(self.ss.networkRevenue(consumeN))
 
         O_minted = state.totalOCEANminted()
         O_burned = state.totalOCEANburned()
@@ -64,7 +72,7 @@ class KPIs(
 
     def tick(self) -> int:
         """# ticks since start of run"""
-        assert len(self._consume_sales_per_marketplace_per_s__per_tick) == self._tick
+        assert len(self._onemkt_consume_sales_per_s__per_tick) == self._tick
         return self._tick
 
     # =======================================================================
@@ -87,7 +95,9 @@ class KPIs(
     def grantTakersMonthlyRevenueNow(self) -> float:
         ticks_1mo = self._ticksOneMonth()
         rev_per_tick = self._granttakers_revenue_per_tick__per_tick
-        return float(sum(rev_per_tick[-ticks_1mo:]))
+        return rev_per_tick.sumOverTicks(
+            len(rev_per_tick) - ticks_1mo, len(rev_per_tick)
+        )
 
     # =======================================================================
     # sales numbers: 1 marketplace
@@ -107,11 +117,11 @@ class KPIs(
         return self._onemktConsumeSalesOverInterval(t1, t2)
 
     def _onemktConsumeSalesOverInterval(self, t1: int, t2: int) -> float:
-        return self._salesOverInterval(t1, t2, self.onemktConsumeSalesPerSecond)
+        return self._onemkt_consume_sales_per_s__per_tick.sumOverInterval(t1, t2)
 
     def onemktConsumeSalesPerSecond(self, tick) -> float:
         """Returns onemkt's sales per second at a given tick"""
-        return self._consume_sales_per_marketplace_per_s__per_tick[tick]
+        return self._onemkt_consume_sales_per_s__per_tick.valueAt(tick)
 
     # =======================================================================
     # sales numbers: n marketplaces
@@ -132,13 +142,10 @@ class KPIs(
 
     def allmktsConsumeSalesPerSecond(self, tick) -> float:
         """Returns allmkt's sales per second at a given tick"""
-        return (
-            self._consume_sales_per_marketplace_per_s__per_tick[tick]
-            * self._n_marketplaces__per_tick[tick]
-        )
+        return self._allmkts_consume_sales_per_s__per_tick.valueAt(tick)
 
     def _allmktsConsumeSalesOverInterval(self, t1: int, t2: int) -> float:
-        return self._salesOverInterval(t1, t2, self.allmktsConsumeSalesPerSecond)
+        return self._allmkts_consume_sales_per_s__per_tick.sumOverInterval(t1, t2)
 
     # =======================================================================
     # revenue numbers: ocean community
@@ -163,38 +170,11 @@ class KPIs(
         return self._networkRevenueOverInterval(t1, t2)
 
     def _networkRevenueOverInterval(self, t1: int, t2: int) -> float:
-        return self._salesOverInterval(t1, t2, self.networkRevenuePerSecond)
+        return self._network_revenue_per_s__per_tick.sumOverInterval(t1, t2)
 
     def networkRevenuePerSecond(self, tick) -> float:
         """Returns Network Revenue per second at a given tick"""
-        n = self._n_marketplaces__per_tick[tick]
-        consume1 = self._consume_sales_per_marketplace_per_s__per_tick[tick]
-        consumeN = n * consume1
-        network_revenue = self.ss.networkRevenue(consumeN)
-        return network_revenue
-
-    # =======================================================================
-    def _salesOverInterval(self, t1: int, t2: int, revenuePerSecondFunc) -> float:
-        """
-        Helper function for _{onemkt, allmkts, ocean}salesOverInterval().
-
-        In time from t1 to t2 (both in # seconds since start),
-        how much $ was earned, using the revenuePerSecondFunc.
-        """
-        assert t2 > t1
-        tick1: int = max(0, math.floor(t1 / self._time_step))
-        tick2: int = min(self.tick(), math.floor(t2 / self._time_step) + 1)
-        rev = 0.0
-        for tick_i in range(tick1, tick2):
-            rev_this_s = revenuePerSecondFunc(tick_i)
-
-            start_s = max(t1, tick_i * self._time_step)
-            end_s = min(t2, (tick_i + 1) * self._time_step - 1)
-            n_s = end_s - start_s + 1
-            rev_this_tick = rev_this_s * n_s
-
-            rev += rev_this_tick
-        return rev
+        return self._network_revenue_per_s__per_tick.valueAt(tick)
 
     # =======================================================================
     # revenue growth numbers: ocean community
@@ -228,7 +208,7 @@ class KPIs(
     def OCEANburnedInUSDPrevMonth(self) -> float:
         return self._OCEANchangePrevMonth(self._total_OCEAN_burned_USD__per_tick)
 
-    def _OCEANchangePrevMonth(self, O_per_tick) -> float:
+    def _OCEANchangePrevMonth(self, O_per_tick: TickSeries) -> float:
         ticks_total = len(O_per_tick)
 
         if ticks_total == 0:
@@ -236,9 +216,9 @@ class KPIs(
 
         ticks_1mo = self._ticksOneMonth()
         if ticks_total <= ticks_1mo:
-            return O_per_tick[-1]
+            return O_per_tick.valueAt(-1)
 
-        return O_per_tick[-1] - O_per_tick[-(ticks_1mo + 1)]
+        return O_per_tick.valueAt(-1) - O_per_tick.valueAt(-(ticks_1mo + 1))
 
     def _ticksOneMonth(self) -> int:
         """Number of ticks in one month"""
@@ -1,4 +1,4 @@
-from typing import Set
+from typing import List
 
 from enforce_typing import enforce_types
 
@@ -8,6 +8,7 @@ from agents.GrantTakingAgent import GrantTakingAgent
 from agents.MarketplacesAgent import MarketplacesAgent
 from agents.OCEANBurnerAgent import OCEANBurnerAgent
 from agents.RouterAgent import RouterAgent
+from agents.RouterNetworkAgent import RouterNetworkAgent
 from engine import AgentBase, SimStateBase
 from util import valuation
 from util.constants import S_PER_MONTH, S_PER_DAY
@@ -41,11 +42,11 @@ class SimState(
         self._speculation_valuation = ss._init_speculation_valuation  # type:ignore
 
         # Instantiate and connnect agent instances. "Wire up the circuit"
-        new_agents: Set[AgentBase.AgentBaseAbstract] = set()  # type:ignore
+        new_agents: List[AgentBase.AgentBaseAbstract] = []  # type:ignore
 
         # Note: could replace MarketplacesAgent with DataecosystemAgent, for a
         # higher-fidelity simulation using EVM agents
-        new_agents.add(
+        new_agents.append(
             MarketplacesAgent(
                 name="marketplaces1",
                 USD=0.0,
@@ -57,7 +58,7 @@ class SimState(
             )
         )
 
-        new_agents.add(
+        new_agents.append(
             RouterAgent(
                 name="opc_address",
                 USD=0.0,
@@ -69,13 +70,13 @@ class SimState(
             )
         )
 
-        new_agents.add(OCEANBurnerAgent(name="opc_burner", USD=0.0, OCEAN=0.0))
+        new_agents.append(OCEANBurnerAgent(name="opc_burner", USD=0.0, OCEAN=0.0))
 
         # func = MinterAgents.ExpFunc(H=4.0)
         func = MinterAgents.RampedExpFunc(
             H=4.0, T0=0.5, T1=1.0, T2=1.4, T3=3.0, M1=0.10, M2=0.25, M3=0.50
         )
-        new_agents.add(
+        new_agents.append(
             MinterAgents.OCEANFuncMinterAgent(
                 name="ocean_51",
                 receiving_agent_name="ocean_dao",
@@ -85,7 +86,7 @@ class SimState(
             )
         )
 
-        new_agents.add(
+        new_agents.append(
             GrantGivingAgent(
                 name="opf_treasury_for_ocean_dao",
                 USD=0.0,
@@ -96,7 +97,7 @@ class SimState(
             )
         )
 
-        new_agents.add(
+        new_agents.append(
             GrantGivingAgent(
                 name="opf_treasury_for_opf_mgmt",
                 USD=ss.OPF_TREASURY_USD,
@@ -107,7 +108,7 @@ class SimState(
             )
         )
 
-        new_agents.add(
+        new_agents.append(
             GrantGivingAgent(
                 name="bdb_treasury",
                 USD=ss.BDB_TREASURY_USD,
@@ -118,7 +119,7 @@ class SimState(
             )
         )
 
-        new_agents.add(
+        new_agents.append(
             RouterAgent(
                 name="ocean_dao",
                 receiving_agents={"opc_workers": funcOne},
@@ -127,7 +128,7 @@ class SimState(
             )
         )
 
-        new_agents.add(
+        new_agents.append(
             RouterAgent(
                 name="opf_mgmt",
                 receiving_agents={"opc_workers": funcOne},
@@ -136,7 +137,7 @@ class SimState(
             )
         )
 
-        new_agents.add(
+        new_agents.append(
             RouterAgent(
                 name="bdb_mgmt",
                 receiving_agents={"bdb_workers": funcOne},
@@ -145,13 +146,23 @@ class SimState(
             )
         )
 
-        new_agents.add(GrantTakingAgent(name="opc_workers", USD=0.0, OCEAN=0.0))
+        new_agents.append(GrantTakingAgent(name="opc_workers", USD=0.0, OCEAN=0.0))
 
-        new_agents.add(GrantTakingAgent(name="bdb_workers", USD=0.0, OCEAN=0.0))
+        new_agents.append(GrantTakingAgent(name="bdb_workers", USD=0.0, OCEAN=0.0))
 
         for agent in new_agents:
             self.agents[agent.name] = agent
 
+        # routers disburse via compiled flow matrices, at their positions in
+        # the step order above: opc_address, then the other three at once
+        self._router_networks = [
+            RouterNetworkAgent(name=name, routers=[self.agents[r] for r in routers])
+            for name, routers in [
+                ("opc_router_network", ["opc_address"]),
+                ("dao_router_network", ["ocean_dao", "opf_mgmt", "bdb_mgmt"]),
+            ]
+        ]
+
         # track certain metrics over time, so that we don't have to load
         self.kpis = KPIs(self.ss)
 
@@ -11,3 +11,4 @@ Netlist to simulate Web3 Sustainability Loop, with no EVM
 from .SimStrategy import SimStrategy
 from .SimState import SimState
 from .KPIs import KPIs, netlist_createLogData, netlist_plotInstructions
+from .BatchSim import canBatch, runBatch
@@ -0,0 +1,119 @@
+from enforce_typing import enforce_types
+import numpy
+import pytest
+
+from engine.SimEngine import SimEngine
+from util.constants import S_PER_DAY
+from util.plotutil import runDirToHeaderValues
+from .. import netlist
+from .. import BatchSim as BatchSimModule
+from .. import SimState as SimStateModule
+from ..BatchSim import BatchSim, canBatch, runBatch
+
+
+@enforce_types
+def _ss(percent_burn: float, p_s_ratio: float, tau: float):
+    ss = netlist.SimStrategy()
+    ss.setMaxTicks(400)  # > 1 year, so that yearly KPIs kick in
+    ss.setLogInterval(10 * S_PER_DAY)
+    ss._percent_burn = percent_burn
+    ss._p_s_ratio = p_s_ratio
+    ss.tau = tau
+    return ss
+
+
+@enforce_types
+def test_runBatch_matches_SimEngine(tmpdir):
+    ss_list = [
+        _ss(0.05, 30.0, 0.6),
+        _ss(0.0, 10.0, 0.3),
+        _ss(1.0, 50.0, 1.2),
+    ]
+    header, values = runBatch(ss_list, chunk_size=2)
+    assert values.shape == (3, 41, len(header))
+
+    for ss, batch_values in zip(ss_list, values):
+        output_dir = str(tmpdir.join(f"run_{ss._percent_burn}"))
+        state = netlist.SimState(ss)
+        SimEngine(state, output_dir, netlist.netlist_createLogData).run()
+
+        run_header, run_values = runDirToHeaderValues(output_dir)
+        assert run_header == header
+        numpy.testing.assert_allclose(batch_values, run_values, rtol=1e-9)
+
+
+@enforce_types
+def test_runBatch_matches_SimEngine_perAttr(tmpdir):
+    """Each attribute BatchSim claims to sweep changes its results, like it
+    changes SimEngine's"""
+    # R&D to sales ratios run ~500 here, so only a big tau shows
+    new_values = {"init_n_marketplaces": 2, "tau": 100.0}
+    ss_list = []
+    for attr_name in BatchSimModule.SWEEPABLE_ATTRS:
+        ss = _ss(0.05, 30.0, 0.6)
+        setattr(ss, attr_name, new_values.get(attr_name, getattr(ss, attr_name) * 1.5))
+        ss_list.append(ss)
+    header, values = runBatch(ss_list)
+    _, default_values = runBatch([_ss(0.05, 30.0, 0.6)])
+
+    for attr_name, ss, batch_values in zip(
+        BatchSimModule.SWEEPABLE_ATTRS, ss_list, values
+    ):
+        assert not numpy.array_equal(batch_values, default_values[0]), attr_name
+
+        output_dir = str(tmpdir.join(f"run_{attr_name}"))
+        state = netlist.SimState(ss)
+        SimEngine(state, output_dir, netlist.netlist_createLogData).run()
+        run_header, run_values = runDirToHeaderValues(output_dir)
+        assert run_header == header
+        numpy.testing.assert_allclose(batch_values, run_values, rtol=1e-9)
+
+
+@enforce_types
+def test_runBatch_followsSimStateSettings(tmpdir, monkeypatch):
+    """Settings that SimState hardcodes (sales, grant and mint schedules)
+    get read from it, so a change there still matches SimEngine"""
+    monkeypatch.setattr(SimStateModule, "S_PER_MONTH", SimStateModule.S_PER_MONTH // 2)
+    monkeypatch.setattr(SimStateModule, "S_PER_DAY", SimStateModule.S_PER_DAY * 3)
+    ss = _ss(0.05, 30.0, 0.6)
+    header, values = runBatch([ss])
+
+    output_dir = str(tmpdir.join("run"))
+    SimEngine(netlist.SimState(ss), output_dir, netlist.netlist_createLogData).run()
+    run_header, run_values = runDirToHeaderValues(output_dir)
+    assert run_header == header
+    numpy.testing.assert_allclose(values[0], run_values, rtol=1e-9)
+
+
+@enforce_types
+def test_BatchSim_unsupportedAttr():
+    ss1, ss2 = _ss(0.05, 30.0, 0.6), _ss(0.05, 30.0, 0.6)
+    assert canBatch([ss1, ss2])
+    ss2.pool_weight_DT = 4.0  # BatchSim doesn't read it
+    assert not canBatch([ss1, ss2])
+    with pytest.raises(AssertionError):
+        BatchSim([ss1, ss2])
+
+
+@enforce_types
+def test_BatchSim_checksWiring():
+    sim = BatchSim([_ss(0.05, 30.0, 0.6)])
+    state = netlist.SimState(_ss(0.05, 30.0, 0.6))
+    sim._checkWiring(state)
+
+    del state.agents["opc_burner"]
+    with pytest.raises(AssertionError):
+        sim._checkWiring(state)
+
+    state = netlist.SimState(_ss(0.05, 30.0, 0.6))
+    state.getAgent("bdb_treasury")._s_between_grants *= 2  # own schedule
+    with pytest.raises(AssertionError):
+        sim._checkWiring(state)
+
+
+@enforce_types
+def test_BatchSim_needs_lockstep():
+    ss1, ss2 = _ss(0.05, 30.0, 0.6), _ss(0.05, 30.0, 0.6)
+    ss2.setMaxTicks(200)
+    with pytest.raises(AssertionError):
+        BatchSim([ss1, ss2])
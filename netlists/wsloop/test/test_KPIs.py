@@ -10,6 +10,7 @@ from ..KPIs import KPIs
 class DummySS:
     def __init__(self, time_step: int):
         self.time_step: int = time_step
+        self.max_ticks: int = 100
 
         self._percent_consume_sales_for_network = 0.10
 
@@ -100,28 +101,37 @@ def testKPIs_GrantTakersRevenue():
 
     # tick = 1, months = 0.33
     kpis.takeStep(state)
-    assert kpis._granttakers_revenue_per_tick__per_tick == [1e3]
+    assert kpis._granttakers_revenue_per_tick__per_tick.values().tolist() == [1e3]
     assert (
         pytest.approx(kpis.grantTakersMonthlyRevenueNow()) == 1e3
     )  # NOT 1e3*S_PER_DAY*10
 
     # tick = 2, months = 0.66
     kpis.takeStep(state)
-    assert kpis._granttakers_revenue_per_tick__per_tick == [1e3, 1e3]
+    assert kpis._granttakers_revenue_per_tick__per_tick.values().tolist() == [1e3, 1e3]
     assert (
         pytest.approx(kpis.grantTakersMonthlyRevenueNow()) == 2e3
     )  # NOT 2e3*S_PER_DAY*10
 
     # tick = 3, months = 1.00
     kpis.takeStep(state)
-    assert kpis._granttakers_revenue_per_tick__per_tick == [1e3, 1e3, 1e3]
+    assert kpis._granttakers_revenue_per_tick__per_tick.values().tolist() == [
+        1e3,
+        1e3,
+        1e3,
+    ]
     assert (
         pytest.approx(kpis.grantTakersMonthlyRevenueNow()) == 3e3
     )  # NOT 3e3*S_PER_DAY*10
 
     # tick = 4, months = 1.33
     kpis.takeStep(state)
-    assert kpis._granttakers_revenue_per_tick__per_tick == [1e3, 1e3, 1e3, 1e3]
+    assert kpis._granttakers_revenue_per_tick__per_tick.values().tolist() == [
+        1e3,
+        1e3,
+        1e3,
+        1e3,
+    ]
     assert (
         pytest.approx(kpis.grantTakersMonthlyRevenueNow()) == 3e3
     )  # NOT 4e3. NOT 3e3*S_PER_DAY*10
@@ -248,31 +258,37 @@ def testKPIs__mintAndBurn():
 
     state.takeStep()
     kpis.takeStep(state)  # now, tick = 1, months = 0.33
-    assert kpis._total_OCEAN_minted__per_tick == [2.0]
+    assert kpis._total_OCEAN_minted__per_tick.values().tolist() == [2.0]
     assert kpis.OCEANmintedPrevMonth() == 2.0
     assert kpis.OCEANburnedPrevMonth() == 3.0
 
     state.takeStep()
     kpis.takeStep(state)  # now, tick = 2, months = 0.66
-    assert kpis._total_OCEAN_minted__per_tick == [2.0, 4.0]
+    assert kpis._total_OCEAN_minted__per_tick.values().tolist() == [2.0, 4.0]
     assert kpis.OCEANmintedPrevMonth() == 4.0
     assert kpis.OCEANburnedPrevMonth() == 6.0
 
     state.takeStep()
     kpis.takeStep(state)  # now, tick = 3, months = 1.0
-    assert kpis._total_OCEAN_minted__per_tick == [2.0, 4.0, 6.0]
+    assert kpis._total_OCEAN_minted__per_tick.values().tolist() == [2.0, 4.0, 6.0]
     assert kpis.OCEANmintedPrevMonth() == 6.0
     assert kpis.OCEANburnedPrevMonth() == 9.0
 
     state.takeStep()
     kpis.takeStep(state)  # now, tick = 4, months = 1.33
-    assert kpis._total_OCEAN_minted__per_tick == [2.0, 4.0, 6.0, 8.0]
+    assert kpis._total_OCEAN_minted__per_tick.values().tolist() == [2.0, 4.0, 6.0, 8.0]
     assert kpis.OCEANmintedPrevMonth() == 6.0  # note: NOT 8.0
     assert kpis.OCEANburnedPrevMonth() == 9.0  # note: NOT 12.0
 
     state.takeStep()
     kpis.takeStep(state)  # now, tick = 5 months = 1.66
-    assert kpis._total_OCEAN_minted__per_tick == [2.0, 4.0, 6.0, 8.0, 10.0]
+    assert kpis._total_OCEAN_minted__per_tick.values().tolist() == [
+        2.0,
+        4.0,
+        6.0,
+        8.0,
+        10.0,
+    ]
     assert kpis.OCEANmintedPrevMonth() == 6.0  # note: NOT 8.0
     assert kpis.OCEANburnedPrevMonth() == 9.0  # note: NOT 12.0
 
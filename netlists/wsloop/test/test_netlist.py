@@ -1,4 +1,5 @@
 """simply test for scope"""
+
 import inspect
 from .. import netlist
 
@@ -12,3 +13,5 @@ def test1():
     assert inspect.isclass(netlist.KPIs)
     assert callable(netlist.netlist_createLogData)
     assert callable(netlist.netlist_plotInstructions)
+    assert callable(netlist.runBatch)
+    assert callable(netlist.canBatch)
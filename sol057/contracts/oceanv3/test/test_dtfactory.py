@@ -1,6 +1,7 @@
 import brownie
 
 import sol057.contracts.oceanv3.oceanv3util
+from util import contractregistry
 from util.base18 import toBase18
 from util.constants import BROWNIE_PROJECT057
 from util.tx import txdict
@@ -57,3 +58,14 @@ def test_via_newDatatoken_util():
     assert dt.blob() == "foo_blob"
     assert dt.name() == "datatoken1"
     assert dt.symbol() == "DT1"
+
+
+def test_DTFactory_deploysOnce():
+    dtfactory = sol057.contracts.oceanv3.oceanv3util.DTFactory()
+    n_deploys = contractregistry.deployStats()["n_deploys"]
+
+    assert sol057.contracts.oceanv3.oceanv3util.DTFactory() == dtfactory
+    sol057.contracts.oceanv3.oceanv3util.newDatatoken(
+        "foo_blob", "datatoken1", "DT1", toBase18(100.0), account0
+    )
+    assert contractregistry.deployStats()["n_deploys"] == n_deploys
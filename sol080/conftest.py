@@ -0,0 +1,7 @@
+"""
+Contract tests use brownie accounts from import time on (eg accounts[0]).
+util.constants connects lazily, so connect here before collecting them.
+"""
+from util import constants
+
+constants.connectToChain()
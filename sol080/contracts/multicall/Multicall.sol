@@ -0,0 +1,30 @@
+// SPDX-License-Identifier: Apache-2.0
+pragma solidity ^0.8.0;
+
+/**
+ * @title Multicall
+ * @dev Runs many read-only calls in one eth_call. Like MakerDAO's Multicall.
+ * Reverts if any call fails.
+ */
+contract Multicall {
+    struct Call {
+        address target;
+        bytes callData;
+    }
+
+    function aggregate(Call[] memory calls)
+        public
+        view
+        returns (uint256 blockNumber, bytes[] memory returnData)
+    {
+        blockNumber = block.number;
+        returnData = new bytes[](calls.length);
+        for (uint256 i = 0; i < calls.length; i++) {
+            (bool success, bytes memory ret) = calls[i].target.staticcall(
+                calls[i].callData
+            );
+            require(success, "Multicall: call failed");
+            returnData[i] = ret;
+        }
+    }
+}
@@ -0,0 +1,50 @@
+// SPDX-License-Identifier: Apache-2.0
+pragma solidity ^0.8.0;
+
+interface IERC20Transfer {
+    function transferFrom(
+        address from,
+        address to,
+        uint256 value
+    ) external returns (bool);
+}
+
+/**
+ * @title MultiSend
+ * @dev Sends many ETH and ERC20 transfers in one tx.
+ * Transfer i sends amounts[i] of tokens[i] to recipients[i]; a token of
+ * address(0) means ETH. ETH comes from msg.value, which must cover the ETH
+ * transfers exactly. ERC20s come from msg.sender, who must have approved
+ * this contract for them. Reverts if any transfer fails.
+ */
+contract MultiSend {
+    function multiSend(
+        address[] calldata tokens,
+        address payable[] calldata recipients,
+        uint256[] calldata amounts
+    ) external payable {
+        require(
+            tokens.length == recipients.length &&
+                tokens.length == amounts.length,
+            "MultiSend: length mismatch"
+        );
+        uint256 ethSent = 0;
+        for (uint256 i = 0; i < tokens.length; i++) {
+            if (tokens[i] == address(0)) {
+                ethSent += amounts[i];
+                (bool success, ) = recipients[i].call{value: amounts[i]}("");
+                require(success, "MultiSend: ETH transfer failed");
+            } else {
+                require(
+                    IERC20Transfer(tokens[i]).transferFrom(
+                        msg.sender,
+                        recipients[i],
+                        amounts[i]
+                    ),
+                    "MultiSend: token transfer failed"
+                );
+            }
+        }
+        require(ethSent == msg.value, "MultiSend: ETH mismatch");
+    }
+}
@@ -1,82 +1,40 @@
-from typing import Any, List
+from typing import Any, Dict, List
 from enforce_typing import enforce_types
 
-import brownie
 
 from util.base18 import toBase18
-from util.constants import (
-    BROWNIE_PROJECT080,
-    GOD_ACCOUNT,
-    ZERO_ADDRESS,
-    OPF_ADDRESS,
-)
+from util import chainreverts, constants
+from util.constants import ZERO_ADDRESS
+from util.contractregistry import deployOnce, registerCache
 from util.globaltokens import OCEANtoken
+from util.fasttx import sendTx
 from util.tx import txdict
 
-_ERC721_TEMPLATE = None
-
 
 @enforce_types
 def ERC721Template():
-    global _ERC721_TEMPLATE  # pylint: disable=global-statement
-    try:
-        erc721_template = _ERC721_TEMPLATE  # may trigger failure
-        if erc721_template is not None:
-            x = erc721_template.address  # "" # pylint: disable=unused-variable
-    except brownie.exceptions.ContractNotFound:
-        erc721_template = None
-    if erc721_template is None:
-        _ERC721_TEMPLATE = BROWNIE_PROJECT080.ERC721Template.deploy(txdict(GOD_ACCOUNT))
-        erc721_template = _ERC721_TEMPLATE
-    return erc721_template
-
-
-_ERC20_TEMPLATE = None
+    return deployOnce("BROWNIE_PROJECT080", "ERC721Template")
 
 
 @enforce_types
 def ERC20Template():
-    global _ERC20_TEMPLATE  # pylint: disable=global-statement
-    try:
-        erc20_template = _ERC20_TEMPLATE  # may trigger failure
-        if erc20_template is not None:
-            x = erc20_template.address  # "" # pylint: disable=unused-variable
-    except brownie.exceptions.ContractNotFound:
-        erc20_template = None
-    if erc20_template is None:
-        _ERC20_TEMPLATE = BROWNIE_PROJECT080.ERC20Template.deploy(txdict(GOD_ACCOUNT))
-        erc20_template = _ERC20_TEMPLATE
-    return erc20_template
-
-
-_POOL_TEMPLATE = None
+    return deployOnce("BROWNIE_PROJECT080", "ERC20Template")
 
 
 @enforce_types
 def POOLTemplate():
-    global _POOL_TEMPLATE  # pylint: disable=global-statement
-    try:
-        pool_template = _POOL_TEMPLATE  # may trigger failure
-        if pool_template is not None:
-            x = pool_template.address  # "" # pylint: disable=unused-variable
-    except brownie.exceptions.ContractNotFound:
-        pool_template = None
-    if pool_template is None:
-        _POOL_TEMPLATE = BROWNIE_PROJECT080.BPool.deploy(txdict(GOD_ACCOUNT))
-        pool_template = _POOL_TEMPLATE
-
-    return pool_template
+    return deployOnce("BROWNIE_PROJECT080", "BPool")
 
 
 @enforce_types
 def deployRouter(from_account):
     OCEAN = OCEANtoken()
     pool_template = POOLTemplate()
-    router = BROWNIE_PROJECT080.FactoryRouter.deploy(
+    router = constants.BROWNIE_PROJECT080.FactoryRouter.deploy(
         from_account.address,
         OCEAN.address,
         pool_template,
-        OPF_ADDRESS,
+        constants.OPF_ADDRESS,
         [],
         txdict(from_account),
     )
@@ -87,19 +45,90 @@ def deployRouter(from_account):
 def deployERC721Factory(from_account, router):
     erc721_template = ERC721Template()
     erc20_template = ERC20Template()
-    factory = BROWNIE_PROJECT080.ERC721Factory.deploy(
+    factory = constants.BROWNIE_PROJECT080.ERC721Factory.deploy(
         erc721_template.address,
         erc20_template.address,
-        OPF_ADDRESS,
+        constants.OPF_ADDRESS,
         router.address,
         txdict(from_account),
     )
     return factory
 
 
+# ===============================================================
+# infrastructure shared by all pools of a chain: one router, with one
+# ERC721 factory and one SideStaking bot. Deployed and set up once, owned
+# by GOD_ACCOUNT. Then a new pool costs just its NFT, datatoken and pool txs.
+# A chain revert drops the routers set up after it: their address may get
+# reused, eg by a router that a caller deploys
+# router address : (router, SideStaking, block height once set up)
+_SHARED: Dict[str, tuple] = registerCache({})
+
+
+@enforce_types
+def sharedRouter():
+    router = deployOnce(
+        "BROWNIE_PROJECT080",
+        "FactoryRouter",
+        constants.GOD_ACCOUNT.address,
+        OCEANtoken().address,
+        POOLTemplate().address,
+        constants.OPF_ADDRESS,
+        [],
+    )
+    # new router (eg after a chain reset, maybe at the same address): set up
+    if _SHARED.get(router.address, (None,))[0] is not router:
+        from brownie.network import chain  # pylint: disable=import-outside-toplevel
+
+        ssbot = deployOnce("BROWNIE_PROJECT080", "SideStaking", router.address)
+        erc721_factory = _sharedERC721Factory(router)
+
+        tx_dict = txdict(constants.GOD_ACCOUNT)
+        router.updateMinVestingPeriod(500, tx_dict)
+        router.addSSContract(ssbot.address, tx_dict)
+        router.addFactory(erc721_factory.address, tx_dict)
+        _SHARED[router.address] = (router, ssbot, chain.height)
+        chainreverts.onRevert(_onRevert)
+    return router
+
+
+def _onRevert(height: int) -> None:
+    for router_address, (_, _, setup_height) in list(_SHARED.items()):
+        if setup_height > height:
+            del _SHARED[router_address]
+
+
 @enforce_types
-def createDataNFT(name: str, symbol: str, from_account, router):
-    erc721_factory = deployERC721Factory(from_account, router)
+def sharedERC721Factory():
+    return _sharedERC721Factory(sharedRouter())
+
+
+def _sharedERC721Factory(router):
+    return deployOnce(
+        "BROWNIE_PROJECT080",
+        "ERC721Factory",
+        ERC721Template().address,
+        ERC20Template().address,
+        constants.OPF_ADDRESS,
+        router.address,
+    )
+
+
+@enforce_types
+def sharedSideStaking():
+    return _SHARED[sharedRouter().address][1]
+
+
+# ===============================================================
+# data NFTs, datatokens, pools
+@enforce_types
+def createDataNFT(name: str, symbol: str, from_account, router=None):
+    """Returns (data NFT, its ERC721 factory). router=None: use the shared
+    router and factory. Else deploy a factory for router"""
+    if router is None:
+        router, erc721_factory = sharedRouter(), sharedERC721Factory()
+    else:
+        erc721_factory = deployERC721Factory(from_account, router)
     erc721_template_index = 1
     token_URI = "https://mystorage.com/mytoken.png"
     tx = erc721_factory.deployERC721Contract(
@@ -112,7 +141,7 @@ def createDataNFT(name: str, symbol: str, from_account, router):
         txdict(from_account),
     )
     data_NFT_address = tx.events["NFTCreated"]["newTokenAddress"]
-    data_NFT = BROWNIE_PROJECT080.ERC721Template.at(data_NFT_address)
+    data_NFT = constants.BROWNIE_PROJECT080.ERC721Template.at(data_NFT_address)
     return (data_NFT, erc721_factory)
 
 
@@ -142,14 +171,16 @@ def createDatatokenFromDataNFT(
         erc20_template_index, strings, addresses, uints, _bytes, txdict(from_account)
     )
     DT_address = tx.events["TokenCreated"]["newTokenAddress"]
-    DT = BROWNIE_PROJECT080.ERC20Template.at(DT_address)
+    DT = constants.BROWNIE_PROJECT080.ERC20Template.at(DT_address)
 
     return DT
 
 
 @enforce_types
 def deploySideStaking(from_account, router):
-    return BROWNIE_PROJECT080.SideStaking.deploy(router.address, txdict(from_account))
+    return constants.BROWNIE_PROJECT080.SideStaking.deploy(
+        router.address, txdict(from_account)
+    )
 
 
 @enforce_types
@@ -164,19 +195,24 @@ def createBPoolFromDatatoken(
     LP_swap_fee=0.03,
     mkt_swap_fee=0.01,
 ):  # pylint: disable=too-many-arguments
-
+    """Deploy a pool for datatoken. If its router isn't the shared one, set
+    up the router first: from_account must own it"""
     OCEAN = OCEANtoken()
     pool_template = POOLTemplate()
 
     router_address = datatoken.router()
-    router = BROWNIE_PROJECT080.FactoryRouter.at(router_address)
-    router.updateMinVestingPeriod(500, txdict(from_account))
-
-    OCEAN.approve(router.address, toBase18(OCEAN_init_liquidity), txdict(from_account))
-
-    ssbot = deploySideStaking(from_account, router)
-    router.addSSContract(ssbot.address, txdict(from_account))
-    router.addFactory(erc721_factory.address, txdict(from_account))
+    if router_address in _SHARED:
+        ssbot = _SHARED[router_address][1]
+    else:
+        router = constants.BROWNIE_PROJECT080.FactoryRouter.at(router_address)
+        sendTx(from_account, router, "updateMinVestingPeriod", 500)
+        ssbot = deploySideStaking(from_account, router)
+        sendTx(from_account, router, "addSSContract", ssbot.address)
+        sendTx(from_account, router, "addFactory", erc721_factory.address)
+
+    sendTx(
+        from_account, OCEAN, "approve", router_address, toBase18(OCEAN_init_liquidity)
+    )
 
     ss_params = [
         toBase18(DT_OCEAN_rate),
@@ -194,13 +230,13 @@ def createBPoolFromDatatoken(
         OCEAN.address,
         from_account.address,
         from_account.address,
-        OPF_ADDRESS,
+        constants.OPF_ADDRESS,
         pool_template.address,
     ]
 
     tx = datatoken.deployPool(ss_params, swap_fees, addresses, txdict(from_account))
     pool_address = poolAddressFromNewBPoolTx(tx)
-    pool = BROWNIE_PROJECT080.BPool.at(pool_address)
+    pool = constants.BROWNIE_PROJECT080.BPool.at(pool_address)
 
     return pool
 
@@ -0,0 +1,80 @@
+import brownie
+
+from sol080.contracts.oceanv4 import oceanv4util
+from util import poolstate
+from util.base18 import toBase18
+from util.globaltokens import fundOCEANFromAbove
+from util.poolstate import PoolStateV4
+from util.tx import txdict
+
+accounts = brownie.network.accounts
+
+account0 = accounts[0]
+
+
+def test_PoolStateV4_bit_identical_to_BPool():
+    pool = _deployBPool()
+    OCEAN_address = oceanv4util.OCEANtoken().address
+    DT_address = pool.getDatatokenAddress()
+    pool_state = PoolStateV4(pool, DT_address)
+
+    for consume_fee in [0, toBase18(0.001), pool.getSwapFee()]:
+        assert pool_state.spotPrice(consume_fee) == pool.getSpotPrice(
+            OCEAN_address, DT_address, consume_fee
+        )
+        for amt in [toBase18(0.001), toBase18(1.0), toBase18(7.3)]:
+            for token_in, token_out in [
+                (OCEAN_address, DT_address),
+                (DT_address, OCEAN_address),
+            ]:
+                assert (
+                    pool_state.inGivenOut(token_in, token_out, amt, consume_fee)
+                    == pool.getAmountInExactOut(token_in, token_out, amt, consume_fee)[
+                        0
+                    ]
+                )
+                assert (
+                    pool_state.outGivenIn(token_in, token_out, amt, consume_fee)
+                    == pool.getAmountOutExactIn(token_in, token_out, amt, consume_fee)[
+                        0
+                    ]
+                )
+    assert pool_state.spotPrice() == pool.getSpotPrice(
+        OCEAN_address, DT_address, pool.getSwapFee()
+    )
+
+
+def test_PoolStateV4_follows_swaps():
+    pool = _deployBPool()
+    OCEAN = oceanv4util.OCEANtoken()
+    DT_address = pool.getDatatokenAddress()
+    pool_state = PoolStateV4(pool, DT_address)
+    price_before = pool_state.spotPrice()
+
+    OCEAN.approve(pool.address, toBase18(100.0), txdict(account0))
+    pool.swapExactAmountIn(
+        [OCEAN.address, DT_address, account0.address],
+        [toBase18(100.0), 0, toBase18(1e6), 0],
+        txdict(account0),
+    )
+
+    assert pool_state.spotPrice() > price_before
+    assert pool_state.spotPrice() == pool.getSpotPrice(
+        OCEAN.address, DT_address, pool.getSwapFee()
+    )
+
+
+def _deployBPool():
+    brownie.chain.reset()
+    poolstate.reset()
+    router = oceanv4util.deployRouter(account0)
+    fundOCEANFromAbove(account0.address, toBase18(100000))
+    dataNFT, erc721_factory = oceanv4util.createDataNFT(
+        "dataNFT", "DATANFTSYMBOL", account0, router
+    )
+    datatoken = oceanv4util.createDatatokenFromDataNFT(
+        "DT", "DTSYMBOL", 10000, dataNFT, account0
+    )
+    return oceanv4util.createBPoolFromDatatoken(
+        datatoken, erc721_factory, account0, 80000, 0.1, 1000, 600
+    )
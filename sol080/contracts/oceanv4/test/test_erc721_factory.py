@@ -1,6 +1,7 @@
 import brownie
 
 from sol080.contracts.oceanv4 import oceanv4util
+from util import contractregistry
 from util.base18 import toBase18
 from util.constants import (
     BROWNIE_PROJECT080,
@@ -189,3 +190,38 @@ def test_createBPool_via_util():
     assert OCEAN.balanceOf(pool_address) < toBase18(10000.0)
     assert pool.getMarketFee() == toBase18(mkt_swap_fee)
     assert pool.getSwapFee() == toBase18(LP_swap_fee)
+
+
+def test_createBPools_via_sharedRouter():
+    fundOCEANFromAbove(address0, toBase18(10000.0))
+    router = oceanv4util.sharedRouter()
+    erc721_factory = oceanv4util.sharedERC721Factory()
+    ssbot = oceanv4util.sharedSideStaking()
+
+    n_deploys = contractregistry.deployStats()["n_deploys"]
+    pools = []
+    for i in range(2):
+        dataNFT, factory = oceanv4util.createDataNFT(f"NFT{i}", f"NFT{i}", account0)
+        assert factory == erc721_factory
+        DT = oceanv4util.createDatatokenFromDataNFT(
+            f"DT{i}", f"DT{i}", 10000, dataNFT, account0
+        )
+        assert DT.router() == router.address
+        pools.append(oceanv4util.createBPoolFromDatatoken(DT, factory, account0))
+
+    assert contractregistry.deployStats()["n_deploys"] == n_deploys
+    assert oceanv4util.sharedRouter() == router
+    assert pools[0].address != pools[1].address
+    for pool in pools:
+        assert pool.getController() == ssbot.address
+
+
+def test_sharedRouter_forgottenAfterChainReset():
+    router = oceanv4util.sharedRouter()
+    assert router.address in oceanv4util._SHARED
+    brownie.chain.reset()
+    assert router.address not in oceanv4util._SHARED  # may get reused
+
+    router2 = oceanv4util.sharedRouter()  # deployed and set up anew
+    assert oceanv4util.sharedSideStaking() == oceanv4util._SHARED[router2.address][1]
+    assert router2.isSSContract(oceanv4util.sharedSideStaking().address)
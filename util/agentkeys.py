@@ -0,0 +1,71 @@
+"""
+Agent keypairs that the local chain funds with ETH at genesis.
+
+Without them, each new EVM wallet is a new account, which needs a tx to
+get ETH for gas. Instead, `tsp ganache` creates the chain with
+N_AGENT_KEYS (in tokenspice.ini) extra accounts, after its 10 base ones.
+Their keys are deterministic, so each run sees the same agent addresses.
+Brownie's own chain gets as many extra accounts, from its mnemonic.
+Wallets claim them in order via claimAccount(), then fall back to new
+accounts once all are claimed. Each run (eg sweep variant) claims them
+from the first again, as does a chain reset.
+"""
+from typing import List, Optional
+
+from enforce_typing import enforce_types
+
+from util import chainreverts
+
+# accounts of the chain before the agent ones. GOD_ACCOUNT etc are in here
+N_BASE_ACCOUNTS = 10
+
+_N_CLAIMED = 0  # agent accounts that claimAccount() handed out
+
+
+@enforce_types
+def agentPrivateKey(i: int) -> str:
+    """Private key of the i-th agent account"""
+    assert i >= 0
+    import eth_utils  # pylint: disable=import-outside-toplevel
+
+    return "0x" + eth_utils.keccak(text=f"tokenspice agent {i}").hex()
+
+
+@enforce_types
+def agentPrivateKeys(n: int) -> List[str]:
+    return [agentPrivateKey(i) for i in range(n)]
+
+
+def claimAccount() -> Optional[object]:
+    """The next unclaimed agent account (a brownie Account), or None if
+    the chain has no more"""
+    global _N_CLAIMED  # pylint: disable=global-statement
+    # pylint: disable=import-outside-toplevel
+    import brownie
+    from brownie.network.account import LocalAccount
+
+    chainreverts.onRevert(_onRevert)
+    # the chain's accounts come first. Then ones that accounts.add() made
+    accounts = brownie.network.accounts
+    i = N_BASE_ACCOUNTS + _N_CLAIMED
+    if i >= len(accounts) or isinstance(accounts[i], LocalAccount):
+        return None
+    _N_CLAIMED += 1
+    return accounts[i]
+
+
+@enforce_types
+def numClaimed() -> int:
+    return _N_CLAIMED
+
+
+def reset() -> None:
+    """Let claimAccount() hand out accounts from the first again. Eg after
+    the chain got reset"""
+    global _N_CLAIMED  # pylint: disable=global-statement
+    _N_CLAIMED = 0
+
+
+def _onRevert(height: int) -> None:
+    if height == 0:  # chain reset: the agent accounts are fresh again
+        reset()
@@ -0,0 +1,132 @@
+"""
+Token balances (OCEAN, DTs, BPTs) of wallets, kept in Python.
+
+Reading a balance from the chain costs an RPC. Instead, the ledger reads
+each (token, holder) balance from the chain once. Then it keeps it up to
+date from the Transfer events of every tx that brownie or util.fasttx
+sends, as found in their tx histories. So reads cost no RPCs, whoever
+sent the tx that changed the balance.
+
+Balances that change without a Transfer event, or via txs sent outside
+of this process, would go stale. To catch that, BALANCE_VERIFY in
+tokenspice.ini sets how often reads get checked against the chain:
+"always", "never", or every N ticks (default: 100).
+
+Code that's about to read many balances, eg of each pool, can prefetch()
+them first: the ones that need the chain get read in one batch request.
+"""
+
+from typing import Dict, List, Tuple
+
+from enforce_typing import enforce_types
+
+from util import constants, fasttx
+from util.rpcbatch import RPCBatch
+from util.shadowamm import ShadowToken
+
+_BALANCES: Dict[Tuple[str, str], int] = {}  # (token addr, holder addr) : base
+_TICK_VERIFIED: Dict[Tuple[str, str], int] = {}  # "" : tick of last check
+_N_TXS_APPLIED = (0, 0)  # fasttx.txCounts() of the txs in _BALANCES
+_TICK = 0  # current tick. SimEngine sets it
+
+
+@enforce_types
+def balanceOf(token, holder_address: str) -> int:
+    """Balance of holder_address in token (a brownie Contract), in base units"""
+    _applyNewTxs()
+    key = (token.address, holder_address)
+    if key not in _BALANCES:
+        _BALANCES[key] = token.balanceOf(holder_address)
+        _TICK_VERIFIED[key] = _TICK
+    elif _doVerify(key):
+        chain_balance = token.balanceOf(holder_address)
+        assert _BALANCES[key] == chain_balance, (key, _BALANCES[key], chain_balance)
+        _TICK_VERIFIED[key] = _TICK
+    return _BALANCES[key]
+
+
+@enforce_types
+def prefetch(token_holders: List[tuple]) -> None:
+    """Do the chain reads that balanceOf() would, for each (token, holder
+    address) pair, in one RPC batch. Then balanceOf() of them costs none.
+    util.shadowamm tokens aren't tracked here, so they get skipped"""
+    token_holders = [
+        (token, holder_address)
+        for token, holder_address in token_holders
+        if not isinstance(token, ShadowToken)
+    ]
+    if not token_holders:
+        return
+    _applyNewTxs()
+    batch, keys, seen = RPCBatch(), [], set()  # keys in order, and as a set
+    for token, holder_address in token_holders:
+        key = (token.address, holder_address)
+        if key in seen or (key in _BALANCES and not _doVerify(key)):
+            continue
+        batch.add(token, "balanceOf", holder_address)
+        keys.append(key)
+        seen.add(key)
+    for key, chain_balance in zip(keys, batch.resolve()):
+        if key in _BALANCES:
+            assert _BALANCES[key] == chain_balance, (key, _BALANCES[key], chain_balance)
+        _BALANCES[key] = chain_balance
+        _TICK_VERIFIED[key] = _TICK
+
+
+@enforce_types
+def applyTx(tx) -> None:
+    """Update balances by the Transfer events of tx (a TransactionReceipt,
+    or a util.fasttx FastReceipt).
+    Holders that the ledger doesn't know yet get read from chain later."""
+    if tx.status != 1:  # reverted: no transfers
+        return
+    for token_address, src, dst, amt in fasttx.transfers(tx):
+        for holder_address, delta in [(src, -amt), (dst, amt)]:
+            key = (token_address, holder_address)
+            if key in _BALANCES:
+                _BALANCES[key] += delta
+
+
+@enforce_types
+def setTick(tick: int) -> None:
+    global _TICK  # pylint: disable=global-statement
+    _TICK = tick
+
+
+@enforce_types
+def forget(holder_address: str) -> None:
+    """Drop holder's balances, so they get read from chain next time"""
+    for key in [key for key in _BALANCES if key[1] == holder_address]:
+        del _BALANCES[key]
+        del _TICK_VERIFIED[key]
+
+
+def reset() -> None:
+    """Drop all balances. Eg after the chain got reset"""
+    global _N_TXS_APPLIED  # pylint: disable=global-statement
+    _BALANCES.clear()
+    _TICK_VERIFIED.clear()
+    _N_TXS_APPLIED = (0, 0)
+
+
+def _applyNewTxs() -> None:
+    global _N_TXS_APPLIED  # pylint: disable=global-statement
+    n_txs = fasttx.txCounts()
+    if n_txs[0] < _N_TXS_APPLIED[0] or n_txs[1] < _N_TXS_APPLIED[1]:
+        reset()  # history got cleared
+    if not _BALANCES:  # nothing to update; chain has it all
+        _N_TXS_APPLIED = n_txs
+        return
+    for tx in fasttx.txsSince(_N_TXS_APPLIED):
+        applyTx(tx)
+    _N_TXS_APPLIED = n_txs
+
+
+@enforce_types
+def _doVerify(key: Tuple[str, str]) -> bool:
+    policy = constants.BALANCE_VERIFY
+    if policy == "always":
+        return True
+    if policy == "never":
+        return False
+    return _TICK - _TICK_VERIFIED[key] >= int(policy)
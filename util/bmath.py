@@ -0,0 +1,359 @@
+"""
+Balancer pool math, ported from BNum.sol and BMath.sol. All values are
+base18 ints, and every operation rounds like the contracts do, so results
+are bit-identical to what the pools compute on-chain. Where the contracts
+revert, these raise ValueError with the same reason.
+
+-calc*() are oceanv3's BMath, as used by sol057 BPool
+-calc*V4() are oceanv4's BMath swaps, which take more fees: LP swap fee,
+ OPC fee, publish market fee and consume market fee. oceanv4's joins and
+ exits are oceanv3's, with the LP swap fee as swapFee
+"""
+from typing import Tuple
+
+from enforce_typing import enforce_types
+
+# BConst.sol
+BONE = 10**18
+EXIT_FEE = 0
+MIN_BPOW_BASE = 1
+MAX_BPOW_BASE = (2 * BONE) - 1
+BPOW_PRECISION = BONE // 10**10
+
+MAX_UINT = 2**256 - 1
+
+
+# ========================================================================
+# BNum.sol
+@enforce_types
+def btoi(a: int) -> int:
+    return a // BONE
+
+
+@enforce_types
+def bfloor(a: int) -> int:
+    return btoi(a) * BONE
+
+
+@enforce_types
+def badd(a: int, b: int) -> int:
+    c = a + b
+    if c > MAX_UINT:
+        raise ValueError("ERR_ADD_OVERFLOW")
+    return c
+
+
+@enforce_types
+def bsub(a: int, b: int) -> int:
+    c, flag = bsubSign(a, b)
+    if flag:
+        raise ValueError("ERR_SUB_UNDERFLOW")
+    return c
+
+
+@enforce_types
+def bsubSign(a: int, b: int) -> Tuple[int, bool]:
+    if a >= b:
+        return (a - b, False)
+    return (b - a, True)
+
+
+@enforce_types
+def bmul(a: int, b: int) -> int:
+    c0 = a * b
+    if c0 > MAX_UINT:
+        raise ValueError("ERR_MUL_OVERFLOW")
+    c1 = c0 + (BONE // 2)
+    if c1 > MAX_UINT:
+        raise ValueError("ERR_MUL_OVERFLOW")
+    return c1 // BONE
+
+
+@enforce_types
+def bdiv(a: int, b: int) -> int:
+    if b == 0:
+        raise ValueError("ERR_DIV_ZERO")
+    c0 = a * BONE
+    if c0 > MAX_UINT:
+        raise ValueError("ERR_DIV_INTERNAL")
+    c1 = c0 + (b // 2)
+    if c1 > MAX_UINT:
+        raise ValueError("ERR_DIV_INTERNAL")
+    return c1 // b
+
+
+@enforce_types
+def bpowi(a: int, n: int) -> int:
+    b = a
+    z = b if n % 2 != 0 else BONE
+    n //= 2
+    while n != 0:
+        b = bmul(b, b)
+        if n % 2 != 0:
+            z = bmul(z, b)
+        n //= 2
+    return z
+
+
+@enforce_types
+def bpow(base: int, exp: int) -> int:
+    if base < MIN_BPOW_BASE:
+        raise ValueError("ERR_BPOW_BASE_TOO_LOW")
+    if base > MAX_BPOW_BASE:
+        raise ValueError("ERR_BPOW_BASE_TOO_HIGH")
+    whole = bfloor(exp)
+    remain = bsub(exp, whole)
+    wholePow = bpowi(base, btoi(whole))
+    if remain == 0:
+        return wholePow
+    partialResult = bpowApprox(base, remain, BPOW_PRECISION)
+    return bmul(wholePow, partialResult)
+
+
+@enforce_types
+def bpowApprox(base: int, exp: int, precision: int) -> int:
+    a = exp
+    x, xneg = bsubSign(base, BONE)
+    term = BONE
+    total = term
+    negative = False
+    i = 1
+    while term >= precision:
+        bigK = i * BONE
+        c, cneg = bsubSign(a, bsub(bigK, BONE))
+        term = bmul(term, bmul(c, x))
+        term = bdiv(term, bigK)
+        if term == 0:
+            break
+        if xneg:
+            negative = not negative
+        if cneg:
+            negative = not negative
+        if negative:
+            total = bsub(total, term)
+        else:
+            total = badd(total, term)
+        i += 1
+    return total
+
+
+# ========================================================================
+# BMath.sol, oceanv3
+@enforce_types
+def calcSpotPrice(
+    tokenBalanceIn: int,
+    tokenWeightIn: int,
+    tokenBalanceOut: int,
+    tokenWeightOut: int,
+    swapFee: int,
+) -> int:
+    numer = bdiv(tokenBalanceIn, tokenWeightIn)
+    denom = bdiv(tokenBalanceOut, tokenWeightOut)
+    ratio = bdiv(numer, denom)
+    scale = bdiv(BONE, bsub(BONE, swapFee))
+    return bmul(ratio, scale)
+
+
+@enforce_types
+def calcOutGivenIn(  # pylint: disable=too-many-arguments
+    tokenBalanceIn: int,
+    tokenWeightIn: int,
+    tokenBalanceOut: int,
+    tokenWeightOut: int,
+    tokenAmountIn: int,
+    swapFee: int,
+) -> int:
+    weightRatio = bdiv(tokenWeightIn, tokenWeightOut)
+    adjustedIn = bsub(BONE, swapFee)
+    adjustedIn = bmul(tokenAmountIn, adjustedIn)
+    y = bdiv(tokenBalanceIn, badd(tokenBalanceIn, adjustedIn))
+    foo = bpow(y, weightRatio)
+    bar = bsub(BONE, foo)
+    return bmul(tokenBalanceOut, bar)
+
+
+@enforce_types
+def calcInGivenOut(  # pylint: disable=too-many-arguments
+    tokenBalanceIn: int,
+    tokenWeightIn: int,
+    tokenBalanceOut: int,
+    tokenWeightOut: int,
+    tokenAmountOut: int,
+    swapFee: int,
+) -> int:
+    weightRatio = bdiv(tokenWeightOut, tokenWeightIn)
+    diff = bsub(tokenBalanceOut, tokenAmountOut)
+    y = bdiv(tokenBalanceOut, diff)
+    foo = bpow(y, weightRatio)
+    foo = bsub(foo, BONE)
+    tokenAmountIn = bsub(BONE, swapFee)
+    return bdiv(bmul(tokenBalanceIn, foo), tokenAmountIn)
+
+
+@enforce_types
+def calcPoolOutGivenSingleIn(  # pylint: disable=too-many-arguments
+    tokenBalanceIn: int,
+    tokenWeightIn: int,
+    poolSupply: int,
+    totalWeight: int,
+    tokenAmountIn: int,
+    swapFee: int,
+) -> int:
+    normalizedWeight = bdiv(tokenWeightIn, totalWeight)
+    zaz = bmul(bsub(BONE, normalizedWeight), swapFee)
+    tokenAmountInAfterFee = bmul(tokenAmountIn, bsub(BONE, zaz))
+    newTokenBalanceIn = badd(tokenBalanceIn, tokenAmountInAfterFee)
+    tokenInRatio = bdiv(newTokenBalanceIn, tokenBalanceIn)
+    poolRatio = bpow(tokenInRatio, normalizedWeight)
+    newPoolSupply = bmul(poolRatio, poolSupply)
+    return bsub(newPoolSupply, poolSupply)
+
+
+@enforce_types
+def calcSingleInGivenPoolOut(  # pylint: disable=too-many-arguments
+    tokenBalanceIn: int,
+    tokenWeightIn: int,
+    poolSupply: int,
+    totalWeight: int,
+    poolAmountOut: int,
+    swapFee: int,
+) -> int:
+    normalizedWeight = bdiv(tokenWeightIn, totalWeight)
+    newPoolSupply = badd(poolSupply, poolAmountOut)
+    poolRatio = bdiv(newPoolSupply, poolSupply)
+    boo = bdiv(BONE, normalizedWeight)
+    tokenInRatio = bpow(poolRatio, boo)
+    newTokenBalanceIn = bmul(tokenInRatio, tokenBalanceIn)
+    tokenAmountInAfterFee = bsub(newTokenBalanceIn, tokenBalanceIn)
+    zar = bmul(bsub(BONE, normalizedWeight), swapFee)
+    return bdiv(tokenAmountInAfterFee, bsub(BONE, zar))
+
+
+@enforce_types
+def calcSingleOutGivenPoolIn(  # pylint: disable=too-many-arguments
+    tokenBalanceOut: int,
+    tokenWeightOut: int,
+    poolSupply: int,
+    totalWeight: int,
+    poolAmountIn: int,
+    swapFee: int,
+) -> int:
+    normalizedWeight = bdiv(tokenWeightOut, totalWeight)
+    poolAmountInAfterExitFee = bmul(poolAmountIn, bsub(BONE, EXIT_FEE))
+    newPoolSupply = bsub(poolSupply, poolAmountInAfterExitFee)
+    poolRatio = bdiv(newPoolSupply, poolSupply)
+    tokenOutRatio = bpow(poolRatio, bdiv(BONE, normalizedWeight))
+    newTokenBalanceOut = bmul(tokenOutRatio, tokenBalanceOut)
+    tokenAmountOutBeforeSwapFee = bsub(tokenBalanceOut, newTokenBalanceOut)
+    zaz = bmul(bsub(BONE, normalizedWeight), swapFee)
+    return bmul(tokenAmountOutBeforeSwapFee, bsub(BONE, zaz))
+
+
+@enforce_types
+def calcPoolInGivenSingleOut(  # pylint: disable=too-many-arguments
+    tokenBalanceOut: int,
+    tokenWeightOut: int,
+    poolSupply: int,
+    totalWeight: int,
+    tokenAmountOut: int,
+    swapFee: int,
+) -> int:
+    normalizedWeight = bdiv(tokenWeightOut, totalWeight)
+    zoo = bsub(BONE, normalizedWeight)
+    zar = bmul(zoo, swapFee)
+    tokenAmountOutBeforeSwapFee = bdiv(tokenAmountOut, bsub(BONE, zar))
+    newTokenBalanceOut = bsub(tokenBalanceOut, tokenAmountOutBeforeSwapFee)
+    tokenOutRatio = bdiv(newTokenBalanceOut, tokenBalanceOut)
+    poolRatio = bpow(tokenOutRatio, normalizedWeight)
+    newPoolSupply = bmul(poolRatio, poolSupply)
+    poolAmountInAfterExitFee = bsub(poolSupply, newPoolSupply)
+    return bdiv(poolAmountInAfterExitFee, bsub(BONE, EXIT_FEE))
+
+
+# ========================================================================
+# BMath.sol, oceanv4. fees = (LP swap fee, OPC fee, publish market fee)
+@enforce_types
+def calcSpotPriceV4(  # pylint: disable=too-many-arguments
+    tokenBalanceIn: int,
+    tokenWeightIn: int,
+    tokenBalanceOut: int,
+    tokenWeightOut: int,
+    fees: Tuple[int, int, int],
+    consumeMarketSwapFee: int,
+) -> int:
+    """Like BPool.getSpotPrice()"""
+    swapFee, opcFee, publishMarketFee = fees
+    numer = bdiv(tokenBalanceIn, tokenWeightIn)
+    denom = bdiv(tokenBalanceOut, tokenWeightOut)
+    ratio = bdiv(numer, denom)
+    totalFee = swapFee + opcFee + publishMarketFee + consumeMarketSwapFee
+    scale = bdiv(BONE, bsub(BONE, totalFee))
+    return bmul(ratio, scale)
+
+
+@enforce_types
+def calcOutGivenInV4(  # pylint: disable=too-many-arguments
+    tokenBalanceIn: int,
+    tokenWeightIn: int,
+    tokenBalanceOut: int,
+    tokenWeightOut: int,
+    tokenAmountIn: int,
+    fees: Tuple[int, int, int],
+    consumeMarketSwapFee: int,
+) -> Tuple[int, int, int, int, int]:
+    """Like BPool.getAmountOutExactIn(). Returns (tokenAmountOut, LP fee,
+    OPC fee, publish market fee, consume market fee), fees in tokenIn"""
+    swapFee, opcFee, publishMarketFee = fees
+    weightRatio = bdiv(tokenWeightIn, tokenWeightOut)
+    feeAmounts = _feeAmountsV4(
+        tokenAmountIn, swapFee, opcFee, publishMarketFee, consumeMarketSwapFee
+    )
+    totalFee = swapFee + opcFee + publishMarketFee + consumeMarketSwapFee
+    adjustedIn = bsub(BONE, totalFee)
+    adjustedIn = bmul(tokenAmountIn, adjustedIn)
+    y = bdiv(tokenBalanceIn, badd(tokenBalanceIn, adjustedIn))
+    foo = bpow(y, weightRatio)
+    bar = bsub(BONE, foo)
+    tokenAmountOut = bmul(tokenBalanceOut, bar)
+    return (tokenAmountOut,) + feeAmounts
+
+
+@enforce_types
+def calcInGivenOutV4(  # pylint: disable=too-many-arguments
+    tokenBalanceIn: int,
+    tokenWeightIn: int,
+    tokenBalanceOut: int,
+    tokenWeightOut: int,
+    tokenAmountOut: int,
+    fees: Tuple[int, int, int],
+    consumeMarketSwapFee: int,
+) -> Tuple[int, int, int, int, int]:
+    """Like BPool.getAmountInExactOut(). Returns (tokenAmountIn, LP fee,
+    OPC fee, publish market fee, consume market fee), fees in tokenIn"""
+    swapFee, opcFee, publishMarketFee = fees
+    weightRatio = bdiv(tokenWeightOut, tokenWeightIn)
+    diff = bsub(tokenBalanceOut, tokenAmountOut)
+    y = bdiv(tokenBalanceOut, diff)
+    foo = bpow(y, weightRatio)
+    foo = bsub(foo, BONE)
+    totalFee = swapFee + opcFee + publishMarketFee + consumeMarketSwapFee
+    tokenAmountIn = bdiv(bmul(tokenBalanceIn, foo), bsub(BONE, totalFee))
+    feeAmounts = _feeAmountsV4(
+        tokenAmountIn, swapFee, opcFee, publishMarketFee, consumeMarketSwapFee
+    )
+    return (tokenAmountIn,) + feeAmounts
+
+
+@enforce_types
+def _feeAmountsV4(
+    tokenAmountIn: int,
+    swapFee: int,
+    opcFee: int,
+    publishMarketFee: int,
+    consumeMarketSwapFee: int,
+) -> Tuple[int, int, int, int]:
+    """(LP fee, OPC fee, publish market fee, consume market fee) amounts"""
+    return tuple(
+        bsub(tokenAmountIn, bmul(tokenAmountIn, bsub(BONE, fee)))
+        for fee in [swapFee, opcFee, publishMarketFee, consumeMarketSwapFee]
+    )
@@ -0,0 +1,36 @@
+"""
+Chain reverts and resets, for modules that cache chain state.
+
+brownie tells each object given to its _revert_register() when the chain
+gets reverted to a height, or reset. Here, one such object calls the funcs
+given to onRevert(), with that height. A reset is a revert to height 0.
+"""
+from typing import Callable, List
+
+_FUNCS: List[Callable[[int], None]] = []
+_HOOK = None  # brownie keeps a weakref, so it's kept here
+
+
+class _RevertHook:
+    """Gets told by brownie when the chain gets reverted or reset"""
+
+    def _revert(self, height: int) -> None:
+        for func in _FUNCS:
+            func(height)
+
+    def _reset(self) -> None:
+        self._revert(0)
+
+
+def onRevert(func: Callable[[int], None]) -> None:
+    """Call func(height) at each chain revert, and func(0) at each reset.
+    Giving the same func again has no effect"""
+    global _HOOK  # pylint: disable=global-statement
+    if _HOOK is None:
+        # pylint: disable=import-outside-toplevel
+        from brownie.network.state import _revert_register
+
+        _HOOK = _RevertHook()
+        _revert_register(_HOOK)
+    if func not in _FUNCS:
+        _FUNCS.append(func)
@@ -0,0 +1,210 @@
+"""
+Where a run's chain time goes: # RPCs, # txs, gas used, and seconds spent
+in RPCs, per (agent, contract, method, tick). Eg to find that most of it
+is BPool.getSpotPrice reads by the log function, or one agent's approves.
+
+With CHAIN_STATS = True in tokenspice.ini, a web3 middleware sees every
+request to the chain, and names it by the contract and method it calls,
+as brownie knows them. Requests that call no contract are named by their
+RPC method, under contract "-". SimEngine says which agent is stepping,
+and the tick. Runs log the totals as extra columns, and store the full
+breakdown in chainstats.csv, for `tsp showstats`.
+"""
+import contextlib
+import csv
+import os
+import time
+from typing import Dict, List, Tuple
+
+from enforce_typing import enforce_types
+
+# magic numbers: filename within a run's output directory
+CSV_FILENAME = "chainstats.csv"
+
+STATS = ["n_rpcs", "n_txs", "gas_used", "rpc_seconds"]
+CSV_HEADER = ["agent", "contract", "method", "tick"] + STATS
+
+SEND_METHODS = ["eth_sendTransaction", "eth_sendRawTransaction"]
+
+# who's making requests: an agent's name, or eg "log". "-" = none, eg setup
+_AGENT = "-"
+_TICK = 0
+
+_STATS: Dict[tuple, list] = {}  # (agent, contract, method, tick) : STATS
+_PENDING_TXS: Dict[str, tuple] = {}  # tx hash : key, until its receipt
+_CALL_NAMES: Dict[Tuple[str, str], Tuple[str, str]] = {}  # (to, selector) : ""
+
+
+def install() -> None:
+    """Count requests to the chain that brownie is connected to, from now"""
+    # pylint: disable=import-outside-toplevel
+    from brownie.network.web3 import web3
+    from web3.middleware import Web3Middleware
+
+    class ChainStatsMiddleware(Web3Middleware):
+        def wrap_make_request(self, make_request):
+            def middleware(method, params):
+                t0 = time.perf_counter()
+                response = make_request(method, params)
+                recordRequests([(method, params)], [response], time.perf_counter() - t0)
+                return response
+
+            return middleware
+
+    if "chainstats" not in web3.middleware_onion:
+        web3.middleware_onion.add(ChainStatsMiddleware, name="chainstats")
+
+
+@contextlib.contextmanager
+def attributeTo(agent_name: str):
+    """Count requests made within this scope as agent_name's"""
+    global _AGENT  # pylint: disable=global-statement
+    prev_agent = _AGENT
+    _AGENT = agent_name
+    try:
+        yield
+    finally:
+        _AGENT = prev_agent
+
+
+@enforce_types
+def setTick(tick: int) -> None:
+    global _TICK  # pylint: disable=global-statement
+    _TICK = tick
+
+
+def recordRequests(requests: list, responses: list, seconds: float) -> None:
+    """Count the (method, params) requests, and their responses. 'seconds'
+    is their total wall time. Eg util.rpcbatch sends many at once"""
+    for (method, params), response in zip(requests, responses):
+        key = (_AGENT,) + _requestName(method, params) + (_TICK,)
+        stats = _STATS.setdefault(key, [0, 0, 0, 0.0])
+        stats[0] += 1
+        stats[3] += seconds / len(requests)
+
+        result = response.get("result") if response is not None else None
+        if method in SEND_METHODS:
+            stats[1] += 1
+            if result is not None:
+                _PENDING_TXS[_hexstr(result)] = key
+        elif method == "eth_getTransactionReceipt" and result:
+            send_key = _PENDING_TXS.pop(_hexstr(params[0]), None)
+            if send_key is not None:
+                _STATS[send_key][2] += _toInt(result["gasUsed"])
+
+
+def totals() -> Dict[str, float]:
+    """Dict of STATS, summed over all"""
+    return {
+        name: sum(stats[i] for stats in _STATS.values()) for i, name in enumerate(STATS)
+    }
+
+
+@enforce_types
+def writeCsv(output_dir: str) -> str:
+    """Store all stats in output_dir. Returns the filename"""
+    filename = os.path.join(output_dir, CSV_FILENAME)
+    with open(filename, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(CSV_HEADER)
+        for key, stats in sorted(_STATS.items(), key=lambda item: item[0][3]):
+            writer.writerow(list(key) + stats)
+    return filename
+
+
+@enforce_types
+def summary(filename: str, num_show: int, sort_by: str) -> str:
+    """Report of the chainstats.csv 'filename': stats per (agent, contract,
+    method), summed over ticks. Top 'num_show', by sort_by in STATS"""
+    assert sort_by in STATS, sort_by
+    grouped: Dict[tuple, List[float]] = {}  # (agent, contract, method) : ""
+    with open(filename, newline="") as f:
+        for row in csv.DictReader(f):
+            stats = grouped.setdefault(
+                (row["agent"], row["contract"], row["method"]), [0, 0, 0, 0.0]
+            )
+            for i, name in enumerate(STATS):
+                stats[i] += float(row[name])
+
+    rows = sorted(grouped.items(), key=lambda item: -item[1][STATS.index(sort_by)])
+    total = [sum(stats[i] for _, stats in rows) for i in range(len(STATS))]
+    s = [f"{'agent':<24} {'contract.method':<40}"]
+    s[0] += "".join(f" {name:>12}" for name in STATS)
+    for (agent, contract, method), stats in rows[:num_show] + [
+        (("total", "", ""), total)
+    ]:
+        name = f"{contract}.{method}" if contract else ""
+        s += [f"{agent:<24} {name:<40}" + _formatStats(stats)]
+    return "\n".join(s)
+
+
+def reset() -> None:
+    """Zero all stats"""
+    global _AGENT, _TICK  # pylint: disable=global-statement
+    _AGENT, _TICK = "-", 0
+    _STATS.clear()
+    _PENDING_TXS.clear()
+    _CALL_NAMES.clear()
+
+
+def _formatStats(stats: list) -> str:
+    n_rpcs, n_txs, gas_used, rpc_seconds = stats
+    return (
+        f" {int(n_rpcs):>12} {int(n_txs):>12} {int(gas_used):>12}"
+        f" {rpc_seconds:>12.3f}"
+    )
+
+
+def _requestName(method: str, params) -> Tuple[str, str]:
+    """(contract name, method name) that the request calls. Else ("-",
+    RPC method)"""
+    tx = None
+    if method in ["eth_call", "eth_estimateGas", "eth_sendTransaction"]:
+        tx = params[0]
+    elif method == "eth_sendRawTransaction":
+        tx = _decodeRawTx(params[0])
+    if tx is None:
+        return ("-", method)
+    if not tx.get("to"):
+        return ("-", "deploy")
+    return _callName(_hexstr(tx["to"]), _hexstr(tx.get("data") or b""))
+
+
+def _callName(to: str, data: str) -> Tuple[str, str]:
+    selector = data[:10]
+    key = (to.lower(), selector)
+    if key not in _CALL_NAMES:
+        # pylint: disable=import-outside-toplevel, protected-access
+        from brownie.network import state
+        import eth_utils
+
+        address = eth_utils.to_checksum_address(to)
+        contract = state._find_contract(address)
+        if contract is None:
+            _CALL_NAMES[key] = ("?", selector)
+        else:
+            name = contract.get_method(data) or selector
+            _CALL_NAMES[key] = (contract._name, name)
+    return _CALL_NAMES[key]
+
+
+def _decodeRawTx(raw):
+    """Dict with 'to' and 'data' of a signed tx. None if not a typed tx"""
+    # pylint: disable=import-outside-toplevel
+    from eth_account.typed_transactions import TypedTransaction
+    from hexbytes import HexBytes
+
+    raw = HexBytes(raw)
+    if not raw or raw[0] > 0x7F:  # legacy tx
+        return None
+    return TypedTransaction.from_bytes(raw).as_dict()
+
+
+def _hexstr(value) -> str:
+    if isinstance(value, str):
+        return value.lower()
+    return "0x" + bytes(value).hex()
+
+
+def _toInt(value) -> int:
+    return int(value, 16) if isinstance(value, str) else int(value)
@@ -6,8 +6,6 @@ import configparser
 import math
 import os
 
-import brownie
-from brownie._config import CONFIG  # pylint: disable=no-name-in-module
 from enforce_typing import enforce_types  # pylint: disable=unused-import
 
 # from sol080.contracts.oceanv4.test.test_SideStaking import ZERO_ADDRESS  # pylint: disable=unused-import
@@ -17,14 +15,6 @@ from util.configutil import CONF_FILE_PATH
 config = configparser.ConfigParser()
 config.read(os.path.expanduser(CONF_FILE_PATH))
 
-BROWNIE_PROJECT057 = brownie.project.load("./sol057/", name="Project057")
-BROWNIE_PROJECT080 = brownie.project.load("./sol080/", name="Project080")
-
-# brownie auto-reverts in "development". If needed, set to "ganache"
-brownie.network.connect("development")
-
-GOD_ACCOUNT = brownie.network.accounts[9]
-
 SAFETY = config["general"].getboolean("SAFETY")
 assert SAFETY is not None
 
@@ -38,7 +28,51 @@ if not SAFETY:
 SILENT = config["general"].getboolean("SILENT")
 assert SILENT is not None
 
-CONFIG.argv["silent"] = SILENT  # brownie config
+# "evm" = SimEngine mines a block per tick; "noevm" = time is kept purely
+# in Python and brownie is never imported; "auto" = "noevm" if all of the
+# netlist's agents are NoEvm, else "evm"
+ENGINE_MODE = config["general"].get("ENGINE_MODE", fallback="auto")
+assert ENGINE_MODE in ["auto", "evm", "noevm"], ENGINE_MODE
+
+# how often the balance ledger checks its token balances against the
+# chain: "always", "never", or N = every N ticks. "never" is fastest
+BALANCE_VERIFY = config["general"].get("BALANCE_VERIFY", fallback="100")
+assert BALANCE_VERIFY in ["always", "never"] or (
+    BALANCE_VERIFY.isdigit() and int(BALANCE_VERIFY) > 0
+), BALANCE_VERIFY
+
+# fees of each tx: "chain" = read them from the chain, once per block.
+# Or "<priority_fee>,<max_fee>" in wei = always use these. For local chains
+TX_FEES = config["general"].get("TX_FEES", fallback="chain")
+FIXED_FEES = None if TX_FEES == "chain" else tuple(map(int, TX_FEES.split(",")))
+assert FIXED_FEES is None or len(FIXED_FEES) == 2, TX_FEES
+
+# where oceanv3 tokens & pools live: "evm" = contracts on chain; "shadow" =
+# util.shadowamm, in Python. "shadow" runs with no EVM, ie ENGINE_MODE noevm
+POOL_BACKEND = config["general"].get("POOL_BACKEND", fallback="evm")
+assert POOL_BACKEND in ["evm", "shadow"], POOL_BACKEND
+
+# agent keypairs that the local chain funds with ETH at genesis, after
+# its 10 base accounts. EVM wallets claim them, rather than creating and
+# funding new accounts. See util.agentkeys
+N_AGENT_KEYS = config["general"].getint("N_AGENT_KEYS", fallback=0)
+assert N_AGENT_KEYS >= 0, N_AGENT_KEYS
+
+# the local chain: "ganache" = brownie's development chain, over HTTP
+# JSON-RPC; "inprocess" = py-evm in this process, via eth-tester. See
+# util.inprocesschain
+CHAIN_BACKEND = config["general"].get("CHAIN_BACKEND", fallback="ganache")
+assert CHAIN_BACKEND in ["ganache", "inprocess"], CHAIN_BACKEND
+
+# True = agent wallets send txs via util.fasttx: signed here, no brownie
+# receipts. False = via brownie, like other txs
+FAST_TXS = config["general"].getboolean("FAST_TXS", fallback=True)
+assert FAST_TXS is not None
+
+# True = count RPCs, txs, gas and RPC time per agent, contract method and
+# tick, via util.chainstats. Runs log totals, and store chainstats.csv
+CHAIN_STATS = config["general"].getboolean("CHAIN_STATS", fallback=False)
+assert CHAIN_STATS is not None
 
 # big numbers
 
@@ -61,7 +95,71 @@ BITCOIN_NUM_HALF_LIVES = 34
 GASLIMIT_DEFAULT = 5000000
 BURN_ADDRESS = "0x000000000000000000000000000000000000dEaD"
 
-OPF_ACCOUNT = brownie.network.accounts[8]
-OPF_ADDRESS = OPF_ACCOUNT.address
-
 ZERO_ADDRESS = "0x0000000000000000000000000000000000000000"
+
+# port of the local chain that brownie connects to, or launches if needed.
+# None = brownie's default. Parallel workers each set their own port
+GANACHE_PORT = None
+
+
+def __getattr__(name: str):
+    """Called on module attribute lookup, if normal lookup fails (PEP 562)"""
+    if name == "BROWNIE_PROJECT057":
+        _loadProject("BROWNIE_PROJECT057", "./sol057/", "Project057")
+    elif name == "BROWNIE_PROJECT080":
+        _loadProject("BROWNIE_PROJECT080", "./sol080/", "Project080")
+    elif name in ["GOD_ACCOUNT", "OPF_ACCOUNT", "OPF_ADDRESS"]:
+        connectToChain()
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return globals()[name]
+
+
+def _loadProject(name: str, project_path: str, project_name: str):
+    import brownie  # pylint: disable=import-outside-toplevel
+
+    _configBrownie()
+    globals()[name] = brownie.project.load(project_path, name=project_name)
+
+
+def connectToChain():
+    """Connect brownie to the network, if not done yet. Sets the accounts."""
+    # pylint: disable=global-statement
+    global GOD_ACCOUNT, OPF_ACCOUNT, OPF_ADDRESS
+    if "GOD_ACCOUNT" in globals():
+        return
+    import brownie  # pylint: disable=import-outside-toplevel
+
+    _configBrownie()
+
+    # brownie auto-reverts in "development". If needed, set to "ganache"
+    if not brownie.network.is_connected():
+        if CHAIN_BACKEND == "inprocess":
+            from util import inprocesschain  # pylint: disable=import-outside-toplevel
+
+            inprocesschain.connect()
+        else:
+            brownie.network.connect("development")
+
+    if CHAIN_STATS:
+        from util import chainstats  # pylint: disable=import-outside-toplevel
+
+        chainstats.install()
+
+    GOD_ACCOUNT = brownie.network.accounts[9]
+    OPF_ACCOUNT = brownie.network.accounts[8]
+    OPF_ADDRESS = OPF_ACCOUNT.address
+
+
+def _configBrownie():
+    # pylint: disable=import-outside-toplevel, no-name-in-module
+    from brownie._config import CONFIG
+
+    CONFIG.argv["silent"] = SILENT  # brownie config
+    if GANACHE_PORT is not None:
+        CONFIG.networks["development"]["cmd_settings"]["port"] = GANACHE_PORT
+    if N_AGENT_KEYS > 0:
+        from util.agentkeys import N_BASE_ACCOUNTS
+
+        n_accounts = N_BASE_ACCOUNTS + N_AGENT_KEYS
+        CONFIG.networks["development"]["cmd_settings"]["accounts"] = n_accounts
@@ -0,0 +1,83 @@
+"""
+Infrastructure contracts (tokens, templates, factories, ..), deployed once
+per chain, then reused.
+
+deployOnce() keys each contract by (chain id, project, contract name,
+constructor args). The first call per key deploys it, from GOD_ACCOUNT.
+Later calls return that contract, with no RPCs. Until the chain got reset:
+then brownie marks the contract as reverted, and the next call deploys a
+new one.
+
+Modules that cache what they set up on these contracts (eg oceanv4util's
+shared router) give those caches to registerCache(), so that reset()
+clears them too.
+"""
+from typing import Dict, List
+
+from enforce_typing import enforce_types
+
+from util import constants
+from util.tx import txdict
+
+_CONTRACTS: Dict[tuple, object] = {}  # key : brownie Contract
+_CACHES: List[dict] = []  # see registerCache()
+
+# how well the registry does. See deployStats()
+_DEPLOY_STATS: Dict[str, int] = {"n_calls": 0, "n_deploys": 0}
+
+
+@enforce_types
+def deployOnce(project_name: str, contract_name: str, *args):
+    """The contract_name contract of constants.<project_name> (eg
+    "BROWNIE_PROJECT057"), deployed with constructor args. Deploys it if
+    this chain doesn't have it yet"""
+    # pylint: disable=import-outside-toplevel
+    import brownie
+    from brownie.network import chain
+
+    _DEPLOY_STATS["n_calls"] += 1
+    constants.connectToChain()
+    key = (chain.id, project_name, contract_name) + tuple(_keyArg(a) for a in args)
+    contract = _CONTRACTS.get(key)
+    try:
+        if contract is not None:
+            x = contract.address  # "" # pylint: disable=unused-variable
+    except brownie.exceptions.ContractNotFound:  # chain got reset
+        contract = None
+    if contract is None:
+        container = getattr(getattr(constants, project_name), contract_name)
+        contract = _CONTRACTS[key] = container.deploy(
+            *args, txdict(constants.GOD_ACCOUNT)
+        )
+        _DEPLOY_STATS["n_deploys"] += 1
+    return contract
+
+
+def deployStats() -> Dict[str, int]:
+    """Return dict of: # deployOnce() calls, # of them that deployed"""
+    return dict(_DEPLOY_STATS)
+
+
+def registerCache(cache: dict) -> dict:
+    """Have reset() clear cache too. Returns cache"""
+    _CACHES.append(cache)
+    return cache
+
+
+def reset() -> None:
+    """Forget all contracts and registered caches, and zero the stats. Eg to
+    deploy anew"""
+    _CONTRACTS.clear()
+    for cache in _CACHES:
+        cache.clear()
+    for key in _DEPLOY_STATS:
+        _DEPLOY_STATS[key] = 0
+
+
+def _keyArg(arg):
+    """Constructor arg, as a hashable part of a registry key"""
+    if hasattr(arg, "address"):  # contract or account
+        return arg.address
+    if isinstance(arg, list):
+        return tuple(_keyArg(a) for a in arg)
+    return arg
@@ -0,0 +1,110 @@
+"""
+Differential runs: run a netlist on both pool backends side by side, EVM
+and shadow (util.shadowamm), and flag where they diverge.
+
+Both runs get the same seed, and step in lockstep. After each tick, their
+logged values must be equal, exactly: shadow pools compute the same base18
+ints as the contracts. So do failures: if one run raises, the other must
+too. The first difference is a divergence, eg a shadow pool that's missing
+a require of BPool's.
+"""
+import contextlib
+import logging
+import random
+from typing import Dict, Optional
+
+from enforce_typing import enforce_types
+
+from util import constants, globaltokens
+from util.sweeputil import importNetlistModule
+
+log = logging.getLogger("master")
+
+BACKENDS = ["evm", "shadow"]
+
+
+@enforce_types
+def runDifferential(
+    netlist_str: str, n_ticks: int, seed: Optional[int] = None
+) -> Optional[str]:
+    """Run the netlist for n_ticks on each backend, in lockstep.
+    Returns None if they agree, else a description of the first divergence."""
+    # pylint: disable=import-outside-toplevel
+    from engine.SimEngine import SimEngine
+
+    if seed is None:
+        seed = random.randrange(2**32)
+    log.info("Differential: %d ticks of %s, seed %d", n_ticks, netlist_str, seed)
+    netlist_module = importNetlistModule(netlist_str)
+
+    engines = {}
+    for backend in BACKENDS:
+        with _poolBackend(backend), globaltokens.batchedFunding():
+            state = netlist_module.SimState()
+            state.rng.seed(seed)
+            engines[backend] = SimEngine(
+                state,
+                None,
+                netlist_module.netlist_createLogData,
+                use_evm=(backend == "evm"),
+            )
+
+    for tick in range(n_ticks):
+        outcomes = {}  # backend : (dataheader, datarow), or error string
+        for backend, engine in engines.items():
+            with _poolBackend(backend):
+                outcomes[backend] = _stepEngine(engine)
+
+        divergence = _divergence(tick, outcomes)
+        if divergence is not None:
+            log.warning("Differential: %s", divergence)
+            return divergence
+        if any(isinstance(outcome, str) for outcome in outcomes.values()):
+            log.info("Differential: both backends failed at tick %d. Stop", tick)
+            break
+
+    log.info("Differential: no divergence")
+    return None
+
+
+@enforce_types
+def _stepEngine(engine):
+    """Log, then run one tick. Returns (dataheader, datarow), or what failed"""
+    try:
+        _, dataheader, datarow = engine.createLogData()
+        engine.takeStep()
+        engine.advanceTick()
+    except Exception as e:  # pylint: disable=broad-except
+        log.debug("Step failed", exc_info=True)
+        return f"{type(e).__name__}: {e}"
+    return (dataheader, datarow)
+
+
+@enforce_types
+def _divergence(tick: int, outcomes: Dict[str, object]) -> Optional[str]:
+    evm, shadow = outcomes["evm"], outcomes["shadow"]
+    if isinstance(evm, str) or isinstance(shadow, str):
+        if isinstance(evm, str) and isinstance(shadow, str):
+            return None  # both failed. Messages differ by backend
+        return f"tick {tick}: evm -> {evm}; shadow -> {shadow}"
+
+    header, evm_row = evm
+    shadow_header, shadow_row = shadow
+    assert header == shadow_header
+    for name, evm_value, shadow_value in zip(header, evm_row, shadow_row):
+        if evm_value != shadow_value:
+            return (
+                f"tick {tick}: {name} is {evm_value} on evm, {shadow_value} on shadow"
+            )
+    return None
+
+
+@contextlib.contextmanager
+def _poolBackend(backend: str):
+    """Set POOL_BACKEND for the duration"""
+    prev_backend = constants.POOL_BACKEND
+    constants.POOL_BACKEND = backend
+    try:
+        yield
+    finally:
+        constants.POOL_BACKEND = prev_backend
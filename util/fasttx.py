@@ -0,0 +1,269 @@
+"""
+Fast txs. For each tx, brownie estimates gas, reads the nonce, then builds
+a full TransactionReceipt: it waits for confirmations, prints, and gets a
+trace if the tx reverted. Most txs of agents are approves, transfers and
+swaps whose result gets ignored, so that's overhead.
+
+Instead, sendTx() estimates gas, and signs the tx itself, with a nonce it
+tracks per account. It waits for the bare receipt and returns a
+FastReceipt: status and gas used. Events get decoded only if the caller
+asks for tx.events. Transfer events get read straight from the logs, for
+balanceledger, poolstate and allowances.
+
+FastReceipts aren't TransactionReceipts, so they stay out of brownie's tx
+history. They're kept here instead; txCounts() and txsSince() give the
+txs of both. A chain revert drops the reverted ones, like brownie does.
+
+FAST_TXS in tokenspice.ini turns it off, to send via brownie instead.
+"""
+
+import itertools
+from typing import Dict, List, Optional, Tuple
+
+from enforce_typing import enforce_types
+
+from util import chainreverts, constants
+from util.tx import txdict
+
+# gas limit of each fast tx = estimated gas * this. Like brownie's gas_buffer
+GAS_MARGIN = 1.2
+
+# keccak of "Transfer(address,address,uint256)". Not computed here: importing
+# eth_utils takes ~0.4 s, which NoEvm netlists needn't pay
+TRANSFER_TOPIC = bytes.fromhex(
+    "ddf252ad1be2c89b69c2b068fc378daa952ba7f163c4a11628f55a4df523b3ef"
+)
+
+_NONCES: Dict[str, int] = {}  # address : next nonce
+_RECEIPTS: List["FastReceipt"] = []  # fast txs sent, oldest first
+
+
+class FastReceipt:
+    """What's left of a brownie TransactionReceipt: status, gas used, and
+    Transfer events. Other events get decoded on first access of events"""
+
+    def __init__(self, receipt, sender):
+        import eth_utils  # pylint: disable=import-outside-toplevel
+
+        self.txid: str = eth_utils.to_hex(receipt["transactionHash"])
+        self.sender = sender
+        self.receiver: Optional[str] = receipt["to"]
+        self.status: int = receipt["status"]
+        self.gas_used: int = receipt["gasUsed"]
+        self.block_number: int = receipt["blockNumber"]
+        self.logs: list = receipt["logs"]
+        self._events = None
+
+        # (token address, src, dst, amount) of each Transfer event
+        self.transfers: List[Tuple[str, str, str, int]] = [
+            transfer
+            for transfer in map(_decodeTransfer, self.logs)
+            if transfer is not None
+        ]
+
+    @property
+    def events(self):
+        """All events of the tx, decoded like brownie does. On first access"""
+        if self._events is None:
+            # pylint: disable=import-outside-toplevel
+            from brownie.network import state
+            from brownie.network.event import _decode_logs
+
+            addresses = {log["address"] for log in self.logs}
+            contracts = {a: state._find_contract(a) for a in addresses}
+            self._events = _decode_logs(self.logs, contracts=contracts)
+        return self._events
+
+    def __repr__(self) -> str:
+        return f"<FastReceipt '{self.txid}' status={self.status}>"
+
+
+def sendTx(from_account, contract, method_name: str, *args):
+    """Call contract.method_name(*args) as a tx from from_account. Returns
+    a FastReceipt, or brownie's TransactionReceipt if FAST_TXS is off.
+    Raises brownie's VirtualMachineError if the tx reverted"""
+    if not constants.FAST_TXS:
+        return getattr(contract, method_name)(*args, txdict(from_account))
+
+    # pylint: disable=import-outside-toplevel
+    from brownie.exceptions import VirtualMachineError
+    from brownie.network import chain
+    from brownie.network.web3 import web3
+
+    chainreverts.onRevert(_onRevert)
+    tx_dict = txdict(from_account)
+    tx = {
+        "chainId": chain.id,
+        "from": from_account.address,
+        "to": contract.address,
+        "data": getattr(contract, method_name).encode_input(*args),
+        "value": 0,
+    }
+    try:
+        gas = web3.eth.estimate_gas(tx)
+    except _estimateErrors() as e:  # it would revert
+        raise _vmError(e) from e
+    tx["gas"] = int(gas * GAS_MARGIN)
+    tx["maxPriorityFeePerGas"] = int(tx_dict["priority_fee"])
+    tx["maxFeePerGas"] = int(tx_dict["max_fee"])
+
+    txhash = _send(from_account, tx)
+    receipt = FastReceipt(web3.eth.wait_for_transaction_receipt(txhash), from_account)
+    _RECEIPTS.append(receipt)
+    if receipt.status != 1:  # eg out of gas, or chain state changed since
+        error = "out of gas" if receipt.gas_used == tx["gas"] else "revert"
+        raise VirtualMachineError(
+            ValueError(
+                {
+                    "message": f"{method_name} reverted",
+                    "data": {receipt.txid: {"error": error}},
+                }
+            )
+        )
+    return receipt
+
+
+def transfers(tx) -> List[Tuple[str, str, str, int]]:
+    """(token address, src, dst, amount) of each Transfer event of tx: a
+    FastReceipt, or a brownie TransactionReceipt"""
+    if isinstance(tx, FastReceipt):
+        return tx.transfers
+    return [
+        (event.address, *list(event.values()))  # ERC20 and BPT name them apart
+        for event in tx.events
+        if event.name == "Transfer"
+    ]
+
+
+def logAddresses(tx) -> List[str]:
+    """Addresses of the contracts that emitted tx's events"""
+    if isinstance(tx, FastReceipt):
+        return [log["address"] for log in tx.logs]
+    return [event.address for event in tx.events]
+
+
+def txCounts() -> Tuple[int, int]:
+    """(# txs in brownie's history, # fast txs). Either gets lower when the
+    chain gets reverted"""
+    from brownie.network import history  # pylint: disable=import-outside-toplevel
+
+    return (len(history), len(_RECEIPTS))
+
+
+def txsSince(tx_counts: Tuple[int, int]) -> list:
+    """The txs of brownie's history, then the fast txs, sent after
+    txCounts() was tx_counts"""
+    from brownie.network import history  # pylint: disable=import-outside-toplevel
+
+    # brownie's history can't be sliced
+    return (
+        list(itertools.islice(history, tx_counts[0], None)) + _RECEIPTS[tx_counts[1] :]
+    )
+
+
+def reset() -> None:
+    """Forget all nonces and fast txs. Eg after the chain got reset"""
+    _NONCES.clear()
+    _RECEIPTS.clear()
+
+
+def _onRevert(height: int) -> None:
+    """Forget nonces, and the fast txs of blocks after height"""
+    _NONCES.clear()
+    _RECEIPTS[:] = [tx for tx in _RECEIPTS if tx.block_number <= height]
+
+
+def _estimateErrors() -> tuple:
+    """Exceptions that eth_estimateGas raises if the tx would revert"""
+    # pylint: disable=import-outside-toplevel
+    from web3.exceptions import ContractLogicError, Web3RPCError
+
+    if constants.CHAIN_BACKEND == "inprocess":
+        from eth_tester.exceptions import TransactionFailed
+
+        return (ContractLogicError, Web3RPCError, TransactionFailed)
+    return (ContractLogicError, Web3RPCError)
+
+
+def _vmError(e: Exception):
+    """e, of _estimateErrors(), as brownie's VirtualMachineError"""
+    # pylint: disable=import-outside-toplevel
+    from brownie.exceptions import VirtualMachineError
+    from web3.exceptions import Web3RPCError
+
+    if isinstance(e, Web3RPCError):
+        return VirtualMachineError(e)
+    data = getattr(e, "data", None)
+    if not isinstance(data, str):
+        data = "0x"
+    return VirtualMachineError(ValueError({"message": str(e), "data": data}))
+
+
+def _decodeTransfer(log) -> Optional[Tuple[str, str, str, int]]:
+    """(token address, src, dst, amount) if log is of a token's Transfer
+    event, else None. Its addresses may be indexed (most tokens), or not
+    (Simpletoken)"""
+    topics, data = log["topics"], bytes(log["data"])
+    if not topics or topics[0] != TRANSFER_TOPIC:
+        return None
+    import eth_utils  # pylint: disable=import-outside-toplevel
+
+    if len(topics) == 3:
+        src_word, dst_word, amt_word = topics[1], topics[2], data
+    elif len(topics) == 1 and len(data) == 96:
+        src_word, dst_word, amt_word = data[:32], data[32:64], data[64:]
+    else:  # eg ERC721's, with an indexed token id
+        return None
+    return (
+        log["address"],
+        eth_utils.to_checksum_address(src_word[-20:]),
+        eth_utils.to_checksum_address(dst_word[-20:]),
+        int.from_bytes(amt_word, "big"),
+    )
+
+
+def _send(from_account, tx: dict):
+    """Send tx, with from_account's next nonce. Returns its hash. If the
+    nonce was off, eg as from_account sent txs some other way, read it
+    anew and retry once"""
+    # pylint: disable=import-outside-toplevel
+    from brownie.network.web3 import web3
+
+    address = from_account.address
+    tx["nonce"] = _nextNonce(address)
+    try:
+        return _sendSigned(from_account, tx)
+    except Exception:
+        _NONCES.pop(address, None)  # unused. Read it anew
+        if web3.eth.get_transaction_count(address, "pending") == tx["nonce"]:
+            raise  # the nonce was right, so the tx was wrong
+
+    tx["nonce"] = _nextNonce(address)
+    try:
+        return _sendSigned(from_account, tx)
+    except Exception:
+        _NONCES.pop(address, None)
+        raise
+
+
+def _sendSigned(from_account, tx: dict):
+    # pylint: disable=import-outside-toplevel
+    from brownie.network.account import LocalAccount
+    from brownie.network.web3 import web3
+
+    if isinstance(from_account, LocalAccount):
+        signed = web3.eth.account.sign_transaction(tx, from_account.private_key)
+        return web3.eth.send_raw_transaction(signed.raw_transaction)
+    return web3.eth.send_transaction(tx)  # the node has its key
+
+
+@enforce_types
+def _nextNonce(address: str) -> int:
+    """Nonce for address's next tx. Read from chain once, then counted"""
+    from brownie.network.web3 import web3  # pylint: disable=import-outside-toplevel
+
+    if address not in _NONCES:
+        _NONCES[address] = web3.eth.get_transaction_count(address, "pending")
+    nonce = _NONCES[address]
+    _NONCES[address] += 1
+    return nonce
@@ -1,27 +1,26 @@
-import brownie
+import contextlib
+from typing import List, Tuple
+
 from enforce_typing import enforce_types
 
-from util.constants import BROWNIE_PROJECT057, GOD_ACCOUNT
+from util import constants, shadowamm
 from util.base18 import toBase18
+from util.contractregistry import deployOnce
+from util.multisend import MultiSendBatch
 from util.tx import txdict
 
-_OCEAN_TOKEN = None
+# funds that fundFromAbove() queued, within batchedFunding()
+_BATCHING_FUNDS = False
+_PENDING_FUNDS: List[Tuple[str, int, int]] = []  # (dst addr, ETH, OCEAN base)
 
 
 @enforce_types
 def OCEANtoken():
-    global _OCEAN_TOKEN  # pylint: disable=global-statement
-    try:
-        token = _OCEAN_TOKEN  # may trigger failure
-        if token is not None:
-            x = token.address  # "" # pylint: disable=unused-variable
-    except brownie.exceptions.ContractNotFound:
-        token = None
-    if token is None:
-        token = _OCEAN_TOKEN = BROWNIE_PROJECT057.Simpletoken.deploy(
-            "OCEAN", "OCEAN", 18, toBase18(1e9), txdict(GOD_ACCOUNT)
-        )
-    return token
+    if constants.POOL_BACKEND == "shadow":
+        return shadowamm.OCEANtoken()
+    return deployOnce(
+        "BROWNIE_PROJECT057", "Simpletoken", "OCEAN", "OCEAN", 18, toBase18(1e9)
+    )
 
 
 @enforce_types
@@ -31,4 +30,61 @@ def OCEAN_address() -> str:
 
 @enforce_types
 def fundOCEANFromAbove(dst_address: str, amount_base: int):
-    OCEANtoken().transfer(dst_address, amount_base, txdict(GOD_ACCOUNT))
+    if constants.POOL_BACKEND == "shadow":
+        shadowamm.OCEANtoken().mint(shadowamm.GOD_ADDRESS, dst_address, amount_base)
+        return
+    OCEANtoken().transfer(dst_address, amount_base, txdict(constants.GOD_ACCOUNT))
+
+
+@enforce_types
+def fundFromAbove(dst_address: str, ETH_base: int, OCEAN_base: int) -> None:
+    """Send ETH (in wei) and OCEAN to dst_address, from GOD_ACCOUNT, in one
+    tx. Within batchedFunding(), queue them instead"""
+    _PENDING_FUNDS.append((dst_address, ETH_base, OCEAN_base))
+    if not _BATCHING_FUNDS:
+        sendPendingFunds()
+
+
+@contextlib.contextmanager
+def batchedFunding():
+    """Queue the fundFromAbove()s within, then send them all at once, via
+    MultiSend. Eg creating 500 agents then takes a few txs, not 1000+.
+    Code within that sends txs from a funded account must call
+    sendPendingFunds() first; AgentWalletEvm does. If the code within
+    raises, the queue is dropped"""
+    global _BATCHING_FUNDS  # pylint: disable=global-statement
+    prev_batching = _BATCHING_FUNDS
+    _BATCHING_FUNDS = True
+    completed = False
+    try:
+        yield
+        completed = True
+    finally:
+        _BATCHING_FUNDS = prev_batching
+        if not prev_batching:
+            if completed:
+                sendPendingFunds()
+            else:  # drop them, so they don't leak into the next run
+                _PENDING_FUNDS.clear()
+
+
+@enforce_types
+def pendingFunds(dst_address: str) -> Tuple[int, int]:
+    """(ETH, OCEAN) that fundFromAbove() queued for dst_address, not sent yet"""
+    funds = [(ETH, OCEAN) for dst, ETH, OCEAN in _PENDING_FUNDS if dst == dst_address]
+    return (sum(ETH for ETH, _ in funds), sum(OCEAN for _, OCEAN in funds))
+
+
+def sendPendingFunds() -> None:
+    """Send the funds that fundFromAbove() queued, if any"""
+    if not _PENDING_FUNDS:
+        return
+    pending_funds = list(_PENDING_FUNDS)
+    _PENDING_FUNDS.clear()
+
+    OCEAN = OCEANtoken()
+    batch = MultiSendBatch()
+    for dst_address, ETH_base, OCEAN_base in pending_funds:
+        batch.add(None, dst_address, ETH_base)
+        batch.add(OCEAN, dst_address, OCEAN_base)
+    batch.send(constants.GOD_ACCOUNT)
@@ -0,0 +1,114 @@
+"""
+A chain that runs inside this Python process: py-evm, via eth-tester. No
+ganache, so no JSON-RPC over HTTP. Each request is a Python call instead.
+
+connect() puts it behind brownie, where brownie's own "development" chain
+would be. So brownie's accounts, contracts and chain.mine() etc work as
+usual, and the rest of TokenSPICE doesn't know the difference. The chain
+has 10 base accounts plus N_AGENT_KEYS agent ones (util.agentkeys), all
+funded at genesis.
+
+Select it with CHAIN_BACKEND = inprocess, in tokenspice.ini. It needs
+eth-tester with py-evm: `pip install "eth-tester[py-evm]" coincurve`.
+coincurve is optional: py-evm recovers each tx's sender, and without it
+that's pure-Python ECDSA, ~1/3 of the time per tx.
+"""
+import os
+
+from enforce_typing import enforce_types
+import eth_utils
+
+from util import constants
+
+# blocks of the chain hold this much gas. Like ganache's default
+GAS_LIMIT = 30_000_000
+
+_TESTER = None  # eth_tester.EthereumTester, once connected
+
+
+def connect() -> None:
+    """Create the chain, and connect brownie to it. Like
+    brownie.network.connect("development"), without launching ganache"""
+    global _TESTER  # pylint: disable=global-statement
+    # pylint: disable=import-outside-toplevel, no-name-in-module
+    import sys
+
+    import psutil
+    from brownie._config import CONFIG
+    from brownie.network.rpc import Rpc
+    from brownie.network.state import Chain
+    from brownie.network.web3 import web3
+    from eth_tester import EthereumTester, PyEVMBackend
+    from eth_tester.backends.pyevm.main import (
+        generate_genesis_state_for_keys,
+        get_default_account_keys,
+    )
+    from eth_keys import keys
+    from web3.providers.eth_tester import EthereumTesterProvider
+
+    from util.agentkeys import N_BASE_ACCOUNTS, agentPrivateKeys
+
+    # base accounts: eth-tester's usual keys. Then the agent ones, from
+    # util.agentkeys, like `tsp ganache` funds
+    account_keys = get_default_account_keys(quantity=N_BASE_ACCOUNTS) + tuple(
+        keys.PrivateKey(eth_utils.to_bytes(hexstr=private_key))
+        for private_key in agentPrivateKeys(constants.N_AGENT_KEYS)
+    )
+    backend = PyEVMBackend(
+        genesis_parameters=PyEVMBackend.generate_genesis_params(
+            overrides={"gas_limit": GAS_LIMIT}
+        ),
+        genesis_state=generate_genesis_state_for_keys(account_keys),
+    )
+    backend.account_keys = account_keys  # it assumes its usual keys, else
+    _TESTER = EthereumTester(backend)
+
+    CONFIG.set_active_network("development")
+    web3.provider = EthereumTesterProvider(_TESTER)
+    web3.reset_middlewares()
+
+    # brownie's chain.mine(), snapshots etc go to its rpc backend: this
+    # module. The "rpc process" is this one, so brownie never kills it
+    rpc_client = Rpc()  # brownie's one Rpc
+    rpc_client.backend = sys.modules[__name__]
+    rpc_client.process = psutil.Process(os.getpid())
+    Chain()._network_connected()  # sets the accounts, too
+
+
+# brownie rpc backend interface. See brownie.network.rpc.ganache
+def on_connection() -> None:  # pylint: disable=invalid-name
+    pass
+
+
+@enforce_types
+def sleep(seconds: int) -> int:
+    """Move the chain's time ahead by 'seconds'. eth-tester can only do
+    that by mining a block, so that mines an empty one"""
+    _TESTER.time_travel(_pendingTimestamp() + seconds)
+    return seconds
+
+
+def mine(timestamp=None) -> None:
+    """Mine a block, at 'timestamp' if given. brownie's clock may lag the
+    chain's by a second; then the block gets the chain's next timestamp"""
+    if timestamp is not None and int(timestamp) > _pendingTimestamp():
+        _TESTER.time_travel(int(timestamp))  # mines the block
+    else:
+        _TESTER.mine_blocks(1)
+
+
+def snapshot() -> int:
+    return _TESTER.take_snapshot()
+
+
+def revert(snapshot_id: int) -> None:
+    _TESTER.revert_to_snapshot(snapshot_id)
+
+
+def unlock_account(address: str) -> None:  # pylint: disable=invalid-name
+    """Only the chain's own accounts can send txs. Others have no keys here"""
+    raise ValueError(f"Can't unlock {address}: the in-process chain has no key")
+
+
+def _pendingTimestamp() -> int:
+    return _TESTER.get_block_by_number("pending")["timestamp"]
@@ -0,0 +1,136 @@
+"""
+Monte Carlo: run N replicas of a netlist, each with its own seed, in
+parallel. Then aggregate them into percentile series.
+
+Each replica's seed comes from one root seed, via numpy's SeedSequence.
+So the whole set of replicas reproduces from the root seed alone, and
+the replicas' random streams are independent of each other.
+
+Output tree:
+  OUTPUT_DIR/index.csv -- one row per replica: run dir, status, seed
+  OUTPUT_DIR/run_0000/ -- output of first replica (data.csv, data.npz). Etc.
+  OUTPUT_DIR/p5/, p50/, p95/ -- each logged column's percentile across
+    replicas, per row. Same format as a run's output, so 'tsp plot' works
+"""
+import csv
+import logging
+import os
+from typing import Dict, List, Optional, Tuple
+
+from enforce_typing import enforce_types
+import numpy
+
+from engine.RunRecorder import RunRecorder
+from util.parallelutil import runInWorkers
+from util.plotutil import runDirToHeaderValues
+from util.sweeputil import runDirName, runVariant
+
+log = logging.getLogger("master")
+
+INDEX_FILENAME = "index.csv"
+PERCENTILES = [5, 50, 95]
+
+
+@enforce_types
+def replicaSeeds(root_seed: int, n_runs: int) -> List[int]:
+    """Return one independent seed per replica, derived from root_seed"""
+    children = numpy.random.SeedSequence(root_seed).spawn(n_runs)
+    return [int(child.generate_state(1, numpy.uint64)[0]) for child in children]
+
+
+@enforce_types
+def runMonteCarlo(
+    netlist_str: str,
+    n_runs: int,
+    output_dir: str,
+    root_seed: Optional[int] = None,
+    n_workers: Optional[int] = None,
+) -> Tuple[int, List[str]]:
+    """
+    Run n_runs replicas of the netlist across worker processes, then write
+    the percentile series. If root_seed is None, draw a fresh one.
+    Returns (root_seed, status of each run: "ok" or why it failed).
+    """
+    assert n_runs > 0
+    if root_seed is None:
+        root_seed = int(numpy.random.SeedSequence().entropy)
+    seeds = replicaSeeds(root_seed, n_runs)
+
+    os.mkdir(output_dir)
+    run_dirs = [runDirName(output_dir, run_i) for run_i in range(n_runs)]
+    args_list = [
+        (netlist_str, {}, run_dir, seed) for run_dir, seed in zip(run_dirs, seeds)
+    ]
+    log.info("Monte Carlo: %d runs of %s, root seed %d", n_runs, netlist_str, root_seed)
+    statuses = runInWorkers(runVariant, args_list, n_workers)
+
+    _writeIndex(output_dir, run_dirs, statuses, seeds)
+    ok_run_dirs = [d for d, status in zip(run_dirs, statuses) if status == "ok"]
+    if ok_run_dirs:
+        header, percentile_values = percentileSeries(ok_run_dirs, PERCENTILES)
+        for p, values in percentile_values.items():
+            _writeSeries(os.path.join(output_dir, f"p{p}"), header, values)
+
+    log.info(
+        "Monte Carlo done: %d ok, %d failed",
+        len(ok_run_dirs),
+        n_runs - len(ok_run_dirs),
+    )
+    return root_seed, statuses
+
+
+@enforce_types
+def percentileSeries(
+    run_dirs: List[str], percentiles: List[int]
+) -> Tuple[List[str], Dict[int, numpy.ndarray]]:
+    """
+    For every logged column, compute percentiles across runs at each row.
+    Runs must have the same header and number of rows (same netlist & ss).
+    Returns (header, dict of percentile : 2d array [row_i, col_i]).
+    """
+    header = None
+    all_values = []
+    for run_dir in run_dirs:
+        run_header, values = runDirToHeaderValues(run_dir)
+        if header is None:
+            header = run_header
+        elif run_header != header:
+            raise ValueError(f"{run_dir} has a different header")
+        if all_values and values.shape != all_values[0].shape:
+            raise ValueError(f"{run_dir} has a different # rows")
+        all_values.append(values.astype(numpy.float64))
+
+    stacked = numpy.stack(all_values)  # [run_i, row_i, col_i]
+    percentile_values = {p: _percentile(stacked, p) for p in percentiles}
+    return header, percentile_values
+
+
+@enforce_types
+def _percentile(stacked: numpy.ndarray, p: int) -> numpy.ndarray:
+    """Like numpy.percentile along axis 0, but where there's nothing to
+    interpolate, take the value as-is. Eg 3 runs at inf give inf, not nan"""
+    with numpy.errstate(invalid="ignore"):  # inf - inf
+        values = numpy.percentile(stacked, p, axis=0)
+    lower = numpy.percentile(stacked, p, axis=0, method="lower")
+    higher = numpy.percentile(stacked, p, axis=0, method="higher")
+    return numpy.where(lower == higher, lower, values)
+
+
+@enforce_types
+def _writeSeries(output_dir: str, header: List[str], values: numpy.ndarray):
+    recorder = RunRecorder(output_dir)
+    for row in values.tolist():
+        recorder.record(header, row)
+    recorder.close()
+
+
+@enforce_types
+def _writeIndex(
+    output_dir: str, run_dirs: List[str], statuses: List[str], seeds: List[int]
+):
+    filename = os.path.join(output_dir, INDEX_FILENAME)
+    with open(filename, mode="w", encoding="UTF-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["run_dir", "status", "seed"])
+        for run_dir, status, seed in zip(run_dirs, statuses, seeds):
+            writer.writerow([os.path.basename(run_dir), status, seed])
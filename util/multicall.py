@@ -0,0 +1,60 @@
+"""
+Batched contract reads. Each contract read is an RPC round-trip. Instead,
+add() the reads to a MulticallBatch, then resolve() them all at once: one
+eth_call to a Multicall contract, which makes the reads on-chain.
+
+Reads in one batch can't depend on each other's results. Eg read a pool's
+swap fee in one batch, then the spot price at that fee in the next.
+
+Reads of util.shadowamm contracts cost no RPC, so they get made directly.
+"""
+from typing import Any, List, Optional
+
+from enforce_typing import enforce_types
+
+from util.contractregistry import deployOnce
+from util.shadowamm import ShadowToken
+
+
+@enforce_types
+def multicallContract():
+    """The Multicall contract. Deploys it on first use, and after resets"""
+    return deployOnce("BROWNIE_PROJECT057", "Multicall")
+
+
+@enforce_types
+class MulticallBatch:
+    """Gathers contract reads, then resolves them in one eth_call"""
+
+    def __init__(self):
+        self._reads: List[tuple] = []  # (contract, method_name, args)
+        self.results: Optional[list] = None  # set by resolve()
+
+    def add(self, contract, method_name: str, *args) -> int:
+        """Add the read contract.method_name(*args) (a brownie Contract, or
+        a shadowamm one). Returns its index into the results of resolve()"""
+        self._reads.append((contract, method_name, args))
+        return len(self._reads) - 1
+
+    def __len__(self) -> int:
+        return len(self._reads)
+
+    def resolve(self) -> list:
+        """Make all the reads, in one eth_call. Returns their results, in
+        the order they were added, like calling each method would"""
+        results: List[Any] = [None] * len(self._reads)
+        calls, methods, chain_indices = [], [], []
+        for i, (contract, method_name, args) in enumerate(self._reads):
+            method = getattr(contract, method_name)
+            if isinstance(contract, ShadowToken):
+                results[i] = method(*args)
+                continue
+            calls.append((contract.address, method.encode_input(*args)))
+            methods.append(method)
+            chain_indices.append(i)
+        if calls:
+            _, return_datas = multicallContract().aggregate(calls)
+            for i, method, return_data in zip(chain_indices, methods, return_datas):
+                results[i] = method.decode_output(return_data)
+        self.results = results
+        return self.results
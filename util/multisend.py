@@ -0,0 +1,94 @@
+"""
+Batched transfers. Each ETH or token transfer is its own tx. Instead, add()
+the transfers to a MultiSendBatch, then send() them all at once: one tx to
+a MultiSend contract, which makes the transfers on-chain. Eg to fund many
+new agents with ETH for gas plus OCEAN.
+
+Token transfers go via transferFrom, so the sender approves the MultiSend
+contract for each token, whenever its on-chain allowance is too low.
+"""
+
+from typing import Dict, List
+
+from enforce_typing import enforce_types
+
+from util import constants
+from util.contractregistry import deployOnce
+from util.tx import txdict
+
+# transfers per tx. Each costs <=~50K gas, so a tx stays well below the
+# block gas limit
+MAX_TRANSFERS_PER_TX = 100
+
+
+@enforce_types
+def multisendContract():
+    """The MultiSend contract. Deploys it on first use, and after resets"""
+    return deployOnce("BROWNIE_PROJECT080", "MultiSend")
+
+
+@enforce_types
+class MultiSendBatch:
+    """Gathers ETH and token transfers, then sends them in as few txs as
+    MAX_TRANSFERS_PER_TX allows"""
+
+    def __init__(self):
+        self._transfers: List[tuple] = []  # (token or None, dst addr, amt)
+
+    def add(self, token, dst_address: str, amt_base: int) -> None:
+        """Add a transfer of amt_base of token (a brownie Contract) to
+        dst_address. token=None means ETH, in wei"""
+        assert amt_base >= 0
+        if amt_base > 0:
+            self._transfers.append((token, dst_address, amt_base))
+
+    def __len__(self) -> int:
+        return len(self._transfers)
+
+    def send(self, from_account) -> list:
+        """Send all the transfers, from from_account. Returns the txs"""
+        if not self._transfers:
+            return []
+        multisend = multisendContract()
+        tokens: Dict[str, object] = {}  # token addr : token
+        token_amts: Dict[str, int] = {}  # token addr : total amt_base
+        for token, _, amt in self._transfers:
+            if token is not None:
+                tokens[token.address] = token
+                token_amts[token.address] = token_amts.get(token.address, 0) + amt
+        for token_address, token in tokens.items():
+            _approveMultiSend(token, from_account, token_amts[token_address])
+
+        txs = []
+        for i in range(0, len(self._transfers), MAX_TRANSFERS_PER_TX):
+            chunk = self._transfers[i : i + MAX_TRANSFERS_PER_TX]
+            token_addresses = [_tokenAddress(token) for token, _, _ in chunk]
+            dst_addresses = [dst_address for _, dst_address, _ in chunk]
+            amts = [amt for _, _, amt in chunk]
+            ETH_base = sum(amt for token, _, amt in chunk if token is None)
+            tx_dict = txdict(from_account)
+            tx_dict["value"] = ETH_base
+            txs.append(
+                multisend.multiSend(token_addresses, dst_addresses, amts, tx_dict)
+            )
+        self._transfers = []
+        return txs
+
+
+@enforce_types
+def _tokenAddress(token) -> str:
+    if token is None:
+        return constants.ZERO_ADDRESS
+    return token.address
+
+
+@enforce_types
+def _approveMultiSend(token, owner_account, amt_base: int) -> None:
+    """Let MultiSend move amt_base of owner's token. If the allowance is too
+    low, approve as much as possible. Checks on-chain, as a reset chain
+    redeploys MultiSend and the tokens at the same addresses, with no
+    allowances"""
+    multisend = multisendContract()
+    if token.allowance(owner_account.address, multisend.address) >= amt_base:
+        return
+    token.approve(multisend.address, constants.HUGEINT, txdict(owner_account))
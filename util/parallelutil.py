@@ -0,0 +1,59 @@
+"""
+Run jobs on a pool of worker processes. By default, one worker per core.
+
+Each worker gets its own local chain: it sets constants.GANACHE_PORT to
+a port of its own, so brownie launches a separate ganache there the first
+time the worker connects. NoEvm jobs never connect, so never start one.
+"""
+import concurrent.futures
+import multiprocessing
+import os
+from typing import Optional
+from urllib.parse import urlparse
+
+from enforce_typing import enforce_types
+
+from util import constants
+from util.configutil import confFileValue
+
+
+@enforce_types
+def runInWorkers(func, args_list: list, n_workers: Optional[int] = None) -> list:
+    """
+    Call func(*args) for each 'args' in args_list, on worker processes.
+    Returns the results, in the same order as args_list.
+
+    'func' must be a module-level function, so that workers can import it.
+    """
+    if not args_list:
+        return []
+    if n_workers is None:
+        n_workers = os.cpu_count() or 1
+    n_workers = max(1, min(n_workers, len(args_list)))
+
+    # spawn, not fork: a forked worker would share the parent's brownie state
+    ctx = multiprocessing.get_context("spawn")
+    worker_counter = ctx.Value("i", 0)
+    with concurrent.futures.ProcessPoolExecutor(
+        max_workers=n_workers,
+        mp_context=ctx,
+        initializer=_initWorker,
+        initargs=(worker_counter,),
+    ) as pool:
+        futures = [pool.submit(func, *args) for args in args_list]
+        return [future.result() for future in futures]
+
+
+@enforce_types
+def workerChainPort(worker_i: int) -> int:
+    """Port of the local chain of worker 'worker_i'. Never the default
+    port in GANACHE_URL, so that a 'tsp ganache' chain stays untouched."""
+    default_port = urlparse(confFileValue("general", "GANACHE_URL")).port
+    return default_port + 1 + worker_i
+
+
+def _initWorker(worker_counter) -> None:
+    with worker_counter.get_lock():
+        worker_i = worker_counter.value
+        worker_counter.value += 1
+    constants.GANACHE_PORT = workerChainPort(worker_i)
@@ -9,6 +9,8 @@ import matplotlib
 from matplotlib import pyplot
 import numpy
 
+from engine.RunRecorder import CSV_FILENAME, NPZ_FILENAME
+
 LINEAR, LOG, BOTH = 0, 1, 2  # pyplot.yscale interprets 1st 2
 MULT1, MULT100, DIV1M, DIV1B = 0, 1, 2, 3  # multiply or divide the value?
 COUNT, DOLLAR, PERCENT = 0, 1, 2
@@ -256,6 +258,43 @@ def _csvToHeaderValues(input_csv_filename: str):
     return (header, values)
 
 
+@enforce_types
+def _npzToHeaderValues(input_npz_filename: str):
+    """Given binary columnar file from a TokenSPICE run, creates (header, values).
+
+    Args:
+        input_npz_filename -- absolute path of input npz file
+
+    Returns:
+        header: List[str] -- e.g. 'Tick', 'Second', ...
+        values: 2d array of float64 [tick_i, valuetype_i] --
+    """
+    assert os.path.exists(input_npz_filename)
+    with numpy.load(input_npz_filename) as data:
+        header = [str(param) for param in data["header"]]
+        values = data["values"]
+    return (header, values)
+
+
+@enforce_types
+def runDirToHeaderValues(input_dir: str):
+    """Load (header, values) from a run's output directory.
+
+    Uses the binary columnar file if the run wrote one, else the csv file.
+
+    Args:
+        input_dir -- output directory of a TokenSPICE run
+
+    Returns:
+        header: List[str] -- e.g. 'Tick', 'Second', ...
+        values: 2d array [tick_i, valuetype_i] --
+    """
+    npz_filename = os.path.join(input_dir, NPZ_FILENAME)
+    if os.path.exists(npz_filename):
+        return _npzToHeaderValues(npz_filename)
+    return _csvToHeaderValues(os.path.join(input_dir, CSV_FILENAME))
+
+
 @enforce_types
 def csvToPngs(input_csv_filename: str, output_png_dir: str, netlist_plot_instrs_func):
     """Main plotting routine, delegates subtasks to worker routines.
@@ -266,7 +305,26 @@ def csvToPngs(input_csv_filename: str, output_png_dir: str, netlist_plot_instrs_
         netlist_plot_instrs -- function to convert to (x, y_params)
     """
     (header, values) = _csvToHeaderValues(input_csv_filename)
+    _headerValuesToPngs(header, values, output_png_dir, netlist_plot_instrs_func)
+
+
+@enforce_types
+def runDirToPngs(input_dir: str, output_png_dir: str, netlist_plot_instrs_func):
+    """Like csvToPngs, but input is a run's output directory.
 
+    Args:
+        input_dir -- output directory of a TokenSPICE run
+        output_png_dir -- path of output png to be created and filled
+        netlist_plot_instrs -- function to convert to (x, y_params)
+    """
+    (header, values) = runDirToHeaderValues(input_dir)
+    _headerValuesToPngs(header, values, output_png_dir, netlist_plot_instrs_func)
+
+
+@enforce_types
+def _headerValuesToPngs(
+    header: List[str], values, output_png_dir: str, netlist_plot_instrs_func
+):
     (x_label, x, y_params) = netlist_plot_instrs_func(header, values)
     y_params = _expandBOTHinY(y_params)
 
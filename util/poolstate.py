@@ -0,0 +1,249 @@
+"""
+Snapshots of pools' state: balances, weights, fees, BPT supply. Agents and
+KPIs that look at the same pool share one snapshot. Spot prices and swap,
+join and exit quotes get computed from it locally, via util.bmath.
+
+A snapshot reads all of its pool's state at once, on first access, in one
+eth_call. It stays valid until a tx touches the pool, as found in the tx
+histories of brownie and util.fasttx (like balanceledger does for
+balances). Pool state only changes via txs, so that's at most one read per
+pool per tick, unless the pool traded. Static info (datatoken, controller)
+is read once, by the PoolAgent. Pools of util.shadowamm report their
+changes themselves instead.
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+from enforce_typing import enforce_types
+
+from util import bmath, constants, fasttx, globaltokens, shadowamm
+from util.multicall import MulticallBatch
+
+_SNAPSHOTS: Dict[str, "PoolState"] = {}  # pool address : snapshot
+_N_TXS_SEEN = (0, 0)  # fasttx.txCounts() of txs checked for touched pools
+
+
+@enforce_types
+class PoolState:
+    """State of an oceanv3 pool of OCEAN and a datatoken, in base units.
+    Quotes come from util.bmath, bit-identical to the pool's own"""
+
+    def __init__(self, pool, DT_address: str):
+        self._pool = pool
+        self._DT_address = DT_address
+        self._values: Optional[dict] = None  # None = stale
+        _SNAPSHOTS[pool.address] = self
+
+    def balance(self, token_address: str) -> int:
+        return self._get()["balance"][token_address]
+
+    def denormWeight(self, token_address: str) -> int:
+        return self._get()["weight"][token_address]
+
+    def totalDenormWeight(self) -> int:
+        return sum(self._get()["weight"].values())
+
+    def swapFee(self) -> int:
+        return self._get()["swapFee"]
+
+    def totalSupply(self) -> int:
+        """# BPTs"""
+        return self._get()["totalSupply"]
+
+    def spotPrice(self) -> int:
+        """Price of 1 DT, in OCEAN, as getSpotPrice(OCEAN, DT)"""
+        return bmath.calcSpotPrice(
+            *self._inOut(self._OCEAN(), self._DT_address), self.swapFee()
+        )
+
+    def inGivenOut(
+        self, tokenIn_address: str, tokenOut_address: str, tokenAmountOut: int
+    ) -> int:
+        """Amount of tokenIn to swap for tokenAmountOut of tokenOut"""
+        return bmath.calcInGivenOut(
+            *self._inOut(tokenIn_address, tokenOut_address),
+            tokenAmountOut,
+            self.swapFee(),
+        )
+
+    def outGivenIn(
+        self, tokenIn_address: str, tokenOut_address: str, tokenAmountIn: int
+    ) -> int:
+        """Amount of tokenOut that a swap of tokenAmountIn of tokenIn gives"""
+        return bmath.calcOutGivenIn(
+            *self._inOut(tokenIn_address, tokenOut_address),
+            tokenAmountIn,
+            self.swapFee(),
+        )
+
+    def poolOutGivenSingleIn(self, tokenIn_address: str, tokenAmountIn: int) -> int:
+        """# BPTs that joinswapExternAmountIn gives for tokenAmountIn"""
+        return bmath.calcPoolOutGivenSingleIn(
+            self.balance(tokenIn_address),
+            self.denormWeight(tokenIn_address),
+            self.totalSupply(),
+            self.totalDenormWeight(),
+            tokenAmountIn,
+            self.swapFee(),
+        )
+
+    def singleOutGivenPoolIn(self, tokenOut_address: str, poolAmountIn: int) -> int:
+        """Amount of tokenOut that exitswapPoolAmountIn gives for poolAmountIn"""
+        return bmath.calcSingleOutGivenPoolIn(
+            self.balance(tokenOut_address),
+            self.denormWeight(tokenOut_address),
+            self.totalSupply(),
+            self.totalDenormWeight(),
+            poolAmountIn,
+            self.swapFee(),
+        )
+
+    def invalidate(self) -> None:
+        """Re-read the pool on next access"""
+        self._values = None
+
+    def _inOut(self, tokenIn_address: str, tokenOut_address: str) -> tuple:
+        """(balance in, weight in, balance out, weight out)"""
+        return (
+            self.balance(tokenIn_address),
+            self.denormWeight(tokenIn_address),
+            self.balance(tokenOut_address),
+            self.denormWeight(tokenOut_address),
+        )
+
+    def _OCEAN(self) -> str:
+        return globaltokens.OCEAN_address()
+
+    def _get(self) -> dict:
+        _invalidateTouched()
+        if self._values is None:
+            fill([self])
+        return self._values
+
+    def _addReads(self, batch: MulticallBatch) -> None:
+        for token_address in [self._OCEAN(), self._DT_address]:
+            batch.add(self._pool, "getBalance", token_address)
+            batch.add(self._pool, "getDenormalizedWeight", token_address)
+        batch.add(self._pool, "getSwapFee")
+        batch.add(self._pool, "totalSupply")
+
+    def _setValues(self, results: list) -> None:
+        OCEAN_address, DT_address = self._OCEAN(), self._DT_address
+        OCEAN_bal, OCEAN_w, DT_bal, DT_w, swapFee, supply = results[:6]
+        self._values = {
+            "balance": {OCEAN_address: OCEAN_bal, DT_address: DT_bal},
+            "weight": {OCEAN_address: OCEAN_w, DT_address: DT_w},
+            "swapFee": swapFee,
+            "totalSupply": supply,
+        }
+
+
+@enforce_types
+class PoolStateV4(PoolState):
+    """State of an oceanv4 pool. Swaps there also pay an OPC fee, a publish
+    market fee, and a consume market fee that the swapper picks"""
+
+    def fees(self) -> Tuple[int, int, int]:
+        """(LP swap fee, OPC fee, publish market fee)"""
+        values = self._get()
+        return (values["swapFee"], values["opcFee"], values["marketFee"])
+
+    def spotPrice(self, consumeMarketSwapFee: Optional[int] = None) -> int:
+        """Price of 1 DT, in OCEAN, as getSpotPrice(OCEAN, DT, fee).
+        fee = consumeMarketSwapFee, or the LP swap fee if None"""
+        if consumeMarketSwapFee is None:
+            consumeMarketSwapFee = self.swapFee()
+        return bmath.calcSpotPriceV4(
+            *self._inOut(self._OCEAN(), self._DT_address),
+            self.fees(),
+            consumeMarketSwapFee,
+        )
+
+    def inGivenOut(
+        self,
+        tokenIn_address: str,
+        tokenOut_address: str,
+        tokenAmountOut: int,
+        consumeMarketSwapFee: int = 0,
+    ) -> int:
+        """Amount of tokenIn to swap for tokenAmountOut of tokenOut, fees in"""
+        return bmath.calcInGivenOutV4(
+            *self._inOut(tokenIn_address, tokenOut_address),
+            tokenAmountOut,
+            self.fees(),
+            consumeMarketSwapFee,
+        )[0]
+
+    def outGivenIn(
+        self,
+        tokenIn_address: str,
+        tokenOut_address: str,
+        tokenAmountIn: int,
+        consumeMarketSwapFee: int = 0,
+    ) -> int:
+        """Amount of tokenOut that a swap of tokenAmountIn of tokenIn gives"""
+        return bmath.calcOutGivenInV4(
+            *self._inOut(tokenIn_address, tokenOut_address),
+            tokenAmountIn,
+            self.fees(),
+            consumeMarketSwapFee,
+        )[0]
+
+    def _addReads(self, batch: MulticallBatch) -> None:
+        super()._addReads(batch)
+        batch.add(self._pool, "getOPCFee")
+        batch.add(self._pool, "getMarketFee")
+
+    def _setValues(self, results: list) -> None:
+        super()._setValues(results)
+        self._values["opcFee"], self._values["marketFee"] = results[6:8]
+
+
+@enforce_types
+def fill(pool_states: List[PoolState], batch: Optional[MulticallBatch] = None) -> None:
+    """Read the state of all stale pools in pool_states, in one eth_call.
+    Eg to log all pools at once. batch: other reads to resolve in the same
+    eth_call. Their results are in batch.results after"""
+    # pylint: disable=protected-access
+    _invalidateTouched()
+    stale = [pool_state for pool_state in pool_states if pool_state._values is None]
+    if batch is None:
+        batch = MulticallBatch()
+    starts = []
+    for pool_state in stale:
+        starts.append(len(batch))
+        pool_state._addReads(batch)
+    results = batch.resolve()
+    for pool_state, start, end in zip(stale, starts, starts[1:] + [len(batch)]):
+        pool_state._setValues(results[start:end])
+
+
+def reset() -> None:
+    """Invalidate all snapshots. Eg after the chain got reset"""
+    global _N_TXS_SEEN  # pylint: disable=global-statement
+    for pool_state in _SNAPSHOTS.values():
+        pool_state.invalidate()
+    _N_TXS_SEEN = (0, 0)
+
+
+def _invalidateTouched() -> None:
+    """Invalidate the snapshots of pools that new txs touched: sent to the
+    pool, emitted events from it, or moved tokens to or from it"""
+    global _N_TXS_SEEN  # pylint: disable=global-statement
+    if constants.POOL_BACKEND == "shadow":
+        for address in shadowamm.popTouchedPools() & _SNAPSHOTS.keys():
+            _SNAPSHOTS[address].invalidate()
+        return
+
+    n_txs = fasttx.txCounts()
+    if n_txs[0] < _N_TXS_SEEN[0] or n_txs[1] < _N_TXS_SEEN[1]:
+        reset()  # history got cleared
+    for tx in fasttx.txsSince(_N_TXS_SEEN):
+        if tx.status != 1:  # reverted: no changes
+            continue
+        touched = {tx.receiver} | set(fasttx.logAddresses(tx))
+        for _, src, dst, _ in fasttx.transfers(tx):
+            touched.update([src, dst])
+        for address in touched & _SNAPSHOTS.keys():
+            _SNAPSHOTS[address].invalidate()
+    _N_TXS_SEEN = n_txs
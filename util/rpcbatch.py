@@ -0,0 +1,108 @@
+"""
+Batched RPC reads. Each contract read or ETH balance read is its own HTTP
+request to the chain. Instead, add() the reads to an RPCBatch, then
+resolve() them all at once: one JSON-RPC batch request, ie one HTTP
+round-trip, holding an eth_call or eth_getBalance per read.
+
+Unlike util.multicall, no contract is needed, and ETH balances can be read
+too. Reads of util.shadowamm contracts cost no RPC, so they get made
+directly. Providers without batch support (eg the in-process chain) get
+one request per read, as before.
+"""
+import time
+from typing import Any, List, Optional
+
+from enforce_typing import enforce_types
+
+from util import chainstats, constants
+from util.shadowamm import ShadowToken
+
+# reads per JSON-RPC batch. Keeps each HTTP request body small
+MAX_READS_PER_REQUEST = 500
+
+
+@enforce_types
+class RPCBatch:
+    """Gathers reads, then resolves them in one JSON-RPC batch request"""
+
+    def __init__(self):
+        self._reads: List[tuple] = []  # (contract or None, method_name, args)
+        self.results: Optional[list] = None  # set by resolve()
+
+    def add(self, contract, method_name: str, *args) -> int:
+        """Add the read contract.method_name(*args) (a brownie Contract, or
+        a shadowamm one). Returns its index into the results of resolve()"""
+        self._reads.append((contract, method_name, args))
+        return len(self._reads) - 1
+
+    def addETHBalance(self, address: str) -> int:
+        """Add the read of address's ETH balance, in wei. Returns its index"""
+        self._reads.append((None, "eth_getBalance", (address,)))
+        return len(self._reads) - 1
+
+    def __len__(self) -> int:
+        return len(self._reads)
+
+    def resolve(self) -> list:
+        """Make all the reads, in as few requests as MAX_READS_PER_REQUEST
+        allows. Returns their results, in the order they were added, like
+        calling each method would"""
+        results: List[Any] = [None] * len(self._reads)
+        requests, decoders, chain_indices = [], [], []
+        for i, (contract, method_name, args) in enumerate(self._reads):
+            if contract is None:
+                requests.append(("eth_getBalance", [args[0], "latest"]))
+                decoders.append(_toInt)
+                chain_indices.append(i)
+                continue
+            method = getattr(contract, method_name)
+            if isinstance(contract, ShadowToken):
+                results[i] = method(*args)
+                continue
+            tx = {"to": contract.address, "data": method.encode_input(*args)}
+            requests.append(("eth_call", [tx, "latest"]))
+            decoders.append(method.decode_output)
+            chain_indices.append(i)
+
+        for start in range(0, len(requests), MAX_READS_PER_REQUEST):
+            end = start + MAX_READS_PER_REQUEST
+            responses = _makeRequests(requests[start:end])
+            for i, decoder, response in zip(
+                chain_indices[start:end], decoders[start:end], responses
+            ):
+                if "error" in response:
+                    raise ValueError(f"RPC read {self._reads[i]}: {response['error']}")
+                results[i] = decoder(_toHexstr(response["result"]))
+        self.results = results
+        return self.results
+
+
+def _makeRequests(requests: List[tuple]) -> list:
+    """Responses to the requests, in order. One batch request if the
+    provider supports it, else one request each"""
+    # pylint: disable=import-outside-toplevel
+    from brownie.network.web3 import web3
+
+    constants.connectToChain()
+    t0 = time.perf_counter()
+    try:
+        responses = web3.provider.make_batch_request(requests)
+    except NotImplementedError:
+        responses = [web3.provider.make_request(*request) for request in requests]
+    if not isinstance(responses, list):  # the whole batch failed
+        raise ValueError(f"RPC batch request: {responses.get('error')}")
+    if constants.CHAIN_STATS:  # the provider is called directly, not via web3
+        chainstats.recordRequests(requests, responses, time.perf_counter() - t0)
+    return responses
+
+
+def _toHexstr(result) -> str:
+    if isinstance(result, str):
+        return result
+    if isinstance(result, int):
+        return hex(result)
+    return "0x" + bytes(result).hex()
+
+
+def _toInt(hexstr: str) -> int:
+    return int(hexstr, 16)
@@ -0,0 +1,439 @@
+"""
+Shadow AMM: oceanv3's tokens and pools in pure Python, so that oceanv3
+netlists can run without an EVM.
+
+-ShadowToken acts like an ERC20 token, eg OCEAN or a datatoken
+-ShadowPool acts like oceanv3's BPool (sol057), down to the wei. Its math is
+ util.bmath, and it checks what the contract requires. Where the contract
+ reverts, it raises ValueError with the same reason
+
+Methods that change state take the sender's address first, in place of
+brownie's tx dict. Like a reverted tx, a call that raises changes nothing.
+
+Set POOL_BACKEND = shadow in tokenspice.ini to use it. Then agents hold
+AgentWalletShadow wallets, and OCEAN is a ShadowToken.
+"""
+from typing import Dict, List, Set, Tuple
+
+from enforce_typing import enforce_types
+
+from util import bmath, constants
+from util.bmath import BONE
+
+# BConst.sol
+MIN_BOUND_TOKENS = 2
+MAX_BOUND_TOKENS = 8
+MIN_FEE = BONE // 10**6
+MIN_WEIGHT = BONE
+MAX_WEIGHT = BONE * 50
+MAX_TOTAL_WEIGHT = BONE * 50
+MIN_BALANCE = BONE // 10**12
+INIT_POOL_SUPPLY = BONE * 100
+MAX_IN_RATIO = BONE // 2
+MAX_OUT_RATIO = (BONE // 3) + 1
+
+GOD_ADDRESS = "0x" + "5" * 40  # mints OCEAN, like GOD_ACCOUNT on chain
+
+_CONTRACTS: Dict[str, "ShadowToken"] = {}  # address : token or pool
+_N_ADDRESSES = 0  # addresses handed out so far
+_TOUCHED_POOLS: Set[str] = set()  # pools whose state changed. See popTouchedPools()
+_OCEAN_TOKEN = None
+
+
+@enforce_types
+def newAddress() -> str:
+    """A fresh address, for a contract or a wallet"""
+    global _N_ADDRESSES  # pylint: disable=global-statement
+    _N_ADDRESSES += 1
+    return f"0x{2**64 + _N_ADDRESSES:040x}"  # clear of ZERO_ & BURN_ADDRESS
+
+
+@enforce_types
+def contractAt(address: str) -> "ShadowToken":
+    return _CONTRACTS[address]
+
+
+@enforce_types
+def OCEANtoken() -> "ShadowToken":
+    global _OCEAN_TOKEN  # pylint: disable=global-statement
+    if _OCEAN_TOKEN is None:
+        _OCEAN_TOKEN = ShadowToken("OCEAN", "OCEAN", GOD_ADDRESS)
+    return _OCEAN_TOKEN
+
+
+@enforce_types
+def popTouchedPools() -> Set[str]:
+    """Addresses of the pools whose state changed since the last call"""
+    touched = set(_TOUCHED_POOLS)
+    _TOUCHED_POOLS.clear()
+    return touched
+
+
+def reset() -> None:
+    """Drop all tokens and pools. Eg between runs"""
+    global _OCEAN_TOKEN  # pylint: disable=global-statement
+    _CONTRACTS.clear()
+    _TOUCHED_POOLS.clear()
+    _OCEAN_TOKEN = None
+
+
+@enforce_types
+class ShadowToken:
+    """ERC20 token. Only the minter may mint, up to the cap"""
+
+    def __init__(
+        self, name: str, symbol: str, minter_address: str, cap: int = bmath.MAX_UINT
+    ):
+        self.address = newAddress()
+        self.name = name
+        self.symbol = symbol
+        self._minter_address = minter_address
+        self._cap = cap
+        self._total_supply = 0
+        self._balances: Dict[str, int] = {}
+        self._allowances: Dict[Tuple[str, str], int] = {}  # (owner, spender)
+        _CONTRACTS[self.address] = self
+
+    def balanceOf(self, address: str) -> int:
+        return self._balances.get(address, 0)
+
+    def totalSupply(self) -> int:
+        return self._total_supply
+
+    def allowance(self, owner_address: str, spender_address: str) -> int:
+        return self._allowances.get((owner_address, spender_address), 0)
+
+    def approve(self, sender: str, spender_address: str, amt: int) -> None:
+        self._allowances[(sender, spender_address)] = amt
+
+    def transfer(self, sender: str, dst_address: str, amt: int) -> None:
+        self._move(sender, dst_address, amt)
+
+    def transferFrom(
+        self, sender: str, src_address: str, dst_address: str, amt: int
+    ) -> None:
+        if sender != src_address and amt > self.allowance(src_address, sender):
+            raise ValueError("ERR_BTOKEN_BAD_CALLER")
+        self._move(src_address, dst_address, amt)
+        if sender != src_address:
+            self._allowances[(src_address, sender)] -= amt
+
+    def mint(self, sender: str, dst_address: str, amt: int) -> None:
+        if sender != self._minter_address:
+            raise ValueError("ERR_NOT_MINTER")
+        if self._total_supply + amt > self._cap:
+            raise ValueError("ERR_CAP_EXCEEDED")
+        self._total_supply += amt
+        self._balances[dst_address] = self.balanceOf(dst_address) + amt
+
+    def _burn(self, amt: int) -> None:
+        """Burn amt of self's own balance. BPool burns its pool shares"""
+        self._balances[self.address] = bmath.bsub(self.balanceOf(self.address), amt)
+        self._total_supply = bmath.bsub(self._total_supply, amt)
+
+    def _move(self, src_address: str, dst_address: str, amt: int) -> None:
+        if self.balanceOf(src_address) < amt:
+            raise ValueError("ERR_INSUFFICIENT_BAL")
+        self._balances[src_address] = self.balanceOf(src_address) - amt
+        self._balances[dst_address] = self.balanceOf(dst_address) + amt
+
+
+@enforce_types
+class ShadowPool(ShadowToken):
+    """oceanv3 BPool, as created by BFactory.newBPool(): the swap fee is
+    MIN_FEE. It is its own pool token (BPT)"""
+
+    def __init__(self, controller_address: str):
+        # pool shares get minted by joins, never via mint()
+        super().__init__("Balancer Pool Token", "BPT", constants.ZERO_ADDRESS)
+        self._controller_address = controller_address
+        self._swap_fee = MIN_FEE
+        self._finalized = False
+        self._tokens: List[str] = []
+        self._records: Dict[str, dict] = {}  # token : {"denorm", "balance"}
+        self._total_weight = 0
+
+    # ===================================================================
+    # views
+    def getController(self) -> str:
+        return self._controller_address
+
+    def getCurrentTokens(self) -> List[str]:
+        return list(self._tokens)
+
+    def isFinalized(self) -> bool:
+        return self._finalized
+
+    def isBound(self, token_address: str) -> bool:
+        return token_address in self._records
+
+    def getBalance(self, token_address: str) -> int:
+        return self._record(token_address)["balance"]
+
+    def getDenormalizedWeight(self, token_address: str) -> int:
+        return self._record(token_address)["denorm"]
+
+    def getTotalDenormalizedWeight(self) -> int:
+        return self._total_weight
+
+    def getSwapFee(self) -> int:
+        return self._swap_fee
+
+    def getSpotPrice(self, tokenIn_address: str, tokenOut_address: str) -> int:
+        return bmath.calcSpotPrice(
+            *self._inOut(tokenIn_address, tokenOut_address), self._swap_fee
+        )
+
+    # ===================================================================
+    # setup, by the controller
+    def bind(self, sender: str, token_address: str, balance: int, denorm: int):
+        """Bind a token, with its initial balance and weight. As bind() then
+        rebind() of a fresh token in BPool"""
+        self._requireController(sender)
+        if token_address in self._records:
+            raise ValueError("ERR_IS_BOUND")
+        self._requireNotFinalized()
+        if len(self._tokens) >= MAX_BOUND_TOKENS:
+            raise ValueError("ERR_MAX_TOKENS")
+        if denorm < MIN_WEIGHT:
+            raise ValueError("ERR_MIN_WEIGHT")
+        if denorm > MAX_WEIGHT:
+            raise ValueError("ERR_MAX_WEIGHT")
+        if balance < MIN_BALANCE:
+            raise ValueError("ERR_MIN_BALANCE")
+        if self._total_weight + denorm > MAX_TOTAL_WEIGHT:
+            raise ValueError("ERR_MAX_TOTAL_WEIGHT")
+
+        self._pullUnderlying(token_address, sender, balance)
+        self._tokens.append(token_address)
+        self._records[token_address] = {"denorm": denorm, "balance": balance}
+        self._total_weight += denorm
+        self._touch()
+
+    def finalize(self, sender: str) -> None:
+        self._requireController(sender)
+        self._requireNotFinalized()
+        if len(self._tokens) < MIN_BOUND_TOKENS:
+            raise ValueError("ERR_MIN_TOKENS")
+        self._finalized = True
+        self._mintPoolShare(sender, INIT_POOL_SUPPLY)
+        self._touch()
+
+    # ===================================================================
+    # swaps
+    def swapExactAmountIn(  # pylint: disable=too-many-arguments
+        self,
+        sender: str,
+        tokenIn_address: str,
+        tokenAmountIn: int,
+        tokenOut_address: str,
+        minAmountOut: int,
+        maxPrice: int,
+    ) -> Tuple[int, int]:
+        """Returns (tokenAmountOut, spotPriceAfter)"""
+        in_record, _ = self._swapRecords(tokenIn_address, tokenOut_address)
+        if tokenAmountIn > bmath.bmul(in_record["balance"], MAX_IN_RATIO):
+            raise ValueError("ERR_MAX_IN_RATIO")
+        spotPriceBefore = self._checkPriceBefore(
+            tokenIn_address, tokenOut_address, maxPrice
+        )
+        tokenAmountOut = bmath.calcOutGivenIn(
+            *self._inOut(tokenIn_address, tokenOut_address),
+            tokenAmountIn,
+            self._swap_fee,
+        )
+        if tokenAmountOut < minAmountOut:
+            raise ValueError("ERR_LIMIT_OUT")
+        spotPriceAfter = self._swap(
+            sender,
+            (tokenIn_address, tokenAmountIn),
+            (tokenOut_address, tokenAmountOut),
+            spotPriceBefore,
+            maxPrice,
+        )
+        return (tokenAmountOut, spotPriceAfter)
+
+    def swapExactAmountOut(  # pylint: disable=too-many-arguments
+        self,
+        sender: str,
+        tokenIn_address: str,
+        maxAmountIn: int,
+        tokenOut_address: str,
+        tokenAmountOut: int,
+        maxPrice: int,
+    ) -> Tuple[int, int]:
+        """Returns (tokenAmountIn, spotPriceAfter)"""
+        _, out_record = self._swapRecords(tokenIn_address, tokenOut_address)
+        if tokenAmountOut > bmath.bmul(out_record["balance"], MAX_OUT_RATIO):
+            raise ValueError("ERR_MAX_OUT_RATIO")
+        spotPriceBefore = self._checkPriceBefore(
+            tokenIn_address, tokenOut_address, maxPrice
+        )
+        tokenAmountIn = bmath.calcInGivenOut(
+            *self._inOut(tokenIn_address, tokenOut_address),
+            tokenAmountOut,
+            self._swap_fee,
+        )
+        if tokenAmountIn > maxAmountIn:
+            raise ValueError("ERR_LIMIT_IN")
+        spotPriceAfter = self._swap(
+            sender,
+            (tokenIn_address, tokenAmountIn),
+            (tokenOut_address, tokenAmountOut),
+            spotPriceBefore,
+            maxPrice,
+        )
+        return (tokenAmountIn, spotPriceAfter)
+
+    # ===================================================================
+    # single-sided joins and exits
+    def joinswapExternAmountIn(
+        self,
+        sender: str,
+        tokenIn_address: str,
+        tokenAmountIn: int,
+        minPoolAmountOut: int,
+    ) -> int:
+        """Returns poolAmountOut"""
+        self._requireFinalized()
+        in_record = self._record(tokenIn_address)
+        if tokenAmountIn > bmath.bmul(in_record["balance"], MAX_IN_RATIO):
+            raise ValueError("ERR_MAX_IN_RATIO")
+        poolAmountOut = bmath.calcPoolOutGivenSingleIn(
+            in_record["balance"],
+            in_record["denorm"],
+            self._total_supply,
+            self._total_weight,
+            tokenAmountIn,
+            self._swap_fee,
+        )
+        if poolAmountOut < minPoolAmountOut:
+            raise ValueError("ERR_LIMIT_OUT")
+
+        self._pullUnderlying(tokenIn_address, sender, tokenAmountIn)
+        in_record["balance"] = bmath.badd(in_record["balance"], tokenAmountIn)
+        self._mintPoolShare(sender, poolAmountOut)
+        self._touch()
+        return poolAmountOut
+
+    def exitswapPoolAmountIn(
+        self, sender: str, tokenOut_address: str, poolAmountIn: int, minAmountOut: int
+    ) -> int:
+        """Returns tokenAmountOut"""
+        self._requireFinalized()
+        out_record = self._record(tokenOut_address)
+        tokenAmountOut = bmath.calcSingleOutGivenPoolIn(
+            out_record["balance"],
+            out_record["denorm"],
+            self._total_supply,
+            self._total_weight,
+            poolAmountIn,
+            self._swap_fee,
+        )
+        if tokenAmountOut < minAmountOut:
+            raise ValueError("ERR_LIMIT_OUT")
+        if tokenAmountOut > bmath.bmul(out_record["balance"], MAX_OUT_RATIO):
+            raise ValueError("ERR_MAX_OUT_RATIO")
+
+        self._move(sender, self.address, poolAmountIn)  # pull pool shares
+        out_record["balance"] = bmath.bsub(out_record["balance"], tokenAmountOut)
+        self._burn(poolAmountIn)  # EXIT_FEE is 0: no shares to the factory
+        contractAt(tokenOut_address).transfer(self.address, sender, tokenAmountOut)
+        self._touch()
+        return tokenAmountOut
+
+    # ===================================================================
+    # helpers
+    def _swap(  # pylint: disable=too-many-arguments
+        self,
+        sender: str,
+        token_in: Tuple[str, int],
+        token_out: Tuple[str, int],
+        spotPriceBefore: int,
+        maxPrice: int,
+    ) -> int:
+        """Swap token_in = (address, amount) for token_out, once the prices
+        check out. Returns spotPriceAfter"""
+        (tokenIn_address, tokenAmountIn), (tokenOut_address, tokenAmountOut) = (
+            token_in,
+            token_out,
+        )
+        in_record = self._records[tokenIn_address]
+        out_record = self._records[tokenOut_address]
+        new_in_balance = bmath.badd(in_record["balance"], tokenAmountIn)
+        new_out_balance = bmath.bsub(out_record["balance"], tokenAmountOut)
+        spotPriceAfter = bmath.calcSpotPrice(
+            new_in_balance,
+            in_record["denorm"],
+            new_out_balance,
+            out_record["denorm"],
+            self._swap_fee,
+        )
+        if spotPriceAfter < spotPriceBefore:
+            raise ValueError("ERR_MATH_APPROX")
+        if spotPriceAfter > maxPrice:
+            raise ValueError("ERR_LIMIT_PRICE")
+        if spotPriceBefore > bmath.bdiv(tokenAmountIn, tokenAmountOut):
+            raise ValueError("ERR_MATH_APPROX")
+
+        self._pullUnderlying(tokenIn_address, sender, tokenAmountIn)
+        in_record["balance"], out_record["balance"] = new_in_balance, new_out_balance
+        contractAt(tokenOut_address).transfer(self.address, sender, tokenAmountOut)
+        self._touch()
+        return spotPriceAfter
+
+    def _checkPriceBefore(
+        self, tokenIn_address: str, tokenOut_address: str, maxPrice: int
+    ) -> int:
+        """Returns spotPriceBefore"""
+        spotPriceBefore = self.getSpotPrice(tokenIn_address, tokenOut_address)
+        if spotPriceBefore > maxPrice:
+            raise ValueError("ERR_BAD_LIMIT_PRICE")
+        return spotPriceBefore
+
+    def _swapRecords(self, tokenIn_address: str, tokenOut_address: str) -> tuple:
+        in_record = self._record(tokenIn_address)
+        out_record = self._record(tokenOut_address)
+        if not self._finalized:  # only finalize() makes swaps public here
+            raise ValueError("ERR_SWAP_NOT_PUBLIC")
+        return in_record, out_record
+
+    def _inOut(self, tokenIn_address: str, tokenOut_address: str) -> tuple:
+        """(balance in, weight in, balance out, weight out)"""
+        in_record = self._record(tokenIn_address)
+        out_record = self._record(tokenOut_address)
+        return (
+            in_record["balance"],
+            in_record["denorm"],
+            out_record["balance"],
+            out_record["denorm"],
+        )
+
+    def _record(self, token_address: str) -> dict:
+        if token_address not in self._records:
+            raise ValueError("ERR_NOT_BOUND")
+        return self._records[token_address]
+
+    def _pullUnderlying(self, token_address: str, src_address: str, amt: int):
+        contractAt(token_address).transferFrom(
+            self.address, src_address, self.address, amt
+        )
+
+    def _mintPoolShare(self, dst_address: str, amt: int) -> None:
+        self._total_supply = bmath.badd(self._total_supply, amt)
+        self._balances[dst_address] = self.balanceOf(dst_address) + amt
+
+    def _requireController(self, sender: str) -> None:
+        if sender != self._controller_address:
+            raise ValueError("ERR_NOT_CONTROLLER")
+
+    def _requireFinalized(self) -> None:
+        if not self._finalized:
+            raise ValueError("ERR_NOT_FINALIZED")
+
+    def _requireNotFinalized(self) -> None:
+        if self._finalized:
+            raise ValueError("ERR_IS_FINALIZED")
+
+    def _touch(self) -> None:
+        _TOUCHED_POOLS.add(self.address)
@@ -0,0 +1,217 @@
+"""
+Parameter sweeps: run a netlist once per combination of SimStrategy
+attribute values, in parallel.
+
+A sweep spec is a dict (typically from a json file) of
+attribute name : values. Values are either a list, or a range given as
+{"start": .., "stop": .., "step": ..} where 'stop' is excluded, like
+Python's range(). Example:
+  {"_percent_burn": [0.0, 0.05, 0.5],
+   "max_ticks": {"start": 100, "stop": 400, "step": 100}}
+
+Each run gets a fresh SimStrategy(), then its attributes get overridden.
+Attributes that the constructor derived from others don't get recomputed.
+
+If the netlist module has runBatch(ss_list) and canBatch(ss_list)
+functions (eg wsloop), and canBatch() accepts the runs, they go through
+runBatch() instead: runs that share time_step, max_ticks and log_interval
+step together in one process, as numpy arrays.
+
+Output tree:
+  OUTPUT_DIR/index.csv -- one row per run: run dir, status, sweep values
+  OUTPUT_DIR/run_0000/ -- output of first run (data.csv, data.npz). Etc.
+"""
+
+import csv
+import importlib
+import itertools
+import json
+import logging
+import os
+from typing import Dict, List, Optional
+
+from enforce_typing import enforce_types
+
+from engine.RunRecorder import RunRecorder
+from util import agentkeys, chainstats, globaltokens
+from util.parallelutil import runInWorkers
+
+log = logging.getLogger("master")
+
+INDEX_FILENAME = "index.csv"
+
+
+@enforce_types
+def loadSweepSpec(filename: str) -> Dict[str, list]:
+    with open(filename, encoding="UTF-8") as f:
+        spec = json.load(f)
+    return parseSweepSpec(spec)
+
+
+@enforce_types
+def parseSweepSpec(spec: dict) -> Dict[str, list]:
+    """Return dict of attribute name : list of values. Expands ranges."""
+    if not spec:
+        raise ValueError("sweep spec needs at least one attribute")
+
+    parsed_spec = {}
+    for attr_name, vals in spec.items():
+        if isinstance(vals, dict):
+            vals = _rangeVals(attr_name, vals)
+        if not isinstance(vals, list) or not vals:
+            raise ValueError(f"'{attr_name}' needs a non-empty list or a range")
+        parsed_spec[attr_name] = vals
+    return parsed_spec
+
+
+@enforce_types
+def _rangeVals(attr_name: str, range_spec: dict) -> list:
+    if set(range_spec.keys()) != {"start", "stop", "step"}:
+        raise ValueError(f"range of '{attr_name}' needs start, stop, step")
+    start, stop, step = range_spec["start"], range_spec["stop"], range_spec["step"]
+    if step == 0:
+        raise ValueError(f"range of '{attr_name}' has step 0")
+
+    # start + i*step, rather than adding step repeatedly: no float drift
+    n_vals = max(0, -int((start - stop) // step))
+    return [start + i * step for i in range(n_vals)]
+
+
+@enforce_types
+def sweepPoints(spec: Dict[str, list]) -> List[dict]:
+    """Return every combination of values, as a list of
+    dicts of attribute name : value. The last attribute varies fastest."""
+    attr_names = list(spec.keys())
+    return [dict(zip(attr_names, vals)) for vals in itertools.product(*spec.values())]
+
+
+def buildSimStrategy(netlist_module, overrides: dict):
+    """Return the netlist's SimStrategy(), with attributes overridden"""
+    ss = netlist_module.SimStrategy()
+    for attr_name, val in overrides.items():
+        if not hasattr(ss, attr_name):
+            raise ValueError(f"SimStrategy has no attribute '{attr_name}'")
+        is_int = isinstance(val, int) and not isinstance(val, bool)
+        if is_int and isinstance(getattr(ss, attr_name), float):
+            val = float(val)  # eg json "1" for a float attribute
+        setattr(ss, attr_name, val)
+    return ss
+
+
+@enforce_types
+def importNetlistModule(netlist_str: str):
+    module_str = netlist_str.replace("/", ".").replace(".py", "")
+    return importlib.import_module(module_str)
+
+
+@enforce_types
+def runSweep(
+    netlist_str: str,
+    spec: Dict[str, list],
+    output_dir: str,
+    n_workers: Optional[int] = None,
+) -> List[str]:
+    """
+    Run the netlist once per point of the sweep, across worker processes.
+    Returns the status of each run: "ok", or why it failed.
+    """
+    points = sweepPoints(spec)
+
+    # fail fast on bad attribute names, rather than in every worker
+    netlist_module = importNetlistModule(netlist_str)
+    buildSimStrategy(netlist_module, points[0])
+
+    os.mkdir(output_dir)
+    run_dirs = [runDirName(output_dir, run_i) for run_i in range(len(points))]
+    log.info("Sweep: %d runs of %s", len(points), netlist_str)
+    if hasattr(netlist_module, "runBatch") and netlist_module.canBatch(
+        [buildSimStrategy(netlist_module, point) for point in points]
+    ):
+        statuses = _runBatches(netlist_module, points, run_dirs)
+    else:
+        args_list = [
+            (netlist_str, point, run_dir) for point, run_dir in zip(points, run_dirs)
+        ]
+        statuses = runInWorkers(runVariant, args_list, n_workers)
+
+    _writeIndex(output_dir, list(spec.keys()), points, run_dirs, statuses)
+    n_ok = statuses.count("ok")
+    log.info("Sweep done: %d ok, %d failed", n_ok, len(statuses) - n_ok)
+    return statuses
+
+
+@enforce_types
+def runDirName(output_dir: str, run_i: int) -> str:
+    return os.path.join(output_dir, f"run_{run_i:04d}")
+
+
+@enforce_types
+def runVariant(
+    netlist_str: str, overrides: dict, output_dir: str, seed: Optional[int] = None
+) -> str:
+    """Run one variant of the netlist. Returns "ok", or why it failed.
+    If 'seed' is given, it seeds the run's random stream (state.rng).
+    Runs in a worker process."""
+    # pylint: disable=import-outside-toplevel
+    from engine.SimEngine import SimEngine
+
+    netlist_module = importNetlistModule(netlist_str)
+    chainstats.reset()  # workers run many variants. Count each from its setup
+    agentkeys.reset()  # and give each the agent accounts, from the first
+    try:
+        ss = buildSimStrategy(netlist_module, overrides)
+        with globaltokens.batchedFunding():  # fund all agents at once
+            state = netlist_module.SimState(ss)
+        if seed is not None:
+            state.rng.seed(seed)
+        engine = SimEngine(state, output_dir, netlist_module.netlist_createLogData)
+        engine.run()
+    except Exception as e:  # pylint: disable=broad-except
+        log.error("Run %s failed", output_dir, exc_info=True)
+        return f"failed: {type(e).__name__}: {e}"
+    return "ok"
+
+
+def _runBatches(netlist_module, points: List[dict], run_dirs: List[str]) -> List[str]:
+    """Run the points with the netlist's runBatch(), one batch per
+    (time_step, max_ticks, log_interval). Returns status of each run."""
+    batches: Dict[tuple, List[int]] = {}  # lockstep key : run indices
+    ss_list = [buildSimStrategy(netlist_module, point) for point in points]
+    for run_i, ss in enumerate(ss_list):
+        key = (ss.time_step, ss.max_ticks, ss.log_interval)
+        batches.setdefault(key, []).append(run_i)
+
+    statuses = [""] * len(points)
+    for run_indices in batches.values():
+        try:
+            header, values = netlist_module.runBatch([ss_list[i] for i in run_indices])
+        except Exception as e:  # pylint: disable=broad-except
+            log.error("Batch of %d runs failed", len(run_indices), exc_info=True)
+            for run_i in run_indices:
+                statuses[run_i] = f"failed: {type(e).__name__}: {e}"
+            continue
+
+        for run_i, run_values in zip(run_indices, values):
+            recorder = RunRecorder(run_dirs[run_i])
+            for row in run_values.tolist():
+                recorder.record(header, row)
+            recorder.close()
+            statuses[run_i] = "ok"
+    return statuses
+
+
+@enforce_types
+def _writeIndex(
+    output_dir: str,
+    attr_names: List[str],
+    points: List[dict],
+    run_dirs: List[str],
+    statuses: List[str],
+):  # pylint: disable=too-many-arguments
+    filename = os.path.join(output_dir, INDEX_FILENAME)
+    with open(filename, mode="w", encoding="UTF-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["run_dir", "status"] + attr_names)
+        for point, run_dir, status in zip(points, run_dirs, statuses):
+            run_dir = os.path.basename(run_dir)
+            writer.writerow([run_dir, status] + [point[a] for a in attr_names])
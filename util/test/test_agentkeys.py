@@ -0,0 +1,48 @@
+import brownie
+from enforce_typing import enforce_types
+from eth_account import Account
+
+from util import agentkeys, constants
+
+
+@enforce_types
+def test_agentPrivateKey():
+    keys = agentkeys.agentPrivateKeys(5)
+    assert keys == agentkeys.agentPrivateKeys(5)  # deterministic
+    assert keys[0] == agentkeys.agentPrivateKey(0)
+    assert len(set(keys)) == 5
+
+    addresses = [Account.from_key(key).address for key in keys]
+    assert len(set(addresses)) == 5
+
+
+@enforce_types
+def test_claimAccount(monkeypatch):
+    constants.connectToChain()
+    accounts = brownie.network.accounts
+
+    # pretend that the chain's last 2 base accounts are agent accounts
+    monkeypatch.setattr(agentkeys, "N_BASE_ACCOUNTS", 8)
+    monkeypatch.setattr(agentkeys, "_N_CLAIMED", 0)
+    assert agentkeys.claimAccount() == accounts[8]
+    assert agentkeys.claimAccount() == accounts[9]
+    assert agentkeys.numClaimed() == 2
+
+    accounts.add()  # not the chain's, so not claimable
+    assert agentkeys.claimAccount() is None
+    assert agentkeys.numClaimed() == 2
+
+    agentkeys.reset()
+    assert agentkeys.claimAccount() == accounts[8]
+
+
+@enforce_types
+def test_claimAccount_afterChainReset(monkeypatch):
+    constants.connectToChain()
+    monkeypatch.setattr(agentkeys, "N_BASE_ACCOUNTS", 8)
+    monkeypatch.setattr(agentkeys, "_N_CLAIMED", 0)
+    agentkeys.claimAccount()
+    assert agentkeys.numClaimed() == 1
+
+    brownie.network.chain.reset()
+    assert agentkeys.numClaimed() == 0
@@ -0,0 +1,76 @@
+import brownie
+from enforce_typing import enforce_types
+import pytest
+
+from util import balanceledger, constants, globaltokens
+from util.base18 import toBase18
+from util.tx import transferETH, txdict
+
+accounts = brownie.network.accounts
+
+
+@enforce_types
+def test_balanceOf_follows_transfers():
+    OCEAN = globaltokens.OCEANtoken()
+    alice, bob = accounts.add(), accounts.add()
+    globaltokens.fundOCEANFromAbove(alice.address, toBase18(5.0))
+
+    assert balanceledger.balanceOf(OCEAN, alice.address) == toBase18(5.0)
+    assert balanceledger.balanceOf(OCEAN, bob.address) == 0
+
+    # a tx sent by anyone updates the ledger, via its Transfer event
+    transferETH(constants.GOD_ACCOUNT, alice, "0.01 ether")  # for gas
+    OCEAN.transfer(bob.address, toBase18(2.0), txdict(alice))
+    globaltokens.fundOCEANFromAbove(bob.address, toBase18(1.0))
+
+    assert balanceledger.balanceOf(OCEAN, alice.address) == toBase18(3.0)
+    assert balanceledger.balanceOf(OCEAN, bob.address) == toBase18(3.0)
+    assert OCEAN.balanceOf(bob.address) == toBase18(3.0)
+
+
+@enforce_types
+def test_verify(monkeypatch):
+    OCEAN = globaltokens.OCEANtoken()
+    alice = accounts.add()
+    assert balanceledger.balanceOf(OCEAN, alice.address) == 0
+
+    # make the ledger stale
+    balanceledger._BALANCES[(OCEAN.address, alice.address)] = 1
+
+    monkeypatch.setattr(constants, "BALANCE_VERIFY", "never")
+    assert balanceledger.balanceOf(OCEAN, alice.address) == 1
+
+    monkeypatch.setattr(constants, "BALANCE_VERIFY", "10")
+    balanceledger.setTick(9)
+    assert balanceledger.balanceOf(OCEAN, alice.address) == 1
+    balanceledger.setTick(10)
+    with pytest.raises(AssertionError):
+        balanceledger.balanceOf(OCEAN, alice.address)
+
+    monkeypatch.setattr(constants, "BALANCE_VERIFY", "always")
+    with pytest.raises(AssertionError):
+        balanceledger.balanceOf(OCEAN, alice.address)
+
+    balanceledger.forget(alice.address)
+    assert balanceledger.balanceOf(OCEAN, alice.address) == 0
+    balanceledger.setTick(0)
+
+
+@enforce_types
+def test_prefetch(monkeypatch):
+    monkeypatch.setattr(constants, "BALANCE_VERIFY", "never")
+    OCEAN = globaltokens.OCEANtoken()
+    alice, bob = accounts.add(), accounts.add()
+    globaltokens.fundOCEANFromAbove(alice.address, toBase18(5.0))
+
+    balanceledger.prefetch([(OCEAN, alice.address), (OCEAN, bob.address)])
+    assert balanceledger._BALANCES[(OCEAN.address, alice.address)] == toBase18(5.0)
+    assert balanceledger._BALANCES[(OCEAN.address, bob.address)] == 0
+
+    # prefetch checks known balances too, when they're due
+    balanceledger._BALANCES[(OCEAN.address, alice.address)] = 1
+    balanceledger.prefetch([(OCEAN, alice.address)])
+    monkeypatch.setattr(constants, "BALANCE_VERIFY", "always")
+    with pytest.raises(AssertionError):
+        balanceledger.prefetch([(OCEAN, alice.address)])
+    balanceledger.forget(alice.address)
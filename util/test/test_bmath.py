@@ -0,0 +1,105 @@
+import brownie
+from enforce_typing import enforce_types
+import numpy
+import pytest
+
+from sol057.contracts.oceanv3 import oceanv3util
+from util import bmath
+from util.bmath import BONE
+from util.base18 import toBase18
+
+accounts = brownie.network.accounts
+
+N_CASES = 40  # random cases per function, for the differential tests
+
+
+# ===================================================================
+# pure python
+@enforce_types
+def test_bmul_bdiv_round_half_up():
+    assert bmath.bmul(BONE, BONE) == BONE
+    assert bmath.bmul(3, BONE // 2) == 2  # 1.5 wei rounds up
+    assert bmath.bdiv(BONE, 3 * BONE) == 333333333333333333
+    assert bmath.bdiv(2 * BONE, 3 * BONE) == 666666666666666667
+
+
+@enforce_types
+def test_bpow_close_to_float():
+    for base, exp in [(1.5, 0.3), (0.5, 2.7), (1.9, 4.0), (0.01, 0.5)]:
+        result = bmath.bpow(toBase18(base), toBase18(exp)) / BONE
+        assert result == pytest.approx(base**exp, abs=1e-8)  # BPOW_PRECISION
+
+
+@enforce_types
+def test_reverts_raise():
+    with pytest.raises(ValueError, match="ERR_SUB_UNDERFLOW"):
+        bmath.bsub(1, 2)
+    with pytest.raises(ValueError, match="ERR_DIV_ZERO"):
+        bmath.bdiv(1, 0)
+    with pytest.raises(ValueError, match="ERR_MUL_OVERFLOW"):
+        bmath.bmul(2**255, 2)
+    with pytest.raises(ValueError, match="ERR_BPOW_BASE_TOO_HIGH"):
+        bmath.bpow(2 * BONE, BONE // 2)
+
+
+@enforce_types
+def test_swap_round_trip():
+    bals_weights = (toBase18(200.0), toBase18(7.0), toBase18(20.0), toBase18(3.0))
+    fee = toBase18(0.003)
+    amt_in = bmath.calcInGivenOut(*bals_weights, toBase18(1.0), fee)
+    amt_out = bmath.calcOutGivenIn(*bals_weights, amt_in, fee)
+    assert amt_out == pytest.approx(toBase18(1.0), rel=1e-9)
+
+
+# ===================================================================
+# differential: vs oceanv3's BPool, whose BMath functions are public
+@pytest.mark.parametrize(
+    "func_name",
+    [
+        "calcSpotPrice",
+        "calcOutGivenIn",
+        "calcInGivenOut",
+        "calcPoolOutGivenSingleIn",
+        "calcSingleInGivenPoolOut",
+        "calcSingleOutGivenPoolIn",
+        "calcPoolInGivenSingleOut",
+    ],
+)
+def test_bit_identical_to_BPool(func_name):
+    pool = oceanv3util.newBPool(accounts[0])
+    rng = numpy.random.default_rng(seed=len(func_name))  # deterministic
+    for _ in range(N_CASES):
+        args = _randomArgs(func_name, rng)
+        try:
+            expected = getattr(pool, func_name)(*args)
+        except brownie.exceptions.VirtualMachineError:
+            with pytest.raises(ValueError):
+                getattr(bmath, func_name)(*args)
+            continue
+        assert getattr(bmath, func_name)(*args) == expected, (func_name, args)
+
+
+def _randomArgs(func_name: str, rng) -> list:
+    """Args in the ranges that pools see: balances 1e-3..1e6, weights
+    1..25, amounts up to half the balance, fees 1e-6..0.1"""
+
+    def _base18(low: float, high: float) -> int:
+        return int(
+            toBase18(float(10 ** rng.uniform(numpy.log10(low), numpy.log10(high))))
+        )
+
+    bal1, bal2 = _base18(1e-3, 1e6), _base18(1e-3, 1e6)
+    w1, w2 = _base18(1.0, 25.0), _base18(1.0, 25.0)
+    fee = _base18(1e-6, 0.1)
+    if func_name == "calcSpotPrice":
+        return [bal1, w1, bal2, w2, fee]
+    if func_name in ["calcOutGivenIn", "calcInGivenOut"]:
+        amt = _base18(1e-6, 0.5) * bal2 // BONE
+        return [bal1, w1, bal2, w2, amt, fee]
+    supply = _base18(1.0, 1e4)
+    total_w = w1 + w2
+    if func_name in ["calcPoolOutGivenSingleIn", "calcPoolInGivenSingleOut"]:
+        amt = _base18(1e-6, 0.3) * bal1 // BONE
+    else:
+        amt = _base18(1e-6, 0.3) * supply // BONE
+    return [bal1, w1, supply, total_w, amt, fee]
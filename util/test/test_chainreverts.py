@@ -0,0 +1,23 @@
+import brownie
+from enforce_typing import enforce_types
+
+from util import chainreverts, constants
+
+chain = brownie.network.chain
+
+
+@enforce_types
+def test_onRevert():
+    constants.connectToChain()
+    heights = []
+
+    def _onRevert(height: int):
+        heights.append(height)
+
+    chainreverts.onRevert(_onRevert)
+    chainreverts.onRevert(_onRevert)  # no effect
+    height = chain.height
+    chain.snapshot()
+    chain.mine()
+    chain.revert()
+    assert heights == [height]
@@ -0,0 +1,114 @@
+import brownie
+from enforce_typing import enforce_types
+import pytest
+
+from util import chainstats, constants, globaltokens
+from util.fasttx import sendTx
+
+accounts = brownie.network.accounts
+
+
+@pytest.fixture(autouse=True)
+def _resetStats():
+    chainstats.reset()
+    yield
+    chainstats.reset()
+
+
+@enforce_types
+def test_install():
+    constants.connectToChain()
+    chainstats.install()
+    chainstats.install()  # no-op the second time
+    assert "chainstats" in brownie.network.web3.middleware_onion
+
+    OCEAN = globaltokens.OCEANtoken()
+    alice, bob = accounts[0], accounts[1]
+    with chainstats.attributeTo("alice"):
+        OCEAN.balanceOf(alice.address)
+        tx = sendTx(alice, OCEAN, "approve", bob.address, 7)
+
+    reads = chainstats._STATS[("alice", OCEAN._name, "balanceOf", 0)]
+    assert reads[0] == 1 and reads[1] == 0 and reads[3] > 0.0
+    approves = chainstats._STATS[("alice", OCEAN._name, "approve", 0)]
+    assert approves[1] == 1 and approves[2] == tx.gas_used
+
+
+@enforce_types
+def test_recordRequests_noContract():
+    chainstats.setTick(3)
+    with chainstats.attributeTo("alice"):
+        chainstats.recordRequests(
+            [("eth_blockNumber", []), ("eth_blockNumber", [])],
+            [{"result": "0x1"}, {"result": "0x1"}],
+            0.5,
+        )
+    chainstats.recordRequests([("eth_chainId", [])], [{"result": "0x1"}], 0.25)
+
+    assert chainstats._STATS == {
+        ("alice", "-", "eth_blockNumber", 3): [2, 0, 0, 0.5],
+        ("-", "-", "eth_chainId", 3): [1, 0, 0, 0.25],
+    }
+
+
+@enforce_types
+def test_recordRequests_deployGas():
+    deploy = {"from": "0x" + "11" * 20, "data": "0x6080"}
+    with chainstats.attributeTo("alice"):
+        chainstats.recordRequests(
+            [("eth_sendTransaction", [deploy])], [{"result": "0xABCD"}], 0.0
+        )
+    chainstats.setTick(1)  # the receipt may come later. Its gas is the send's
+    chainstats.recordRequests(
+        [("eth_getTransactionReceipt", ["0xabcd"])],
+        [{"result": {"gasUsed": "0x10"}}],
+        0.0,
+    )
+
+    assert chainstats._STATS[("alice", "-", "deploy", 0)] == [1, 1, 16, 0.0]
+    assert chainstats._STATS[("-", "-", "eth_getTransactionReceipt", 1)][2] == 0
+    assert chainstats.totals() == {
+        "n_rpcs": 2,
+        "n_txs": 1,
+        "gas_used": 16,
+        "rpc_seconds": 0.0,
+    }
+
+
+@enforce_types
+def test_attributeTo():
+    with chainstats.attributeTo("alice"):
+        with chainstats.attributeTo("log"):
+            assert chainstats._AGENT == "log"
+        assert chainstats._AGENT == "alice"
+        with pytest.raises(ValueError):
+            with chainstats.attributeTo("bob"):
+                raise ValueError()
+        assert chainstats._AGENT == "alice"
+    assert chainstats._AGENT == "-"
+
+
+@enforce_types
+def test_writeCsv_summary(tmp_path):
+    for tick in [0, 1]:
+        chainstats.setTick(tick)
+        with chainstats.attributeTo("alice"):
+            chainstats.recordRequests(
+                [("eth_call", [{"to": None}])], [{"result": "0x"}], 1.0
+            )
+        with chainstats.attributeTo("bob"):
+            chainstats.recordRequests([("eth_gasPrice", [])], [{"result": "0x"}], 0.5)
+            chainstats.recordRequests([("eth_gasPrice", [])], [{"result": "0x"}], 0.5)
+
+    filename = chainstats.writeCsv(str(tmp_path))
+    assert filename == str(tmp_path / "chainstats.csv")
+    with open(filename) as f:
+        assert f.readline().strip() == ",".join(chainstats.CSV_HEADER)
+
+    lines = chainstats.summary(filename, 1, "rpc_seconds").split("\n")
+    assert len(lines) == 3  # header, top 1, total
+    assert lines[1].split()[:3] == ["alice", "-.deploy", "2"]
+    assert lines[2].split() == ["total", "6", "0", "0", "4.000"]
+
+    lines = chainstats.summary(filename, 5, "n_rpcs").split("\n")
+    assert lines[1].split()[:3] == ["bob", "-.eth_gasPrice", "4"]
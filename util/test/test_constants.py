@@ -1,5 +1,6 @@
 import brownie
 
+from util import constants
 from util.constants import (
     INF,
     S_PER_MIN,
@@ -32,13 +33,15 @@ def testSeconds():
 
 def test_network_connected():
     """
-    Importing from util.constants includes:
+    Accessing a brownie-dependent constant in util.constants includes:
     brownie.network.connect("development")
     """
+    assert constants.GOD_ACCOUNT is not None
     assert brownie.network.is_connected()
 
 
 def test_have_accounts():
+    assert constants.OPF_ADDRESS == constants.OPF_ACCOUNT.address
     assert brownie.network.is_connected()
     # by default, brownie should have 10 accounts
     assert brownie.network.accounts
@@ -0,0 +1,56 @@
+import brownie
+from enforce_typing import enforce_types
+
+from util import contractregistry
+from util.base18 import toBase18
+from util.contractregistry import deployOnce
+
+chain = brownie.network.chain
+
+
+@enforce_types
+def test_deployOnce():
+    n_deploys = contractregistry.deployStats()["n_deploys"]
+    token1 = deployOnce("BROWNIE_PROJECT057", "Simpletoken", "A", "A", 18, 100)
+    token2 = deployOnce("BROWNIE_PROJECT057", "Simpletoken", "A", "A", 18, 100)
+    assert token2 == token1
+    assert token1.symbol() == "A"
+    assert contractregistry.deployStats()["n_deploys"] <= n_deploys + 1
+
+    # other constructor args: other contract
+    token3 = deployOnce("BROWNIE_PROJECT057", "Simpletoken", "B", "B", 18, 100)
+    assert token3.address != token1.address
+    assert token3.symbol() == "B"
+
+
+@enforce_types
+def test_deployOnce_afterChainRevert():
+    chain.snapshot()
+    token1 = deployOnce("BROWNIE_PROJECT057", "Simpletoken", "C", "C", 18, 1)
+    token1_address = token1.address  # token1.address raises after the revert
+    chain.revert()  # token1 is gone
+
+    n_deploys = contractregistry.deployStats()["n_deploys"]
+    token2 = deployOnce("BROWNIE_PROJECT057", "Simpletoken", "C", "C", 18, 1)
+    assert contractregistry.deployStats()["n_deploys"] == n_deploys + 1
+    assert token2 is not token1
+    assert token2.address == token1_address  # same deployer nonce as token1's
+    assert token2.totalSupply() == 1
+    assert deployOnce("BROWNIE_PROJECT057", "Simpletoken", "C", "C", 18, 1) == token2
+
+
+@enforce_types
+def test_registerCache():
+    cache = contractregistry.registerCache({"setup": 1})
+    contractregistry.reset()
+    assert not cache
+
+
+@enforce_types
+def test_keyArg():
+    class MockContract:
+        address = "0x123"
+
+    assert contractregistry._keyArg(MockContract()) == "0x123"
+    assert contractregistry._keyArg([MockContract(), 2]) == ("0x123", 2)
+    assert contractregistry._keyArg(toBase18(1.0)) == toBase18(1.0)
@@ -0,0 +1,37 @@
+from enforce_typing import enforce_types
+
+from util import constants, differentialutil
+
+HEADER = ["Tick", "foo"]
+
+
+@enforce_types
+def test_divergence():
+    _divergence = differentialutil._divergence  # pylint: disable=protected-access
+    same = (HEADER, [3, 1.5])
+    assert _divergence(3, {"evm": same, "shadow": same}) is None
+
+    other = (HEADER, [3, 1.25])
+    divergence = _divergence(3, {"evm": same, "shadow": other})
+    assert "tick 3" in divergence and "foo" in divergence
+
+    assert (
+        _divergence(3, {"evm": "VirtualMachineError: x", "shadow": "ValueError: y"})
+        is None
+    )
+    assert _divergence(3, {"evm": same, "shadow": "ValueError: y"}) is not None
+
+
+@enforce_types
+def test_poolBackend():
+    prev_backend = constants.POOL_BACKEND
+    with differentialutil._poolBackend("shadow"):  # pylint: disable=protected-access
+        assert constants.POOL_BACKEND == "shadow"
+    assert constants.POOL_BACKEND == prev_backend
+
+
+def test_runDifferential_oceanv3():
+    divergence = differentialutil.runDifferential(
+        "netlists/oceanv3/netlist.py", n_ticks=200, seed=1
+    )
+    assert divergence is None
@@ -0,0 +1,118 @@
+import brownie
+from brownie.exceptions import VirtualMachineError
+from enforce_typing import enforce_types
+import pytest
+
+from util import balanceledger, constants, globaltokens
+from util.base18 import toBase18
+from util import fasttx
+from util.fasttx import FastReceipt, sendTx, transfers
+
+accounts = brownie.network.accounts
+
+
+@enforce_types
+def test_sendTx():
+    OCEAN = globaltokens.OCEANtoken()
+    alice, bob = accounts[0], accounts[1]
+    n_txs = fasttx.txCounts()
+    tx = sendTx(alice, OCEAN, "approve", bob.address, 7)
+    assert isinstance(tx, FastReceipt)
+    assert tx.status == 1 and tx.gas_used > 0
+    assert fasttx.txsSince(n_txs) == [tx]
+    assert tx not in brownie.network.history  # it's no TransactionReceipt
+    assert OCEAN.allowance(alice.address, bob.address) == 7
+
+    # nonces get counted locally, across txs
+    sendTx(alice, OCEAN, "approve", bob.address, 8)
+    assert OCEAN.allowance(alice.address, bob.address) == 8
+
+
+@enforce_types
+def test_sendTx_fromLocalAccount():
+    OCEAN = globaltokens.OCEANtoken()
+    alice, bob = accounts.add(), accounts.add()
+    accounts[0].transfer(alice, "0.01 ether")
+    globaltokens.fundOCEANFromAbove(alice.address, toBase18(5.0))
+    assert balanceledger.balanceOf(OCEAN, bob.address) == 0
+
+    tx = sendTx(alice, OCEAN, "transfer", bob.address, toBase18(2.0))
+    assert transfers(tx) == [(OCEAN.address, alice.address, bob.address, toBase18(2.0))]
+    assert OCEAN.balanceOf(bob.address) == toBase18(2.0)
+    assert balanceledger.balanceOf(OCEAN, bob.address) == toBase18(2.0)
+
+    # events get decoded when asked for
+    assert tx.events["Transfer"]["value"] == toBase18(2.0)
+
+
+@enforce_types
+def test_sendTx_revert():
+    OCEAN = globaltokens.OCEANtoken()
+    alice, bob = accounts[0], accounts[1]
+    too_much = OCEAN.balanceOf(alice.address) + 1
+    with pytest.raises(VirtualMachineError):
+        sendTx(alice, OCEAN, "transfer", bob.address, too_much)
+    sendTx(alice, OCEAN, "approve", bob.address, 1)  # nonce still ok
+
+
+@enforce_types
+def test_sendTx_nonceAfterOtherTxs():
+    OCEAN = globaltokens.OCEANtoken()
+    alice, bob = accounts[0], accounts[1]
+    sendTx(alice, OCEAN, "approve", bob.address, 1)
+    alice.transfer(bob, 1)  # via brownie: the counted nonce is now too low
+    sendTx(alice, OCEAN, "approve", bob.address, 2)
+    assert OCEAN.allowance(alice.address, bob.address) == 2
+
+
+@enforce_types
+def test_sendTx_afterChainRevert():
+    OCEAN = globaltokens.OCEANtoken()
+    alice, bob = accounts[0], accounts[1]
+    n_txs = fasttx.txCounts()
+    brownie.network.chain.snapshot()
+    sendTx(alice, OCEAN, "approve", bob.address, 3)
+    brownie.network.chain.revert()
+    assert fasttx.txCounts() == n_txs  # the reverted tx is dropped
+
+    sendTx(alice, OCEAN, "approve", bob.address, 4)  # nonce read anew
+    assert OCEAN.allowance(alice.address, bob.address) == 4
+
+
+@enforce_types
+def test_sendTx_viaBrownie(monkeypatch):
+    monkeypatch.setattr(constants, "FAST_TXS", False)
+    tx = sendTx(accounts[0], globaltokens.OCEANtoken(), "approve", accounts[1], 3)
+    assert isinstance(tx, brownie.network.transaction.TransactionReceipt)
+
+
+@enforce_types
+def test_decodeTransfer():
+    src, dst = "0x" + "11" * 20, "0x" + "22" * 20
+    src_word, dst_word = bytes(12) + bytes.fromhex("11" * 20), bytes(
+        12
+    ) + bytes.fromhex("22" * 20)
+    amt_word = (5).to_bytes(32, "big")
+    topic = fasttx.TRANSFER_TOPIC
+    expected = ("0xToken", src, dst, 5)
+
+    # indexed addresses, like most tokens. Or not, like Simpletoken
+    log = {
+        "address": "0xToken",
+        "topics": [topic, src_word, dst_word],
+        "data": amt_word,
+    }
+    assert fasttx._decodeTransfer(log) == expected
+    log = {
+        "address": "0xToken",
+        "topics": [topic],
+        "data": src_word + dst_word + amt_word,
+    }
+    assert fasttx._decodeTransfer(log) == expected
+
+    # ERC721: the token id is indexed too
+    log["topics"] = [topic, src_word, dst_word, amt_word]
+    log["data"] = b""
+    assert fasttx._decodeTransfer(log) is None
+    log = {"address": "0xToken", "topics": [bytes(32)], "data": b""}
+    assert fasttx._decodeTransfer(log) is None
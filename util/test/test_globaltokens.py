@@ -1,6 +1,57 @@
-from util import globaltokens
+import brownie
+
+from util import constants, globaltokens
+from util.base18 import toBase18
+from util.tx import transferETH
+
+accounts = brownie.network.accounts
+history = brownie.network.history
 
 
 def test_OCEAN():
     assert globaltokens.OCEANtoken().symbol() == "OCEAN"
     assert globaltokens.OCEAN_address()[:2] == "0x"
+
+
+def test_batchedFunding():
+    OCEAN = globaltokens.OCEANtoken()
+    alice, bob = accounts.add(), accounts.add()
+
+    n_txs_before = len(history)
+    with globaltokens.batchedFunding():
+        globaltokens.fundFromAbove(alice.address, toBase18(0.01), toBase18(1.0))
+        globaltokens.fundFromAbove(bob.address, 0, toBase18(2.0))
+        globaltokens.fundFromAbove(bob.address, 0, toBase18(3.0))
+        assert len(history) == n_txs_before
+        assert globaltokens.pendingFunds(alice.address) == (
+            toBase18(0.01),
+            toBase18(1.0),
+        )
+        assert globaltokens.pendingFunds(bob.address) == (0, toBase18(5.0))
+
+    assert globaltokens.pendingFunds(bob.address) == (0, 0)
+    assert alice.balance() == toBase18(0.01)
+    assert OCEAN.balanceOf(alice.address) == toBase18(1.0)
+    assert OCEAN.balanceOf(bob.address) == toBase18(5.0)
+
+
+def test_batchedFunding_sentBeforeTx():
+    alice = accounts.add()
+    with globaltokens.batchedFunding():
+        globaltokens.fundFromAbove(alice.address, toBase18(0.01), toBase18(1.0))
+        globaltokens.sendPendingFunds()
+        assert globaltokens.pendingFunds(alice.address) == (0, 0)
+        transferETH(alice, constants.GOD_ACCOUNT, 1)  # needs alice's ETH
+
+
+def test_batchedFunding_raises():
+    alice = accounts.add()
+    n_txs_before = len(history)
+    try:
+        with globaltokens.batchedFunding():
+            globaltokens.fundFromAbove(alice.address, toBase18(0.01), toBase18(1.0))
+            raise ValueError("setup failed")
+    except ValueError:
+        pass
+    assert globaltokens.pendingFunds(alice.address) == (0, 0)  # dropped
+    assert len(history) == n_txs_before
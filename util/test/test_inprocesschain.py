@@ -0,0 +1,69 @@
+import subprocess
+import sys
+
+from enforce_typing import enforce_types
+import pytest
+
+pytest.importorskip("eth_tester")
+
+# runs in a fresh process: connect() takes over brownie's one network
+PROBE = """
+import brownie
+import eth_account
+
+from util import agentkeys, constants
+from util.tx import transferETH
+
+constants.CHAIN_BACKEND = "inprocess"
+constants.N_AGENT_KEYS = 2
+constants.connectToChain()
+accounts, chain = brownie.network.accounts, brownie.network.chain
+
+# 10 base accounts, then the agent ones of util.agentkeys, all funded
+assert len(accounts) == agentkeys.N_BASE_ACCOUNTS + 2
+for i in range(2):
+    agent_address = eth_account.Account.from_key(agentkeys.agentPrivateKey(i)).address
+    assert accounts[agentkeys.N_BASE_ACCOUNTS + i].address == agent_address
+    assert accounts[agentkeys.N_BASE_ACCOUNTS + i].balance() > 0
+assert agentkeys.claimAccount() == accounts[agentkeys.N_BASE_ACCOUNTS]
+
+# mine, like SimEngine does
+height, timestamp = chain.height, chain[-1].timestamp
+chain.mine(blocks=1, timedelta=3600)
+assert chain.height == height + 1
+assert abs(chain[-1].timestamp - (timestamp + 3600)) < 60  # brownie's clock
+timestamp = chain[-1].timestamp
+chain.sleep(100)
+assert chain[-1].timestamp >= timestamp + 100
+
+# txs, and reverting them
+balance = accounts[1].balance()
+chain.snapshot()
+tx = transferETH(accounts[0], accounts[1], 5)
+assert tx.status == 1 and accounts[1].balance() == balance + 5
+chain.revert()
+assert accounts[1].balance() == balance
+
+# accounts made here sign their own txs
+new_account = accounts.add()
+transferETH(accounts[0], new_account, 10**18)
+transferETH(new_account, accounts[1], 7)
+
+try:
+    brownie.network.rpc.unlock_account(accounts[0].address)
+    assert False, "should have raised"
+except ValueError:
+    pass
+
+brownie.network.disconnect()
+print("ok")
+"""
+
+
+@enforce_types
+def test_inprocessChain():
+    result = subprocess.run(
+        [sys.executable, "-c", PROBE], capture_output=True, text=True, check=False
+    )
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.split()[-1] == "ok"
@@ -0,0 +1,69 @@
+import csv
+import os
+
+from enforce_typing import enforce_types
+import numpy
+import pytest
+
+from engine.RunRecorder import RunRecorder
+from util import montecarloutil
+from util.plotutil import runDirToHeaderValues
+
+HEADER = ["Tick", "foo"]
+
+
+@enforce_types
+def test_replicaSeeds():
+    seeds = montecarloutil.replicaSeeds(42, 5)
+    assert len(seeds) == len(set(seeds)) == 5
+    assert montecarloutil.replicaSeeds(42, 5) == seeds
+    assert montecarloutil.replicaSeeds(43, 5) != seeds
+    assert montecarloutil.replicaSeeds(42, 3) == seeds[:3]
+
+
+@enforce_types
+def _writeRun(run_dir: str, foos: list):
+    recorder = RunRecorder(run_dir)
+    for tick, foo in enumerate(foos):
+        recorder.record(HEADER, [tick, foo])
+    recorder.close()
+
+
+@enforce_types
+def test_percentileSeries(tmpdir):
+    run_dirs = [str(tmpdir.join(f"run_{i}")) for i in range(3)]
+    _writeRun(run_dirs[0], [1.0, 10.0])
+    _writeRun(run_dirs[1], [2.0, 30.0])
+    _writeRun(run_dirs[2], [3.0, 20.0])
+
+    header, percentile_values = montecarloutil.percentileSeries(run_dirs, [0, 50])
+    assert header == HEADER
+    numpy.testing.assert_array_equal(percentile_values[0], [[0, 1.0], [1, 10.0]])
+    numpy.testing.assert_array_equal(percentile_values[50], [[0, 2.0], [1, 20.0]])
+
+    _writeRun(str(tmpdir.join("short_run")), [1.0])
+    with pytest.raises(ValueError):
+        montecarloutil.percentileSeries(
+            run_dirs + [str(tmpdir.join("short_run"))], [50]
+        )
+
+
+@enforce_types
+def test_runMonteCarlo_wsloop(tmpdir):
+    output_dir = str(tmpdir.join("mc"))
+    root_seed, statuses = montecarloutil.runMonteCarlo(
+        "netlists/wsloop/netlist.py", 3, output_dir, root_seed=7, n_workers=2
+    )
+    assert root_seed == 7
+    assert statuses == ["ok"] * 3
+
+    with open(os.path.join(output_dir, "index.csv"), encoding="UTF-8") as f:
+        rows = list(csv.reader(f))
+    assert rows[0] == ["run_dir", "status", "seed"]
+    assert [int(row[2]) for row in rows[1:]] == montecarloutil.replicaSeeds(7, 3)
+
+    # wsloop has no randomness, so every percentile equals each run
+    _, run_values = runDirToHeaderValues(os.path.join(output_dir, "run_0000"))
+    for p in [5, 50, 95]:
+        _, p_values = runDirToHeaderValues(os.path.join(output_dir, f"p{p}"))
+        numpy.testing.assert_allclose(p_values, run_values)
@@ -0,0 +1,32 @@
+import brownie
+from enforce_typing import enforce_types
+
+from util import globaltokens
+from util.base18 import toBase18
+from util.multicall import MulticallBatch
+
+accounts = brownie.network.accounts
+
+
+@enforce_types
+def test_resolve_matches_calls():
+    OCEAN = globaltokens.OCEANtoken()
+    alice = accounts.add()
+    globaltokens.fundOCEANFromAbove(alice.address, toBase18(5.0))
+
+    batch = MulticallBatch()
+    i_symbol = batch.add(OCEAN, "symbol")
+    i_balance = batch.add(OCEAN, "balanceOf", alice.address)
+    batch.add(OCEAN, "totalSupply")
+    assert len(batch) == 3
+
+    results = batch.resolve()
+    assert results == batch.results
+    assert results[i_symbol] == "OCEAN"
+    assert results[i_balance] == toBase18(5.0)
+    assert results[2] == OCEAN.totalSupply()
+
+
+@enforce_types
+def test_resolve_empty():
+    assert MulticallBatch().resolve() == []
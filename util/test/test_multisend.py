@@ -0,0 +1,67 @@
+import brownie
+from enforce_typing import enforce_types
+
+from util import constants, globaltokens, multisend
+from util.base18 import toBase18
+from util.multisend import MultiSendBatch
+
+accounts = brownie.network.accounts
+
+
+@enforce_types
+def test_send():
+    OCEAN = globaltokens.OCEANtoken()
+    alice, bob = accounts.add(), accounts.add()
+
+    batch = MultiSendBatch()
+    batch.add(None, alice.address, toBase18(0.01))
+    batch.add(OCEAN, alice.address, toBase18(2.0))
+    batch.add(OCEAN, bob.address, toBase18(3.0))
+    batch.add(OCEAN, bob.address, 0)  # nothing to send
+    assert len(batch) == 3
+
+    txs = batch.send(constants.GOD_ACCOUNT)
+    assert len(txs) == 1
+    assert len(batch) == 0
+    assert alice.balance() == toBase18(0.01)
+    assert OCEAN.balanceOf(alice.address) == toBase18(2.0)
+    assert OCEAN.balanceOf(bob.address) == toBase18(3.0)
+
+
+@enforce_types
+def test_send_inChunks(monkeypatch):
+    monkeypatch.setattr(multisend, "MAX_TRANSFERS_PER_TX", 2)
+    OCEAN = globaltokens.OCEANtoken()
+    alices = [accounts.add() for _ in range(5)]
+
+    batch = MultiSendBatch()
+    for alice in alices:
+        batch.add(OCEAN, alice.address, toBase18(1.0))
+    txs = batch.send(constants.GOD_ACCOUNT)
+
+    assert len(txs) == 3
+    for alice in alices:
+        assert OCEAN.balanceOf(alice.address) == toBase18(1.0)
+
+
+@enforce_types
+def test_send_empty():
+    assert MultiSendBatch().send(constants.GOD_ACCOUNT) == []
+
+
+@enforce_types
+def test_send_afterChainRevert():
+    """A reset chain redeploys MultiSend at the same address, with no
+    allowances. send() approves it again"""
+    OCEAN = globaltokens.OCEANtoken()
+    alice = accounts.add()
+    brownie.network.chain.snapshot()
+    batch = MultiSendBatch()
+    batch.add(OCEAN, alice.address, toBase18(1.0))
+    batch.send(constants.GOD_ACCOUNT)
+    brownie.network.chain.revert()
+
+    OCEAN = globaltokens.OCEANtoken()
+    batch.add(OCEAN, alice.address, toBase18(2.0))
+    batch.send(constants.GOD_ACCOUNT)
+    assert OCEAN.balanceOf(alice.address) == toBase18(2.0)
@@ -0,0 +1,55 @@
+import brownie
+from enforce_typing import enforce_types
+import pytest
+
+from util import globaltokens, rpcbatch
+from util.base18 import toBase18
+from util.rpcbatch import RPCBatch
+from util.tx import transferETH
+
+accounts = brownie.network.accounts
+
+
+@enforce_types
+def test_resolve_matches_calls():
+    OCEAN = globaltokens.OCEANtoken()
+    alice = accounts.add()
+    globaltokens.fundOCEANFromAbove(alice.address, toBase18(5.0))
+    transferETH(accounts[0], alice, "0.01 ether")
+
+    batch = RPCBatch()
+    i_symbol = batch.add(OCEAN, "symbol")
+    i_balance = batch.add(OCEAN, "balanceOf", alice.address)
+    i_ETH = batch.addETHBalance(alice.address)
+    batch.add(OCEAN, "totalSupply")
+    assert len(batch) == 4
+
+    results = batch.resolve()
+    assert results == batch.results
+    assert results[i_symbol] == "OCEAN"
+    assert results[i_balance] == toBase18(5.0)
+    assert results[i_ETH] == toBase18(0.01)
+    assert results[3] == OCEAN.totalSupply()
+
+
+@enforce_types
+def test_resolve_inChunks(monkeypatch):
+    monkeypatch.setattr(rpcbatch, "MAX_READS_PER_REQUEST", 2)
+    OCEAN = globaltokens.OCEANtoken()
+    batch = RPCBatch()
+    for account in accounts[:5]:
+        batch.add(OCEAN, "balanceOf", account.address)
+    assert batch.resolve() == [OCEAN.balanceOf(a.address) for a in accounts[:5]]
+
+
+@enforce_types
+def test_resolve_revert():
+    batch = RPCBatch()
+    batch.add(globaltokens.OCEANtoken(), "transferFrom", accounts[1], accounts[2], 1)
+    with pytest.raises(ValueError):
+        batch.resolve()
+
+
+@enforce_types
+def test_resolve_empty():
+    assert RPCBatch().resolve() == []
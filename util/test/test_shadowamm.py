@@ -0,0 +1,161 @@
+import brownie
+from enforce_typing import enforce_types
+import pytest
+
+from sol057.contracts.oceanv3 import oceanv3util
+from util import constants, globaltokens, shadowamm
+from util.base18 import toBase18
+from util.shadowamm import ShadowPool, ShadowToken
+from util.tx import transferETH, txdict
+
+accounts = brownie.network.accounts
+
+ALICE = "0x" + "a" * 40
+BOB = "0x" + "b" * 40
+
+
+@pytest.fixture(autouse=True)
+def _reset():
+    shadowamm.reset()
+
+
+@enforce_types
+def test_token():
+    token = ShadowToken("DT", "DT", ALICE, cap=toBase18(10.0))
+    assert shadowamm.contractAt(token.address) is token
+
+    token.mint(ALICE, ALICE, toBase18(10.0))
+    with pytest.raises(ValueError, match="ERR_CAP_EXCEEDED"):
+        token.mint(ALICE, ALICE, 1)
+    with pytest.raises(ValueError, match="ERR_NOT_MINTER"):
+        token.mint(BOB, BOB, 0)
+
+    token.transfer(ALICE, BOB, toBase18(3.0))
+    assert token.balanceOf(BOB) == toBase18(3.0)
+    with pytest.raises(ValueError, match="ERR_INSUFFICIENT_BAL"):
+        token.transfer(BOB, ALICE, toBase18(4.0))
+
+    with pytest.raises(ValueError, match="ERR_BTOKEN_BAD_CALLER"):
+        token.transferFrom(BOB, ALICE, BOB, 1)
+    token.approve(ALICE, BOB, toBase18(2.0))
+    token.transferFrom(BOB, ALICE, BOB, toBase18(0.5))
+    assert token.allowance(ALICE, BOB) == toBase18(1.5)
+    assert token.balanceOf(ALICE) == toBase18(6.5)
+    assert token.totalSupply() == toBase18(10.0)
+
+
+@enforce_types
+def test_pool_swap_and_revert():
+    OCEAN, DT, pool = _shadowPool()
+    assert shadowamm.popTouchedPools() == {pool.address}
+    assert shadowamm.popTouchedPools() == set()
+    assert pool.balanceOf(ALICE) == shadowamm.INIT_POOL_SUPPLY
+
+    OCEAN.mint(shadowamm.GOD_ADDRESS, BOB, toBase18(100.0))
+    OCEAN.approve(BOB, pool.address, toBase18(100.0))
+    price = pool.getSpotPrice(OCEAN.address, DT.address)
+    amt_in, price_after = pool.swapExactAmountOut(
+        BOB, OCEAN.address, toBase18(100.0), DT.address, toBase18(1.0), 2**255
+    )
+    assert price_after > price
+    assert DT.balanceOf(BOB) == toBase18(1.0)
+    assert OCEAN.balanceOf(BOB) == toBase18(100.0) - amt_in
+    assert pool.getBalance(OCEAN.address) == toBase18(200.0) + amt_in
+    assert shadowamm.popTouchedPools() == {pool.address}
+
+    # a failed swap changes nothing
+    with pytest.raises(ValueError, match="ERR_MAX_OUT_RATIO"):
+        pool.swapExactAmountOut(
+            BOB, OCEAN.address, toBase18(100.0), DT.address, toBase18(10.0), 2**255
+        )
+    with pytest.raises(ValueError, match="ERR_BTOKEN_BAD_CALLER"):
+        pool.swapExactAmountIn(BOB, DT.address, toBase18(1.0), OCEAN.address, 0, 2**255)
+    assert DT.balanceOf(BOB) == toBase18(1.0)
+    assert shadowamm.popTouchedPools() == set()
+
+
+@enforce_types
+def test_pool_join_exit():
+    OCEAN, _, pool = _shadowPool()
+    OCEAN.mint(shadowamm.GOD_ADDRESS, BOB, toBase18(10.0))
+    OCEAN.approve(BOB, pool.address, toBase18(10.0))
+
+    BPT_out = pool.joinswapExternAmountIn(BOB, OCEAN.address, toBase18(10.0), 0)
+    assert pool.balanceOf(BOB) == BPT_out
+    assert pool.totalSupply() == shadowamm.INIT_POOL_SUPPLY + BPT_out
+
+    OCEAN_out = pool.exitswapPoolAmountIn(BOB, OCEAN.address, BPT_out, 0)
+    assert pool.balanceOf(BOB) == 0
+    assert pool.totalSupply() == shadowamm.INIT_POOL_SUPPLY
+    assert OCEAN_out < toBase18(10.0)  # paid swap fees, both ways
+    assert OCEAN.balanceOf(BOB) == OCEAN_out
+
+
+def test_pool_bit_identical_to_BPool():
+    """Same actions on a shadow pool and on a BPool give the same ints"""
+    shadow_OCEAN, shadow_DT, shadow_pool = _shadowPool()
+    account = accounts.add()  # fresh: no OCEAN from other tests
+    transferETH(constants.GOD_ACCOUNT, account, "1 ether")
+    OCEAN = globaltokens.OCEANtoken()
+    DT = oceanv3util.newDatatoken("", "DT", "DT", toBase18(100.0), account)
+    DT.mint(account.address, toBase18(100.0), txdict(account))
+    globaltokens.fundOCEANFromAbove(account.address, toBase18(1000.0))
+    pool = oceanv3util.newBPool(account)
+    DT.approve(pool.address, toBase18(20.0), txdict(account))
+    OCEAN.approve(pool.address, toBase18(200.0), txdict(account))
+    pool.bind(DT.address, toBase18(20.0), toBase18(3.0), txdict(account))
+    pool.bind(OCEAN.address, toBase18(200.0), toBase18(7.0), txdict(account))
+    pool.finalize(txdict(account))
+    OCEAN.approve(pool.address, toBase18(1000.0), txdict(account))
+    DT.approve(pool.address, toBase18(1000.0), txdict(account))
+
+    shadow_OCEAN.mint(shadowamm.GOD_ADDRESS, ALICE, toBase18(800.0))
+    shadow_OCEAN.approve(ALICE, shadow_pool.address, toBase18(1000.0))
+    shadow_DT.approve(ALICE, shadow_pool.address, toBase18(1000.0))
+
+    def _both(method_name, *args):
+        shadow_args = [_shadowAddress(arg, shadow_OCEAN, shadow_DT) for arg in args]
+        tx = getattr(pool, method_name)(*args, txdict(account))
+        getattr(shadow_pool, method_name)(ALICE, *shadow_args)
+        return tx
+
+    _both("swapExactAmountOut", OCEAN, toBase18(500.0), DT, toBase18(1.7), 2**255)
+    _both("swapExactAmountIn", DT, toBase18(2.3), OCEAN, 0, 2**255)
+    _both("joinswapExternAmountIn", OCEAN, toBase18(33.3), 0)
+    _both("exitswapPoolAmountIn", OCEAN, toBase18(4.2), 0)
+
+    assert shadow_pool.getBalance(shadow_OCEAN.address) == pool.getBalance(OCEAN)
+    assert shadow_pool.getBalance(shadow_DT.address) == pool.getBalance(DT)
+    assert shadow_pool.totalSupply() == pool.totalSupply()
+    assert shadow_pool.balanceOf(ALICE) == pool.balanceOf(account)
+    assert shadow_OCEAN.balanceOf(ALICE) == OCEAN.balanceOf(account)
+    assert shadow_DT.balanceOf(ALICE) == DT.balanceOf(account)
+
+
+def _shadowAddress(arg, shadow_OCEAN, shadow_DT):
+    """Map an arg of a BPool call to the shadow one: tokens to addresses"""
+    if not hasattr(arg, "address"):
+        return arg
+    if arg.address == globaltokens.OCEAN_address():
+        return shadow_OCEAN.address
+    return shadow_DT.address
+
+
+@enforce_types
+def _shadowPool() -> tuple:
+    """OCEAN, DT, and a finalized pool of 20 DT & 200 OCEAN. ALICE controls
+    it, with 80 DT left, like agents/test/conftest.py's pool"""
+    OCEAN = shadowamm.OCEANtoken()
+    OCEAN.mint(shadowamm.GOD_ADDRESS, ALICE, toBase18(200.0))
+    DT = ShadowToken("DT", "DT", ALICE, cap=toBase18(100.0))
+    DT.mint(ALICE, ALICE, toBase18(100.0))
+
+    pool = ShadowPool(ALICE)
+    DT.approve(ALICE, pool.address, toBase18(20.0))
+    OCEAN.approve(ALICE, pool.address, toBase18(200.0))
+    with pytest.raises(ValueError, match="ERR_NOT_FINALIZED"):
+        pool.joinswapExternAmountIn(ALICE, OCEAN.address, 1, 0)
+    pool.bind(ALICE, DT.address, toBase18(20.0), toBase18(3.0))
+    pool.bind(ALICE, OCEAN.address, toBase18(200.0), toBase18(7.0))
+    pool.finalize(ALICE)
+    return OCEAN, DT, pool
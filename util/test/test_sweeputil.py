@@ -0,0 +1,139 @@
+import csv
+import json
+import os
+
+from enforce_typing import enforce_types
+import numpy
+import pytest
+
+from netlists.wsloop import netlist as wsloop_netlist
+from util import agentkeys, constants, parallelutil, sweeputil
+from util.plotutil import runDirToHeaderValues
+
+WSLOOP = "netlists/wsloop/netlist.py"
+
+
+@enforce_types
+def test_parseSweepSpec_lists_and_ranges(tmpdir):
+    filename = str(tmpdir.join("sweep.json"))
+    with open(filename, "w", encoding="UTF-8") as f:
+        json.dump(
+            {
+                "a": [1, 2],
+                "b": {"start": 0.0, "stop": 0.3, "step": 0.1},
+                "c": {"start": 5, "stop": 0, "step": -2},
+            },
+            f,
+        )
+    spec = sweeputil.loadSweepSpec(filename)
+    assert spec["a"] == [1, 2]
+    assert spec["b"] == pytest.approx([0.0, 0.1, 0.2])
+    assert spec["c"] == [5, 3, 1]
+
+
+@enforce_types
+def test_parseSweepSpec_bad():
+    for bad_spec in [
+        {},
+        {"a": []},
+        {"a": 3},
+        {"a": {"start": 0, "stop": 3}},
+        {"a": {"start": 0, "stop": 3, "step": 0}},
+    ]:
+        with pytest.raises(ValueError):
+            sweeputil.parseSweepSpec(bad_spec)
+
+
+@enforce_types
+def test_sweepPoints():
+    points = sweeputil.sweepPoints({"a": [1, 2], "b": ["x", "y", "z"]})
+    assert len(points) == 6
+    assert points[0] == {"a": 1, "b": "x"}
+    assert points[1] == {"a": 1, "b": "y"}
+    assert points[-1] == {"a": 2, "b": "z"}
+
+
+@enforce_types
+def test_buildSimStrategy():
+    ss = sweeputil.buildSimStrategy(
+        wsloop_netlist, {"_percent_burn": 1, "max_ticks": 7}
+    )
+    assert ss._percent_burn == 1.0
+    assert isinstance(ss._percent_burn, float)
+    assert ss.max_ticks == 7
+
+    with pytest.raises(ValueError):
+        sweeputil.buildSimStrategy(wsloop_netlist, {"not_an_attribute": 1})
+
+
+@enforce_types
+def test_workerChainPort():
+    assert parallelutil.workerChainPort(0) == 8546
+    assert parallelutil.workerChainPort(3) == 8549
+    assert constants.GANACHE_PORT is None  # parent process keeps the default
+
+
+@enforce_types
+def test_runSweep_wsloop(tmpdir):
+    output_dir = str(tmpdir.join("sweep"))
+    spec = {
+        "_percent_burn": [0.0, 0.5],
+        "max_ticks": [3],
+        "log_interval": [constants.S_PER_DAY],
+    }
+    statuses = sweeputil.runSweep(WSLOOP, spec, output_dir, n_workers=2)
+    assert statuses == ["ok", "ok"]
+
+    with open(os.path.join(output_dir, "index.csv"), encoding="UTF-8") as f:
+        rows = list(csv.reader(f))
+    assert rows[0] == [
+        "run_dir",
+        "status",
+        "_percent_burn",
+        "max_ticks",
+        "log_interval",
+    ]
+    assert rows[1][:3] == ["run_0000", "ok", "0.0"]
+    assert rows[2][:3] == ["run_0001", "ok", "0.5"]
+
+    for run_dir in ["run_0000", "run_0001"]:
+        header, values = runDirToHeaderValues(os.path.join(output_dir, run_dir))
+        assert header[0] == "Tick"
+        assert values.shape[0] == 4  # ticks 0, 1, 2, 3
+
+
+@enforce_types
+def test_runSweep_batch_matches_runVariant(tmpdir):
+    # wsloop has runBatch(), so runSweep() steps its runs together
+    output_dir = str(tmpdir.join("sweep"))
+    spec = {"_percent_burn": [0.5], "max_ticks": [40]}
+    assert sweeputil.runSweep(WSLOOP, spec, output_dir) == ["ok"]
+
+    run_dir = str(tmpdir.join("variant"))
+    overrides = {"_percent_burn": 0.5, "max_ticks": 40}
+    assert sweeputil.runVariant(WSLOOP, overrides, run_dir) == "ok"
+
+    header, values = runDirToHeaderValues(os.path.join(output_dir, "run_0000"))
+    variant_header, variant_values = runDirToHeaderValues(run_dir)
+    assert header == variant_header
+    numpy.testing.assert_allclose(values, variant_values, rtol=1e-9)
+
+
+@enforce_types
+def test_runSweep_unbatchable_runsEach(tmpdir, monkeypatch):
+    # BatchSim ignores pool_weight_DT, so these runs go via runVariant()
+    def _runBatch(ss_list):
+        raise AssertionError("should not batch")
+
+    monkeypatch.setattr(wsloop_netlist, "runBatch", _runBatch)
+    output_dir = str(tmpdir.join("sweep"))
+    spec = {"pool_weight_DT": [3.0, 4.0], "max_ticks": [3]}
+    assert sweeputil.runSweep(WSLOOP, spec, output_dir, n_workers=1) == ["ok", "ok"]
+
+
+@enforce_types
+def test_runVariant_resetsAgentKeys(tmpdir, monkeypatch):
+    monkeypatch.setattr(agentkeys, "_N_CLAIMED", 5)  # claimed by an earlier run
+    overrides = {"max_ticks": 3}
+    assert sweeputil.runVariant(WSLOOP, overrides, str(tmpdir.join("run"))) == "ok"
+    assert agentkeys.numClaimed() == 0  # wsloop has no EVM agents
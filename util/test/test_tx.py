@@ -1,5 +1,6 @@
 import brownie
 
+from util import constants, tx
 from util.tx import txdict
 
 
@@ -11,3 +12,39 @@ def test_txdict():
     d = txdict(from_account)
     assert set(d.keys()) == set(["priority_fee", "max_fee", "from"])
     assert d["from"] == from_account
+
+
+def test_fees_cachedUntilInvalidated():
+    if not brownie.network.is_connected():
+        brownie.network.connect("development")
+    tx.resetFees()
+
+    d1, d2 = txdict("foo_account"), txdict("foo_account")
+    assert (d1["priority_fee"], d1["max_fee"]) == (d2["priority_fee"], d2["max_fee"])
+    assert tx.feeStats() == {"n_calls": 2, "n_refreshes": 1, "n_rpcs_saved": 3}
+
+    brownie.network.chain.mine()
+    tx.invalidateFees()
+    txdict("foo_account")
+    assert tx.feeStats()["n_refreshes"] == 2
+
+
+def test_fees_invalidatedOnChainRevert():
+    if not brownie.network.is_connected():
+        brownie.network.connect("development")
+    tx.resetFees()
+
+    brownie.network.chain.snapshot()
+    txdict("foo_account")
+    brownie.network.chain.revert()
+    txdict("foo_account")
+    assert tx.feeStats()["n_refreshes"] == 2
+
+
+def test_fixedFees(monkeypatch):
+    monkeypatch.setattr(constants, "FIXED_FEES", (1, 10))
+    tx.resetFees()
+
+    d = txdict("foo_account")
+    assert (d["priority_fee"], d["max_fee"]) == (1, 10)
+    assert tx.feeStats() == {"n_calls": 1, "n_refreshes": 0, "n_rpcs_saved": 3}
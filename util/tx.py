@@ -1,6 +1,20 @@
 """tx utilities"""
-import brownie
-from brownie.network import chain
+
+from typing import Dict, Optional, Tuple
+
+from util import chainreverts, constants
+
+# fees only change when a block gets mined. So read them from the chain once,
+# until invalidateFees(), not once per tx. Or never, if TX_FEES fixes them.
+# Each tx gets automined into a block of its own, which doesn't raise the
+# base fee; ticks mine via SimEngine, which invalidates them
+_FEES: Optional[Tuple[int, int]] = None  # (priority_fee, max_fee)
+
+# RPCs to get fees without caching: priority_fee, base_fee, priority_fee
+_N_RPCS_UNCACHED = 3
+
+# how well the cache does. See feeStats()
+_FEE_STATS: Dict[str, int] = {"n_calls": 0, "n_refreshes": 0, "n_rpcs_saved": 0}
 
 
 def txdict(from_account) -> dict:
@@ -24,8 +38,45 @@ def transferETH(from_account, to_account, amount):
     )
 
 
+def feeStats() -> Dict[str, int]:
+    """Return dict of: # fee lookups, # of them that read fees from chain,
+    # RPCs saved compared to reading fees from chain at every lookup"""
+    return dict(_FEE_STATS)
+
+
+def invalidateFees() -> None:
+    """Read fees from chain anew at the next lookup. Call after mining"""
+    global _FEES  # pylint: disable=global-statement
+    _FEES = None
+
+
+def resetFees() -> None:
+    """Forget cached fees and zero the stats"""
+    invalidateFees()
+    for key in _FEE_STATS:
+        _FEE_STATS[key] = 0
+
+
+def _onRevert(height: int) -> None:  # pylint: disable=unused-argument
+    invalidateFees()
+
+
 def _fees() -> tuple:
-    assert brownie.network.is_connected()
-    priority_fee = chain.priority_fee
-    max_fee = chain.base_fee + 2 * chain.priority_fee
-    return (priority_fee, max_fee)
+    global _FEES  # pylint: disable=global-statement
+    _FEE_STATS["n_calls"] += 1
+    if constants.FIXED_FEES is not None:
+        _FEE_STATS["n_rpcs_saved"] += _N_RPCS_UNCACHED
+        return constants.FIXED_FEES
+    if _FEES is not None:
+        _FEE_STATS["n_rpcs_saved"] += _N_RPCS_UNCACHED
+        return _FEES
+
+    from brownie.network import chain  # pylint: disable=import-outside-toplevel
+
+    constants.connectToChain()
+    chainreverts.onRevert(_onRevert)
+    priority_fee = chain.priority_fee  # 1 RPC
+    max_fee = chain.base_fee + 2 * priority_fee  # 1 RPC
+    _FEES = (priority_fee, max_fee)
+    _FEE_STATS["n_refreshes"] += 1
+    return _FEES